@@ -0,0 +1,136 @@
+"""
+Action History for Root Access
+
+NPCMessageManager used to keep a {npc: {action_type: count}} dict for message
+cooldowns and walk all of it on every new turn to count each entry down by
+one and delete the zeros. Nothing was ever removed for NPCs that had gone
+quiet, so the walk got slower with every NPC that had ever said anything.
+
+This module stores when a cooldown runs out instead of how much of it is
+left. What is left is worked out only when someone asks
+(expiry turn - current turn), so turns don't have to touch the entries.
+Entries whose cooldown has run out are dropped by a time wheel: each entry is
+filed under the turn it expires, and advancing to a new turn only opens the
+bucket for that turn.
+
+Key Components:
+--------------
+1. ExpiryWheel: Buckets of keys by the turn they expire, for O(1) turn changes
+2. ActionHistory: Per-(npc, action) cooldowns with lazy countdown and wheel eviction
+
+Cost:
+----
+- record / remaining / is_cooling_down: O(1)
+- advance (once per turn): O(1) plus the entries that expire that turn, which
+  is at most one per recorded action (so O(1) amortized)
+- Size: only actions whose cooldown is still running are stored, so the
+  history is bounded by (actions per turn x longest cooldown), not by how
+  many NPCs exist
+"""
+
+import collections
+
+
+class ExpiryWheel:
+    """Keys filed by the turn they expire. Advancing a turn opens only that turn's bucket."""
+
+    def __init__(self, turn=0):
+        self.turn = turn  # Last turn advanced to
+        self.buckets = collections.defaultdict(list)  # expiry turn -> keys
+
+    def schedule(self, key, expiry_turn):
+        """File a key to expire at the start of the given turn."""
+        if expiry_turn <= self.turn:
+            expiry_turn = self.turn + 1
+        self.buckets[expiry_turn].append(key)
+
+    def advance(self, turn):
+        """
+        Move to a new turn and return the keys that expire by then.
+
+        Keys can be scheduled more than once (when their expiry is pushed
+        back), so callers check that the key really expires now.
+        """
+        expired = []
+        buckets = self.buckets
+        if turn - self.turn > len(buckets):
+            # Long jump (e.g. a loaded save): only visit buckets that exist
+            for expiry_turn in [t for t in buckets if t <= turn]:
+                expired.extend(buckets.pop(expiry_turn))
+        else:
+            for expiry_turn in range(self.turn + 1, turn + 1):
+                keys = buckets.pop(expiry_turn, None)
+                if keys:
+                    expired.extend(keys)
+        self.turn = max(self.turn, turn)
+        return expired
+
+    def clear(self):
+        self.buckets.clear()
+
+    def __len__(self):
+        """Number of scheduled keys (including ones that were scheduled again later)."""
+        return sum(len(keys) for keys in self.buckets.values())
+
+
+class ActionHistory:
+    """Per-NPC action cooldowns stored as expiry turns, counted down lazily."""
+
+    def __init__(self, turn=0):
+        self.turn = turn
+        self.expiries = {}  # (npc, action type) -> turn the cooldown runs out
+        self.wheel = ExpiryWheel(turn)
+
+    def record(self, npc, action_type, cooldown, turn=None):
+        """Start (or restart) the action's cooldown for the NPC."""
+        turn = self.turn if turn is None else turn
+        key = (npc, action_type)
+        expiry_turn = turn + cooldown
+        self.expiries[key] = expiry_turn
+        self.wheel.schedule(key, expiry_turn)
+
+    def remaining(self, npc, action_type, turn=None):
+        """
+        Turns of cooldown left (0 if the action is ready).
+
+        Matches the old countdown: recorded with cooldown N, it reads N in the
+        same turn, N-1 one turn later, and so on down to 0.
+        """
+        expiry_turn = self.expiries.get((npc, action_type))
+        if expiry_turn is None:
+            return 0
+        left = expiry_turn - (self.turn if turn is None else turn)
+        return left if left > 0 else 0
+
+    def is_cooling_down(self, npc, action_type, turn=None):
+        return self.remaining(npc, action_type, turn) > 0
+
+    def advance(self, turn):
+        """Move to a new turn and drop the entries whose cooldown ran out. Returns how many were dropped."""
+        self.turn = turn
+        expiries = self.expiries
+        dropped = 0
+        for key in self.wheel.advance(turn):
+            # Skip keys that were recorded again after this bucket was filed
+            if expiries.get(key, turn + 1) <= turn:
+                del expiries[key]
+                dropped += 1
+        return dropped
+
+    def forget(self, npc, action_types):
+        """Drop an NPC's cooldowns (e.g. when it dies). Their wheel entries are skipped later."""
+        for action_type in action_types:
+            self.expiries.pop((npc, action_type), None)
+
+    def actions_for(self, npc):
+        """Get {action type: turns left} for one NPC (a scan, for debugging)."""
+        return {action_type: expiry_turn - self.turn
+                for (name, action_type), expiry_turn in self.expiries.items()
+                if name == npc and expiry_turn > self.turn}
+
+    def clear(self):
+        self.expiries.clear()
+        self.wheel.clear()
+
+    def __len__(self):
+        return len(self.expiries)
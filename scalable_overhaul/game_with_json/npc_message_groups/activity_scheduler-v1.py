@@ -0,0 +1,121 @@
+"""
+Activity Scheduler for Root Access
+
+Only the part of the world around the player needs to be simulated every turn.
+This module keeps track of which areas are "active" (the player's area and the
+areas its exits lead to) and only ticks those. Every other area is left alone
+until it becomes active again, and is then caught up in one step: instead of
+replaying every missed turn, cooldowns and plant growth are advanced by the
+number of turns that passed.
+
+This keeps the cost of a turn tied to the number of NPCs near the player, not
+to the number of NPCs in the whole world.
+
+Key Components:
+--------------
+1. ActivityScheduler: Tracks active areas and when each area was last ticked
+2. get_active_areas: The player's area plus its neighbours (via Area.exits)
+3. catch_up: Advances one area to the current turn in closed form
+4. npcs_to_tick: The NPCs whose behaviors should run this turn
+
+What Gets Caught Up:
+-------------------
+- NPC cooldowns: detection cooldowns decay by the elapsed turns
+- Plants in soil: each soil's plant bed grows by the elapsed turns in one step
+(Behavior cooldowns are stored as "last turn performed", and hazard effects
+expire by turn in effect_scheduler, so neither needs catching up.)
+
+Behaviors still only run in the player's area, since everything they produce
+is a message for the player. Neighbouring areas are kept warm so walking
+through an exit never lands the player in a stale area.
+"""
+
+
+class ActivityScheduler:
+    """Ticks the areas around the player and fast-forwards areas that were out of range."""
+
+    def __init__(self, game):
+        self.game = game
+        self.last_tick_turn = {}  # Area -> turn the area was last brought up to date
+        self.active_areas = []  # Areas ticked on the last update
+
+    def get_current_turn(self):
+        """Get the current turn number from the message system."""
+        message_manager = getattr(self.game, 'message_manager', None)
+        return getattr(message_manager, 'current_turn', 0)
+
+    def get_active_areas(self, area=None):
+        """Get the player's area (or the given area) plus every area its exits lead to."""
+        if area is None:
+            area = self.game.player.current_area
+        if area is None:
+            return []
+
+        active_areas = [area]
+        for neighbour in area.exits.values():
+            if neighbour is not None and neighbour not in active_areas:
+                active_areas.append(neighbour)
+        return active_areas
+
+    def is_active(self, area):
+        """Check if an area was ticked on the last update."""
+        return area in self.active_areas
+
+    def update(self, current_turn=None):
+        """
+        Bring every active area up to the current turn.
+
+        Areas that were active last turn advance by one turn; areas that just
+        became active advance by all the turns they missed.
+
+        Returns:
+            The list of active areas
+        """
+        if current_turn is None:
+            current_turn = self.get_current_turn()
+
+        self.active_areas = self.get_active_areas()
+        for area in self.active_areas:
+            self.catch_up(area, current_turn)
+        return self.active_areas
+
+    def catch_up(self, area, current_turn):
+        """
+        Advance one area to the current turn in closed form.
+
+        Returns:
+            The number of turns the area was advanced by
+        """
+        # Every area starts at turn 0 along with the rest of the world
+        elapsed = current_turn - self.last_tick_turn.get(area, 0)
+        if elapsed <= 0:
+            return 0
+        self.last_tick_turn[area] = current_turn
+
+        # Cooldowns on NPCs
+        for npc in area.npcs:
+            if hasattr(npc, 'is_alive') and not npc.is_alive:
+                continue
+            if hasattr(npc, 'advance_cooldowns'):
+                npc.advance_cooldowns(elapsed)
+
+        # Plants growing in soil: one clock move per bed, however many plants it holds
+        for obj in area.get_objects('soil'):
+            bed = getattr(obj, 'bed', None)
+            if bed is not None:
+                bed.tick(elapsed)
+
+        return elapsed
+
+    def npcs_to_tick(self):
+        """Get the living NPCs in the player's area, whose behaviors run this turn."""
+        area = self.game.player.current_area
+        if area is None:
+            return []
+        return [npc for npc in area.npcs if not (hasattr(npc, 'is_alive') and not npc.is_alive)]
+
+    def forget_area(self, area):
+        """Stop tracking an area (e.g. when it is removed from the world)."""
+        self.last_tick_turn.pop(area, None)
+        if area in self.active_areas:
+            self.active_areas.remove(area)
@@ -0,0 +1,129 @@
+"""
+Cooldown Table for Root Access
+
+Behavior cooldowns used to live in a dict keyed by id(npc), with a nested
+dict per NPC that was never cleaned up. Dead NPCs stayed in there forever,
+and because Python reuses id() values after an object is garbage collected,
+a new NPC could silently inherit the cooldowns of a dead one.
+
+This module stores the same information in a fixed layout instead:
+
+- Every NPC gets a stable integer slot the first time it records a behavior
+- Each behavior type is one column: a dense array with one entry per slot
+  holding the last turn that behavior was performed
+- When an NPC dies or is removed from the game its slot is cleared and
+  handed to the next NPC, so the table never grows past the number of NPCs
+  alive at the same time
+
+Key Components:
+--------------
+1. CooldownTable: The slot allocator plus one last-turn column per behavior type
+2. NEVER: Marker stored for behaviors a slot has never performed
+
+Queries:
+-------
+- is_ready(npc, key, turn, cooldown): One NPC, one behavior
+- ready_row(npc, keys, turn, cooldowns): One NPC, several behaviors (one slot lookup)
+- ready_npcs(npcs, key, turn, cooldown): Many NPCs, one behavior (one column scan)
+- ready_mask(key, turn, cooldown): Every slot at once, as a bytearray
+"""
+
+from array import array
+
+
+# Stored for "never performed". It is so far in the past that any cooldown has
+# passed, which matches the old "never performed means allowed" rule.
+NEVER = -(2 ** 62)
+
+
+class CooldownTable:
+    """Dense last-performed-turn table with one column per key and one slot per NPC."""
+
+    def __init__(self, columns, initial_capacity=64):
+        self.columns = {key: index for index, key in enumerate(columns)}  # key -> column index
+        self.last_turns = [array('q') for _ in self.columns]  # One dense column per key
+        self.slots = {}  # npc -> slot index
+        self.owners = []  # slot index -> npc (None for free slots)
+        self.free_slots = []  # Free slot indices, lowest index on top
+        self.capacity = 0
+        self._grow(max(1, initial_capacity))
+
+    def _grow(self, capacity):
+        """Grow every column (and the slot bookkeeping) to the new capacity."""
+        extra = capacity - self.capacity
+        if extra <= 0:
+            return
+        for column in self.last_turns:
+            column.extend([NEVER] * extra)
+        self.owners.extend([None] * extra)
+        # Newest slots go under the existing free ones, so low slots get reused first
+        self.free_slots[:0] = range(capacity - 1, self.capacity - 1, -1)
+        self.capacity = capacity
+
+    def slot_for(self, npc):
+        """Get the NPC's slot, assigning a free one if it doesn't have one yet."""
+        slot = self.slots.get(npc)
+        if slot is None:
+            if not self.free_slots:
+                self._grow(self.capacity * 2)
+            slot = self.free_slots.pop()
+            self.slots[npc] = slot
+            self.owners[slot] = npc
+        return slot
+
+    def release(self, npc):
+        """Free the NPC's slot (when it dies or leaves the game). Returns True if it had one."""
+        slot = self.slots.pop(npc, None)
+        if slot is None:
+            return False
+        for column in self.last_turns:
+            column[slot] = NEVER
+        self.owners[slot] = None
+        self.free_slots.append(slot)
+        return True
+
+    def record(self, npc, key, turn):
+        """Record that the NPC performed the behavior in the given turn."""
+        self.last_turns[self.columns[key]][self.slot_for(npc)] = turn
+
+    def get_last_turn(self, npc, key):
+        """Get the last turn the NPC performed the behavior (None if never)."""
+        slot = self.slots.get(npc)
+        if slot is None:
+            return None
+        last_turn = self.last_turns[self.columns[key]][slot]
+        return None if last_turn == NEVER else last_turn
+
+    def is_ready(self, npc, key, current_turn, cooldown):
+        """Check if the cooldown for one behavior has passed for one NPC."""
+        slot = self.slots.get(npc)
+        if slot is None:
+            # NPCs without a slot have never done anything
+            return True
+        return current_turn - self.last_turns[self.columns[key]][slot] >= cooldown
+
+    def ready_row(self, npc, keys, current_turn, cooldowns):
+        """Check several behaviors for one NPC at once. Returns a list of bools in key order."""
+        slot = self.slots.get(npc)
+        if slot is None:
+            return [True] * len(keys)
+        columns = self.columns
+        last_turns = self.last_turns
+        return [current_turn - last_turns[columns[key]][slot] >= cooldowns.get(key, 0)
+                for key in keys]
+
+    def ready_npcs(self, npcs, key, current_turn, cooldown):
+        """Get the NPCs (from the given ones) whose cooldown for a behavior has passed."""
+        column = self.last_turns[self.columns[key]]
+        threshold = current_turn - cooldown
+        slots = self.slots
+        return [npc for npc in npcs if npc not in slots or column[slots[npc]] <= threshold]
+
+    def ready_mask(self, key, current_turn, cooldown):
+        """Get a bytearray over every slot: 1 where the behavior's cooldown has passed."""
+        threshold = current_turn - cooldown
+        return bytearray(last_turn <= threshold for last_turn in self.last_turns[self.columns[key]])
+
+    def __len__(self):
+        """Number of NPCs currently holding a slot."""
+        return len(self.slots)
@@ -0,0 +1,225 @@
+"""
+Effect Scheduler for Root Access
+
+Hazard effects (hallucinations, friendliness, gift-giving, ...) used to be a
+list on each gang member, and every Effect counted itself down. The
+ActivityScheduler called advance_effects() on every NPC in the active areas
+every turn, hazards called update_effects() on each NPC they hit, and expired
+effects were taken out with list.remove. Asking "is this NPC hallucinating?"
+(attack_player, choosing behaviors, triggering hazards) meant scanning the
+list by name. After a hazard hit a crowd of hundreds, all of them were
+scanned every turn until the last effect ran out. The player's effects were a
+separate dict that nothing ever counted down.
+
+This module keeps every active effect, for NPCs and the player, in one place:
+
+- Each kind of effect (by name) gets a bit, and every entity has a bit mask
+  of the kinds it has right now, so has() is one dict lookup and an AND.
+- Each application is filed in a min-heap under the turn it expires.
+  Advancing to a new turn pops only the entries that are due; entities whose
+  effects aren't due are never touched.
+
+Durations count the turn the effect is applied on: an effect with duration 3
+applied on turn 10 is active for the rest of turn 10 and on turn 11, and is
+gone at the start of turn 12 (the old countdown also took a turn off right
+after applying). Applying an effect the entity already has extends it to the
+later expiry; a stackable effect counts each application and lasts until the
+last one runs out.
+
+Key Components:
+--------------
+1. EffectScheduler: Active effects per entity, with bit masks and an expiry heap
+2. effect_scheduler: The shared scheduler (saved with the game, see snapshot.py)
+
+Usage:
+-----
+    effect_scheduler.apply(npc, Effect("hallucinations", "Causes hallucinations", duration=3))
+    effect_scheduler.apply_all(crowd, effect)      # A hazard hitting many at once
+    effect_scheduler.has(npc, "hallucinations")   # O(1)
+    effect_scheduler.advance(turn)                # Once per turn: expires what is due
+"""
+
+import heapq
+
+
+class EffectScheduler:
+    """Active effects of every entity, expired from a min-heap keyed by expiry turn."""
+
+    def __init__(self):
+        self.turn = 0  # Last turn advanced to
+        self.kind_bits = {}  # Effect name -> bit
+        self.kind_names = []  # Bit number -> effect name
+        self.masks = {}  # Entity -> bit mask of the effect kinds it has
+        self.active = {}  # (entity, effect name) -> [effect, expiry turn, applications, record id]
+        self._heap = []  # (expiry turn, sequence, entity, effect name, record id); stale entries are skipped
+        self._sequence = 0  # Tie-breaker, so heap entries never compare entities
+
+    def bit(self, name):
+        """Get the bit for an effect kind (new kinds get the next free bit)."""
+        bit = self.kind_bits.get(name)
+        if bit is None:
+            bit = self.kind_bits[name] = 1 << len(self.kind_names)
+            self.kind_names.append(name)
+        return bit
+
+    # ------------------------------------------------------------------
+    # Applying and expiring
+    # ------------------------------------------------------------------
+
+    def apply(self, entity, effect, turn=None):
+        """
+        Give an entity an effect for effect.duration turns, counting this one.
+
+        Returns False if the duration was too short to last past this turn
+        (a duration of 1 or less), in which case nothing is stored.
+        """
+        turn = self.turn if turn is None else turn
+        expiry_turn = turn + effect.duration - 1
+        if expiry_turn <= turn:
+            return False
+        entry = self._record(entity, effect, expiry_turn)
+        if entry is not None:
+            heapq.heappush(self._heap, entry)
+        return True
+
+    def apply_all(self, entities, effect, turn=None):
+        """
+        Give many entities the same effect at once (a hazard hitting a crowd).
+
+        Returns the number of entities that got the effect (0 if the duration
+        was too short, like apply()).
+        """
+        turn = self.turn if turn is None else turn
+        expiry_turn = turn + effect.duration - 1
+        if expiry_turn <= turn:
+            return 0
+        entries = []
+        applied = 0
+        for entity in entities:
+            entry = self._record(entity, effect, expiry_turn)
+            if entry is not None:
+                entries.append(entry)
+            applied += 1
+        heap = self._heap
+        if len(entries) > len(heap):
+            # Merging a big batch with one heapify is cheaper than pushing one at a time
+            heap.extend(entries)
+            heapq.heapify(heap)
+        else:
+            for entry in entries:
+                heapq.heappush(heap, entry)
+        return applied
+
+    def _record(self, entity, effect, expiry_turn):
+        """Store one application. Returns the heap entry to add, or None if none is needed."""
+        key = (entity, effect.name)
+        record = self.active.get(key)
+        if record is None:
+            self._sequence += 1
+            record = self.active[key] = [effect, expiry_turn, 1, self._sequence]
+            self.masks[entity] = self.masks.get(entity, 0) | self.bit(effect.name)
+        elif effect.stackable:
+            record[1] = max(record[1], expiry_turn)
+            record[2] += 1
+        elif expiry_turn > record[1]:
+            record[1] = expiry_turn
+        else:
+            return None  # Already lasts at least this long
+
+        self._sequence += 1
+        return (expiry_turn, self._sequence, entity, effect.name, record[3])
+
+    def advance(self, turn):
+        """
+        Move to a new turn and expire the effects that are due.
+
+        Returns the (entity, effect name) pairs that ran out.
+        """
+        self.turn = max(self.turn, turn)
+        heap = self._heap
+        active = self.active
+        expired = []
+        while heap and heap[0][0] <= self.turn:
+            expiry_turn, _, entity, name, record_id = heapq.heappop(heap)
+            key = (entity, name)
+            record = active.get(key)
+            # Stale: the entity was forgotten, or the effect was extended past this entry
+            if record is None or record[3] != record_id:
+                continue
+            if record[0].stackable:
+                record[2] -= 1
+                if record[2] > 0:
+                    continue
+            elif expiry_turn != record[1]:
+                continue
+            self._remove(key)
+            expired.append(key)
+        return expired
+
+    def _remove(self, key):
+        del self.active[key]
+        entity, name = key
+        mask = self.masks.get(entity, 0) & ~self.kind_bits[name]
+        if mask:
+            self.masks[entity] = mask
+        else:
+            self.masks.pop(entity, None)
+
+    def remove(self, entity, name):
+        """Take one effect off an entity now. Returns True if it had it."""
+        key = (entity, name)
+        if key not in self.active:
+            return False
+        self._remove(key)
+        return True
+
+    def forget(self, entity):
+        """Drop all of an entity's effects (when it dies, respawns or leaves the game)."""
+        for name in self.names(entity):
+            del self.active[(entity, name)]
+        self.masks.pop(entity, None)
+
+    def clear(self):
+        """Drop every effect and start again from turn 0 (a new game)."""
+        self.__init__()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def has(self, entity, name):
+        """Check if an entity has an effect right now (O(1))."""
+        bit = self.kind_bits.get(name)
+        return bit is not None and bool(self.masks.get(entity, 0) & bit)
+
+    def has_any(self, entity):
+        return entity in self.masks
+
+    def names(self, entity):
+        """Names of an entity's effects, in bit order."""
+        mask = self.masks.get(entity, 0)
+        names = []
+        bit = 0
+        while mask:
+            if mask & 1:
+                names.append(self.kind_names[bit])
+            mask >>= 1
+            bit += 1
+        return names
+
+    def effects_of(self, entity):
+        """An entity's Effect objects (the first application of each kind)."""
+        return [self.active[(entity, name)][0] for name in self.names(entity)]
+
+    def remaining(self, entity, name):
+        """Turns left on an effect, counting this one (0 if the entity doesn't have it)."""
+        record = self.active.get((entity, name))
+        return record[1] - self.turn if record is not None else 0
+
+    def __len__(self):
+        """Number of active (entity, effect) pairs."""
+        return len(self.active)
+
+
+# Shared by the NPCs, the player and the hazards
+effect_scheduler = EffectScheduler()
@@ -0,0 +1,295 @@
+"""
+Garden Engine for Root Access
+
+Every plant used to be its own Plant item with its own growth counters, and
+everything that looked at a garden walked the soil objects in the area and
+every Plant inside them: passive growth (ActivityScheduler.catch_up),
+watering, and the Garden Manager app's status, instagrow and hack. That is
+fine for the garden at home but not for a farm with thousands of plants
+tended by NPC gardeners.
+
+This module keeps the plants of one soil object in a PlantBed: parallel
+arrays (one column per field, one row per plant) instead of one object per
+plant. Growing doesn't need a pass over the rows at all. The bed has its own
+clock, and a plant's stage is worked out from when it was planted and how
+many times it was watered:
+
+    stage = min(max_growth, watered + (clock - planted) // PASSIVE_GROWTH_TURNS)
+
+so ticking a bed just moves its clock, however many plants it holds. The
+clock time at which a plant will be ready to harvest is known as soon as it
+is planted (or watered), so the bed keeps those times in a heap and a tick
+only looks at the plants that ripen during it. The number of plants ready to
+harvest is always up to date.
+
+Crop types and plant effects are stored as small numbers. Each bed has a
+table of the crop types planted in it (the crop column holds an index into
+it), and every plant effect gets one bit in the effects column.
+
+Key Components:
+--------------
+1. PlantBed: The plants of one soil object, stored as columns
+2. plant_name: The display name of a crop's plant ("carrot" -> "Carrot Plant")
+3. PASSIVE_GROWTH_TURNS: Turns of passive growth per stage (watering is a stage at once)
+
+Usage:
+-----
+    bed = PlantBed()
+    plant_id = bed.plant("carrot", max_growth=3, value=10)
+    bed.tick(12)                            # Every plant in the bed grows 12 turns' worth
+    bed.water(bed.row(plant_id), substance) # One stage at once, plus the substance's effects
+    bed.ready_count                         # Plants ready to harvest
+"""
+
+import heapq
+from array import array
+from bisect import bisect_left
+
+
+# Plants grow slowly on their own: one stage every this many turns (watering is much faster)
+PASSIVE_GROWTH_TURNS = 10
+
+# The effects column is 64 bits wide
+MAX_EFFECTS = 64
+
+# Plant ids in the ripening heap take the low bits of each entry
+_ID_BITS = 32
+_ID_MASK = (1 << _ID_BITS) - 1
+
+
+def plant_name(crop_type):
+    """The display name of a crop's plant."""
+    return f"{crop_type.capitalize()} Plant"
+
+
+class PlantBed:
+    """
+    The plants growing in one soil object, one row per plant.
+
+    Plants are referred to by a plant id that stays the same while other
+    plants are added and removed (row numbers shift when a plant is harvested).
+    """
+
+    def __init__(self):
+        # Columns (row i of every column is the same plant)
+        self.ids = array('Q')  # Plant id
+        self.crops = array('H')  # Index into crop_types
+        self.max_growth = array('H')  # Stage at which the plant can be harvested
+        self.watered = array('H')  # Stages gained from watering (and instagrow)
+        self.planted = array('q')  # Bed clock when it was planted
+        self.values = array('q')  # Value of the plant (and of what it's harvested into)
+        self.effects = array('Q')  # Bit mask of effect_types
+        self.ready = array('B')  # 1 once the plant is counted in ready_count
+
+        self.crop_types = []  # Crop index -> crop type ("carrot")
+        self.effect_types = []  # Effect bit -> effect (the first one applied with that name)
+        self.watering_history = {}  # Plant id -> substances it was watered with (only plants that had any)
+
+        self.clock = 0  # Turns of passive growth this bed has had
+        self.next_id = 0
+        self.ready_count = 0
+        # Heap of when plants will be ready, packed into one int each (clock << 32 | plant id)
+        # so a big bed doesn't need a tuple per plant; entries for watered or removed plants are stale
+        self._ripening = []
+
+    def __len__(self):
+        return len(self.ids)
+
+    # ------------------------------------------------------------------
+    # Rows
+    # ------------------------------------------------------------------
+
+    def row(self, plant_id):
+        """Get the row a plant is in now (None if it isn't in the bed any more)."""
+        # Plant ids are handed out in increasing order and rows keep planting order,
+        # so the ids column is always sorted and a binary search finds the row
+        ids = self.ids
+        row = bisect_left(ids, plant_id)
+        if row < len(ids) and ids[row] == plant_id:
+            return row
+        return None
+
+    def stage(self, row):
+        """Growth stage of the plant in a row."""
+        grown = self.watered[row] + (self.clock - self.planted[row]) // PASSIVE_GROWTH_TURNS
+        return min(grown, self.max_growth[row])
+
+    def crop_type(self, row):
+        return self.crop_types[self.crops[row]]
+
+    def name(self, row):
+        """Plant name of the plant in a row ("Carrot Plant")."""
+        return plant_name(self.crop_type(row))
+
+    def is_harvestable(self, row):
+        return self.stage(row) >= self.max_growth[row]
+
+    def find(self, name):
+        """Get the id of the first plant with this plant name (case-insensitive), or None."""
+        name = name.lower()
+        for crop, crop_type in enumerate(self.crop_types):
+            if plant_name(crop_type).lower() == name:
+                try:
+                    return self.ids[self.crops.index(crop)]
+                except ValueError:
+                    continue  # Crop was planted here once but none are left
+        return None
+
+    def plant(self, crop_type, max_growth, value):
+        """Add a plant at stage 0 and return its plant id."""
+        try:
+            crop = self.crop_types.index(crop_type)
+        except ValueError:
+            crop = len(self.crop_types)
+            self.crop_types.append(crop_type)
+
+        plant_id = self.next_id
+        self.next_id += 1
+        self.ids.append(plant_id)
+        self.crops.append(crop)
+        self.max_growth.append(max_growth)
+        self.watered.append(0)
+        self.planted.append(self.clock)
+        self.values.append(value)
+        self.effects.append(0)
+        self.ready.append(0)
+        self._update_ripening(len(self.ids) - 1)
+        return plant_id
+
+    def remove(self, plant_id):
+        """Take a plant out of the bed. Returns True if it was there."""
+        row = self.row(plant_id)
+        if row is None:
+            return False
+        if self.ready[row]:
+            self.ready_count -= 1
+        for column in (self.ids, self.crops, self.max_growth, self.watered, self.planted,
+                       self.values, self.effects, self.ready):
+            del column[row]
+        self.watering_history.pop(plant_id, None)
+        return True
+
+    def _update_ripening(self, row):
+        """Count the plant as ready if it is, otherwise (re)schedule when it will be."""
+        if self.ready[row]:
+            return
+        missing = self.max_growth[row] - self.watered[row]
+        ready_at = self.planted[row] + max(missing, 0) * PASSIVE_GROWTH_TURNS
+        if ready_at <= self.clock:
+            self.ready[row] = 1
+            self.ready_count += 1
+        else:
+            heapq.heappush(self._ripening, ready_at << _ID_BITS | self.ids[row])
+
+    # ------------------------------------------------------------------
+    # Growing
+    # ------------------------------------------------------------------
+
+    def tick(self, turns):
+        """
+        Let every plant grow on its own for several turns.
+
+        Returns the number of plants that became ready to harvest.
+        """
+        if turns <= 0:
+            return 0
+        self.clock += turns
+        ripening = self._ripening
+        limit = (self.clock + 1) << _ID_BITS  # Everything ready at or before the new clock
+        if not ripening or ripening[0] >= limit:
+            return 0
+
+        due = set()
+        while ripening and ripening[0] < limit:
+            due.add(heapq.heappop(ripening) & _ID_MASK)
+
+        # One pass over the rows for all of them (a whole field often ripens on the same turn)
+        ripened = 0
+        ready = self.ready
+        for row, plant_id in enumerate(self.ids):
+            # Stale entries: harvested plants aren't in the rows, watered ones are already counted
+            if plant_id in due and not ready[row] and self.is_harvestable(row):
+                ready[row] = 1
+                ripened += 1
+        self.ready_count += ripened
+        return ripened
+
+    def water(self, row, substance=None):
+        """
+        Water the plant in a row: one stage at once, plus the substance's effects.
+
+        Returns False if the plant is already fully grown (nothing happens then).
+        """
+        if self.is_harvestable(row):
+            return False
+        if substance:
+            self.watering_history.setdefault(self.ids[row], []).append(substance)
+            for effect in substance.effects:
+                self.effects[row] |= self.effect_bit(effect)
+        self.watered[row] += 1
+        self._update_ripening(row)
+        return True
+
+    def grow_all(self):
+        """Grow every plant to full size at once. Returns the number of plants that weren't ready yet."""
+        grown = 0
+        ready = self.ready
+        for row in range(len(self.ids)):
+            if not ready[row]:
+                self.watered[row] = self.max_growth[row]
+                ready[row] = 1
+                grown += 1
+        self.ready_count += grown
+        # Every entry left in the heap is stale now
+        self._ripening = []
+        return grown
+
+    # ------------------------------------------------------------------
+    # Effects
+    # ------------------------------------------------------------------
+
+    def effect_bit(self, effect):
+        """Get the bit for an effect (effects with the same name share one)."""
+        for bit, known in enumerate(self.effect_types):
+            if known.name == effect.name:
+                return 1 << bit
+        if len(self.effect_types) >= MAX_EFFECTS:
+            raise ValueError(f"A plant bed can hold at most {MAX_EFFECTS} different effects")
+        self.effect_types.append(effect)
+        return 1 << (len(self.effect_types) - 1)
+
+    def add_effect(self, row, effect):
+        """Give the plant in a row an effect. Returns False if it already had it."""
+        bit = self.effect_bit(effect)
+        if self.effects[row] & bit:
+            return False
+        self.effects[row] |= bit
+        return True
+
+    def add_effect_all(self, effect):
+        """Give every plant an effect. Returns the number of plants that didn't have it yet."""
+        bit = self.effect_bit(effect)
+        effects = self.effects
+        added = 0
+        for row in range(len(effects)):
+            if not effects[row] & bit:
+                effects[row] |= bit
+                added += 1
+        return added
+
+    def effects_of(self, row):
+        """The effects of the plant in a row, in the order they were first used in this bed."""
+        mask = self.effects[row]
+        return [effect for bit, effect in enumerate(self.effect_types) if mask >> bit & 1]
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def status(self):
+        """Yield (plant name, growth stage, max growth, ready to harvest) for every plant, in planting order."""
+        names = [plant_name(crop_type) for crop_type in self.crop_types]
+        clock = self.clock
+        for crop, watered, planted, max_growth in zip(self.crops, self.watered, self.planted, self.max_growth):
+            stage = min(watered + (clock - planted) // PASSIVE_GROWTH_TURNS, max_growth)
+            yield names[crop], stage, max_growth, stage >= max_growth
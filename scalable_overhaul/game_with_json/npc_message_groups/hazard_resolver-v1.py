@@ -0,0 +1,123 @@
+"""
+Hazard Resolver for Root Access
+
+Area hazards (a StaticHazard like Hacked Milk, a thrown HazardItem like the
+Glitter Bomb, a FallingObject) used to find their targets by filtering every
+NPC in the area with isinstance, then call apply_hazard_effect() on each one.
+That rolled resistance, created an Effect and rendered a phrase for every NPC
+in turn, and wrapped it all in an NPCEvent. group_hazard_results then went
+through those events again to sort the members into groups and count them, and
+threw the rendered phrases away because it renders its own for the summary.
+
+This module resolves a hazard for a whole cohort of gang members at once:
+
+- Targets come from the area's NPC index ('hazard_target'), so nothing is
+  filtered by class.
+- Resistance is rolled for every member in one pass, against each member's own
+  hazard_resistance.
+- Everyone who didn't resist gets the same Effect, applied in bulk
+  (effect_scheduler.apply_all).
+- The result is a HazardOutcome: member names grouped the way the summary
+  reports them, with the counts ready to use. No per-NPC text is made.
+
+The single-NPC path (GangMember.apply_hazard_effect) is still used when one
+NPC sets off a hazard item itself.
+
+Key Components:
+--------------
+1. HAZARD_EFFECTS: Hazard effect -> (effect description, duration, result group)
+2. HazardOutcome: Who a hazard hit, grouped by what it did to them
+3. hazard_targets: The living gang members in an area a hazard can affect
+4. resolve_hazard: Rolls resistance for a cohort and applies the effect in bulk
+
+Usage:
+-----
+    outcome = resolve_hazard(glitter_bomb, hazard_targets(area))
+    outcome.counts()                          # {"resisted": 3, "gift_giving": 40}
+    group_hazard_results(glitter_bomb, outcome)   # The summary text
+"""
+
+from effect_scheduler import effect_scheduler
+from npc_behavior import Effect
+from rng_streams import rng
+
+
+# What each kind of hazard does to a member who doesn't resist it
+HAZARD_EFFECTS = {
+    "hallucinations": ("Causes hallucinations", 3, "hallucinating"),
+    "gift-giving": ("Causes compulsive gift-giving", 3, "gift_giving"),
+    "friendliness": ("Makes NPCs friendly", 3, "friendly"),
+    "falling objects": ("Makes objects fall on NPCs", 1, "falling_object"),
+}
+# Any other effect lasts this long and is reported as generic
+GENERIC_EFFECT_DURATION = 3
+
+# The groups of a HazardOutcome, in the order the summary reports them
+RESULT_GROUPS = ("resisted", "hallucinating", "friendly", "gift_giving", "falling_object", "generic")
+
+
+class HazardOutcome:
+    """What a hazard did to a cohort of gang members, grouped for the summary."""
+    __slots__ = ('hazard', 'gang_name', 'groups', 'defeated')
+
+    def __init__(self, hazard):
+        self.hazard = hazard
+        self.gang_name = None  # Gang of the first member (the summary names one gang)
+        self.groups = {group: [] for group in RESULT_GROUPS}  # Result group -> member names
+        self.defeated = []  # Names of members the hazard killed
+
+    def counts(self):
+        """Members per result group (only groups that have any)."""
+        return {group: len(names) for group, names in self.groups.items() if names}
+
+    @property
+    def total(self):
+        return sum(len(names) for names in self.groups.values())
+
+    def __repr__(self):
+        return f"HazardOutcome({self.hazard.name!r}, {self.counts()})"
+
+
+def hazard_targets(area):
+    """The living gang members in an area, in the order they arrived."""
+    return [npc for npc in area.get_npcs('hazard_target') if npc.is_alive]
+
+
+def resolve_hazard(hazard, members):
+    """
+    Resolve a hazard for a cohort of gang members at once.
+
+    Returns:
+        A HazardOutcome with the members grouped by what happened to them
+    """
+    outcome = HazardOutcome(hazard)
+    if not members:
+        return outcome
+    outcome.gang_name = members[0].gang.name
+
+    # One roll per member, all drawn together
+    random = rng.hazards.random
+    draws = [random() for _ in members]
+    resisted = outcome.groups["resisted"]
+    affected = []
+    for member, draw in zip(members, draws):
+        if draw < member.hazard_resistance:
+            resisted.append(member.name)
+        else:
+            affected.append(member)
+    if not affected:
+        return outcome
+
+    description, duration, group = HAZARD_EFFECTS.get(
+        hazard.effect, (f"Effect from {hazard.name}", GENERIC_EFFECT_DURATION, "generic"))
+    # Everyone shares one Effect (effect_scheduler keeps track of when it runs out for each)
+    effect_scheduler.apply_all(affected, Effect(hazard.effect, description, duration=duration))
+    outcome.groups[group].extend(member.name for member in affected)
+
+    if group == "falling_object":
+        for member in affected:
+            member.health -= hazard.damage
+            if member.health <= 0:
+                member.die()
+                outcome.defeated.append(member.name)
+    return outcome
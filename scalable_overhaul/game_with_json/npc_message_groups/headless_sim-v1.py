@@ -0,0 +1,295 @@
+"""
+Headless Simulation Driver for Root Access
+
+This module runs the real game turn pipeline without a terminal. Commands come
+from a script (a file or any iterable/generator) instead of input(), and
+everything the game prints is captured in memory instead of going to the screen.
+It is mainly used to benchmark how long a turn takes when areas get crowded.
+
+Key Components:
+--------------
+1. TurnProfiler: Collects per-turn latency and per-phase timings from Game.run_turn()
+2. HeadlessSimulator: Feeds a command stream through Game.start_turn()/run_turn()
+3. load_command_script: Reads a command script file (one command per line)
+4. populate_gang: Adds extra gang members to an area to stress the turn loop
+
+Command Scripts:
+---------------
+One command per line, exactly what you would type at the "> " prompt.
+Blank lines and lines starting with '#' are ignored.
+
+Usage:
+-----
+python headless_sim.py                              # 200 turns in the Warehouse
+python headless_sim.py --turns 1000 --gang-size 300 # Stress test a crowded Warehouse
+python headless_sim.py --script commands.txt        # Run a command script
+python headless_sim.py --seed 42 --show-output      # Reproducible run, print captured output
+python headless_sim.py --trace trace.log            # Write debug trace records to a file
+python headless_sim.py --message-stats              # What each NPC message type routed and dropped
+"""
+
+import argparse
+import io
+import itertools
+import math
+import random
+import sys
+import time
+import contextlib
+
+
+# Default command script used when no script is given: go to the Warehouse
+# (where the Bloodhounds hang out) and keep looking around. The teleport is
+# repeated so the player goes back there after dying and respawning at Home.
+DEFAULT_COMMANDS = ["teleport Warehouse", "look", "look", "look"]
+
+
+class TurnProfiler:
+    """Collects per-turn and per-phase timings reported by the game."""
+
+    def __init__(self):
+        self.turn_times = []  # Wall-clock seconds for each full turn
+        self.phase_times = {}  # phase name -> total seconds across all turns
+        self.phase_counts = {}  # phase name -> number of times the phase ran
+        self.phase_order = []  # Phase names in the order they were first seen
+
+    def record_phase(self, phase_name, seconds):
+        """Called by Game._record_phase() when a turn phase finishes."""
+        if phase_name not in self.phase_times:
+            self.phase_times[phase_name] = 0.0
+            self.phase_counts[phase_name] = 0
+            self.phase_order.append(phase_name)
+        self.phase_times[phase_name] += seconds
+        self.phase_counts[phase_name] += 1
+
+    def record_turn(self, seconds):
+        """Record how long one full turn took."""
+        self.turn_times.append(seconds)
+
+    def percentile(self, percent):
+        """Get a turn latency percentile (nearest-rank) in seconds."""
+        if not self.turn_times:
+            return 0.0
+        ordered = sorted(self.turn_times)
+        rank = max(1, math.ceil(percent / 100.0 * len(ordered)))
+        return ordered[min(rank, len(ordered)) - 1]
+
+    def get_report(self):
+        """Build a dict with the benchmark results."""
+        total_time = sum(self.turn_times)
+        turns = len(self.turn_times)
+        phase_total = sum(self.phase_times.values())
+
+        phases = []
+        for phase_name in self.phase_order:
+            seconds = self.phase_times[phase_name]
+            count = self.phase_counts[phase_name]
+            phases.append({
+                'phase': phase_name,
+                'total_ms': seconds * 1000,
+                'mean_ms': (seconds / count) * 1000 if count else 0.0,
+                'share': (seconds / phase_total) * 100 if phase_total else 0.0,
+            })
+
+        return {
+            'turns': turns,
+            'total_seconds': total_time,
+            'turns_per_second': turns / total_time if total_time else 0.0,
+            'p50_ms': self.percentile(50) * 1000,
+            'p99_ms': self.percentile(99) * 1000,
+            'phases': phases,
+        }
+
+    def format_report(self):
+        """Format the benchmark results as readable text."""
+        report = self.get_report()
+        lines = [
+            "--- Headless Simulation Results ---",
+            f"Turns:         {report['turns']}",
+            f"Total time:    {report['total_seconds']:.3f}s",
+            f"Turns/sec:     {report['turns_per_second']:.1f}",
+            f"p50 latency:   {report['p50_ms']:.3f} ms",
+            f"p99 latency:   {report['p99_ms']:.3f} ms",
+            "",
+            f"{'Phase':<18}{'Total ms':>12}{'Mean ms':>12}{'Share':>9}",
+        ]
+        for phase in report['phases']:
+            lines.append(
+                f"{phase['phase']:<18}{phase['total_ms']:>12.2f}"
+                f"{phase['mean_ms']:>12.3f}{phase['share']:>8.1f}%"
+            )
+        return "\n".join(lines)
+
+
+class _ScriptedStdin:
+    """Stand-in for sys.stdin so prompts inside commands (like help paging) never block."""
+
+    def readline(self):
+        # 'q' ends any "press Enter to see more" style prompt
+        return "q\n"
+
+
+def load_command_script(path):
+    """Read a command script file. Blank lines and '#' comments are skipped."""
+    commands = []
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                commands.append(line)
+    return commands
+
+
+def populate_gang(game, area_name="Warehouse", count=0, member_class=None):
+    """
+    Add extra gang members to an area so the turn loop has a big crowd to work with.
+
+    New members join the gang of the first GangMember found in the game and get
+    their own copies of the Knife and USB stick the gang starts with in world.json.
+    member_class makes them something other than GangMember (the memory benchmark
+    uses a dict-backed copy).
+    """
+    from npc_behavior import GangMember
+
+    area = game.areas.get(area_name)
+    if not area or count <= 0:
+        return 0
+
+    gang = None
+    for npc in game.npcs.values():
+        if isinstance(npc, GangMember):
+            gang = npc.gang
+            break
+    if gang is None:
+        return 0
+
+    base_names = [npc.name for npc in game.npcs.values() if isinstance(npc, GangMember)]
+    starting_items = [item for item in (game.items.get("Knife"), game.items.get("USB stick")) if item]
+    added = 0
+    for i in range(count):
+        name = f"{base_names[i % len(base_names)]} {i // len(base_names) + 2}"
+        if name in game.npcs:
+            continue
+        member = (member_class or GangMember)(name, f"A member of the {gang.name} gang.", gang)
+        # Own copies made from the shared prototypes (cheap: nothing is copied but the reference)
+        for item in starting_items:
+            member.add_item(item.copy())
+        game.npcs[name] = member
+        area.add_npc(member)
+        added += 1
+    return added
+
+
+class HeadlessSimulator:
+    """Runs the game turn pipeline from a command stream with all output captured in memory."""
+
+    def __init__(self, game=None, seed=None, gang_size=0, keep_output=True):
+        if seed is not None:
+            # Every subsystem stream gets its own seed derived from this one, so
+            # two runs of the same script do exactly the same work
+            from rng_streams import rng
+            rng.seed(seed)
+            # Modules outside this folder (combat_descriptions) still use the random module
+            random.seed(seed)
+
+        if game is None:
+            from main import Game
+            game = Game()
+        self.game = game
+
+        if gang_size:
+            populate_gang(self.game, count=gang_size)
+
+        self.profiler = TurnProfiler()
+        self.game.turn_profiler = self.profiler
+        self.keep_output = keep_output
+        self.output = io.StringIO()  # Everything the game printed
+
+    def run(self, commands, max_turns=None):
+        """
+        Run each command in the stream as one game turn.
+
+        Args:
+            commands: A list, file-backed list, or generator of command strings
+            max_turns: Stop after this many turns (needed for endless generators)
+
+        Returns:
+            The TurnProfiler with the collected timings
+        """
+        if max_turns is not None:
+            commands = itertools.islice(commands, max_turns)
+
+        sink = self.output if self.keep_output else io.StringIO()
+        real_stdin = sys.stdin
+        sys.stdin = _ScriptedStdin()
+        try:
+            for command_input in commands:
+                if not self.game.is_running:
+                    break
+                command_input = command_input.strip()
+                if not command_input:
+                    continue
+
+                if not self.keep_output:
+                    # Throw away what was printed last turn so memory stays flat
+                    sink.seek(0)
+                    sink.truncate()
+
+                with contextlib.redirect_stdout(sink):
+                    turn_start = time.perf_counter()
+                    self.game.start_turn()
+                    print(f"> {command_input}")
+                    self.game.run_turn(command_input)
+                    self.profiler.record_turn(time.perf_counter() - turn_start)
+        finally:
+            sys.stdin = real_stdin
+
+        return self.profiler
+
+    def get_output(self):
+        """Get everything the game printed during the run."""
+        return self.output.getvalue()
+
+
+def default_command_stream():
+    """Endless generator that cycles through DEFAULT_COMMANDS."""
+    return itertools.cycle(DEFAULT_COMMANDS)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run Root Access headless and benchmark the turn loop.")
+    parser.add_argument('--script', help="Command script file (one command per line)")
+    parser.add_argument('--turns', type=int, default=200, help="Maximum number of turns to run")
+    parser.add_argument('--gang-size', type=int, default=0, help="Extra gang members to add to the Warehouse")
+    parser.add_argument('--seed', type=int, default=None, help="Seed for the game's RNG streams")
+    parser.add_argument('--show-output', action='store_true', help="Print the captured game output")
+    parser.add_argument('--trace', metavar='PATH', help="Write trace records to a file (see trace_channel.py)")
+    parser.add_argument('--trace-level', default='debug', choices=['debug', 'info', 'warning', 'error'],
+                        help="Lowest trace level written with --trace")
+    parser.add_argument('--message-stats', action='store_true',
+                        help="Print the message coordinator's routing counters per message type")
+    args = parser.parse_args(argv)
+
+    if args.trace:
+        from trace_channel import tracer, TraceLevel, FileSink
+        tracer.set_level(TraceLevel[args.trace_level.upper()])
+        tracer.set_sink(FileSink(args.trace))
+
+    if args.script:
+        commands = load_command_script(args.script)
+    else:
+        commands = default_command_stream()
+
+    simulator = HeadlessSimulator(seed=args.seed, gang_size=args.gang_size,
+                                  keep_output=args.show_output)
+    simulator.run(commands, max_turns=args.turns)
+
+    if args.show_output:
+        print(simulator.get_output())
+    print(simulator.profiler.format_report())
+    if args.message_stats:
+        print(simulator.game.message_coordinator.format_route_stats())
+
+
+if __name__ == '__main__':
+    main()
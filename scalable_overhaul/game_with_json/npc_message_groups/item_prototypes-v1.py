@@ -0,0 +1,143 @@
+"""
+Item Prototypes for Root Access
+
+Every item used to be one full object, and the easy way to give lots of NPCs
+the same gear was to hand them all the same object: create_npcs gave every
+gang member the Knife and USB stick from the game's item registry. All 24
+members then held one shared instance, so anything that happened to "a"
+knife (a gift, an effect, a name change) happened to all of them.
+
+This module splits an item into two parts:
+
+- An ItemPrototype holds what all items of one kind share (name, description,
+  value, damage, ...). It is created once, can't be changed, and identical
+  definitions share one prototype.
+- The item itself only holds its prototype and a small state record with what
+  is different about this one item (an overridden description, effects,
+  what a watering can is filled with). An item that was never changed has no
+  state record at all.
+
+Items still read like before (item.name, item.damage, isinstance(item, Weapon)):
+the shared fields are PrototypeField descriptors that look in the item's state
+first and then in its prototype. Setting one only changes that item.
+
+Key Components:
+--------------
+1. ItemPrototype: The shared, read-only definition of one kind of item
+2. PrototypeField: Item attribute that reads from the state record or the prototype
+3. ItemPrototypes: Shares identical definitions and creates items from them
+4. item_prototypes: The shared registry used by the item classes
+
+Usage:
+-----
+    knife = Weapon("Knife", "A sharp blade.", 10, 20)   # Defines (or reuses) the prototype
+    member.add_item(knife.prototype.create())          # A separate knife for each member
+    knife.description += " It has a nick in it."       # Only this knife changes
+"""
+
+
+class ItemPrototype:
+    """The shared, read-only definition of one kind of item."""
+    __slots__ = ('kind', 'fields')
+
+    def __init__(self, kind, fields):
+        # Set past __setattr__, which refuses changes to a prototype that is in use
+        object.__setattr__(self, 'kind', kind)  # Item class the items are created as
+        object.__setattr__(self, 'fields', fields)  # field name -> shared value (don't change)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Item prototypes are shared by every {self.fields.get('name')} and can't be "
+                             f"changed; set {name} on the item instead")
+
+    def create(self):
+        """Create a new item of this kind (cheap: no fields are copied)."""
+        item = self.kind.__new__(self.kind)
+        item.attach(self)
+        return item
+
+    def __reduce__(self):
+        # Pickled items (like the world cache) come back pointing at the shared
+        # prototype for their definition instead of a private copy of it
+        return (_define_prototype, (self.kind, self.fields))
+
+    def __repr__(self):
+        return f"ItemPrototype({self.kind.__name__}, {self.fields.get('name')!r})"
+
+
+def _define_prototype(kind, fields):
+    return item_prototypes.define(kind, **fields)
+
+
+class PrototypeField:
+    """
+    An item attribute shared through the prototype.
+
+    Reading checks the item's own state record first (fields changed on this
+    one item), then the prototype. Writing only goes into the state record.
+    """
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, item, owner=None):
+        if item is None:
+            return self
+        state = item.state
+        if state is not None and self.name in state:
+            return state[self.name]
+        try:
+            return item.prototype.fields[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+    def __set__(self, item, value):
+        state = item.state
+        if state is None:
+            item.state = {self.name: value}
+        else:
+            state[self.name] = value
+
+    def __delete__(self, item):
+        # Goes back to the prototype's value
+        if item.state is not None:
+            item.state.pop(self.name, None)
+
+
+class ItemPrototypes:
+    """Shares identical item definitions and creates items from them."""
+
+    def __init__(self):
+        self.prototypes = {}  # (item class, sorted fields) -> ItemPrototype
+
+    def define(self, kind, **fields):
+        """
+        Get the prototype for an item class and its shared fields.
+
+        Items defined with the same class and fields get the same prototype,
+        so a thousand Weapon("Knife", ...) calls keep one definition.
+        """
+        key = (kind, tuple(sorted(fields.items())))
+        prototype = self.prototypes.get(key)
+        if prototype is None:
+            prototype = self.prototypes[key] = ItemPrototype(kind, fields)
+        return prototype
+
+    def find(self, name, kind=None):
+        """Get a prototype by item name (and optionally class), or None."""
+        for prototype in self.prototypes.values():
+            if prototype.fields.get('name') == name and (kind is None or prototype.kind is kind):
+                return prototype
+        return None
+
+    def create(self, name, kind=None):
+        """Create a new item from the prototype with this name (None if there isn't one)."""
+        prototype = self.find(name, kind)
+        return prototype.create() if prototype is not None else None
+
+    def __len__(self):
+        return len(self.prototypes)
+
+
+# Shared registry used by the item classes in main
+item_prototypes = ItemPrototypes()
@@ -0,0 +1,153 @@
+"""
+Keyword Classifier for Root Access
+
+This module replaces the chains of any(keyword in text_lower for keyword in ...)
+checks that used to be spread over the message systems. Every keyword table in
+the game is registered here once, and all of them are compiled together into a
+single regular expression. Classifying a message is then one scan over the text
+that finds every matching category in every table at the same time.
+
+Key Components:
+--------------
+1. KeywordClassifier: Holds the keyword tables, the compiled pattern and the result cache
+2. keyword_classifier: The shared instance that all game modules register their tables with
+
+Keyword Tables:
+--------------
+A table is an ordered list of (label, keywords) rules, or a dict {label: keywords}.
+Matching works exactly like the old "keyword in text.lower()" checks (plain,
+case-insensitive substring matching), so labels keep the same meaning they had
+in the if/elif ladders. Rule order matters for first_match(), which returns the
+label of the first rule that matched, just like an if/elif ladder would.
+
+    keyword_classifier.register_table('npc_action', [
+        ("attack", ["attacks you", "damage"]),
+        ("gift", ["gives you", "gift"]),
+    ])
+    keyword_classifier.first_match("Buck gives you a Knife.", 'npc_action')  # "gift"
+    keyword_classifier.matches("Buck gives you a Knife.", 'npc_action')      # {"gift"}
+
+Results are cached per message text, since the same NPC messages repeat over
+and over during a session.
+"""
+
+import re
+
+
+class KeywordClassifier:
+    """Compiles every registered keyword table into one pattern and classifies text in one pass."""
+
+    def __init__(self, cache_size=4096):
+        self.tables = {}  # table name -> tuple of (label, keywords) rules
+        self.cache_size = cache_size  # Maximum number of cached message results
+
+        self._pattern = None  # Compiled pattern (built lazily, rebuilt when tables change)
+        self._keyword_hits = {}  # keyword -> tuple of (table name, rule index) it satisfies
+        self._cache = {}  # message text -> {table name: (rule indices, labels)}
+
+    def register_table(self, name, rules):
+        """
+        Register (or replace) a keyword table.
+
+        Args:
+            name: Name of the table, used when asking for matches
+            rules: A dict {label: keywords} or an ordered list of (label, keywords)
+        """
+        if isinstance(rules, dict):
+            rules = rules.items()
+        rules = tuple((label, tuple(keyword.lower() for keyword in keywords))
+                      for label, keywords in rules)
+
+        # Registering the same table again (e.g. a second MessageManager) is free
+        if self.tables.get(name) == rules:
+            return
+
+        self.tables[name] = rules
+        self._pattern = None
+        self._cache.clear()
+
+    def _compile(self):
+        """Build the combined pattern for all registered tables."""
+        keyword_rules = {}
+        for table_name, rules in self.tables.items():
+            for index, (label, keywords) in enumerate(rules):
+                for keyword in keywords:
+                    keyword_rules.setdefault(keyword, set()).add((table_name, index))
+
+        # The scan below only reports the longest keyword starting at each
+        # position, so every keyword also carries the rules of all the shorter
+        # keywords contained in it ("gives you" also satisfies "gives").
+        keywords = sorted(keyword_rules, key=len, reverse=True)
+        self._keyword_hits = {}
+        for keyword in keywords:
+            hits = set()
+            for other in keywords:
+                if len(other) <= len(keyword) and other in keyword:
+                    hits |= keyword_rules[other]
+            self._keyword_hits[keyword] = tuple(hits)
+
+        # A lookahead lets the scan try a match at every position, so
+        # overlapping keywords are all found. Longest keywords come first in
+        # the alternation so the longest match at each position wins.
+        if keywords:
+            alternation = "|".join(re.escape(keyword) for keyword in keywords)
+            self._pattern = re.compile(f"(?=({alternation}))")
+        else:
+            self._pattern = re.compile(r"(?!)")  # Matches nothing
+
+    def classify(self, text):
+        """
+        Find every rule that matches the text, in every table.
+
+        Returns:
+            A dict {table name: (sorted rule indices, frozenset of labels)}
+            containing only the tables that had at least one match
+        """
+        result = self._cache.get(text)
+        if result is not None:
+            return result
+
+        if self._pattern is None:
+            self._compile()
+
+        matched = {}
+        keyword_hits = self._keyword_hits
+        for match in self._pattern.finditer(text.lower()):
+            for table_name, index in keyword_hits[match.group(1)]:
+                matched.setdefault(table_name, set()).add(index)
+
+        result = {}
+        for table_name, indices in matched.items():
+            rules = self.tables[table_name]
+            indices = tuple(sorted(indices))
+            result[table_name] = (indices, frozenset(rules[i][0] for i in indices))
+
+        # Keep the cache bounded by dropping the oldest entry
+        if len(self._cache) >= self.cache_size:
+            del self._cache[next(iter(self._cache))]
+        self._cache[text] = result
+        return result
+
+    def matches(self, text, table_name):
+        """Get the set of labels in a table that match the text."""
+        table_result = self.classify(text).get(table_name)
+        return table_result[1] if table_result else frozenset()
+
+    def first_match(self, text, table_name, default=None):
+        """Get the label of the first rule in the table that matches (like an if/elif ladder)."""
+        table_result = self.classify(text).get(table_name)
+        if not table_result:
+            return default
+        return self.tables[table_name][table_result[0][0]][0]
+
+    def has_match(self, text, table_name, label):
+        """Check whether a specific label of a table matches the text."""
+        return label in self.matches(text, table_name)
+
+    def clear_cache(self):
+        """Forget all cached results."""
+        self._cache.clear()
+
+
+# Shared classifier used by all message systems
+keyword_classifier = KeywordClassifier()
@@ -7,18 +7,69 @@
 # lots of areas to explore and connect to each other
 # need a lot of ideas for more items and hazards
 
-import random
 import time
 import sys
 import os
 import json
 from collections import deque
+from collections.abc import Sequence
 from message_system import MessageManager, MessageCategory, MessagePriority
 
 
 from message_system import MessageManager, MessageCategory, MessagePriority
-from npc_behavior import NPCMessageManager, BehaviorManager
+from npc_behavior import NPCMessageManager, BehaviorManager, choose_next_behaviors
 from message_coordinator import MessageCoordinator
+from keyword_classifier import keyword_classifier
+from activity_scheduler import ActivityScheduler
+from snapshot import SnapshotManager, SnapshotError
+from rng_streams import rng
+from turn_pipeline import TurnPipeline, TurnContext
+from item_prototypes import PrototypeField, item_prototypes
+from world_loader import WorldTypes, WorldError, load_world
+from garden_engine import PlantBed, plant_name
+from effect_scheduler import effect_scheduler
+from trace_channel import tracer, TraceLevel, FileSink, MessageSink
+
+
+# Keyword rules for categorizing NPC behavior results, checked in order
+keyword_classifier.register_table('npc_behavior_category', [
+    # Check for notification-level messages first
+    (MessageCategory.NOTIFICATION, ["planting", "harvesting", "watering", "gives you", "gift",
+                                    "offers you", "item", "defeated", "died", "discovered"]),
+    # Check for NPC gift-giving
+    (MessageCategory.NPC_GIFT, ["gives", "offers", "presents", "hands over", "donates", "shares",
+                                "distributes", "gifts", "bestows", "grants"]),
+    # Check for NPC hazard effects
+    (MessageCategory.NPC_HAZARD, ["affected by", "suffering from", "experiencing", "under the influence of",
+                                  "reacting to", "responding to", "hallucinating", "confused", "dizzy"]),
+    # Check for NPC talking
+    (MessageCategory.NPC_TALK, ["talks", "speaks", "says", "whispers", "mutters", "shouts", "yells",
+                                "screams", "laughs", "cries", "sings", "hums", "grunts", "sighs"]),
+    # Check for NPC interactions
+    (MessageCategory.NPC_INTERACTION, ["picks up", "drops", "examines", "uses", "interacts with", "touches",
+                                       "pushes", "pulls", "opens", "closes", "activates", "deactivates"]),
+    # Check for NPC movement
+    (MessageCategory.NPC_MOVEMENT, ["walks", "running", "moving", "pacing", "wandering", "strolling",
+                                    "jogging", "sprinting", "climbing", "crawling", "sneaking"]),
+    # Check for NPC idle behaviors
+    (MessageCategory.NPC_IDLE, ["stands", "sitting", "waiting", "idle", "resting", "sleeping",
+                                "leaning", "not moving", "stationary"]),
+])
+
+# Keyword rules for categorizing gang member interactions with the player, checked in order
+keyword_classifier.register_table('npc_interaction_category', [
+    (MessageCategory.COMBAT, ["damage", "attack"]),
+    (MessageCategory.NOTIFICATION, ["gives you", "gift", "offers you", "insists you take",
+                                    "item", "defeated", "died"]),
+])
+
+# Priority that goes with each NPC message category (anything else is LOW)
+NPC_CATEGORY_PRIORITIES = {
+    MessageCategory.COMBAT: MessagePriority.HIGH,
+    MessageCategory.NOTIFICATION: MessagePriority.MEDIUM,
+    MessageCategory.NPC_GIFT: MessagePriority.MEDIUM,
+    MessageCategory.NPC_HAZARD: MessagePriority.MEDIUM,
+}
 
 
 
@@ -116,7 +167,10 @@ def process_npc_messages(game, npcs):
 
 def display_npc_summary(game):
     """
-    Display the NPC action summary at the end of the turn in a more natural language format.
+    Display the NPC action summary at the end of the turn as a natural language paragraph.
+    
+    The coordinator renders the paragraph from the turn's action counters
+    (see turn_summary.py), so it is shown as-is.
     
     Args:
         game: The main game instance
@@ -127,178 +181,18 @@ def display_npc_summary(game):
     # Get the NPC summary
     summary = game.message_coordinator.get_npc_summary()
     if summary:
-        # Store the detailed summary for debug mode
+        # Store the summary for debug mode
         game.debug_npc_summary = summary
         
-        # Get active gangs for context
-        active_gangs = getattr(game.message_coordinator, 'active_gangs', set())
-        
-        # Convert the bulleted summary into a natural language paragraph
-        natural_summary = convert_to_natural_language(summary, active_gangs)
-        
-        # Add the natural summary to the message manager with HIGH priority
+        # Add the summary to the message manager with HIGH priority
         game.message_manager.add_message(
-            text=natural_summary,
+            text=summary,
             category=MessageCategory.NPC_SUMMARY,
             priority=MessagePriority.HIGH
         )
         
         # Print the summary directly to ensure it's visible
-        print("\n" + natural_summary + "\n")
-
-def convert_to_natural_language(summary, active_gangs):
-    """
-    Convert the bulleted NPC summary into a more natural paragraph format.
-    
-    Args:
-        summary: The original NPC summary with line breaks
-        active_gangs: Set of active gang names for context
-    
-    Returns:
-        A natural language paragraph describing NPC activities
-    """
-    # Split the summary into individual lines
-    lines = summary.strip().split('\n')
-    
-    # Remove any header lines (those ending with a colon)
-    action_lines = [line for line in lines if not line.endswith(':') and line.strip()]
-    
-    # If we have no action lines, return early
-    if not action_lines:
-        if active_gangs and len(active_gangs) == 1:
-            gang_name = next(iter(active_gangs))
-            return f"The {gang_name} members are quiet for now."
-        else:
-            return "The area is quiet for now."
-    
-    # Group similar actions together
-    hallucination_lines = []
-    friendly_lines = []
-    combat_lines = []
-    gardening_lines = []
-    interaction_lines = []
-    talking_lines = []
-    other_lines = []
-    
-    for line in action_lines:
-        line = line.strip()
-        if "hallucinating" in line.lower() or "seeing things" in line.lower():
-            hallucination_lines.append(line)
-        elif "friendly" in line.lower() or "smiles" in line.lower():
-            friendly_lines.append(line)
-        elif "attack" in line.lower() or "damage" in line.lower() or "fight" in line.lower():
-            combat_lines.append(line)
-        elif "plant" in line.lower() or "water" in line.lower() or "harvest" in line.lower() or "garden" in line.lower():
-            gardening_lines.append(line)
-        elif "interact" in line.lower() or "using" in line.lower() or "gives" in line.lower():
-            interaction_lines.append(line)
-        elif "talk" in line.lower() or "chat" in line.lower() or "conversation" in line.lower():
-            talking_lines.append(line)
-        else:
-            other_lines.append(line)
-    
-    # Build the natural language paragraph
-    paragraph_parts = []
-    
-    # Start with combat actions as they're most important
-    if combat_lines:
-        paragraph_parts.extend(combat_lines)
-    
-    # Add connecting phrases between different action types
-    connectors = ["Meanwhile, ", "At the same time, ", "Nearby, ", "Elsewhere, ", "Also, "]
-    
-    # Add hallucination actions
-    if hallucination_lines:
-        if paragraph_parts:
-            paragraph_parts.append(random.choice(connectors) + hallucination_lines[0].lower())
-            hallucination_lines = hallucination_lines[1:]
-        
-        # If we have multiple hallucination lines, combine them
-        if len(hallucination_lines) > 1:
-            # Extract NPC names from the lines
-            npc_names = []
-            for line in hallucination_lines:
-                parts = line.split()
-                if "member" in line and parts.index("member") + 1 < len(parts):
-                    npc_names.append(parts[parts.index("member") + 1])
-            
-            if npc_names:
-                if len(npc_names) <= 4:
-                    npc_list = ", ".join(npc_names)
-                else:
-                    npc_list = f"{', '.join(npc_names[:4])} and {len(npc_names) - 4} others"
-                
-                paragraph_parts.append(f"while {npc_list} are seeing the walls melting.")
-    
-    # Add gardening actions
-    if gardening_lines:
-        if paragraph_parts:
-            paragraph_parts.append(random.choice(connectors) + gardening_lines[0].lower())
-            gardening_lines = gardening_lines[1:]
-    
-    # Add interaction actions
-    if interaction_lines:
-        if paragraph_parts:
-            paragraph_parts.append(random.choice(connectors) + interaction_lines[0].lower())
-            interaction_lines = interaction_lines[1:]
-    
-    # Add talking actions
-    if talking_lines:
-        if paragraph_parts:
-            paragraph_parts.append(random.choice(connectors) + talking_lines[0].lower())
-            talking_lines = talking_lines[1:]
-    
-    # Add friendly actions
-    if friendly_lines:
-        if paragraph_parts:
-            paragraph_parts.append(random.choice(connectors) + friendly_lines[0].lower())
-            friendly_lines = friendly_lines[1:]
-    
-    # Add other actions
-    if other_lines:
-        if paragraph_parts:
-            paragraph_parts.append(random.choice(connectors) + other_lines[0].lower())
-            other_lines = other_lines[1:]
-    
-    # Combine all remaining lines of each type
-    remaining_lines = (hallucination_lines + gardening_lines + interaction_lines + 
-                      talking_lines + friendly_lines + other_lines)
-    
-    # Add a few more remaining lines with connectors if we have space
-    for i, line in enumerate(remaining_lines[:3]):  # Limit to 3 more lines
-        if paragraph_parts:
-            paragraph_parts.append(random.choice(connectors) + line.lower())
-    
-    # Join everything into a single paragraph
-    if active_gangs and len(active_gangs) == 1:
-        gang_name = next(iter(active_gangs))
-        intro = f"The {gang_name} are active in the area. "
-    elif active_gangs and len(active_gangs) > 1:
-        gang_names = ", ".join(active_gangs)
-        intro = f"Multiple gangs ({gang_names}) are active in the area. "
-    else:
-        intro = "NPCs are active in the area. "
-    
-    # Join all parts with proper spacing and capitalization
-    result = intro
-    
-    for i, part in enumerate(paragraph_parts):
-        if i == 0:
-            # Capitalize the first sentence
-            result += part[0].upper() + part[1:]
-        else:
-            # Keep the rest as is (connectors are already capitalized)
-            result += part
-        
-        # Add period if needed
-        if not result.endswith('.') and not result.endswith('!'):
-            result += '.'
-        
-        # Add space between sentences
-        if i < len(paragraph_parts) - 1:
-            result += ' '
-    
-    return result
+        print("\n" + summary + "\n")
 
 def add_message(game, text, category=None, priority=None, source=None, is_npc_message=False):
     """
@@ -337,93 +231,166 @@ def add_message(game, text, category=None, priority=None, source=None, is_npc_me
 
 
 class Item:
+    # What every item of a kind shares lives in its prototype (see item_prototypes.py);
+    # the item only keeps what is different about it. 'effects' is only set on
+    # items that have effects (harvested plants), so hasattr(item, 'effects') still works.
+    __slots__ = ('prototype', 'state', 'effects')
+
+    name = PrototypeField('name')
+    description = PrototypeField('description')
+    value = PrototypeField('value')
+
     def __init__(self, name, description, value=0):
-        self.name = name
-        self.description = description
-        self.value = value
+        self.attach(self.define(name, description, value))
+
+    @classmethod
+    def define(cls, name, description, value=0, **fields):
+        """Get the shared prototype for items of this class with these fields."""
+        return item_prototypes.define(cls, name=sys.intern(name), description=description, value=value, **fields)
+
+    def attach(self, prototype):
+        """Make this item an item of the prototype's kind, with fresh per-item state."""
+        self.prototype = prototype
+        self.state = None  # Fields changed on this item only (None until something changes)
+        self.init_state()
+
+    def init_state(self):
+        """Set up per-item state. Items with per-item fields override this."""
+
+    def copy(self):
+        """Create another item of the same kind, with fresh state."""
+        return self.prototype.create()
 
     def __str__(self):
         return self.name
 
 
 class Weapon(Item):
+    __slots__ = ()
+
+    damage = PrototypeField('damage')
+
     def __init__(self, name, description, value, damage):
-        super().__init__(name, description, value)
-        self.damage = damage
+        self.attach(self.define(name, description, value, damage=damage))
 
     def __str__(self):
         return f"{self.name} (Damage: {self.damage})"
 
 
 class Consumable(Item):
+    __slots__ = ()
+
+    health_restore = PrototypeField('health_restore')
+
     def __init__(self, name, description, value, health_restore):
-        super().__init__(name, description, value)
-        self.health_restore = health_restore
+        self.attach(self.define(name, description, value, health_restore=health_restore))
 
     def __str__(self):
         return f"{self.name} (Restores: {self.health_restore} health)"
     
 
 class Seed(Item):
+    __slots__ = ()
+
+    crop_type = PrototypeField('crop_type')
+    growth_time = PrototypeField('growth_time')  # Number of turns until fully grown
+
     def __init__(self, name, description, crop_type, value, growth_time=3):
-        super().__init__(name, description, value)
-        self.crop_type = crop_type
-        self.growth_time = growth_time  # Number of turns until fully grown
+        self.attach(self.define(name, description, value, crop_type=crop_type, growth_time=growth_time))
     
     def __str__(self):
         return f"{self.name} ({self.crop_type})"
 
-class Plant(Item):
-    def __init__(self, name, description, crop_type, value, growth_stage=0, max_growth=3):
-        super().__init__(name, description, value)
-        self.crop_type = crop_type
-        self.growth_stage = growth_stage
-        self.max_growth = max_growth
-        self.effects = []  # List of effects applied to this plant
-        self.watering_history = []  # Track what substances were used to water this plant
-        
-    def grow(self):
-        if self.growth_stage < self.max_growth:
-            self.growth_stage += 1
-            return True
-        return False
-    
+def plant_label(name, growth_stage, max_growth, effects):
+    """How a plant reads in a list ("Carrot Plant (growing) [Effects: Hacked]")."""
+    stage_desc = "seedling" if growth_stage == 0 else \
+                "growing" if growth_stage < max_growth else \
+                "ready to harvest"
+
+    base_str = f"{name} ({stage_desc})"
+
+    if effects:
+        effect_names = ", ".join(effect.name for effect in effects)
+        base_str += f" [Effects: {effect_names}]"
+
+    return base_str
+
+def watering_message(name, substance, harvestable):
+    """What the player is told after watering a plant that wasn't fully grown yet."""
+    if substance:
+        message = f"You water the {name} with {substance.name}."
+    else:
+        message = f"You water the {name} with regular water."
+
+    if harvestable:
+        return f"{message} It's now fully grown and ready to harvest!"
+    else:
+        return f"{message} It grows visibly before your eyes!"
+
+class Plant:
+    """
+    A plant growing in soil.
+
+    The plants of a soil object are stored together as columns in its
+    PlantBed (see garden_engine.py), not as one object each. A Plant is just a
+    handle to one plant in the bed, made when something asks for it (a
+    harvest, the area description) and cheap to throw away.
+    """
+    __slots__ = ('bed', 'plant_id', 'crop_type')
+
+    def __init__(self, bed, plant_id):
+        self.bed = bed
+        self.plant_id = plant_id
+        row = bed.row(plant_id)
+        # Kept so the plant can still be named after it is harvested
+        self.crop_type = bed.crop_type(row) if row is not None else None
+
+    def _row(self):
+        row = self.bed.row(self.plant_id)
+        if row is None:
+            raise LookupError(f"The {self.name} is no longer in the soil")
+        return row
+
+    @property
+    def name(self):
+        return plant_name(self.crop_type)
+
+    @property
+    def description(self):
+        return f"A young {self.crop_type} plant growing in the soil."
+
+    @property
+    def value(self):
+        return self.bed.values[self._row()]
+
+    @property
+    def max_growth(self):
+        return self.bed.max_growth[self._row()]
+
+    @property
+    def growth_stage(self):
+        return self.bed.stage(self._row())
+
+    @property
+    def effects(self):
+        return self.bed.effects_of(self._row())
+
     def water(self, substance=None):
         """Water the plant to accelerate growth, optionally with a special substance."""
-        if self.growth_stage >= self.max_growth:
+        row = self._row()
+        if not self.bed.water(row, substance):
             return False, f"The {self.name} is already fully grown and ready to harvest."
-        
-        # Track what was used to water the plant
-        if substance:
-            self.watering_history.append(substance)
-            
-            # Apply effects from the substance to the plant
-            for effect in substance.effects:
-                if effect not in self.effects:
-                    self.effects.append(effect)
-            
-            message = f"You water the {self.name} with {substance.name}."
-        else:
-            message = f"You water the {self.name} with regular water."
-        
-        # Water the plant, which advances growth by a full stage
-        self.growth_stage += 1
-        
-        if self.is_harvestable():
-            return True, f"{message} It's now fully grown and ready to harvest!"
-        else:
-            return True, f"{message} It grows visibly before your eyes!"
-    
+        return True, watering_message(self.name, substance, self.bed.is_harvestable(row))
+
     def is_harvestable(self):
-        return self.growth_stage >= self.max_growth
-    
+        return self.bed.is_harvestable(self._row())
+
     def add_effect(self, effect):
         """Add an effect to this plant."""
-        if effect not in self.effects:
-            self.effects.append(effect)
+        if self.bed.add_effect(self._row(), effect):
             return True, f"The {effect.name} effect has been applied to the {self.name}."
         return False, f"The {self.name} already has the {effect.name} effect."
-    
+
     def get_harvested_item(self):
         """Create a harvested item based on this plant, transferring any effects."""
         harvested_item = Item(
@@ -433,25 +400,24 @@ class Plant(Item):
         )
         
         # Transfer effects to the harvested item
-        if self.effects:
-            harvested_item.effects = self.effects.copy()
-            effect_names = ", ".join(effect.name for effect in self.effects)
+        effects = self.effects
+        if effects:
+            harvested_item.effects = effects
+            effect_names = ", ".join(effect.name for effect in effects)
             harvested_item.description += f" It seems to have been affected by: {effect_names}."
         
         return harvested_item
-    
+
+    def __eq__(self, other):
+        return isinstance(other, Plant) and other.bed is self.bed and other.plant_id == self.plant_id
+
+    def __hash__(self):
+        return hash((id(self.bed), self.plant_id))
+
     def __str__(self):
-        stage_desc = "seedling" if self.growth_stage == 0 else \
-                    "growing" if self.growth_stage < self.max_growth else \
-                    "ready to harvest"
-        
-        base_str = f"{self.name} ({stage_desc})"
-        
-        if self.effects:
-            effect_names = ", ".join(effect.name for effect in self.effects)
-            base_str += f" [Effects: {effect_names}]"
-            
-        return base_str
+        row = self._row()
+        bed = self.bed
+        return plant_label(self.name, bed.stage(row), bed.max_growth[row], bed.effects_of(row))
     
 
 
@@ -480,10 +446,7 @@ class SupervisionEffect(PlantEffect):
     def apply_to_player(self, player, game):
         """Apply supervision effect to player, spawning hidden items in the area."""
         # Add the effect to player's active effects
-        if not hasattr(player, 'active_effects'):
-            player.active_effects = {}
-        
-        player.active_effects[self.name] = self.duration
+        effect_scheduler.apply(player, Effect(self.name, self.description, duration=self.duration))
         
         # Spawn hidden items in the current area
         hidden_items = [
@@ -493,10 +456,9 @@ class SupervisionEffect(PlantEffect):
         ]
         
         # Add 1-2 random hidden items to the area
-        import random
-        num_items = random.randint(1, 2)
+        num_items = rng.worldgen.randint(1, 2)
         for _ in range(num_items):
-            item = random.choice(hidden_items)
+            item = rng.worldgen.choice(hidden_items)
             player.current_area.add_item(item)
         
         return f"Your vision shifts and warps. Suddenly, you can see things that weren't visible before. The {self.name} effect will last for {self.duration} turns."
@@ -509,10 +471,7 @@ class HackedPlantEffect(PlantEffect):
     
     def apply_to_player(self, player, game):
         """Apply hacked plant effect, allowing control of plants."""
-        if not hasattr(player, 'active_effects'):
-            player.active_effects = {}
-        
-        player.active_effects[self.name] = 5  # Lasts for 5 turns
+        effect_scheduler.apply(player, Effect(self.name, self.description, duration=5))  # Lasts for 5 turns
         
         return "You feel a strange connection to the plants around you. They seem to respond to your thoughts."
 
@@ -541,8 +500,12 @@ class HackedMilk(Substance):
 
 class WateringCan(Item):
     """A watering can that can be filled with different substances."""
+    __slots__ = ('substance',)
+
     def __init__(self, name="Watering Can", description="A metal watering can for watering plants.", value=5):
         super().__init__(name, description, value)
+
+    def init_state(self):
         self.substance = None  # Default is empty/water
     
     def fill_with(self, substance):
@@ -618,16 +581,19 @@ class GardenApp(App):
         plants_found = False
         status = "Garden Status:\n"
         
-        for obj in area.objects:
-            if isinstance(obj, Soil) and obj.plants:
+        for obj in area.get_objects('soil'):
+            if isinstance(obj, Soil) and len(obj.bed):
                 plants_found = True
                 status += f"\n{obj.name}:\n"
-                for plant in obj.plants:
-                    growth_percent = (plant.growth_stage / plant.max_growth) * 100
-                    status += f"  - {plant.name}: {growth_percent:.0f}% grown"
-                    if plant.is_harvestable():
+                # Read straight from the bed's columns, no Plant per row
+                for name, growth_stage, max_growth, harvestable in obj.bed.status():
+                    growth_percent = (growth_stage / max_growth) * 100 if max_growth else 100
+                    status += f"  - {name}: {growth_percent:.0f}% grown"
+                    if harvestable:
                         status += " (Ready to harvest!)"
                     status += "\n"
+                if len(obj.bed) > 1:
+                    status += f"  {obj.bed.ready_count} of {len(obj.bed)} ready to harvest\n"
         
         if not plants_found:
             return "No plants found in this area."
@@ -638,12 +604,9 @@ class GardenApp(App):
         area = player.current_area
         plants_grown = 0
         
-        for obj in area.objects:
+        for obj in area.get_objects('soil'):
             if isinstance(obj, Soil):
-                for plant in obj.plants:
-                    if not plant.is_harvestable():
-                        plant.growth_stage = plant.max_growth
-                        plants_grown += 1
+                plants_grown += obj.bed.grow_all()
         
         if plants_grown > 0:
             return f"HACK SUCCESSFUL: {plants_grown} plants have instantly grown to full maturity!"
@@ -659,13 +622,10 @@ class GardenApp(App):
         # Create a hacked plant effect
         hacked_effect = HackedPlantEffect()
         
-        for obj in area.objects:
-            if isinstance(obj, Soil) and obj.plants:
+        for obj in area.get_objects('soil'):
+            if isinstance(obj, Soil) and len(obj.bed):
                 plants_found = True
-                for plant in obj.plants:
-                    success, _ = plant.add_effect(hacked_effect)
-                    if success:
-                        plants_hacked += 1
+                plants_hacked += obj.bed.add_effect_all(hacked_effect)
         
         if not plants_found:
             return "No plants found in this area to hack."
@@ -687,8 +647,10 @@ class GardenApp(App):
 class Smartphone(Tech, Item):
     """A smartphone that can run various apps."""
     def __init__(self, name="Smartphone", description="A high-tech smartphone with various apps", value=50):
-        Tech.__init__(self, name, description)
+        # Item.__init__ sets the name and description Tech.__init__ would
         Item.__init__(self, name, description, value)
+
+    def init_state(self):
         self.apps = {}
         self.current_app = None
         
@@ -804,25 +766,33 @@ class Storage(Object):
 class Soil(Object):
     def __init__(self, name, description, capacity=5):
         super().__init__(name, description, portable=False)
-        self.plants = []
+        self.bed = PlantBed()  # The plants growing here, stored as columns (see garden_engine.py)
         self.capacity = capacity  # Maximum number of plants this soil can hold
+
+    @property
+    def plants(self):
+        """The plants growing here, in planting order (handles into the bed)."""
+        bed = self.bed
+        return [Plant(bed, plant_id) for plant_id in bed.ids]
+
+    def plant_labels(self):
+        """How each plant here reads in a list, in planting order (straight from the bed's rows)."""
+        bed = self.bed
+        for row, (name, growth_stage, max_growth, _) in enumerate(bed.status()):
+            yield plant_label(name, growth_stage, max_growth, bed.effects_of(row))
     
     def add_plant(self, seed):
         """Convert a seed into a plant and add it to the soil."""
-        if len(self.plants) >= self.capacity:
+        if len(self.bed) >= self.capacity:
             return False, "This soil is already at full capacity."
         
-        # Create a new plant from the seed
-        plant_name = f"{seed.crop_type.capitalize()} Plant"
-        plant_desc = f"A young {seed.crop_type} plant growing in the soil."
-        new_plant = Plant(plant_name, plant_desc, seed.crop_type, seed.value * 2, 0, seed.growth_time)
-        
-        self.plants.append(new_plant)
+        # Plants are worth twice their seed
+        self.bed.plant(seed.crop_type, seed.growth_time, seed.value * 2)
         return True, f"You planted a {seed.crop_type} seed. Water it to help it grow!"
     
     def water_plants(self, plant_name=None, substance=None):
         """Water all plants or a specific plant in the soil, optionally with a special substance."""
-        if not self.plants:
+        if not len(self.bed):
             return False, "There are no plants in this soil to water."
         
         if plant_name:
@@ -834,12 +804,12 @@ class Soil(Object):
             success, message = plant.water(substance)
             return success, message
         else:
-            # Water all plants
+            # Water all plants, row by row (no Plant handle per plant)
+            bed = self.bed
             results = []
-            for plant in self.plants:
-                success, message = plant.water(substance)
-                if success:
-                    results.append(message)
+            for row in range(len(bed)):
+                if bed.water(row, substance):
+                    results.append(watering_message(bed.name(row), substance, bed.is_harvestable(row)))
             
             if results:
                 return True, "\n".join(results)
@@ -848,22 +818,17 @@ class Soil(Object):
     
     def get_plant(self, plant_name):
         """Find a plant by name."""
-        for plant in self.plants:
-            if plant.name.lower() == plant_name.lower():
-                return plant
-        return None
+        plant_id = self.bed.find(plant_name)
+        return Plant(self.bed, plant_id) if plant_id is not None else None
     
     def remove_plant(self, plant):
         """Remove a plant from the soil."""
-        if plant in self.plants:
-            self.plants.remove(plant)
-            return True
-        return False
+        return plant.bed is self.bed and self.bed.remove(plant.plant_id)
     
     def __str__(self):
         base_str = f"{self.name}"
-        if self.plants:
-            base_str += f" with {len(self.plants)} plants growing"
+        if len(self.bed):
+            base_str += f" with {len(self.bed)} plants growing"
 
             return base_str
         
@@ -871,18 +836,245 @@ from npc_behavior import NPC, Civillian, Gang, GangMember, BehaviorManager, NPCM
 
 
 
+class AreaCollection(Sequence):
+    """
+    Ordered container for the items, NPCs or objects in an area.
+
+    It behaves like the list it replaces (iteration order is insertion order,
+    it can be indexed and passed to random.choice/random.sample), but checking
+    membership, removing something and finding something by name don't have
+    to walk the whole area. The same object can be added more than once, just
+    like with a list; remove() takes out the oldest copy.
+    """
+
+    def __init__(self, things=()):
+        # The indexes hold a plain insertion number while there is only one
+        # entry (the usual case for NPCs) and only switch to a list/dict for
+        # duplicates, which saves a container per NPC in crowded areas
+        self._entries = {}  # insertion number -> thing (dicts keep insertion order)
+        self._copies = {}  # id(thing) -> insertion number, or list of them (oldest first) for copies
+        self._names = {}  # case-folded name -> insertion number, or {insertion number: None} for duplicates
+        self._name_keys = {}  # insertion number -> case-folded name it was indexed under
+        self._next_number = 0
+        self._snapshot = None  # List of the contents, rebuilt after changes
+        for thing in things:
+            self.append(thing)
+
+    def append(self, thing):
+        """Add something at the end."""
+        number = self._next_number
+        self._next_number += 1
+        self._entries[number] = thing
+        copies = self._copies.get(id(thing))
+        if copies is None:
+            self._copies[id(thing)] = number
+        elif isinstance(copies, int):
+            self._copies[id(thing)] = [copies, number]
+        else:
+            copies.append(number)
+
+        if self._names is not None:
+            self._index_name(number, thing)
+        self._snapshot = None
+
+    def _index_name(self, number, thing):
+        name = getattr(thing, 'name', None)
+        if isinstance(name, str):
+            name_key = sys.intern(name.casefold())
+            named = self._names.get(name_key)
+            if named is None:
+                self._names[name_key] = number
+            elif isinstance(named, int):
+                self._names[name_key] = {named: None, number: None}
+            else:
+                named[number] = None
+            self._name_keys[number] = name_key
+
+    def _get_names(self):
+        # Built on first use after a load (see __setstate__)
+        if self._names is None:
+            self._names = {}
+            self._name_keys = {}
+            for number, thing in self._entries.items():
+                self._index_name(number, thing)
+        return self._names
+
+    def remove(self, thing):
+        """Remove the oldest copy of something (ValueError if it isn't here, like list.remove)."""
+        if not self.discard(thing):
+            raise ValueError("AreaCollection.remove(x): x not in collection")
+
+    def discard(self, thing):
+        """Remove the oldest copy of something if it's here. Returns True if something was removed."""
+        copies = self._copies.get(id(thing))
+        if copies is None:
+            return False
+        if isinstance(copies, int):
+            number = copies
+            del self._copies[id(thing)]
+        else:
+            number = copies.pop(0)
+            if len(copies) == 1:
+                self._copies[id(thing)] = copies[0]
+        del self._entries[number]
+
+        name_key = self._name_keys.pop(number, None) if self._names is not None else None
+        if name_key is not None:
+            named = self._names[name_key]
+            if isinstance(named, int):
+                del self._names[name_key]
+            else:
+                del named[number]
+                if len(named) == 1:
+                    self._names[name_key] = next(iter(named))
+        self._snapshot = None
+        return True
+
+    def find(self, name):
+        """Get the first thing with this name (case-insensitive), or None."""
+        named = self._get_names().get(name.casefold())
+        if named is None:
+            return None
+        if isinstance(named, int):
+            return self._entries[named]
+        return self._entries[next(iter(named))]
+
+    def find_all(self, name):
+        """Get everything with this name (case-insensitive), in insertion order."""
+        named = self._get_names().get(name.casefold())
+        if named is None:
+            return []
+        if isinstance(named, int):
+            return [self._entries[named]]
+        return [self._entries[number] for number in named]
+
+    def _get_snapshot(self):
+        if self._snapshot is None:
+            self._snapshot = list(self._entries.values())
+        return self._snapshot
+
+    def __contains__(self, thing):
+        return id(thing) in self._copies
+
+    def __iter__(self):
+        # Iterate over a snapshot so the area can change while someone loops over it
+        return iter(self._get_snapshot())
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getitem__(self, index):
+        return self._get_snapshot()[index]
+
+    def __repr__(self):
+        return f"AreaCollection({self._get_snapshot()!r})"
+
+    # Saved as a plain list: the copy index is keyed by id(), which doesn't survive a load
+    def __getstate__(self):
+        return list(self._get_snapshot())
+
+    def __setstate__(self, state):
+        # pickle can hand over things that aren't fully loaded yet (an NPC whose
+        # area is being loaded), so their names are only indexed on first use
+        self.__init__()
+        self._names = None
+        for thing in state:
+            self.append(thing)
+
+
+# Words that make an item count as a gardening tool
+GARDENING_TOOL_WORDS = ['water', 'watering', 'fertilizer', 'compost', 'shovel', 'trowel', 'rake']
+# Words that make an object look like soil (even without an add_plant method)
+SOIL_WORDS = ['soil', 'dirt', 'garden', 'plot', 'planter', 'pot']
+
+# What items and objects are good for, so NPCs can ask an area "is there a
+# weapon here?" without scanning everything in it. Each capability is checked
+# once when something is added to the area.
+ITEM_CAPABILITIES = {
+    'weapon': lambda item: hasattr(item, 'damage') or getattr(item, 'type', None) == 'weapon',
+    'healing': lambda item: hasattr(item, 'healing') or getattr(item, 'type', None) == 'food',
+    'seed': lambda item: getattr(item, 'type', None) == 'seed' or 'seed' in getattr(item, 'name', '').lower(),
+    'hazard': lambda item: getattr(item, 'type', None) == 'hazard',
+    'gardening_tool': lambda item: any(word in getattr(item, 'name', '').lower() for word in GARDENING_TOOL_WORDS),
+}
+OBJECT_CAPABILITIES = {
+    'soil': lambda obj: hasattr(obj, 'add_plant'),
+    'soil_named': lambda obj: any(word in getattr(obj, 'name', '').lower() for word in SOIL_WORDS),
+}
+NPC_CAPABILITIES = {
+    'hazard_target': lambda npc: hasattr(npc, 'hazard_resistance'),  # Gang members (see hazard_resolver.py)
+}
+
+
 class Area:
     def __init__(self, name, description):
         self.name = name
         self.description = description
-        self.items = []
-        self.npcs = []
-        self.objects = []
+        self.items = AreaCollection()
+        self.npcs = AreaCollection()
+        self.objects = AreaCollection()
         self.exits = {}  # Dictionary to hold exits: direction -> Area
 
+        # Capability indexes: capability -> {item/object: copies in this area}
+        # (dicts keep insertion order, so the first entry is the first one added)
+        self.item_index = {capability: {} for capability in ITEM_CAPABILITIES}
+        self.object_index = {capability: {} for capability in OBJECT_CAPABILITIES}
+        self.npc_index = {capability: {} for capability in NPC_CAPABILITIES}
+
+        # Bumped whenever something that describe() shows changes (see touch())
+        self.version = 0
+        self._describe_cache = {}  # uses message system (bool) -> (version, segments)
+
+    def touch(self):
+        """Mark the area as changed so describe() rebuilds its cached text."""
+        self.version += 1
+
+    def _index_add(self, index, capabilities, thing):
+        """Add something to every capability index it qualifies for."""
+        for capability, check in capabilities.items():
+            if check(thing):
+                entries = index[capability]
+                entries[thing] = entries.get(thing, 0) + 1
+
+    def _index_remove(self, index, thing):
+        """Remove one copy of something from the capability indexes."""
+        for entries in index.values():
+            count = entries.get(thing)
+            if count is None:
+                continue
+            if count > 1:
+                entries[thing] = count - 1
+            else:
+                del entries[thing]
+
+    def has_items(self, capability):
+        """Check if there's at least one item with a capability here ('weapon', 'seed', ...)."""
+        return bool(self.item_index[capability])
+
+    def get_items(self, capability):
+        """Get the items here with a capability, in the order they were added."""
+        return [item for item, count in self.item_index[capability].items() for _ in range(count)]
+
+    def has_objects(self, capability):
+        """Check if there's at least one object with a capability here ('soil', ...)."""
+        return bool(self.object_index[capability])
+
+    def get_objects(self, capability):
+        """Get the objects here with a capability, in the order they were added."""
+        return [obj for obj, count in self.object_index[capability].items() for _ in range(count)]
+
+    def first_object(self, capability):
+        """Get the first object here with a capability (None if there isn't one)."""
+        return next(iter(self.object_index[capability]), None)
+
+    def get_npcs(self, capability):
+        """Get the NPCs here with a capability ('hazard_target'), in the order they arrived."""
+        return list(self.npc_index[capability])
+
     def add_exit(self, direction, area):
         """Add an exit to another area in a given direction."""
         self.exits[direction] = area
+        self.touch()
 
     def get_exit(self, direction):
         """Get the area in the given direction."""
@@ -890,107 +1082,170 @@ class Area:
 
     def add_item(self, item):
         self.items.append(item)
+        self._index_add(self.item_index, ITEM_CAPABILITIES, item)
+        self.touch()
 
     def remove_item(self, item):
-        if item in self.items:
-            self.items.remove(item)
+        if self.items.discard(item):
+            self._index_remove(self.item_index, item)
+            self.touch()
 
     def add_object(self, object):
         self.objects.append(object)
+        self._index_add(self.object_index, OBJECT_CAPABILITIES, object)
+        self.touch()
 
     def remove_object(self, obj):
-        if obj in self.objects: # using the word item in place of object because the word "object" is a keyword
-            self.objects.remove(obj)
+        if self.objects.discard(obj): # using the word item in place of object because the word "object" is a keyword
+            self._index_remove(self.object_index, obj)
+            self.touch()
             return True
         return False
     
 
     def add_npc(self, npc):
         self.npcs.append(npc)
+        self._index_add(self.npc_index, NPC_CAPABILITIES, npc)
         npc.location = self
+        self.touch()
 
     def remove_npc(self, npc):
-        if npc in self.npcs:
-            self.npcs.remove(npc)
+        if self.npcs.discard(npc):
+            self._index_remove(self.npc_index, npc)
+            self.touch()
+
+    def find_item(self, name):
+        """Find an item here by name (case-insensitive)."""
+        return self.items.find(name)
+
+    def find_npc(self, name):
+        """Find an NPC here by name (case-insensitive)."""
+        return self.npcs.find(name)
+
+    def find_object(self, name, object_class=None):
+        """Find an object here by name (case-insensitive), optionally only of a given class."""
+        for obj in self.objects.find_all(name):
+            if object_class is None or isinstance(obj, object_class):
+                return obj
+        return None
 
     def describe(self, game=None):
         """Describe the area, including items, NPCs, and objects.
         
         If game is provided, uses the message system to filter NPC descriptions.
+        
+        The text is cached and only rebuilt when the area's version changes.
+        Parts that can change without the area knowing (plants, open storage)
+        or that are randomly throttled (NPC activities, hazards) are filled in
+        each time.
         """
-        desc = f"{self.name}\n{self.description}\n"
+        use_message_system = bool(game and hasattr(game, 'message_manager'))
+        cached = self._describe_cache.get(use_message_system)
+        if cached is None or cached[0] != self.version:
+            cached = (self.version, self._build_describe_segments(use_message_system))
+            self._describe_cache[use_message_system] = cached
+        segments = cached[1]
+        
+        # Nothing dynamic in this area: the cached text is the whole description
+        if len(segments) == 1 and segments[0][0] == 'text':
+            return segments[0][1]
+        
+        if use_message_system:
+            show_npc, _, npc_throttle_rate = game.message_manager.display_settings[MessageCategory.NPC_MINOR]
+            show_hazard, _, hazard_throttle_rate = game.message_manager.display_settings[MessageCategory.HAZARD_EFFECT]
+        
+        parts = []
+        for kind, value in segments:
+            if kind == 'text':
+                parts.append(value)
+            elif kind == 'activity':
+                # Add activity description only if settings allow
+                if value.current_activity and show_npc and rng.messaging.random() > npc_throttle_rate:
+                    parts.append(f" - {value.current_activity}")
+            elif kind == 'soil':
+                # If it's soil, show the plants
+                if len(value.bed):
+                    parts.append("   Plants in this soil:\n")
+                    parts.extend(f"   * {label}\n" for label in value.plant_labels())
+            elif kind == 'storage':
+                # If it's an open storage, show the items inside
+                if value.is_open and value.items:
+                    parts.append("   Items in this storage:\n")
+                    parts.extend(f"   * {item}\n" for item in value.items)
+            elif kind == 'hazard':
+                # If it's a hazard, only show details based on settings
+                if show_hazard and rng.messaging.random() > hazard_throttle_rate:
+                    if hasattr(value, 'description') and value.description:
+                        parts.append(f"   * {value.description}\n")
+        return "".join(parts)
+
+    def _build_describe_segments(self, use_message_system):
+        """
+        Build the cached form of describe(): a list of (kind, value) segments.
+
+        'text' segments are finished text. The other kinds ('activity', 'soil',
+        'storage', 'hazard') hold the NPC or object whose part of the text is
+        filled in when describe() runs. Neighbouring text is merged together.
+        """
+        segments = []
+        
+        def add_text(text):
+            if segments and segments[-1][0] == 'text':
+                segments[-1] = ('text', segments[-1][1] + text)
+            else:
+                segments.append(('text', text))
+        
+        lines = [f"{self.name}\n{self.description}\n"]
         
         # Items
         if self.items:
-            desc += "You see the following items:\n"
-            for item in self.items:
-                desc += f" - {item.name}\n"
+            lines.append("You see the following items:\n")
+            lines.extend(f" - {item.name}\n" for item in self.items)
         
         # NPCs
         if self.npcs:
-            desc += "You see the following people:\n"
-            
-            # If game is provided, use message system to filter NPC descriptions
-            if game and hasattr(game, 'message_manager'):
-                # Get NPC display settings
-                show_npc, _, throttle_rate = game.message_manager.display_settings[MessageCategory.NPC_MINOR]
+            lines.append("You see the following people:\n")
+            for npc in self.npcs:
+                # Always show the NPC name, plus status info
+                npc_desc = f" - {npc.name}"
+                if hasattr(npc, 'is_alive') and not npc.is_alive:
+                    npc_desc += " (dead)"
                 
-                # Show all NPCs but with minimal descriptions for minor NPCs
-                for npc in self.npcs:
-                    # Always show the NPC name
-                    npc_desc = f" - {npc.name}"
-                    
-                    # Add status info for important NPCs or based on settings
-                    if hasattr(npc, 'is_alive') and not npc.is_alive:
-                        npc_desc += " (dead)"
-
-                    
-                    # Add activity description only if settings allow
-                    if show_npc and random.random() > throttle_rate:
-                        if hasattr(npc, 'current_activity') and npc.current_activity:
-                            npc_desc += f" - {npc.current_activity}"
-                    
-                    desc += npc_desc + "\n"
-            else:
-                # Without message system, show all NPCs with basic info
-                for npc in self.npcs:
-                    npc_desc = f" - {npc.name}"
-                    if hasattr(npc, 'is_alive') and not npc.is_alive:
-                        npc_desc += " (dead)"
-                    desc += npc_desc + "\n"
+                # With the message system, NPCs doing something get a throttled activity suffix
+                if use_message_system and getattr(npc, 'current_activity', None):
+                    lines.append(npc_desc)
+                    add_text("".join(lines))
+                    lines = []
+                    segments.append(('activity', npc))
+                    lines.append("\n")
+                else:
+                    lines.append(npc_desc + "\n")
         
         # Objects
         if self.objects:
-            desc += "There are some objects here:\n"
+            lines.append("There are some objects here:\n")
             for obj in self.objects:
-                desc += f" - {obj.name}\n"
-                
-                # If it's soil, show the plants
-                if isinstance(obj, Soil) and obj.plants:
-                    desc += "   Plants in this soil:\n"
-                    for plant in obj.plants:
-                        desc += f"   * {plant}\n"
+                lines.append(f" - {obj.name}\n")
                 
-                # If it's an open storage, show the items inside
-                elif isinstance(obj, Storage) and obj.is_open and obj.items:
-                    desc += "   Items in this storage:\n"
-                    for item in obj.items:
-                        desc += f"   * {item}\n"
-                        
-                # If it's a hazard, only show details based on settings
-                elif isinstance(obj, StaticHazard) and game and hasattr(game, 'message_manager'):
-                    show_hazard, _, throttle_rate = game.message_manager.display_settings[MessageCategory.HAZARD_EFFECT]
-                    if show_hazard and random.random() > throttle_rate:
-                        if hasattr(obj, 'description') and obj.description:
-                            desc += f"   * {obj.description}\n"
+                if isinstance(obj, Soil):
+                    kind = 'soil'
+                elif isinstance(obj, Storage):
+                    kind = 'storage'
+                elif isinstance(obj, StaticHazard) and use_message_system:
+                    kind = 'hazard'
+                else:
+                    continue
+                add_text("".join(lines))
+                lines = []
+                segments.append((kind, obj))
         
         # Add exits
         if self.exits:
-            desc += "Exits:\n"
-            for direction, area in self.exits.items():
-                desc += f" - {direction}: {area.name}\n"
-                
-        return desc
+            lines.append("Exits:\n")
+            lines.extend(f" - {direction}: {area.name}\n" for direction, area in self.exits.items())
+        
+        add_text("".join(lines))
+        return segments
 
 
 class Player:
@@ -998,7 +1253,6 @@ class Player:
         self.current_area = starting_area
         self.inventory = starting_items or []
         self.health = 100
-        self.active_effects = {}  # Dictionary of effect_name -> turns_remaining
         self.hidden = False  # Add hidden attribute for detection logic
         self.detected_by = set()  # Track gangs that detected the player
         
@@ -1059,30 +1313,16 @@ class Player:
         
         return message
     
-    def update_effects(self):
-        """Update active effects, reducing their duration by 1 turn."""
-        expired_effects = []
-        
-        for effect_name, turns_remaining in self.active_effects.items():
-            if turns_remaining <= 1:
-                expired_effects.append(effect_name)
-            else:
-                self.active_effects[effect_name] = turns_remaining - 1
-        
-        # Remove expired effects
-        for effect_name in expired_effects:
-            del self.active_effects[effect_name]
-            
-        return expired_effects
+    @property
+    def active_effects(self):
+        """Dictionary of effect_name -> turns_remaining (effects run out in effect_scheduler)."""
+        return {name: effect_scheduler.remaining(self, name) for name in effect_scheduler.names(self)}
 
     def attack(self, target_name, game):
         """Attack a gang member in the current area by name."""
         # Find gang member in current area
-        target = None
-        for npc in self.current_area.npcs:
-            if npc.name.lower() == target_name.lower() and isinstance(npc, GangMember):
-                target = npc
-                break
+        target = next((npc for npc in self.current_area.npcs.find_all(target_name)
+                       if isinstance(npc, GangMember)), None)
         if not target:
             return f"No gang member named '{target_name}' here to attack."
 
@@ -1117,7 +1357,7 @@ class Player:
                 f"With a quick motion, you slice at {target.name} with your knife"
             ]
             # 50% chance to use weapon-specific description
-            if random.random() < 0.5:
+            if rng.combat.random() < 0.5:
                 attack_descriptions = knife_descriptions
         elif weapon.name == "Gun":
             gun_descriptions = [
@@ -1127,11 +1367,11 @@ class Player:
                 f"With steady hands, you fire your gun at {target.name}"
             ]
             # 50% chance to use weapon-specific description
-            if random.random() < 0.5:
+            if rng.combat.random() < 0.5:
                 attack_descriptions = gun_descriptions
         
         # Select a random attack description
-        attack_desc = random.choice(attack_descriptions)
+        attack_desc = rng.combat.choice(attack_descriptions)
         
         if target.health <= 0:
             # Remove target from gang and area
@@ -1147,7 +1387,7 @@ class Player:
                 f"{attack_desc}. Your attack proves too much for {target.name}, who crumples to the floor."
             ]
             
-            return random.choice(defeat_descriptions)
+            return rng.combat.choice(defeat_descriptions)
         else:
             # Create descriptive damage message
             if target.health > 75:
@@ -1171,7 +1411,7 @@ class Player:
             if home_area:
                 self.current_area = home_area
                 self.health = 100
-                self.active_effects.clear()
+                effect_scheduler.forget(self)
                 self.hidden = False
                 self.detected_by.clear()
                 
@@ -1206,9 +1446,9 @@ class Hazard:
 import json
 import os
 import collections
-import random
 
-from npc_behavior import NPC_REACTIONS
+from phrase_bank import phrase_bank
+from hazard_resolver import hazard_targets, resolve_hazard
 
 class Hazard:
     def __init__(self, name, description, effect, damage, duration=None):
@@ -1228,10 +1468,23 @@ class Hazard:
                 self.active = False
         return self.active
 
-    def group_results(self, results):
+    def group_results(self, outcome):
         """Group hazard results by effect status with proper grammar and interesting details"""
         from npc_behavior import group_hazard_results
-        return group_hazard_results(self, results)
+        return group_hazard_results(self, outcome)
+
+    def resolve(self, area, subset=False):
+        """Resolve this hazard for the gang members in an area at once and return the summary text."""
+        targets = hazard_targets(area)
+
+        # If we have a lot of NPCs, only affect a random subset
+        # This prevents the same NPCs from being affected by multiple hazards
+        if subset and len(targets) > 3:
+            # Affect between 1 and 3 NPCs, or up to 1/3 of the total NPCs
+            max_affected = min(3, len(targets) // 3 + 1)
+            targets = rng.hazards.sample(targets, max_affected)
+
+        return self.group_results(resolve_hazard(self, targets))
 
 
 class StaticHazard(Hazard):
@@ -1241,26 +1494,8 @@ class StaticHazard(Hazard):
 
 
     def affect_area(self, area):
-        """Apply hazard to all gang members in area with grouped results"""
-        results = []
-        
-        # Get a list of eligible NPCs (gang members)
-        eligible_npcs = [npc for npc in area.npcs if isinstance(npc, GangMember)]
-        
-        # If we have a lot of NPCs, only affect a random subset
-        # This prevents the same NPCs from being affected by multiple hazards
-        if len(eligible_npcs) > 3:
-            # Affect between 1 and 3 NPCs, or up to 1/3 of the total NPCs
-            max_affected = min(3, len(eligible_npcs) // 3 + 1)
-            eligible_npcs = random.sample(eligible_npcs, max_affected)
-        
-        # Apply hazard effect to selected NPCs
-        for npc in eligible_npcs:
-            result = npc.apply_hazard_effect(self)
-            npc.update_effects()
-            results.append(result)
-                
-        return self.group_results(results)
+        """Apply hazard to a subset of the gang members in area with grouped results"""
+        return self.resolve(area, subset=True)
     
     def get_affected_verb(self, count):
         """Get appropriate verb for affected members"""
@@ -1281,31 +1516,12 @@ class HazardItem(Hazard):
     
     def use(self, player):
         """Use hazard item on a subset of gang members with grouped results"""
-        
-        results = []
-        
-        # Get a list of eligible NPCs (gang members)
-        eligible_npcs = [npc for npc in player.current_area.npcs if isinstance(npc, GangMember)]
-        
-        # If we have a lot of NPCs, only affect a random subset
-        # This prevents the same NPCs from being affected by multiple hazards
-        if len(eligible_npcs) > 3:
-            # Affect between 1 and 3 NPCs, or up to 1/3 of the total NPCs
-            max_affected = min(3, len(eligible_npcs) // 3 + 1)
-            eligible_npcs = random.sample(eligible_npcs, max_affected)
-        
-        # Apply hazard effect to selected NPCs
-        for npc in eligible_npcs:
-            result = npc.apply_hazard_effect(self)
-            npc.update_effects()
-            results.append(result)
-                
-        return self.group_results(results)
+        return self.resolve(player.current_area, subset=True)
         
     def activate(self):
         """Activate the hazard item - this method is called when an NPC triggers the item"""
         # This method exists to be called by NPCs when they trigger the hazard
-        # The actual effect is applied through apply_hazard_effect
+        # The actual effect is applied through apply_hazard_effect (or resolve_hazard for a whole area)
         # We could add additional effects here if needed
         return True
 
@@ -1364,43 +1580,70 @@ class FallingObject(Hazard):
 
     def affect_area(self, area):
         """Apply hazard to all gang members in area with grouped results"""
-        results = []
-        for npc in area.npcs:
-            if isinstance(npc, GangMember):
-                result = npc.apply_hazard_effect(self)
-                npc.update_effects()
-                results.append(result)
-
-                
+        return self.resolve(area)
+    
+    
+    
+
+# The classes the world file's "type" names create
+WORLD_TYPES = WorldTypes(
+    items={
+        'item': Item,
+        'weapon': Weapon,
+        'consumable': Consumable,
+        'seed': Seed,
+        'watering_can': WateringCan,
+        'smartphone': Smartphone,
+        'hazard_item': HazardItem,
+    },
+    objects={
+        'object': Object,
+        'storage': Storage,
+        'soil': Soil,
+        'static_hazard': StaticHazard,
+    },
+    npcs={
+        'npc': NPC,
+        'civilian': Civillian,
+    },
+    substances={
+        'Hacked Milk': HackedMilk,
+    },
+    area=Area,
+    gang=Gang,
+    gang_member=GangMember,
+)
 
-        return self.group_results(results)
-    
-    
-    
 
 class Game:
+    # World file the game starts from (a .json or .toml file, see world_loader.py)
+    WORLD_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "world.json")
+
     def __init__(self):
         self.areas = {}
         self.items = {}  # Centralized item registry
         self.objects = {}  # Centralized object registry
         self.npcs = {}  # Centralized NPC registry
+        self.gangs = {}  # Gang name -> Gang
+        effect_scheduler.clear()  # Effects from a previous game don't carry over
 
-        self.NPC_REACTIONS = NPC_REACTIONS
+        self.NPC_REACTIONS = phrase_bank  # Shared with npc_behavior, phrases load per category on first use
         self.npc_message_manager = NPCMessageManager()  # For summarizing NPC messages
         self.message_manager = None  # Will be initialized after player is created
         self.message_coordinator = None  # Will be initialized after message_manager
 
-        self.player_starting_items = []  # Initialize this before create_items
-        
-        self.create_items()
-        self.create_areas()
-        self.create_objects()
-        self.create_npcs()
+        self.player_start_area = None
+        self.player_starting_items = []
 
-        self.player = Player(self.areas.get('Home'), self.player_starting_items)
+        # Areas, items, objects and NPCs come from the world file (see world_loader.py)
+        self.load_world(self.WORLD_FILE)
+
+        self.player = Player(self.areas.get(self.player_start_area), self.player_starting_items)
         
         # Initialize the message manager after player is created
         self.message_manager = MessageManager(self)
+        # Trace records show up as debug messages while the message manager is in debug mode
+        tracer.set_sink(MessageSink(self.message_manager))
         
         # Initialize notification manager for the player if it doesn't exist
         from notification_system import NotificationManager
@@ -1414,6 +1657,16 @@ class Game:
             npc_message_manager=self.npc_message_manager,
             notification_manager=self.player.notification_manager
         )
+
+        # Only the areas around the player are simulated every turn
+        self.activity_scheduler = ActivityScheduler(self)
+
+        # Named random streams (behavior, combat, messaging, hazards, worldgen);
+        # seed them with self.rng.seed(n) for a reproducible game
+        self.rng = rng
+
+        # Binary save/load (full snapshots plus deltas of what changed since)
+        self.snapshot_manager = SnapshotManager(self)
         self.commands = {
             'move': {'handler': self.cmd_move, 'category': 'movement'},
             'go': {'handler': self.cmd_move, 'category': 'movement'},
@@ -1461,8 +1714,23 @@ class Game:
             'messages': {'handler': self.cmd_message_settings, 'category': 'system'},
             'behavior-settings': {'handler': self.cmd_behavior_settings, 'category': 'system'},
             'npc-settings': {'handler': self.cmd_behavior_settings, 'category': 'system'},
+            # Save/load commands
+            'save': {'handler': self.cmd_save, 'category': 'system'},
+            'load': {'handler': self.cmd_load, 'category': 'system'},
+            'autosave': {'handler': self.cmd_autosave, 'category': 'system'},
+            # Turn pipeline commands
+            'stats': {'handler': self.cmd_stats, 'category': 'system'},
+            'phases': {'handler': self.cmd_phases, 'category': 'system'},
+            # Diagnostics
+            'trace': {'handler': self.cmd_trace, 'category': 'system'},
+            'message-stats': {'handler': self.cmd_message_stats, 'category': 'system'},
         }
         self.is_running = True
+        self.turn_profiler = None  # Optional phase timer, attached by the headless simulator
+
+        # Every turn runs as a list of named, timed phases that can be hooked, disabled or reordered
+        self.turn_pipeline = TurnPipeline()
+        self.register_turn_phases()
 
     def add_item_to_area(self, area_name, item_name):
         """Add an item to a specified area."""
@@ -1494,449 +1762,308 @@ class Game:
         return "Area or NPC not found."
 
 
-    def create_items(self):
-        """Dynamically create and register items."""
-
-        # regular items
-        shovel = Item("Shovel", "A shovel for digging.", 5)
-
-        
-        # weapons
-        knife = Weapon("Knife","A sharp blade.", 10, 20)
-        gun = Weapon("Gun", "A firearm.", 20, 50)
-        
-        usb_stick = Item("USB stick", "A USB stick with data on it.", 10)
-        farm_note = Item("Note", "An old, crumbled up piece of paper with some scribbled writing on it: Take the backroads. You'll find what you're looking for up north.", 10)
-
-        glitter_bomb = HazardItem("Glitter Bomb", "A small, shiny bomb that explodes into glitter.", "gift-giving")
-
-
-
-        # Register items in the centralized item registry
-        self.items["Shovel"] = shovel
-        self.items["Knife"] = knife
-        self.items["USB stick"] = usb_stick  # item.name is also a valid key
-        self.items["Note"] = farm_note  # need to organize this better for multiple notes
-
-
-        self.items["Glitter Bomb"] = glitter_bomb
-
-
-        carrot_seed = Seed("Carrot Seed", "A seed for planting carrots.", "carrot", 5)
-        tomato_seed = Seed("Tomato Seed", "A seed for planting tomatoes.", "tomato", 5)
-        grape_seed = Seed("Grape Seed", "A seed for planting grapes.", "grape", 5)
-
-
-
-        self.items["Carrot Seed"] = carrot_seed
-        self.items["Tomato Seed"] = tomato_seed
-        self.items["Grape Seed"] = grape_seed
-        
-        # Create smartphone
-        smartphone = Smartphone("Smartphone", "A high-tech smartphone with various apps", 100)
-        self.items["Smartphone"] = smartphone
-        
-        # Create watering can
-        watering_can = WateringCan()
-        self.items["Watering Can"] = watering_can
-
-        hackedmilk = HackedMilk()
-
-        watering_can.fill_with(hackedmilk) # not sure if this works
-        
-        
-        # Add smartphone and watering can to player's starting inventory
-        self.player_starting_items = [smartphone, watering_can, gun, carrot_seed, tomato_seed]  # We'll use this in the Player initialization
+    def load_world(self, path):
+        """
+        Load areas, items, objects and NPCs from a world file into the registries.
 
-    def create_objects(self):
-        # Dynamically create and register objects.
+        The built world is cached next to the file, so only the first start
+        after the file changes has to check and build it (see world_loader.py).
+        """
+        world = load_world(path, WORLD_TYPES)
+        # Name variations come from the worldgen stream, so they're drawn fresh every game
+        world.add_name_variations(rng.worldgen, WORLD_TYPES.gang_member)
+        self.areas = world.areas
+        self.items = world.items
+        self.objects = world.objects
+        self.npcs = world.npcs
+        self.gangs = world.gangs
+        self.player_start_area = world.player_area
+        self.player_starting_items = world.player_items
+
+    def remove_npc(self, name):
+        """Remove an NPC from the game: the NPC registry, its area, its gang and its behavior cooldowns."""
+        from npc_behavior import behavior_settings
+        npc = self.npcs.pop(name, None)
+        if npc is None:
+            return None
+        if npc.location:
+            npc.location.remove_npc(npc)
+        if hasattr(npc, 'gang'):
+            npc.gang.remove_member(npc)
+        behavior_settings.forget_npc(npc)
+        return npc
 
-        garden = Soil("Garden", "A garden full of plants.")
+    def game_loop(self):
+        print("Welcome to Root Access!")
+        print("Type 'help' for a list of commands.\n")
+        while self.is_running:
+            self.start_turn()
+            command_input = input("> ").strip()
+            if not command_input:
+                continue
+            self.run_turn(command_input)
+
+    def start_turn(self):
+        """Reset the message systems for a new turn and show the location prompt."""
+        phase_start = time.perf_counter()
+        # Start a new turn for the message systems
+        if hasattr(self, 'message_coordinator'):
+            # Use the coordinator to reset all message systems
+            self.message_coordinator.new_turn()
+        else:
+            # Fall back to just resetting the message manager
+            self.message_manager.new_turn()
 
-        soil_box = Soil("Soil Box", "A box filled with soil.")
-        self.objects["Soil Box"] = soil_box
-        
-        # Create a storage object for the player's home
-        toolbox = Storage("Toolbox", "A sturdy metal toolbox for storing garden tools.", capacity=5)
-        
-        # Create a watering can for gardening
-        watering_can = Item("Watering Can", "A metal watering can for watering plants.", 5)
-        self.items["Watering Can"] = watering_can
+        # Effects that run out this turn are gone before the command, wherever in the world they are
+        effect_scheduler.advance(self.message_manager.current_turn)
+        tracer.turn = self.message_manager.current_turn
         
-        # Register objects in the centralized object registry
-        self.objects["Garden"] = garden
-        self.objects["Toolbox"] = toolbox
+        # Get the current location and check for notifications
+        unread_count = self.player.notification_manager.get_unread_count()
+        location_text = f"\nCurrent location: {self.player.current_area.name}"
         
-        # Add objects to areas
-        self.add_object_to_area('Home', 'Garden')
-        self.add_object_to_area('Home', 'Toolbox')
-        
-        # Add the watering can to the toolbox
-        toolbox.add_item(watering_can)
-
-
-        # Create hacked milk
-        hacked_milk = StaticHazard("Hacked Milk", "A container of milk that has been tampered with.", "hallucinations")
-        self.objects["Hacked Milk"] = hacked_milk
-        
-        self.add_object_to_area('Warehouse', 'Hacked Milk')
-        self.add_object_to_area('Warehouse', 'Soil Box')
-
-
-
-    def create_npcs(self):
-        """Dynamically create and register NPCs."""
-        # NPCs
-        Jack = NPC("Jack", "The owner of Jacks Fuel, who may offer valuable intel.")
-        self.npcs["Jack"] = Jack
-
-        # Create Bloodhounds gang and members
-        bloodhounds_gang = Gang("Bloodhounds")
-        bloodhounds_names = ["Buck", "Bubbles", "Boop", "Noodle", "Flop", "Squirt", "Squeaky", "Gus-Gus", "Puddles", "Muffin", "Binky", "Beep-Beep"]
-
-
-        # CHANGING NAMES IN A WACKY WAY
-
-        name_variations = ["etti", "oodle", "op", "eeky", "-eep", "uffin", "bertmo", "athur", "ubble", "uck"]
-
-        def generate_name_variations(names, variations):
-            """Replaces last character in each name with a random variation."""
-            new_names = []
-            for name in names:
-                variation = random.choice(variations)  # Pick a random suffix
-                modified_name = name[:-1] + variation  # Remove last character and append new one
-                new_names.append(modified_name)
-            return new_names
-
-        # Generate modified gang names
-        modified_bloodhound_names = generate_name_variations(bloodhounds_names, name_variations)
-
-        # Print new gang member names
-        for name in modified_bloodhound_names:
-            bloodhounds_names.append(name)
-
-
-
-        for name in bloodhounds_names:
-            member = GangMember(name, f"A member of the {bloodhounds_gang.name} gang.", bloodhounds_gang)
-            # Add default items to each gang member
-            knife = self.items.get("Knife")
-            if knife:
-                member.add_item(knife)
-            member.add_item(self.items.get("USB stick"))
-            self.npcs[name] = member
-
-        # Add gang members to Warehouse area NPC list
-        warehouse_area = self.areas.get("Warehouse")
-        if warehouse_area:
-            for name in bloodhounds_names:
-                member = self.npcs.get(name)
-                if member:
-                    warehouse_area.add_npc(member)
-
-
-
-
-    def create_areas(self):
-        """Create and connect areas in a scalable way."""
-        Suburbs = Area("Suburbs", "A quiet suburban neighborhood.")
-        Downtown = Area("Downtown", "A bustling city area.")
-        Warehouse = Area("Warehouse", "An abandoned warehouse with construction containers lining the walls, stacked up to the ceiling, run by the Bloodhounds.")
-        Backroads = Area("Backroads", "A foggy, long stretch of road leads to the unknown.")
-        JacksFuel = Area("Jack's Fuel Station", "On the side of the road, a small fuel station with a sign that reads 'Jack's Fuel'.")
-        Farm = Area("The Farm", "A seemingly abandoned farm taken over by the Bloodhounds.")
-
-
-        Home = Area("Home", "In the entrance to your house. The living room is to the north. The suburbs are outside.")
-        Home_Living_Room = Area("Living Room", "A room with a couch, a TV, and a coffee table.")
-        Home_Kitchen = Area("Kitchen", "A room with a sink, a fridge, and cabinets.")
-        Home_Study = Area("Study", "A room with a desk, a computer, and a chair.")
-
-
-        # Connect areas
-
-
-        Home.add_exit("east", Warehouse)
-        Home.add_exit("outside", Suburbs)
-
-        Downtown.add_exit("south", Suburbs)
-        Downtown.add_exit("east", Warehouse)
-
-        Warehouse.add_exit("west", Downtown)
-        Warehouse.add_exit("north", Backroads)
-
-        Backroads.add_exit("North", Farm)
-        Backroads.add_exit("west", JacksFuel)
-        # add a road that goes east, leads to abandoned train tracks with a tunnel and a maintenance building inside the tunnel (more weapons and other item discoveries, maybe intel)
-
-
-
-
-        Suburbs.add_exit("north", Downtown)
-        Suburbs.add_exit("inside", Home)
-
-        # Add areas to the dictionary
-        self.areas['Home'] = Home
-        self.areas['Downtown'] = Downtown
-        self.areas['Warehouse'] = Warehouse
-        self.areas['Backroads'] = Backroads
-        self.areas['JacksFuel'] = JacksFuel
-        self.areas['Farm'] = Farm
-
-        # Add items to areas
-        self.add_item_to_area('Home', 'Shovel')
-        self.add_item_to_area('Downtown', 'Knife')
-        self.add_item_to_area('Warehouse', 'USB stick')
-        self.add_item_to_area('Warehouse', 'Note')
-        self.add_item_to_area('Backroads', 'Carrot Seed')
+        # Add notification indicator with count if there are unread notifications
+        if unread_count > 0:
+            notification_indicator = f" 🔔x{unread_count}"
+            print(f"{location_text}{notification_indicator}")
+        else:
+            print(location_text)
+        self._record_phase('new_turn', phase_start)
 
-        self.add_item_to_area('Warehouse', 'Glitter Bomb')
+    def run_turn(self, command_input):
+        """
+        Run one full turn for a single command.
 
+        This covers everything that happens after the player types something:
+        command dispatch, hazards, NPC behaviors, gang attacks and the end of
+        turn summaries. game_loop() feeds it from input(), the headless
+        simulator (headless_sim.py) feeds it from a scripted command stream.
 
-        self.add_npc_to_area('JacksFuel', 'Jack')
-        
-
-    def game_loop(self):
-        print("Welcome to Root Access!")
-        print("Type 'help' for a list of commands.\n")
-        while self.is_running:
-            # Start a new turn for the message systems
+        The work itself is done by the phases registered in register_turn_phases(),
+        run in order by self.turn_pipeline (see the 'phases' and 'stats' commands).
+        """
+        parts = command_input.split()
+        command = parts[0].lower()
+        args = parts[1:]
+        cmd_entry = self.commands.get(command)
+        if not cmd_entry:
+            print("Unknown command. Type 'help' for a list of commands.")
+            return
+
+        return self.turn_pipeline.run(self, TurnContext(command, args, cmd_entry))
+
+    def register_turn_phases(self):
+        """Register the standard turn phases, in the order they run."""
+        pipeline = self.turn_pipeline
+        pipeline.register('command', Game._phase_command,
+                          "Run the player's command", required=True)
+        pipeline.register('world', Game._phase_world,
+                          "Catch up the areas around the player")
+        pipeline.register('hazards', Game._phase_hazards,
+                          "Hazards in the player's area")
+        pipeline.register('npc_behaviors', Game._phase_npc_behaviors,
+                          "NPC behaviors, then next behavior choices")
+        pipeline.register('npc_attacks', Game._phase_npc_attacks,
+                          "Gang members interacting with the player")
+        pipeline.register('release_items', Game._phase_release_items,
+                          "Release items examined this turn")
+        pipeline.register('npc_summary', Game._phase_npc_summary,
+                          "Summarize what the NPCs did")
+        pipeline.register('message_summary', Game._phase_message_summary,
+                          "Show the turn's remaining messages")
+        pipeline.register('autosave', Game._phase_autosave,
+                          "Autosave every few turns, if turned on")
+
+    def _phase_command(self, context):
+        """Process the player command."""
+        output = context.cmd_entry['handler'](context.args)
+        context.output = output
+        if output:
+            # Add player command output to message system using the coordinator if available
             if hasattr(self, 'message_coordinator'):
-                # Use the coordinator to reset all message systems
-                self.message_coordinator.new_turn()
-            else:
-                # Fall back to just resetting the message manager
-                self.message_manager.new_turn()
-            
-            # Get the current location and check for notifications
-            unread_count = self.player.notification_manager.get_unread_count()
-            location_text = f"\nCurrent location: {self.player.current_area.name}"
-            
-            # Add notification indicator with count if there are unread notifications
-            if unread_count > 0:
-                notification_indicator = f" 🔔x{unread_count}"
-                print(f"{location_text}{notification_indicator}")
+                should_show = self.message_coordinator.process_player_message(
+                    output, 
+                    priority=MessagePriority.HIGH
+                )
             else:
-                print(location_text)
-                
-            command_input = input("> ").strip()
-            if not command_input:
-                continue
-            parts = command_input.split()
-            command = parts[0].lower()
-            args = parts[1:]
-            cmd_entry = self.commands.get(command)
-            if cmd_entry:
-                # Process player command
-                output = cmd_entry['handler'](args)
-                if output:
-                    # Add player command output to message system using the coordinator if available
+                # Fall back to direct message manager
+                should_show, _ = self.message_manager.add_message(
+                    output, 
+                    category=MessageCategory.PLAYER_ACTION,
+                    priority=MessagePriority.HIGH
+                )
+            if should_show:
+                print(output)
+        
+        # Handle notification-worthy events directly
+        if self.player.health < 50:
+            self.player.notification_manager.add_notification(
+                "Your health is low! Find a way to heal.",
+                category="general",
+                importance=5
+            )
+
+    def _phase_world(self, context):
+        """Bring the areas around the player up to date.
+
+        This runs after the command, so a move or teleport catches up the area
+        the player just entered.
+        """
+        self.activity_scheduler.update()
+
+    def _phase_hazards(self, context):
+        """After player command, process hazards in current area."""
+        for obj in list(self.player.current_area.objects):
+            if isinstance(obj, StaticHazard) and obj.active:
+                hazard_result = obj.affect_area(self.player.current_area)
+                if hazard_result:
+                    # Add hazard results to message system using the coordinator if available
                     if hasattr(self, 'message_coordinator'):
-                        should_show = self.message_coordinator.process_player_message(
-                            output, 
+                        self.message_coordinator.process_system_message(
+                            hazard_result, 
+                            category=MessageCategory.HAZARD_EFFECT,
                             priority=MessagePriority.HIGH
                         )
                     else:
                         # Fall back to direct message manager
-                        should_show, _ = self.message_manager.add_message(
-                            output, 
-                            category=MessageCategory.PLAYER_ACTION,
-                            priority=MessagePriority.HIGH
+                        self.message_manager.add_message(
+                            hazard_result, 
+                            category=MessageCategory.HAZARD_EFFECT
                         )
-                    if should_show:
-                        print(output)
-                
-                # Handle notification-worthy events directly
-                if self.player.health < 50:
-                    self.player.notification_manager.add_notification(
-                        "Your health is low! Find a way to heal.",
-                        category=MessageCategory.NOTIFICATION,
-                        priority=MessagePriority.HIGH
-                    )
 
-                # After player command, process hazards in current area
-                for obj in list(self.player.current_area.objects):
-                    if isinstance(obj, StaticHazard) and obj.active:
-                        hazard_result = obj.affect_area(self.player.current_area)
-                        if hazard_result:
-                            # Add hazard results to message system using the coordinator if available
-                            if hasattr(self, 'message_coordinator'):
-                                self.message_coordinator.process_system_message(
-                                    hazard_result, 
-                                    category=MessageCategory.HAZARD_EFFECT,
-                                    priority=MessagePriority.HIGH
-                                )
-                            else:
-                                # Fall back to direct message manager
-                                self.message_manager.add_message(
-                                    hazard_result, 
-                                    category=MessageCategory.HAZARD_EFFECT
-                                )
-
-                # Process all NPCs in the current area - first behaviors, then attacks
-                # Step 1: Process NPC behaviors (non-combat actions)
-                for npc in self.player.current_area.npcs:
-                    # Skip dead NPCs
-                    if hasattr(npc, 'is_alive') and not npc.is_alive:
-                        continue
-                        
-                    # Update behavior if the NPC has a behavior manager
-                    if hasattr(npc, 'update_behavior'):
-                        behavior_result = npc.update_behavior(self)
-                        if behavior_result:
-                            # Determine message category based on content
-                            text_lower = behavior_result.lower()
-                            
-                            # Check for notification-level messages first
-                            if any(keyword in text_lower for keyword in 
-                                  ["planting", "harvesting", "watering", "gives you", "gift", 
-                                   "offers you", "item", "defeated", "died", "discovered"]):
-                                category = MessageCategory.NOTIFICATION
-                                priority = MessagePriority.MEDIUM
-                            # Check for NPC gift-giving
-                            elif any(keyword in text_lower for keyword in 
-                                    ["gives", "offers", "presents", "hands over", "donates", "shares",
-                                     "distributes", "gifts", "bestows", "grants"]):
-                                category = MessageCategory.NPC_GIFT
-                                priority = MessagePriority.MEDIUM
-                            # Check for NPC hazard effects
-                            elif any(keyword in text_lower for keyword in 
-                                    ["affected by", "suffering from", "experiencing", "under the influence of",
-                                     "reacting to", "responding to", "hallucinating", "confused", "dizzy"]):
-                                category = MessageCategory.NPC_HAZARD
-                                priority = MessagePriority.MEDIUM
-                            # Check for NPC talking
-                            elif any(keyword in text_lower for keyword in 
-                                    ["talks", "speaks", "says", "whispers", "mutters", "shouts", "yells",
-                                     "screams", "laughs", "cries", "sings", "hums", "grunts", "sighs"]):
-                                category = MessageCategory.NPC_TALK
-                                priority = MessagePriority.LOW
-                            # Check for NPC interactions
-                            elif any(keyword in text_lower for keyword in 
-                                    ["picks up", "drops", "examines", "uses", "interacts with", "touches",
-                                     "pushes", "pulls", "opens", "closes", "activates", "deactivates"]):
-                                category = MessageCategory.NPC_INTERACTION
-                                priority = MessagePriority.LOW
-                            # Check for NPC movement
-                            elif any(keyword in text_lower for keyword in 
-                                    ["walks", "running", "moving", "pacing", "wandering", "strolling",
-                                     "jogging", "sprinting", "climbing", "crawling", "sneaking"]):
-                                category = MessageCategory.NPC_MOVEMENT
-                                priority = MessagePriority.LOW
-                            # Check for NPC idle behaviors
-                            elif any(keyword in text_lower for keyword in 
-                                    ["stands", "sitting", "waiting", "idle", "resting", "sleeping",
-                                     "leaning", "not moving", "stationary"]):
-                                category = MessageCategory.NPC_IDLE
-                                priority = MessagePriority.LOW
-                            # Default to NPC_MINOR for any other NPC messages
-                            else:
-                                category = MessageCategory.NPC_MINOR
-                                priority = MessagePriority.LOW
-                            
-                            # Add to message system using the coordinator if available
-                            if hasattr(self, 'message_coordinator'):
-                                self.message_coordinator.process_npc_message(behavior_result, npc=npc)
-                            else:
-                                # Fall back to direct message manager
-                                self.message_manager.add_message(
-                                    behavior_result, 
-                                    category=category,
-                                    priority=priority,
-                                    source=npc
-                                )
-                
-                # Step 2: Process NPC attacks and interactions with player
-                # Only process gang members that are alive
-                gang_members = [npc for npc in self.player.current_area.npcs 
-                               if isinstance(npc, GangMember) and npc.is_alive]
-                
-                # Limit the number of gang members that can interact with the player
-                if len(gang_members) > 5:
-                    gang_members = random.sample(gang_members, 5)
-                
-                # Process each gang member's interaction with the player
-                for member in gang_members:
-                    # Get the result of the member's interaction with the player
-                    interaction_result = member.attack_player(self.player)
-                    
-                    if interaction_result:
-                        # Determine message category based on content
-                        if "damage" in interaction_result.lower() or "attack" in interaction_result.lower():
-                            category = MessageCategory.COMBAT
-                            priority = MessagePriority.HIGH
-                        elif any(keyword in interaction_result.lower() for keyword in 
-                              ["gives you", "gift", "offers you", "insists you take", 
-                               "item", "defeated", "died"]):
-                            category = MessageCategory.NOTIFICATION
-                            priority = MessagePriority.MEDIUM
-                        else:
-                            category = MessageCategory.NPC_MINOR
-                            priority = MessagePriority.LOW
-                        
-                        # Add to message system using the coordinator if available
-                        if hasattr(self, 'message_coordinator'):
-                            should_show = self.message_coordinator.process_npc_message(
-                                interaction_result, 
-                                npc=member
-                            )
-                        else:
-                            # Fall back to direct message manager
-                            should_show, _ = self.message_manager.add_message(
-                                interaction_result, 
-                                category=category,
-                                priority=priority,
-                                source=member,
-                                target=self.player
-                            )
+    def _phase_npc_behaviors(self, context):
+        """Process NPC behaviors (non-combat actions) in the current area."""
+        # Process all NPCs in the current area - first behaviors, then attacks
+        # Step 1: Process NPC behaviors (non-combat actions)
+        # The scheduler only hands out living NPCs in the player's area
+        # Next behaviors are chosen for all of them together afterwards
+        pending_choices = []
+        for npc in self.activity_scheduler.npcs_to_tick():
+            # Update behavior if the NPC has a behavior manager
+            if hasattr(npc, 'update_behavior'):
+                behavior_result = npc.update_behavior(self, defer_choice=True)
+                if npc.behavior_manager.choice_pending:
+                    pending_choices.append(npc.behavior_manager)
+                if behavior_result:
+                    # Add to message system using the coordinator if available
+                    if hasattr(self, 'message_coordinator'):
+                        self.message_coordinator.process_npc_message(behavior_result, npc=npc)
+                    else:
+                        # Determine message category based on content (first matching rule wins)
+                        behavior_result = str(behavior_result)
+                        category = keyword_classifier.first_match(
+                            behavior_result, 'npc_behavior_category', MessageCategory.NPC_MINOR)
+                        priority = NPC_CATEGORY_PRIORITIES.get(category, MessagePriority.LOW)
                         
-                        # Combat messages should always be shown immediately
-                        if category == MessageCategory.COMBAT and should_show:
-                            print(interaction_result)
-                    
-                    # Check if player died and respawn
-                    death_message = self.player.check_death_and_respawn(self)
-                    if death_message:
-                        # Death messages are critical, always show and add to notifications
-                        if hasattr(self, 'message_coordinator'):
-                            self.message_coordinator.process_system_message(
-                                death_message, 
-                                category=MessageCategory.CRITICAL,
-                                priority=MessagePriority.CRITICAL
-                            )
-                        else:
-                            self.message_manager.add_message(
-                                death_message, 
-                                category=MessageCategory.CRITICAL,
-                                priority=MessagePriority.CRITICAL
-                            )
-                        print(death_message)
-                        break
-                
-                # Release any items that were being examined this turn
-                self._release_examined_items()
+                        # Fall back to direct message manager
+                        self.message_manager.add_message(
+                            behavior_result, 
+                            category=category,
+                            priority=priority,
+                            source=npc
+                        )
+
+        # Choose every NPC's next behavior in one batch
+        choose_next_behaviors(pending_choices, self)
+
+    def _phase_npc_attacks(self, context):
+        """Process NPC attacks and interactions with the player."""
+        # Step 2: Process NPC attacks and interactions with player
+        # Only process gang members that are alive
+        gang_members = [npc for npc in self.player.current_area.npcs 
+                       if isinstance(npc, GangMember) and npc.is_alive]
+        
+        # Limit the number of gang members that can interact with the player
+        if len(gang_members) > 5:
+            gang_members = rng.combat.sample(gang_members, 5)
+        
+        # Process each gang member's interaction with the player
+        for member in gang_members:
+            # Get the result of the member's interaction with the player
+            interaction_result = member.attack_player(self.player)
+            
+            if interaction_result:
+                # Determine message category based on content
+                category = keyword_classifier.first_match(
+                    str(interaction_result), 'npc_interaction_category', MessageCategory.NPC_MINOR)
+                priority = NPC_CATEGORY_PRIORITIES.get(category, MessagePriority.LOW)
                 
-                # Display NPC summary if using the coordinator
+                # Add to message system using the coordinator if available
                 if hasattr(self, 'message_coordinator'):
-                    # Get and display the NPC summary
-                    display_npc_summary(self)
-                
-                # Get message summary for this turn and display it
-                # This will show messages that should be displayed directly
-                # but haven't been shown yet (like NPC_MINOR messages)
-                message_summary = self.message_manager.get_message_summary(
-                    categories=[
-                        MessageCategory.NPC_MINOR,
-                        MessageCategory.HAZARD_EFFECT,
-                        MessageCategory.AMBIENT,
-                        MessageCategory.NPC_SUMMARY  # Add NPC_SUMMARY to displayed categories
-                    ]
-                )
+                    should_show = self.message_coordinator.process_npc_message(
+                        interaction_result, 
+                        npc=member
+                    )
+                else:
+                    # Fall back to direct message manager
+                    should_show, _ = self.message_manager.add_message(
+                        str(interaction_result), 
+                        category=category,
+                        priority=priority,
+                        source=member,
+                        target=self.player
+                    )
                 
-                if message_summary:
-                    print(message_summary)
-            else:
-                print("Unknown command. Type 'help' for a list of commands.")
+                # Combat messages should always be shown immediately
+                if category == MessageCategory.COMBAT and should_show:
+                    print(interaction_result)
+            
+            # Check if player died and respawn
+            death_message = self.player.check_death_and_respawn(self)
+            if death_message:
+                # Death messages are critical, always show and add to notifications
+                if hasattr(self, 'message_coordinator'):
+                    self.message_coordinator.process_system_message(
+                        death_message, 
+                        category=MessageCategory.CRITICAL,
+                        priority=MessagePriority.CRITICAL
+                    )
+                else:
+                    self.message_manager.add_message(
+                        death_message, 
+                        category=MessageCategory.CRITICAL,
+                        priority=MessagePriority.CRITICAL
+                    )
+                print(death_message)
+                break
+
+    def _phase_release_items(self, context):
+        """Release any items that were being examined this turn."""
+        self._release_examined_items()
+
+    def _phase_npc_summary(self, context):
+        """Display the NPC summary if using the coordinator."""
+        # Display NPC summary if using the coordinator
+        if hasattr(self, 'message_coordinator'):
+            # Get and display the NPC summary
+            display_npc_summary(self)
+
+    def _phase_message_summary(self, context):
+        """Display the messages of this turn that haven't been shown yet."""
+        # Get message summary for this turn and display it
+        # This will show messages that should be displayed directly
+        # but haven't been shown yet (like NPC_MINOR messages)
+        message_summary = self.message_manager.get_message_summary(
+            categories=[
+                MessageCategory.NPC_MINOR,
+                MessageCategory.HAZARD_EFFECT,
+                MessageCategory.AMBIENT,
+                MessageCategory.NPC_SUMMARY  # Add NPC_SUMMARY to displayed categories
+            ]
+        )
+        
+        if message_summary:
+            print(message_summary)
+
+    def _phase_autosave(self, context):
+        """Autosave (a delta of what changed) every few turns, if turned on."""
+        self.snapshot_manager.on_turn_end(self.message_manager.current_turn)
+
+    def _record_phase(self, phase_name, phase_start):
+        """Record how long work outside the turn pipeline took (like start_turn) and return the end time."""
+        phase_end = time.perf_counter()
+        self.turn_pipeline.record(phase_name, phase_end - phase_start, profiler=self.turn_profiler)
+        return phase_end
 
     def cmd_move(self, args):
         if not args:
@@ -1946,11 +2073,8 @@ class Game:
 
     def _release_examined_items(self):
         """Release all items that were being examined this turn."""
-        if hasattr(self, '_items_to_release'):
-            for item in self._items_to_release:
-                if hasattr(item, '_being_examined_by'):
-                    delattr(item, '_being_examined_by')
-            self._items_to_release = []
+        from npc_behavior import behavior_settings
+        behavior_settings.release_examined_items()
     
     def cmd_teleport(self, args):
         if not args:
@@ -1988,9 +2112,9 @@ class Game:
             
         item_name = " ".join(args)
         # Find item in current area by name
-        for item in self.player.current_area.items:
-            if item.name.lower() == item_name.lower():
-                return self.player.pick_up(item)
+        item = self.player.current_area.find_item(item_name)
+        if item:
+            return self.player.pick_up(item)
         return f"No such item here: {item_name}"
 
     def cmd_drop(self, args):
@@ -2003,6 +2127,182 @@ class Game:
                 return self.player.drop(item)
         return f"You don't have that item: {item_name}"
 
+    def cmd_save(self, args):
+        """Save the game.
+
+        Usage:
+          save - Save to the autosave slot
+          save [name] - Save under a name
+          save [name] full - Write a full save instead of a delta
+
+        The first save under a name writes everything; saving again under the
+        same name only writes what changed since the last save.
+        """
+        full = bool(args) and args[-1].lower() == 'full'
+        if full:
+            args = args[:-1]
+        name = " ".join(args) if args else None
+        try:
+            path = self.snapshot_manager.save(name, full=full)
+        except (OSError, SnapshotError) as error:
+            return f"Could not save the game: {error}"
+        _, written, reachable, size, seconds = self.snapshot_manager.last_save_stats
+        return (f"Game saved to {path} ({written} of {reachable} objects written, "
+                f"{size} bytes, {seconds * 1000:.1f} ms).")
+
+    def cmd_load(self, args):
+        """Load a saved game.
+
+        Usage:
+          load - Load the autosave slot
+          load [name] - Load a named save (the full save plus every delta after it)
+        """
+        name = " ".join(args) if args else None
+        started = time.perf_counter()
+        try:
+            turn = self.snapshot_manager.load(name)
+        except (OSError, SnapshotError) as error:
+            return f"Could not load the game: {error}"
+        seconds = time.perf_counter() - started
+        # Described without the message system, which would draw from the
+        # restored random streams and make the loaded game go differently
+        return (f"Game loaded (turn {turn}, {seconds * 1000:.1f} ms).\n"
+                f"{self.player.current_area.describe()}")
+
+    def cmd_autosave(self, args):
+        """Turn autosaving on or off.
+
+        Usage:
+          autosave - Show the autosave setting
+          autosave [turns] - Autosave every [turns] turns
+          autosave off - Stop autosaving
+        """
+        manager = self.snapshot_manager
+        if not args:
+            if manager.autosave_interval:
+                return f"Autosaving every {manager.autosave_interval} turns to '{manager.autosave_name}'."
+            return "Autosave is off."
+        if args[0].lower() in ('off', '0'):
+            manager.autosave_interval = 0
+            return "Autosave turned off."
+        try:
+            interval = int(args[0])
+        except ValueError:
+            return "Usage: autosave [turns|off]"
+        if interval < 1:
+            return "Autosave interval must be at least 1 turn."
+        manager.autosave_interval = interval
+        return f"Autosaving every {interval} turns."
+
+    def cmd_stats(self, args):
+        """Show how long each phase of the turn takes.
+
+        Usage:
+          stats - Show per-phase timings (calls, mean/max ms, share of turn time,
+                  net memory blocks allocated per call)
+          stats reset - Start collecting timings from scratch
+        """
+        pipeline = self.turn_pipeline
+        if args and args[0].lower() == 'reset':
+            pipeline.reset_stats()
+            return "Turn phase timings reset."
+        return "Turn phase timings:\n" + pipeline.format_stats()
+
+    def cmd_phases(self, args):
+        """List, disable, enable or reorder the phases of a turn.
+
+        Usage:
+          phases - List the phases in the order they run
+          phases disable [phase] - Skip a phase every turn
+          phases enable [phase] - Run a skipped phase again
+          phases move [phase] before [other] - Run a phase right before another one
+          phases move [phase] after [other] - Run a phase right after another one
+
+        Examples:
+          phases disable npc_summary
+          phases move hazards after npc_behaviors
+        """
+        pipeline = self.turn_pipeline
+        if not args:
+            return "Turn phases (in order):\n" + pipeline.format_phases()
+
+        action = args[0].lower()
+        if action in ('disable', 'enable', 'off', 'on') and len(args) == 2:
+            error = pipeline.set_enabled(args[1], action in ('enable', 'on'))
+            if error:
+                return error
+            return f"Phase '{args[1]}' {'enabled' if action in ('enable', 'on') else 'disabled'}."
+
+        if action == 'move' and len(args) == 4 and args[2].lower() in ('before', 'after'):
+            name, where, other = args[1], args[2].lower(), args[3]
+            if pipeline.get_phase(name) is None or pipeline.get_phase(other) is None:
+                return f"Unknown phase. Phases: {', '.join(phase.name for phase in pipeline.phases)}"
+            if where == 'before':
+                pipeline.move(name, before=other)
+            else:
+                pipeline.move(name, after=other)
+            return f"Phase '{name}' now runs {where} '{other}'."
+
+        return "Usage: phases [disable|enable <phase>] [move <phase> before|after <phase>]"
+
+    def cmd_trace(self, args):
+        """Show or change what the trace channel records (see trace_channel.py).
+
+        Usage:
+          trace - Show the level, the sinks and the most recent records
+          trace [debug|info|warning|error|off] - Record this level and above
+          trace recent [n] - Show the last n records (default 10)
+          trace file [path] - Also write records to a file ("trace file off" stops)
+          trace messages [on|off] - Show records as debug messages in the game
+        """
+        def format_records(records):
+            return "\n".join(record.format() for record in records) if records else "(no records)"
+
+        if not args:
+            sinks = ", ".join(sink.describe() for sink in tracer.sinks) or "none"
+            return (f"Trace level: {tracer.level.name.lower()}\nSinks: {sinks}\n"
+                    f"Recent records:\n{format_records(tracer.recent(5))}")
+
+        action = args[0].lower()
+        if action.upper() in TraceLevel.__members__ and len(args) == 1:
+            tracer.set_level(TraceLevel[action.upper()])
+            return f"Tracing {action} and up." if action != 'off' else "Tracing off."
+
+        if action == 'recent':
+            count = int(args[1]) if len(args) > 1 and args[1].isdigit() else 10
+            return format_records(tracer.recent(count))
+
+        if action == 'file' and len(args) > 1:
+            path = " ".join(args[1:])
+            if path.lower() == 'off':
+                tracer.remove_sinks(FileSink)
+                return "No longer writing trace records to a file."
+            tracer.set_sink(FileSink(path))
+            return f"Writing trace records to {path}."
+
+        if action == 'messages' and len(args) == 2 and args[1].lower() in ('on', 'off'):
+            enabled = args[1].lower() == 'on'
+            self.message_manager.set_debug_mode(enabled)
+            return f"Trace records {'will' if enabled else 'will no longer'} be shown as debug messages."
+
+        return "Usage: trace [debug|info|warning|error|off] [recent <n>] [file <path>|off] [messages on|off]"
+
+    def cmd_message_stats(self, args):
+        """Show what the message coordinator routed and dropped, per message type.
+
+        Usage:
+          message-stats - Routed, duplicate, turn limit, type cap and notified counts per type
+          message-stats reset - Start counting again
+        """
+        if not self.message_coordinator:
+            return "The message coordinator is not running."
+        if args and args[0].lower() == 'reset':
+            self.message_coordinator.reset_route_stats()
+            return "Message routing counters reset."
+        if args:
+            return "Usage: message-stats [reset]"
+        return self.message_coordinator.format_route_stats()
+
     def cmd_quit(self, args):
         self.is_running = False
         return "Thanks for playing! Goodbye."
@@ -2172,10 +2472,7 @@ class Game:
         soil = None
         if soil_name:
             # Look for specific soil
-            for obj in self.player.current_area.objects:
-                if isinstance(obj, Soil) and obj.name.lower() == soil_name.lower():
-                    soil = obj
-                    break
+            soil = self.player.current_area.find_object(soil_name, Soil)
             if not soil:
                 return f"There is no soil called '{soil_name}' in this area."
         else:
@@ -2249,10 +2546,10 @@ class Game:
         storage_name = " ".join(args)
         
         # Find storage object in current area
-        for obj in self.player.current_area.objects:
-            if isinstance(obj, Storage) and obj.name.lower() == storage_name.lower():
-                success, message = obj.open()
-                return message
+        obj = self.player.current_area.find_object(storage_name, Storage)
+        if obj:
+            success, message = obj.open()
+            return message
         
         return f"There is no storage named '{storage_name}' here."
     
@@ -2264,10 +2561,10 @@ class Game:
         storage_name = " ".join(args)
         
         # Find storage object in current area
-        for obj in self.player.current_area.objects:
-            if isinstance(obj, Storage) and obj.name.lower() == storage_name.lower():
-                success, message = obj.close()
-                return message
+        obj = self.player.current_area.find_object(storage_name, Storage)
+        if obj:
+            success, message = obj.close()
+            return message
         
         return f"There is no storage named '{storage_name}' here."
     
@@ -2281,17 +2578,17 @@ class Game:
         storage_name = " ".join(args[from_index+1:])
         
         # Find storage object in current area
-        for obj in self.player.current_area.objects:
-            if isinstance(obj, Storage) and obj.name.lower() == storage_name.lower():
-                if not obj.is_open:
-                    return f"The {obj.name} is closed. You need to open it first."
+        obj = self.player.current_area.find_object(storage_name, Storage)
+        if obj:
+            if not obj.is_open:
+                return f"The {obj.name} is closed. You need to open it first."
                 
-                success, item = obj.remove_item(item_name)
-                if success:
-                    self.player.inventory.append(item)
-                    return f"You take the {item.name} from the {obj.name}."
-                else:
-                    return f"There is no {item_name} in the {obj.name}."
+            success, item = obj.remove_item(item_name)
+            if success:
+                self.player.inventory.append(item)
+                return f"You take the {item.name} from the {obj.name}."
+            else:
+                return f"There is no {item_name} in the {obj.name}."
         
         return f"There is no storage named '{storage_name}' here."
     
@@ -2315,14 +2612,14 @@ class Game:
             return f"You don't have a {item_name} in your inventory."
         
         # Find storage object in current area
-        for obj in self.player.current_area.objects:
-            if isinstance(obj, Storage) and obj.name.lower() == storage_name.lower():
-                if not obj.is_open:
-                    return f"The {obj.name} is closed. You need to open it first."
+        obj = self.player.current_area.find_object(storage_name, Storage)
+        if obj:
+            if not obj.is_open:
+                return f"The {obj.name} is closed. You need to open it first."
                 
-                self.player.inventory.remove(item)
-                success, message = obj.add_item(item)
-                return message
+            self.player.inventory.remove(item)
+            success, message = obj.add_item(item)
+            return message
         
         return f"There is no storage named '{storage_name}' here."
     
@@ -2335,14 +2632,14 @@ class Game:
         storage_name = " ".join(args[in_index+1:])
         
         # Find storage object in current area
-        for obj in self.player.current_area.objects:
-            if isinstance(obj, Storage) and obj.name.lower() == storage_name.lower():
-                if not obj.is_open:
-                    return f"The {obj.name} is closed. You need to open it first."
+        obj = self.player.current_area.find_object(storage_name, Storage)
+        if obj:
+            if not obj.is_open:
+                return f"The {obj.name} is closed. You need to open it first."
                 
-                return obj.list_items()
+            return obj.list_items()
         
-            return f"There is no storage named '{storage_name}' here."
+        return f"There is no storage named '{storage_name}' here."
         
         
             
@@ -2402,12 +2699,9 @@ class Game:
             arg_str = " ".join(args)
             
             # Check if it's a soil name first
-            soil_found = False
-            for obj in self.player.current_area.objects:
-                if isinstance(obj, Soil) and obj.name.lower() == arg_str.lower():
-                    soil_name = arg_str
-                    soil_found = True
-                    break
+            soil_found = self.player.current_area.find_object(arg_str, Soil) is not None
+            if soil_found:
+                soil_name = arg_str
             
             # If not a soil, assume it's a plant name
             if not soil_found:
@@ -2955,5 +3249,9 @@ class NotificationManager:
         return self.unread_count
 
 if __name__ == '__main__':
-    game = Game()
+    try:
+        game = Game()
+    except WorldError as e:
+        print(e)
+        sys.exit(1)
     game.game_loop()
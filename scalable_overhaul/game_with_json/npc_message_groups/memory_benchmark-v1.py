@@ -0,0 +1,232 @@
+"""
+Memory Benchmark for Root Access
+
+This module measures how much memory the game's most numerous objects take,
+so changes to their layout (like __slots__) can be checked with real numbers.
+It builds a normal Game, then adds a crowd of gang members the same way the
+headless simulator does and reports the bytes each one added. Items, hazard
+effects, messages and notifications are measured the same way, by creating
+many of them and dividing.
+
+Every object is measured twice: as the game's slotted class, and as a copy of
+that class (and its slotted base classes) that keeps its attributes in a
+__dict__ instead, which is how they were laid out before. The copies have the
+same methods, so both columns come from the same code on the same Python.
+
+Key Components:
+--------------
+1. dict_backed: A copy of a slotted class that uses a __dict__ instead
+2. measure_allocation: Bytes allocated per object while a factory builds N objects
+3. measure_npcs: Bytes per gang member added to a real game (with its behavior manager);
+   measure_npcs_isolated runs it in a fresh interpreter
+4. measure_objects: Bytes per Item, Effect, Message and Notification
+5. format_report: The results as a table, __dict__ and __slots__ side by side
+
+GangMember includes its name string, inventory list, its BehaviorManager and
+starting IdleBehavior, its own knife and USB stick (see item_prototypes.py;
+these stay slotted in both columns), and the area's index entries.
+
+Usage:
+-----
+python memory_benchmark.py                  # 10000 of each object
+python memory_benchmark.py --count 50000    # Bigger crowd
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import multiprocessing
+import sys
+import tracemalloc
+from types import CellType, FunctionType
+
+
+_DICT_BACKED = {}  # Slotted class -> its dict-backed copy
+
+
+def _rebind(value, cls, copy):
+    """Point a method's super() (its __class__ cell) at the copy instead of the original class."""
+    if isinstance(value, FunctionType):
+        code = value.__code__
+        if '__class__' not in code.co_freevars:
+            return value
+        closure = tuple(CellType(copy) if name == '__class__' else cell
+                        for name, cell in zip(code.co_freevars, value.__closure__))
+        function = FunctionType(code, value.__globals__, value.__name__, value.__defaults__, closure)
+        function.__kwdefaults__ = value.__kwdefaults__
+        function.__qualname__ = value.__qualname__
+        return function
+    if isinstance(value, property):
+        return property(*(_rebind(f, cls, copy) if f else None for f in (value.fget, value.fset, value.fdel)),
+                        value.__doc__)
+    if isinstance(value, (staticmethod, classmethod)):
+        return type(value)(_rebind(value.__func__, cls, copy))
+    return value
+
+
+def dict_backed(cls):
+    """
+    Get a copy of a class that keeps its attributes in a __dict__ instead of __slots__.
+
+    Slotted base classes are copied too (an unslotted subclass of a slotted
+    class would still store those attributes in slots). Classes without slots
+    anywhere are returned as they are.
+    """
+    if not any('__slots__' in klass.__dict__ for klass in cls.__mro__):
+        return cls
+    copy = _DICT_BACKED.get(cls)
+    if copy is not None:
+        return copy
+    slots = cls.__dict__.get('__slots__', ())
+    slots = (slots,) if isinstance(slots, str) else tuple(slots)
+    namespace = {name: value for name, value in cls.__dict__.items()
+                 if name not in slots and name not in ('__slots__', '__dict__', '__weakref__')}
+    bases = tuple(dict_backed(base) for base in cls.__bases__)
+    copy = _DICT_BACKED[cls] = type(cls)(cls.__name__, bases, namespace)
+    copy.__qualname__ = f"{cls.__qualname__} (__dict__)"
+    for name, value in namespace.items():
+        rebound = _rebind(value, cls, copy)
+        if rebound is not value:
+            setattr(copy, name, rebound)
+    return copy
+
+
+@contextlib.contextmanager
+def _using_dict_backed(*classes):
+    """Swap classes (and their slotted bases) for dict-backed copies in every loaded module."""
+    swaps = {}
+    for cls in classes:
+        for klass in cls.__mro__:
+            if klass not in swaps and dict_backed(klass) is not klass:
+                swaps[klass] = dict_backed(klass)
+    patched = []
+    for module in list(sys.modules.values()):
+        namespace = getattr(module, '__dict__', None)
+        if not namespace:
+            continue
+        for name, value in list(namespace.items()):
+            if isinstance(value, type) and value in swaps:
+                patched.append((namespace, name, value))
+                namespace[name] = swaps[value]
+    try:
+        yield
+    finally:
+        for namespace, name, value in patched:
+            namespace[name] = value
+
+
+def measure_allocation(factory, count):
+    """
+    Build count objects with factory(i) and return the bytes allocated per object.
+
+    The objects are kept alive until the measurement is taken, then dropped.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        objects = [factory(i) for i in range(count)]
+        gc.collect()
+        end, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # The list holding them isn't part of the objects
+    list_bytes = 8 * len(objects)
+    del objects
+    return (end - start - list_bytes) / count
+
+
+def measure_npcs(count, use_dict=False):
+    """Bytes per gang member added to the Warehouse of a fresh game (dict-backed members with use_dict)."""
+    from main import Game
+    from headless_sim import populate_gang
+    from npc_behavior import GangMember, BehaviorManager, IdleBehavior
+
+    game = Game()
+    # The members' own class is passed in (the game's members stay GangMembers),
+    # the behavior objects they make for themselves are swapped in their module
+    member_class = dict_backed(GangMember) if use_dict else GangMember
+    swap = _using_dict_backed(BehaviorManager, IdleBehavior) if use_dict else contextlib.nullcontext()
+    with swap:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            start, _ = tracemalloc.get_traced_memory()
+            added = populate_gang(game, count=count, member_class=member_class)
+            gc.collect()
+            end, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    if not added:
+        return 0.0
+    # Includes the game's npcs dict and the area's NPC list growing to hold them
+    return (end - start) / added
+
+
+def _quiet_measure_npcs(count, use_dict):
+    # Building the game prints its setup messages; they're not part of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        return measure_npcs(count, use_dict)
+
+
+def measure_npcs_isolated(count, use_dict=False):
+    """
+    measure_npcs in a fresh interpreter.
+
+    Game-wide tables (the interned strings most of all) grow in big steps, so
+    in a process that has already built a game the same crowd can measure
+    100 bytes per member more or less. A fresh process starts from the same
+    state every time.
+    """
+    with multiprocessing.get_context('spawn').Pool(1) as pool:
+        return pool.apply(_quiet_measure_npcs, (count, use_dict))
+
+
+def measure_objects(count):
+    """Bytes per Item, Effect, Message and Notification: {name: (dict-backed, slotted)}."""
+    from main import Item
+    from npc_behavior import Effect
+    from message_system import Message, MessageCategory
+    from notification_system import Notification
+
+    factories = {
+        # Worlds have many copies of a few kinds of item
+        "Item": (Item, lambda cls, i: cls(f"Item {i % 50}", "A thing lying around.", 5)),
+        "Effect": (Effect, lambda cls, i: cls("hallucinations", "Causes hallucinations", duration=3)),
+        "Message": (Message, lambda cls, i: cls(f"Message {i}", MessageCategory.NPC_MINOR)),
+        "Notification": (Notification, lambda cls, i: cls(f"Notification {i}", category="npc")),
+    }
+    results = {}
+    for name, (cls, factory) in factories.items():
+        results[name] = tuple(
+            measure_allocation(lambda i, variant=variant: factory(variant, i), count)
+            for variant in (dict_backed(cls), cls))
+    return results
+
+
+def format_report(results, count):
+    """results: {name: (dict-backed bytes, slotted bytes)}"""
+    lines = [f"Memory per object ({count} of each):",
+             f"{'Object':<16}{'__dict__':>10}{'__slots__':>11}{'Saved':>8}"]
+    for name, (dict_size, slots_size) in results.items():
+        saved = 1 - slots_size / dict_size if dict_size else 0.0
+        lines.append(f"{name:<16}{dict_size:>10.0f}{slots_size:>11.0f}{saved:>8.0%}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure how much memory Root Access objects take.")
+    parser.add_argument('--count', type=int, default=10000, help="Objects of each kind to create")
+    args = parser.parse_args(argv)
+
+    # Building the game prints its setup messages; they're not part of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = {"GangMember": (measure_npcs_isolated(args.count, use_dict=True),
+                                  measure_npcs_isolated(args.count))}
+        results.update(measure_objects(args.count))
+    print(format_report(results, args.count))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,284 @@
+"""
+Message Templates for Root Access
+
+Reaction phrases and event texts used to be plain strings that were passed to
+str.format() every time they were shown, often inside try/except because a
+phrase from npc_reactions.json could reference a placeholder the caller didn't
+provide. The JSON also had to list every phrase twice, once for one NPC
+("sees pink elephants") and once for a group ("see pink elephants").
+
+This module parses every phrase once into a MessageTemplate:
+
+- Placeholders are checked against the fields the caller provides when the
+  phrase is loaded, so a broken phrase is reported (and skipped) at load time
+  instead of failing or leaking "{...}" into the game text later
+- Singular and plural text come from one template: {singular|plural}
+- Each template keeps a ready-made string for both forms, so phrases without
+  placeholders (most of them) render with no formatting at all
+- Phrases with placeholders are compiled into a small function built around an
+  f-string, which renders about twice as fast as parsing the phrase with
+  str.format() on every call
+
+Key Components:
+--------------
+1. TemplateError: Raised for phrases that don't parse or use unknown placeholders
+2. MessageTemplate: One compiled phrase with its singular and plural forms
+3. compile_templates: Compiles a list of phrases, reporting and skipping broken ones
+4. TemplateBank: Compiled templates for phrase bank categories, cached per category
+5. template_bank: The shared bank built on the shared phrase bank
+
+Template Syntax:
+---------------
+{field}            A value passed to render(), e.g. {name}
+{field.attribute}  An attribute of a value, e.g. {hazard.name}
+{} / {0}           Positional placeholders, mapped to the template's fields in order
+{one|many}         Singular/plural alternatives, e.g. "{sees|see} pink elephants"
+{{ and }}          Literal braces
+
+    template = MessageTemplate("{pulls|pull} out {their phone|their phones}.")
+    template.render()             # "pulls out their phone."
+    template.render(plural=True)  # "pull out their phones."
+"""
+
+import re
+import string
+import keyword
+
+from phrase_bank import phrase_bank
+from trace_channel import tracer
+
+
+class TemplateError(ValueError):
+    """A phrase could not be compiled into a template."""
+
+
+_formatter = string.Formatter()
+
+# {one|many} alternatives (but not {{escaped}} braces). They are swapped for
+# numbered markers before parsing, so their text can contain ! and : freely.
+_ALTERNATIVES = re.compile(r"(?<!\{)\{([^{}]*\|[^{}]*)\}(?!\})")
+_MARKER = "\x00"
+
+# Characters a format spec can't contain once it is moved into generated code
+_UNSAFE_SPEC = set("{}'\"\\\n")
+
+
+class MessageTemplate:
+    """A phrase parsed once into ready-to-use singular and plural forms."""
+    __slots__ = ('source', 'fields', 'singular', 'plural', 'needs_values',
+                 'render_singular', 'render_plural')
+
+    def __init__(self, source, fields=None):
+        """
+        Args:
+            source: The phrase text
+            fields: Placeholder names the caller will provide (None = allow any name)
+        """
+        self.source = source
+        self.fields = tuple(fields) if fields is not None else None
+        singular, plural, used = self._compile(source)
+        self.needs_values = bool(used)
+        if self.needs_values:
+            # Format strings with only validated placeholders left in them
+            self.singular = self._format_string(singular)
+            self.plural = self._format_string(plural)
+            if self.fields is not None:
+                self.render_singular = self._build_renderer(singular, used)
+                self.render_plural = self._build_renderer(plural, used)
+            else:
+                # Any placeholder name is allowed, so there's no fixed signature to compile
+                self.render_singular = lambda **values: self.singular.format_map(values)
+                self.render_plural = lambda **values: self.plural.format_map(values)
+        else:
+            # Nothing to fill in: keep the finished text (with {{ }} unescaped)
+            self.singular = "".join(singular)
+            self.plural = "".join(plural)
+            self.render_singular = lambda **values: self.singular
+            self.render_plural = lambda **values: self.plural
+
+    def _compile(self, source):
+        """
+        Split the phrase into singular/plural parts and check its placeholders.
+
+        Returns:
+            (singular parts, plural parts, used field names). Each part is either
+            literal text or a (field, conversion, spec) placeholder.
+        """
+        alternatives = []
+
+        def mark(match):
+            alternatives.append(match.group(1).partition("|"))
+            return "{" + _MARKER + str(len(alternatives) - 1) + "}"
+
+        try:
+            parsed = list(_formatter.parse(_ALTERNATIVES.sub(mark, source)))
+        except ValueError as e:
+            raise TemplateError(f"Can't parse phrase {source!r}: {e}")
+
+        singular = []
+        plural = []
+        used = set()
+        position = 0
+        for literal, field, spec, conversion in parsed:
+            if literal:
+                singular.append(literal)
+                plural.append(literal)
+            if field is None:
+                continue
+
+            if field.startswith(_MARKER):
+                # Singular/plural alternatives
+                one, _, many = alternatives[int(field[1:])]
+                singular.append(one)
+                plural.append(many)
+                continue
+
+            # Positional placeholders map to the declared fields in order
+            if field == "" or field.isdigit():
+                index = position if field == "" else int(field)
+                position += 1
+                if self.fields is None or index >= len(self.fields):
+                    raise TemplateError(f"Phrase {source!r} has more placeholders than values")
+                field = self.fields[index]
+
+            if "[" in field:
+                raise TemplateError(f"Phrase {source!r} uses an index placeholder {{{field}}}")
+            names = field.split(".")
+            if not all(name.isidentifier() and not keyword.iskeyword(name)
+                       and not name.startswith("_") for name in names):
+                raise TemplateError(f"Phrase {source!r} has a broken placeholder {{{field}}}")
+            if self.fields is not None and names[0] not in self.fields:
+                raise TemplateError(f"Phrase {source!r} uses unknown placeholder {{{field}}}")
+            if conversion not in (None, "r", "s", "a") or _UNSAFE_SPEC.intersection(spec or ""):
+                raise TemplateError(f"Phrase {source!r} has an unsupported format in {{{field}}}")
+            used.add(names[0])
+
+            placeholder = (field, conversion, spec)
+            singular.append(placeholder)
+            plural.append(placeholder)
+
+        return singular, plural, used
+
+    @staticmethod
+    def _format_string(parts):
+        """Join compiled parts back into a str.format() string."""
+        text = []
+        for part in parts:
+            if isinstance(part, str):
+                text.append(part.replace("{", "{{").replace("}", "}}"))
+                continue
+            field, conversion, spec = part
+            text.append("{" + field + ("!" + conversion if conversion else "") + (":" + spec if spec else "") + "}")
+        return "".join(text)
+
+    @staticmethod
+    def _build_renderer(parts, used):
+        """
+        Build a function that renders the parts with one f-string.
+
+        Literal text goes in as Python string literals (repr), placeholders were
+        checked to be plain attribute paths, so the generated code can't run
+        anything the phrase didn't ask for. Values the phrase doesn't use are
+        accepted and ignored.
+        """
+        pieces = []
+        for part in parts:
+            if isinstance(part, str):
+                pieces.append(repr(part))
+                continue
+            field, conversion, spec = part
+            pieces.append("f'{" + field + ("!" + conversion if conversion else "") + (":" + spec if spec else "") + "}'")
+        code = "lambda *, " + ", ".join(sorted(used)) + ", **_unused: " + " ".join(pieces)
+        return eval(code, {"__builtins__": {}})
+
+    def render(self, plural=False, **values):
+        """
+        Render the singular (or plural) form with the given placeholder values.
+
+        Hot paths can call template.render_singular(**values) (or
+        render_plural) directly and skip this extra call.
+        """
+        if not self.needs_values:
+            return self.plural if plural else self.singular
+        if plural:
+            return self.render_plural(**values)
+        return self.render_singular(**values)
+
+    def __repr__(self):
+        return f"MessageTemplate({self.source!r})"
+
+
+def compile_templates(phrases, fields=None, label="phrases"):
+    """
+    Compile a list of phrases. Broken phrases are reported once and left out.
+
+    Returns:
+        A list of MessageTemplate
+    """
+    templates = []
+    for phrase in phrases:
+        try:
+            templates.append(MessageTemplate(phrase, fields))
+        except TemplateError as e:
+            tracer.warning("templates", "phrase_skipped", label=label, error=e)
+    return templates
+
+
+class TemplateBank:
+    """Compiled templates for phrase bank categories, compiled on first use and cached."""
+
+    def __init__(self, phrases):
+        self.phrases = phrases  # PhraseBank the phrases come from
+        self._cache = {}  # (group, key, fields, default) -> list of MessageTemplate
+
+    def templates(self, group, key=None, default=(), fields=()):
+        """
+        Get the compiled templates of a category.
+
+        Args:
+            group, key: The phrase bank category
+            default: Phrases to use when the category is missing or empty
+            fields: Placeholder names the caller provides when rendering
+
+        Returns:
+            A non-empty list of MessageTemplate (the compiled defaults if needed)
+        """
+        # Call sites can have different defaults for the same category
+        cache_key = (group, key, fields, tuple(default))
+        templates = self._cache.get(cache_key)
+        if templates is None:
+            label = group if key is None else f"{group}/{key}"
+            templates = compile_templates(self.phrases.phrases(group, key, ()), fields, label)
+            if not templates:
+                templates = compile_templates(default, fields, label)
+            self._cache[cache_key] = templates
+        return templates
+
+    def inflected(self, group, plural, default=(), fields=()):
+        """
+        Get the templates for a category that has singular and plural forms.
+
+        Uses the combined "reactions" list ({one|many} templates) if the
+        category has one, otherwise the older separate "singular"/"plural"
+        lists (reaction packs written before templates existed).
+        """
+        if self.phrases.has(group, "reactions"):
+            return self.templates(group, "reactions", default, fields)
+        return self.templates(group, "plural" if plural else "singular", default, fields)
+
+    def render_choice(self, generator, group, key=None, default=(), fields=(), plural=False, **values):
+        """Pick a random template of a category (with the given random stream) and render it."""
+        template = generator.choice(self.templates(group, key, default, fields))
+        return template.render(plural, **values)
+
+    def render_inflected(self, generator, group, plural=False, default=(), fields=(), **values):
+        """Pick a random singular/plural template of a category and render it."""
+        template = generator.choice(self.inflected(group, plural, default, fields))
+        return template.render(plural, **values)
+
+    def clear(self):
+        self._cache.clear()
+
+
+# Shared template bank on top of the shared phrase bank
+template_bank = TemplateBank(phrase_bank)
@@ -30,8 +30,9 @@ See MESSAGE_SYSTEM_README.md for more information on customizing the system.
 
 import enum
 import time
-import random
 from collections import defaultdict, deque
+from keyword_classifier import keyword_classifier
+from rng_streams import rng
 
 class MessageCategory(enum.Enum):
     """Categories for game messages."""
@@ -71,6 +72,8 @@ class MessagePriority(enum.Enum):
 
 class Message:
     """Represents a single game message."""
+    __slots__ = ('text', 'category', 'priority', 'source', 'target', 'timestamp', 'metadata', 'shown')
+
     def __init__(self, text, category, priority=MessagePriority.MEDIUM, 
                  source=None, target=None, timestamp=None, metadata=None):
         self.text = text
@@ -222,6 +225,23 @@ class MessageManager:
             ]
         }
         
+        # Order in which NPC categories are checked (first match wins)
+        self.npc_category_order = [
+            MessageCategory.NPC_GIFT,
+            MessageCategory.NPC_HAZARD,
+            MessageCategory.NPC_TALK,
+            MessageCategory.NPC_INTERACTION,
+            MessageCategory.NPC_MOVEMENT,
+            MessageCategory.NPC_IDLE,
+        ]
+        
+        # Compile the keyword tables into the shared classifier. The extra "npc"
+        # rule marks messages that are about an NPC at all.
+        keyword_classifier.register_table(
+            'message_category',
+            list(self.category_keywords.items()) + [("npc", ["member", "npc"])]
+        )
+        
         # Cooldown periods (in turns) for each category to prevent spam
         self.category_cooldowns = {
             # NPC message categories with different cooldowns
@@ -267,56 +287,30 @@ class MessageManager:
     
     def _detect_category(self, text):
         """Automatically detect the category of a message based on its content."""
-        text_lower = text.lower()
+        # One pass over the text finds every category whose keywords appear in it
+        matched = keyword_classifier.matches(text, 'message_category')
         
         # First check for combat messages (highest priority)
-        if any(keyword in text_lower for keyword in self.category_keywords[MessageCategory.COMBAT]):
+        if MessageCategory.COMBAT in matched:
             return MessageCategory.COMBAT
         
         # Then check for notification messages (second highest priority)
-        if any(keyword in text_lower for keyword in self.category_keywords[MessageCategory.NOTIFICATION]):
+        if MessageCategory.NOTIFICATION in matched:
             return MessageCategory.NOTIFICATION
         
         # Check for NPC-specific categories
-        if "member" in text_lower or "npc" in text_lower:
-            # Check for NPC gift-giving
-            if any(keyword in text_lower for keyword in self.category_keywords[MessageCategory.NPC_GIFT]):
-                return MessageCategory.NPC_GIFT
-            
-            # Check for NPC hazard effects
-            if any(keyword in text_lower for keyword in self.category_keywords[MessageCategory.NPC_HAZARD]):
-                return MessageCategory.NPC_HAZARD
-            
-            # Check for NPC talking
-            if any(keyword in text_lower for keyword in self.category_keywords[MessageCategory.NPC_TALK]):
-                return MessageCategory.NPC_TALK
-            
-            # Check for NPC interactions
-            if any(keyword in text_lower for keyword in self.category_keywords[MessageCategory.NPC_INTERACTION]):
-                return MessageCategory.NPC_INTERACTION
-            
-            # Check for NPC movement
-            if any(keyword in text_lower for keyword in self.category_keywords[MessageCategory.NPC_MOVEMENT]):
-                return MessageCategory.NPC_MOVEMENT
-            
-            # Check for NPC idle behaviors
-            if any(keyword in text_lower for keyword in self.category_keywords[MessageCategory.NPC_IDLE]):
-                return MessageCategory.NPC_IDLE
+        if "npc" in matched:
+            for category in self.npc_category_order:
+                if category in matched:
+                    return category
             
             # If it's an NPC message but doesn't match any specific category, use NPC_MINOR
             return MessageCategory.NPC_MINOR
         
-        # Check for hazard effects
-        if any(keyword in text_lower for keyword in self.category_keywords[MessageCategory.HAZARD_EFFECT]):
-            return MessageCategory.HAZARD_EFFECT
-        
-        # Check for ambient messages
-        if any(keyword in text_lower for keyword in self.category_keywords[MessageCategory.AMBIENT]):
-            return MessageCategory.AMBIENT
-        
-        # Check for trivial messages
-        if any(keyword in text_lower for keyword in self.category_keywords[MessageCategory.TRIVIAL]):
-            return MessageCategory.TRIVIAL
+        # Check for hazard effects, ambient and trivial messages
+        for category in (MessageCategory.HAZARD_EFFECT, MessageCategory.AMBIENT, MessageCategory.TRIVIAL):
+            if category in matched:
+                return category
         
         # Default to NOTIFICATION if no category is detected
         return MessageCategory.NOTIFICATION
@@ -331,7 +325,8 @@ class MessageManager:
         on_cooldown = (self.current_turn - self.last_shown[category]) < cooldown
         
         # Apply throttling - randomly decide whether to show based on throttle rate
-        throttled = random.random() < throttle_rate
+        # (debug messages don't draw, so tracing doesn't change what a seeded game does)
+        throttled = category != MessageCategory.DEBUG and rng.messaging.random() < throttle_rate
         
         # Determine if message should be shown directly
         should_show = show_directly and not throttled and not on_cooldown
@@ -1,12 +1,39 @@
-import random
+"""
+Notification System for Root Access
+
+Notifications are the messages the player can read later with the
+'notifications' command (found items, gifts, low health, ...).
+
+Key Components:
+--------------
+1. Notification: A single notification (message, category, importance, read flag)
+2. NotificationManager: Stores notifications and formats them for reading
+
+How Notifications Are Stored:
+----------------------------
+- A hash index on (message, category) finds duplicates without scanning
+- Notifications are kept in insertion order so the oldest one can be dropped
+  when the store is full (max_notifications)
+- Every notification also sits in an importance bucket, both globally and per
+  category. Each bucket is ordered oldest to newest, so reading the top N
+  (highest importance first, newest first) only touches the N notifications
+  that are returned.
+"""
+
+import sys
 import time
-from collections import deque
+import bisect
+import itertools
+from collections import OrderedDict
+from rng_streams import rng
 
 class Notification:
     """Represents a single notification in the game."""
+    __slots__ = ('message', 'category', 'timestamp', 'importance', 'read')
+
     def __init__(self, message, category="general", timestamp=None, importance=1):
         self.message = message
-        self.category = category  # e.g., "item", "npc", "event", "combat"
+        self.category = sys.intern(category)  # e.g., "item", "npc", "event", "combat"
         self.timestamp = timestamp or time.time()
         self.importance = importance  # 1-5 scale, 5 being most important
         self.read = False
@@ -21,13 +48,27 @@ class Notification:
 
 class NotificationManager:
     """Manages game notifications to reduce spam and improve player experience."""
+    # Read notifications below this importance are cleared after viewing
+    IMPORTANT_LEVEL = 4
+
     def __init__(self, max_notifications=50, reminder_frequency=5):
-        self.notifications = deque(maxlen=max_notifications)  # Use deque with max size to auto-remove old notifications
+        self.max_notifications = max_notifications  # Oldest notifications are dropped beyond this
         self.unread_count = 0
         self.last_reminder_turn = 0
         self.reminder_frequency = reminder_frequency  # How often to remind player about unread notifications
         self.turn_counter = 0
-    
+
+        self._entries = OrderedDict()  # notification -> None, oldest first (for dropping old ones)
+        self._by_key = {}  # (message, category) -> notification (duplicate check)
+        self._by_importance = {}  # importance -> OrderedDict(notification -> None), oldest first
+        self._by_category = {}  # category -> {importance -> OrderedDict(notification -> None)}
+        self._importance_levels = []  # Sorted importance levels that have had notifications
+
+    @property
+    def notifications(self):
+        """All stored notifications, oldest first."""
+        return list(self._entries)
+
     def new_turn(self):
         """Update turn counter and check if we should remind the player about notifications."""
         self.turn_counter += 1
@@ -37,24 +78,60 @@ class NotificationManager:
         # The game will show the notification count in the UI instead
         
         return None
+
+    def _bucket(self, buckets, importance):
+        """Get (or create) the bucket for an importance level."""
+        bucket = buckets.get(importance)
+        if bucket is None:
+            bucket = buckets[importance] = OrderedDict()
+            if importance not in self._importance_levels:
+                bisect.insort(self._importance_levels, importance)
+        return bucket
+
+    def _store(self, notification):
+        """Put a notification into every index."""
+        self._entries[notification] = None
+        self._by_key[(notification.message, notification.category)] = notification
+        self._bucket(self._by_importance, notification.importance)[notification] = None
+        category_buckets = self._by_category.setdefault(notification.category, {})
+        self._bucket(category_buckets, notification.importance)[notification] = None
+
+    def _discard(self, notification):
+        """Take a notification out of every index."""
+        self._entries.pop(notification, None)
+        self._by_key.pop((notification.message, notification.category), None)
+        self._by_importance[notification.importance].pop(notification, None)
+        category_buckets = self._by_category[notification.category]
+        category_buckets[notification.importance].pop(notification, None)
+        if not notification.read:
+            self.unread_count = max(0, self.unread_count - 1)
+
+    def _touch(self, notification):
+        """Move a notification to the newest end of its importance buckets (its timestamp changed)."""
+        self._by_importance[notification.importance].move_to_end(notification)
+        self._by_category[notification.category][notification.importance].move_to_end(notification)
     
     def add_notification(self, message, category="general", importance=1):
         """Add a new notification to the system."""
         # Check for duplicate notifications (same message and category)
         # to prevent spam
-        for existing in self.notifications:
-            if existing.message == message and existing.category == category:
-                # If we already have this exact notification, don't add it again
-                # Just update the timestamp if it's already read
-                if existing.read:
-                    existing.timestamp = time.time()
-                    existing.read = False
-                    self.unread_count += 1
-                return False
-        
-        # If it's a new notification, add it
+        existing = self._by_key.get((message, category))
+        if existing is not None:
+            # If we already have this exact notification, don't add it again
+            # Just update the timestamp if it's already read
+            if existing.read:
+                existing.timestamp = time.time()
+                existing.read = False
+                self.unread_count += 1
+                self._touch(existing)
+            return False
+        
+        # If it's a new notification, add it (dropping the oldest one if we're full)
+        while self._entries and len(self._entries) >= self.max_notifications:
+            oldest = next(iter(self._entries))
+            self._discard(oldest)
         notification = Notification(message, category, importance=importance)
-        self.notifications.append(notification)
+        self._store(notification)
         self.unread_count += 1
         
         # Return True if this is the first unread notification
@@ -63,6 +140,17 @@ class NotificationManager:
     def get_unread_count(self):
         """Get the number of unread notifications."""
         return self.unread_count
+
+    def iter_by_importance(self, category=None):
+        """Iterate over notifications by importance (highest first), newest first within a level."""
+        if category:
+            buckets = self._by_category.get(category, {})
+        else:
+            buckets = self._by_importance
+        for importance in reversed(self._importance_levels):
+            bucket = buckets.get(importance)
+            if bucket:
+                yield from reversed(bucket)
     
     def read_notifications(self, count=None, category=None):
         """Read and return notifications, optionally filtering by category.
@@ -74,23 +162,11 @@ class NotificationManager:
         Returns:
             A tuple of (notifications_text, remaining_count)
         """
-        if not self.notifications:
+        if not self._entries:
             return "You have no notifications.", 0
         
-        # Filter notifications by category if specified
-        if category:
-            filtered_notifications = [n for n in self.notifications if n.category == category]
-        else:
-            filtered_notifications = list(self.notifications)
-        
-        # Sort by importance (highest first) and then by timestamp (newest first)
-        filtered_notifications.sort(key=lambda n: (-n.importance, -n.timestamp))
-        
-        # Limit to requested count if specified
-        if count and count < len(filtered_notifications):
-            notifications_to_read = filtered_notifications[:count]
-        else:
-            notifications_to_read = filtered_notifications
+        # Highest importance first, then newest first (only the ones we return are visited)
+        notifications_to_read = list(itertools.islice(self.iter_by_importance(category), count or None))
         
         # Format the notifications
         if not notifications_to_read:
@@ -128,15 +204,30 @@ class NotificationManager:
     
     def clear_notifications(self):
         """Clear all notifications and reset unread count."""
-        self.notifications.clear()
+        self._entries.clear()
+        self._by_key.clear()
+        self._by_importance.clear()
+        self._by_category.clear()
+        self._importance_levels = []
         self.unread_count = 0
         return "All notifications cleared."
+
+    def clear_non_important_notifications(self):
+        """Clear notifications that were already read and are below IMPORTANT_LEVEL."""
+        for importance in self._importance_levels:
+            if importance >= self.IMPORTANT_LEVEL:
+                break
+            bucket = self._by_importance.get(importance)
+            if not bucket:
+                continue
+            for notification in [n for n in bucket if n.read]:
+                self._discard(notification)
     
     def add_test_notification(self):
         """Add a test notification for debugging purposes."""
         test_categories = ["item", "npc", "hazard", "effect", "general"]
-        test_category = random.choice(test_categories)
-        test_importance = random.randint(1, 5)
+        test_category = rng.messaging.choice(test_categories)
+        test_importance = rng.messaging.randint(1, 5)
         
         test_messages = [
             "This is a test notification.",
@@ -147,7 +238,7 @@ class NotificationManager:
         ]
         
         self.add_notification(
-            random.choice(test_messages),
+            rng.messaging.choice(test_messages),
             category=test_category,
             importance=test_importance
         )
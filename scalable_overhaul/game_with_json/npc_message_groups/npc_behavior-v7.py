@@ -10,6 +10,7 @@ Key Components:
 2. BehaviorSettings: Global settings for behavior frequencies
 3. BehaviorManager: Controls NPC decision-making
 4. NPCMessageManager: Manages NPC-generated messages
+5. choose_next_behaviors: Chooses the next behavior for a whole batch of NPCs at once
 
 Behavior Types:
 -------------
@@ -30,11 +31,21 @@ behavior-settings [behavior] cooldown [n]   # Set cooldown period in turns
 See MESSAGE_SYSTEM_README.md for more information on customizing the system.
 """
 
-import random
 import collections
-import json
-import os
 import enum
+import bisect
+import itertools
+import sys
+from keyword_classifier import keyword_classifier
+from npc_events import NPCEvent
+from cooldown_table import CooldownTable
+from rng_streams import rng
+from phrase_bank import phrase_bank
+from message_templates import template_bank, compile_templates
+from turn_summary import TurnSummary
+from action_history import ActionHistory, ExpiryWheel
+from effect_scheduler import effect_scheduler
+from trace_channel import tracer
 
 class BehaviorType(enum.Enum):
     """Types of NPC behaviors."""
@@ -78,11 +89,17 @@ class BehaviorSettings:
             BehaviorType.GIFT: 5,      # 5 turns between gifting
         }
         
-        # Last turn each behavior was performed (per NPC)
-        self.last_behavior_turn = {}
+        # Last turn each behavior was performed, one dense column per behavior type
+        # and one slot per NPC (slots are freed when NPCs die or leave the game)
+        self.cooldown_table = CooldownTable(list(BehaviorType))
         
         # Global switch to disable all NPC behaviors
         self.npcs_enabled = True
+
+        # Side tables for per-NPC/per-item state that used to be set on the
+        # objects themselves with setattr (the objects use __slots__ now)
+        self.examined_items = {}  # item -> name of the NPC handling it this turn (cleared every turn)
+        self.searched_items = {}  # npc -> items it already looked for and didn't find
     
     def get_adjusted_weights(self, npc, game):
         """Get behavior weights adjusted by frequency multipliers."""
@@ -98,28 +115,55 @@ class BehaviorSettings:
     
     def can_perform_behavior(self, npc, behavior_type, current_turn):
         """Check if an NPC can perform a behavior based on cooldowns."""
-        # Get the NPC's last behavior times
-        npc_id = id(npc)
-        if npc_id not in self.last_behavior_turn:
-            self.last_behavior_turn[npc_id] = {}
-        
-        # If behavior has never been performed, allow it
-        if behavior_type not in self.last_behavior_turn[npc_id]:
-            return True
-        
-        # Check if cooldown has elapsed
-        cooldown = self.cooldowns.get(behavior_type, 0)
-        last_turn = self.last_behavior_turn[npc_id].get(behavior_type, 0)
-        
-        return (current_turn - last_turn) >= cooldown
+        # Behaviors that were never performed are always allowed
+        return self.cooldown_table.is_ready(npc, behavior_type, current_turn,
+                                            self.cooldowns.get(behavior_type, 0))
+    
+    def get_ready_behaviors(self, npc, behavior_types, current_turn):
+        """Check the cooldowns of several behaviors for one NPC at once (list of bools, same order)."""
+        return self.cooldown_table.ready_row(npc, behavior_types, current_turn, self.cooldowns)
+    
+    def get_ready_npcs(self, npcs, behavior_type, current_turn):
+        """Get the NPCs (from the given ones) that can perform a behavior this turn."""
+        return self.cooldown_table.ready_npcs(npcs, behavior_type, current_turn,
+                                              self.cooldowns.get(behavior_type, 0))
     
     def record_behavior(self, npc, behavior_type, current_turn):
         """Record that an NPC performed a behavior."""
-        npc_id = id(npc)
-        if npc_id not in self.last_behavior_turn:
-            self.last_behavior_turn[npc_id] = {}
-        
-        self.last_behavior_turn[npc_id][behavior_type] = current_turn
+        self.cooldown_table.record(npc, behavior_type, current_turn)
+    
+    def forget_npc(self, npc):
+        """Free an NPC's cooldown slot and effects (call when the NPC dies or is removed from the game)."""
+        self.searched_items.pop(npc, None)
+        effect_scheduler.forget(npc)
+        return self.cooldown_table.release(npc)
+
+    def claim_item(self, item, npc):
+        """
+        Mark an item as being handled by an NPC this turn, so other NPCs leave it alone.
+
+        Returns:
+            False if another NPC already has it this turn
+        """
+        holder = self.examined_items.get(item)
+        if holder is not None and holder != npc.name:
+            return False
+        self.examined_items[item] = npc.name
+        return True
+
+    def release_examined_items(self):
+        """Release every item claimed this turn (called at the end of the turn)."""
+        self.examined_items.clear()
+
+    def mark_searched(self, npc, item):
+        """Remember that an NPC looked for an item. Returns False if it already had."""
+        searched = self.searched_items.get(npc)
+        if searched is None:
+            searched = self.searched_items[npc] = set()
+        elif item in searched:
+            return False
+        searched.add(item)
+        return True
     
     def set_frequency(self, behavior_type, frequency):
         """Set the frequency multiplier for a behavior type."""
@@ -134,41 +178,130 @@ class BehaviorSettings:
 # Create a global instance of BehaviorSettings
 behavior_settings = BehaviorSettings()
 
-# Load NPC reactions JSON once at module level
-npc_reactions_path = os.path.join(os.path.dirname(__file__), "npc_reactions.json")
-NPC_REACTIONS = {}
-try:
-    with open(npc_reactions_path, "r") as f:
-        NPC_REACTIONS = json.load(f)
-except Exception as e:
-    print(f"Error loading npc_reactions.json: {e}")
+# Keyword rules used to recognize NPC messages, checked in order (first match wins).
+# They are compiled once into the shared keyword classifier.
+keyword_classifier.register_table('npc_action_type', [
+    ("attack", ["attacks you", "damage"]),
+    # Check for hazard trigger messages
+    ("hazard_trigger", ["triggers the", "sets off the", "activates the", "fumbles with the"]),
+    # Check for hallucination effects with more descriptive messages
+    ("hallucination", ["is so high", "hallucinating", "seeing things", "imagines", "starts seeing"]),
+    # Check for friendliness effects with more descriptive messages
+    ("friendly", ["smiles at you", "friendly", "cheerful", "happy", "unusually friendly"]),
+    # Check for gift-giving effects with more descriptive messages
+    ("gift", ["gives you", "gift", "insists you take", "presses", "offers you", "generous", "give away", "share"]),
+    # Check for falling object effects with more descriptive messages
+    ("falling_object", ["falls", "falling", "struck", "crashes", "heavy object"]),
+    # Check for gardening behaviors
+    ("gardening", ["waters the", "plants the", "harvests the", "fertilizer", "applies", "soil", "garden"]),
+    # Check for idle behaviors
+    ("idle", ["standing around", "is idle"]),
+    # Check for looking away behaviors
+    ("looking_away", ["looking the other way"]),
+    # Check for unnoticed behaviors - combine all "not detected" messages
+    ("unnoticed", ["doesn't notice you", "doesn't see you", "hasn't spotted you", "unaware", "oblivious",
+                   "so high that they don't see you"]),
+    # Check for talking behaviors
+    ("talk", ["talks to"]),
+    # Check for interaction behaviors
+    ("interact", ["interacts with", "uses"]),
+])
+
+# NPCMessageManager action types and the MessageCoordinator message types
+# they are counted as in the buffer summary (see turn_summary.py)
+SUMMARY_MESSAGE_TYPES = {
+    "attack": "npc_attack",
+    "hallucination": "npc_hallucination",
+    "friendly": "npc_friendly",
+    "gift": "npc_gift",
+    "idle": "npc_idle",
+    "looking_away": "npc_idle",
+    "unnoticed": "npc_idle",
+    "distracted": "npc_idle",
+    "talk": "npc_talk",
+    "interact": "npc_interact",
+    "falling_object": "npc_falling_object",
+    "gardening": "npc_gardening",
+    "hazard_trigger": "hazard_trigger",
+    "resist": "npc_resist_hazard",
+}
+
+# NPC reaction phrases from npc_reactions.json. The file is compiled into an
+# indexed, memory-mapped phrase bank and each category is only read when used.
+NPC_REACTIONS = phrase_bank  # Older name, kept for modules that import it
+
+# Placeholders hazard reaction phrases can use: {hazard.name}, and {member} for
+# the (first) gang member the phrase is about
+HAZARD_PHRASE_FIELDS = ('hazard', 'member')
+
+# What a hazard with no specific reaction does to gang members, as {singular|plural} templates
+GENERIC_EFFECT_TEMPLATES = compile_templates([
+    "{stumbles|stumble} around after exposure to the {hazard.name}, looking completely disoriented",
+    "{gets|get} a face full of {hazard.name} and {starts|start} making weird faces",
+    "{inhales|inhale} the {hazard.name} and {starts|start} laughing uncontrollably",
+    "{is|are} hit by the {hazard.name} and {starts doing an impromptu dance routine|start doing impromptu dance routines}",
+    "{gets|get} blasted with {hazard.name} and {starts|start} speaking in rhymes",
+    "{is|are} affected by the {hazard.name} and {starts|start} walking backward everywhere",
+    "{breathes|breathe} in the {hazard.name} and {develops a temporary British accent|develop temporary British accents}",
+    "{is|are} exposed to the {hazard.name} and {starts|start} narrating everything they do",
+    "{gets|get} a dose of {hazard.name} and {begins|begin} telling dad jokes to everyone",
+    "{is|are} hit with {hazard.name} and {starts|start} moving in slow motion",
+], fields=('hazard',), label="generic hazard effects")
 
 class Effect:
     """Represents a hazard effect with duration and properties"""
+    # When it runs out is tracked by effect_scheduler (see effect_scheduler.py),
+    # so one Effect doesn't count itself down and can be shared
+    __slots__ = ('name', 'description', 'duration', 'stackable')
+
     def __init__(self, name, description, duration=3, stackable=False):
-        self.name = name
+        self.name = sys.intern(name)
         self.description = description
         self.duration = duration
         self.stackable = stackable
-        self.remaining_turns = duration
-
-    def update(self):
-        """Decrement remaining turns and return True if expired"""
-        self.remaining_turns -= 1
-        return self.remaining_turns <= 0
 
     def __str__(self):
         return f"{self.name}"
 
 class NPC:
+    # Slotted so big crowds stay small in memory (see memory_benchmark.py).
+    # Per-turn flags go in behavior_settings' side tables, not on the NPC.
+    __slots__ = ('name', 'description', 'relationship', 'items', 'behavior_manager',
+                 'location', '_is_alive', '_current_activity')
+
     def __init__(self, name, description):
-        self.name = name
-        self.description = description
+        # Names are looked up in dicts all the time and repeat across messages, and
+        # descriptions are mostly shared ("A member of the Bloodhounds gang.")
+        self.name = sys.intern(name)
+        self.description = sys.intern(description)
         self.relationship = 0
         self.items = []
         self.behavior_manager = BehaviorManager(self)
         self.location = None
         self.is_alive = True
+        self.current_activity = None  # Short description shown next to the NPC's name in the area
+
+    # Area descriptions are cached, so the area has to know when something it
+    # shows about an NPC changes
+    @property
+    def is_alive(self):
+        return self._is_alive
+
+    @is_alive.setter
+    def is_alive(self, value):
+        self._is_alive = value
+        if self.location is not None:
+            self.location.touch()
+
+    @property
+    def current_activity(self):
+        return self._current_activity
+
+    @current_activity.setter
+    def current_activity(self, value):
+        self._current_activity = value
+        if self.location is not None:
+            self.location.touch()
 
     def add_item(self, item):
         """Add an item to NPC's inventory, checking if it has the necessary attributes of an Item."""
@@ -178,8 +311,8 @@ class NPC:
             self.items.append(item)
             return True
         else:
-            # For debugging - this should rarely happen in normal gameplay
-            print(f"Warning: {self.name} tried to add an invalid object to inventory: {item}")
+            # This should rarely happen in normal gameplay
+            tracer.warning("behaviors", "invalid_inventory_item", npc=self.name, item=item)
             return False
 
     def remove_item(self, item_name):
@@ -190,9 +323,11 @@ class NPC:
     def apply_hazard_effect(self, hazard):
         """Default hazard effect application for NPCs that do not have specific implementation."""
         # By default, NPCs are unaffected by hazards
-        return f"{self.name} is unaffected by the {hazard.name}."
+        return NPCEvent(self, "hazard_unaffected", hazard=hazard)
 
 class Civillian(NPC):
+    __slots__ = ('is_injured', 'is_arrested', 'is_fighting', 'emotion', 'needs_help')
+
     def __init__(self, name, description):
         super().__init__(name, description)
         self.is_injured = False
@@ -204,7 +339,7 @@ class Civillian(NPC):
 # Scalable Gang class to manage gang name and members
 class Gang:
     def __init__(self, name):
-        self.name = name
+        self.name = sys.intern(name)
         self.members = []
 
     def add_member(self, gang_member):
@@ -219,6 +354,9 @@ class Gang:
 
 # Scalable GangMember class inheriting from NPC
 class GangMember(NPC):
+    __slots__ = ('gang', 'health', 'detection_chance', 'has_detected_player', 'detection_cooldown',
+                 'hazard_resistance')
+
     def __init__(self, name, description, gang):
         super().__init__(name, description)
         self.gang = gang
@@ -227,27 +365,29 @@ class GangMember(NPC):
         self.detection_chance = 0.05  # 10 = Base 10% chance to detect player
         self.has_detected_player = False
         self.detection_cooldown = 0
-        self.active_effects = []  # List of active effects
-        self.hazard_resistance = 50  # Base 5% chance to resist hazard effects (0.05 = 5%)
+        self.hazard_resistance = 0.05  # Chance to resist hazard effects (5%), rolled against random()
         self.gang.add_member(self)
 
-    def update_effects(self):
-        """Update active effects and remove expired ones."""
-        expired_effects = []
-        for effect in self.active_effects:
-            if effect.update():  # Returns True if expired
-                expired_effects.append(effect)
-        
-        # Remove expired effects
-        for effect in expired_effects:
-            self.active_effects.remove(effect)
-            
-        return expired_effects
+    @property
+    def active_effects(self):
+        """The hazard effects this member has now (a read-only list, see effect_scheduler)."""
+        return effect_scheduler.effects_of(self)
+
+    def advance_cooldowns(self, turns):
+        """
+        Fast-forward the detection cooldown by several turns at once.
+
+        Used by the ActivityScheduler to catch up NPCs in areas the player
+        hasn't been near. (Effects run out on their own in effect_scheduler.)
+        """
+        if self.detection_cooldown > 0:
+            self.detection_cooldown = max(0, self.detection_cooldown - turns)
 
     def die(self):
         if self.health <= 0 and self.is_alive:
             self.is_alive = False
             self.gang.remove_member(self)
+            behavior_settings.forget_npc(self)
             return f"{self.name} has been defeated!"
         return None
 
@@ -264,53 +404,39 @@ class GangMember(NPC):
         if not hasattr(player, 'current_area') or player.current_area != self.location:
             return None
         
-        # Check hazard effects first
-        for effect in self.active_effects:
-            if effect.name == "hallucinations":
+        # Check hazard effects first (bit mask checks, in this order)
+        if effect_scheduler.has_any(self):
+            if effect_scheduler.has(self, "hallucinations"):
                 # Only generate a message 10% of the time to reduce spam
-                if random.random() < 0.1:
-                    return f"{self.name} is so high that they don't see you."
+                if rng.combat.random() < 0.1:
+                    return NPCEvent(self, "player_unseen_high")
                 else:
                     # Most of the time, return None to avoid generating a message
                     return None
-            if effect.name == "friendliness":
+            if effect_scheduler.has(self, "friendliness"):
                 # Only generate a message 25% of the time to reduce spam
-                if random.random() < 0.25:
-                    # Get a random friendly phrase
-                    friendly_phrases = [
-                        f"{self.name} smiles at you warmly.",
-                        f"{self.name} gives you a friendly nod.",
-                        f"{self.name} waves cheerfully in your direction.",
-                        f"{self.name} seems unusually happy to see you.",
-                        f"{self.name} greets you like an old friend."
-                    ]
-                    return random.choice(friendly_phrases)
+                if rng.combat.random() < 0.25:
+                    # Pick a random friendly phrase
+                    return NPCEvent(self, "player_friendly")
                 else:
                     # Most of the time, return None to avoid generating a message
                     return None
-            if effect.name == "gift-giving" and self.items:
-                gift = random.choice(self.items)
+            if effect_scheduler.has(self, "gift-giving") and self.items:
+                gift = rng.combat.choice(self.items)
                 player.inventory.append(gift)
                 self.items.remove(gift)
                 
-                # Get a random gift-giving phrase
-                gift_phrases = [
-                    f"{self.name} gives you {gift.name} as a gift!",
-                    f"{self.name} insists you take their {gift.name}.",
-                    f"{self.name} presses {gift.name} into your hands.",
-                    f"{self.name} seems compelled to give you their {gift.name}.",
-                    f"{self.name} offers you {gift.name} with a strange smile."
-                ]
-                return random.choice(gift_phrases)
+                # Pick a random gift-giving phrase
+                return NPCEvent(self, "player_gift", item=gift)
 
         # Normal detection logic
-        if not player.hidden and (self.has_detected_player or random.random() < self.detection_chance / 100):
+        if not player.hidden and (self.has_detected_player or rng.combat.random() < self.detection_chance / 100):
             self.has_detected_player = True
             player.detected_by.add(self.gang)
 
             if self.items:
                 weapon = next((i for i in self.items if hasattr(i, 'damage')), None)
-                damage = weapon.damage if weapon else random.randint(3, 8)  # Unarmed damage
+                damage = weapon.damage if weapon else rng.combat.randint(3, 8)  # Unarmed damage
                 weapon_name = weapon.name if weapon else None
                 
                 # Apply damage
@@ -319,61 +445,34 @@ class GangMember(NPC):
                 # Format descriptive combat message
                 if player.health <= 0:
                     # Player has been defeated
-                    result = f"{get_death_description()} {self.name} has defeated you!"
-                else:
-                    # Player is still alive - use descriptive combat message
-                    result = format_combat_message(f"{self.name}", 
-                                                  damage, player.health, 100, weapon_name)
-                return result
+                    return NPCEvent(self, "player_defeated", detail=get_death_description())
+                # Player is still alive - use descriptive combat message
+                combat_message = format_combat_message(f"{self.name}", 
+                                                      damage, player.health, 100, weapon_name)
+                return NPCEvent(self, "player_attack", item=weapon, detail=combat_message)
             
             # No weapon - just threats
-            threat_messages = [
-                f"{self.name} spots you and threatens you but has no weapon!",
-                f"{self.name} sees you and shouts threats, but is unarmed.",
-                f"{self.name} notices you and makes threatening gestures.",
-                f"{self.name} locks eyes with you and makes intimidating motions.",
-                f"{self.name} spots you and yells for backup!"
-            ]
-            return random.choice(threat_messages)
+            return NPCEvent(self, "player_threat")
 
         if player.hidden:
             self.has_detected_player = False
             
             # Make these messages extremely rare (1 in 500 chance)
-            if random.random() < 0.002:
-                # Combine all "not detected" messages into one pool
-                undetected_messages = [
-                    f"{self.name} looks around but doesn't see you.",
-                    f"{self.name} walks past your hiding spot.",
-                    f"{self.name} seems oblivious to your presence.",
-                    f"{self.name} fails to notice you lurking nearby.",
-                    f"{self.name} is unaware you're watching them.",
-                    f"{self.name} doesn't notice you.",
-                    f"{self.name} hasn't spotted you yet.",
-                    f"{self.name} is distracted and hasn't seen you.",
-                    f"{self.name} is looking the other way.",
-                    f"{self.name} hasn't registered your presence."
-                ]
-                return random.choice(undetected_messages)
+            if rng.combat.random() < 0.002:
+                # All "not detected" messages share one pool
+                return NPCEvent(self, "player_hidden")
             else:
                 # Almost always, don't generate any message
                 return None
             
         # Not hidden but not detected - make even rarer (1 in 200 chance)
-        if random.random() < 0.005:
-            unnoticed_messages = [
-                f"{self.name} doesn't notice you.",
-                f"{self.name} hasn't spotted you yet.",
-                f"{self.name} is distracted and hasn't seen you.",
-                f"{self.name} is looking the other way.",
-                f"{self.name} hasn't registered your presence."
-            ]
-            return random.choice(unnoticed_messages)
+        if rng.combat.random() < 0.005:
+            return NPCEvent(self, "player_unnoticed")
         else:
             # Most of the time, don't generate any message
             return None
 
-    def update_behavior(self, game):
+    def update_behavior(self, game, defer_choice=False):
         """Update NPC behavior each game tick - ONLY behavior, not attacks."""
         if not self.is_alive:
             return f"{self.name} is dead and cannot act."
@@ -385,108 +484,90 @@ class GangMember(NPC):
         
         # Only update behavior, attacks are handled separately in the game loop
         if self.behavior_manager:
-            return self.behavior_manager.update(game)
+            return self.behavior_manager.update(game, defer_choice=defer_choice)
         
         return None
 
     def apply_hazard_effect(self, hazard):
         """Apply hazard effects to gang members with chance of resistance."""
         # Check if gang member resists the hazard
-        if random.random() < self.hazard_resistance:
-            # Get a specific resistance message from NPC_REACTIONS
-            resistance_message = random.choice(NPC_REACTIONS.get("possible_hallucinations", {}).get("resist_hallucination_singular", 
-                                             ["resists the {hazard.name} effect!"]))
-            
-            # Format the message with hazard name if needed
-            try:
-                # Try to format with hazard name
-                resistance_message = resistance_message.format(hazard=hazard)
-            except (KeyError, AttributeError):
-                # If formatting fails, just use the message as is
-                pass
-                
-            # Add a keyword that will ensure this gets categorized as a resistance message
-            # Use just the name without gang prefix for consistency
-            return f"{self.name} resisted and {resistance_message}"
+        if rng.hazards.random() < self.hazard_resistance:
+            # Get a specific resistance message (rendered now, with the hazard filled in)
+            resistance_message = template_bank.render_choice(
+                rng.hazards, "possible_hallucinations", "resist_hallucination_singular",
+                default=["resists the {hazard.name} effect!"], fields=HAZARD_PHRASE_FIELDS,
+                hazard=hazard, member=self.name)
+            return NPCEvent(self, "hazard_resist", hazard=hazard, detail=resistance_message)
 
         # Apply different effects based on hazard type
         if hazard.effect == "hallucinations":
             # Create and add hallucination effect
             effect = Effect("hallucinations", "Causes hallucinations", duration=3)
-            self.active_effects.append(effect)
+            effect_scheduler.apply(self, effect)
             
-            # Get a random hallucination description from NPC_REACTIONS
-            hallucination = random.choice(NPC_REACTIONS.get("possible_hallucinations", {}).get("singular", ["starts seeing things that aren't there."]))
-            # Add a keyword that will ensure this gets categorized as a hallucination
-            return f"{self.name} is hallucinating and {hallucination}"
+            # Get a random hallucination description from the phrase bank
+            hallucination = template_bank.render_inflected(
+                rng.hazards, "possible_hallucinations", default=["{starts|start} seeing things that aren't there."])
+            return NPCEvent(self, "hazard_hallucination", hazard=hazard, detail=hallucination)
         
         elif hazard.effect == "gift-giving":
             # Create and add gift-giving effect
             effect = Effect("gift-giving", "Causes compulsive gift-giving", duration=3)
-            self.active_effects.append(effect)
+            effect_scheduler.apply(self, effect)
             
-            gift_messages = [
-                f"{self.name} gets a strange urge to give away their possessions.",
-                f"{self.name} suddenly feels very generous.",
-                f"{self.name} starts looking through their pockets for items to give away.",
-                f"{self.name} is overcome with a desire to share everything they own."
-            ]
-            return random.choice(gift_messages)
+            return NPCEvent(self, "hazard_gift_urge", hazard=hazard)
         
         elif hazard.effect == "friendliness":
             # Create and add friendliness effect
             effect = Effect("friendliness", "Makes NPCs friendly", duration=3)
-            self.active_effects.append(effect)
+            effect_scheduler.apply(self, effect)
             
-            # Get a random friendly phrase from NPC_REACTIONS
-            friendlyphrase = random.choice(NPC_REACTIONS.get("possible_friendly_phrases", {}).get("singular", ["becomes unusually friendly."]))
-            return f"{self.name} {friendlyphrase}"
+            # Get a random friendly phrase from the phrase bank
+            friendlyphrase = template_bank.render_inflected(
+                rng.hazards, "possible_friendly_phrases", default=["{becomes|become} unusually friendly."])
+            return NPCEvent(self, "hazard_friendly", hazard=hazard, detail=friendlyphrase)
         
         elif hazard.effect == "falling objects":
             # Create and add falling objects effect
             effect = Effect("falling objects", "Makes objects fall on NPCs", duration=1)
-            self.active_effects.append(effect)
+            effect_scheduler.apply(self, effect)
             self.health -= hazard.damage
             
-            falling_messages = [
-                f"A heavy object falls on {self.name}, causing {hazard.damage} damage!",
-                f"{self.name} is struck by a falling object, taking {hazard.damage} damage!",
-                f"Something crashes down on {self.name} for {hazard.damage} damage!"
-            ]
-            
             if self.health <= 0:
                 self.die()
-                return f"{random.choice(falling_messages)} They collapse to the ground, defeated."
-            return random.choice(falling_messages)
+                return NPCEvent(self, "hazard_falling_defeated", hazard=hazard)
+            return NPCEvent(self, "hazard_falling", hazard=hazard)
         
         else:
             # Generic effect with more descriptive message
             effect = Effect(hazard.effect, f"Effect from {hazard.name}", duration=3)
-            self.active_effects.append(effect)
+            effect_scheduler.apply(self, effect)
             
-            generic_messages = [
-                f"{self.name} is affected by the {hazard.name}.",
-                f"The {hazard.name} causes {self.name} to {hazard.effect}.",
-                f"{self.name} suffers from the effects of the {hazard.name}."
-            ]
-            return random.choice(generic_messages)
+            return NPCEvent(self, "hazard_generic", hazard=hazard)
 
 class NPCMessageManager:
     """Manages and summarizes NPC messages to reduce repetition."""
+    # Turns an NPC's tracked actions are remembered (the NPC gets one action
+    # per turn until then, unless the action is high priority)
+    ACTION_MEMORY_TURNS = 3
+
     def __init__(self):
         self.message_buffer = []
         self.max_buffer_size = 20
         self.summarize_threshold = 2  # Number of messages before summarizing
-        self.last_summary_types = set()  # Track message types from last summary to avoid repetition
+        self.buffer_summary = TurnSummary()  # Counters of what's in the message buffer
         self.last_turn_effects = {}  # Track effects reported per NPC last turn
         self.turn_counter = 0  # Track game turns
         self.npc_actions = {}  # Track actions per NPC in current turn
+        self.npc_action_expiry = {}  # NPC name -> turn its tracked actions are forgotten
+        self.npc_action_wheel = ExpiryWheel()  # Forgets tracked actions without scanning every NPC
         self.pending_actions = collections.defaultdict(list)  # Store all actions before processing
         self.action_categories = collections.defaultdict(list)  # Group actions by category
         self.processed_this_turn = False  # Flag to ensure we process all actions at once
         
         # New: Track NPC action frequency over time to prevent repetition
-        self.npc_action_history = {}  # Format: {npc_id: {action_type: count}}
+        # Cooldowns are stored as the turn they run out and counted down lazily
+        self.npc_action_history = ActionHistory()
         self.action_cooldowns = {
             "idle": 5,              # Increased from 3
             "talk": 3,              # Increased from 2
@@ -522,7 +603,10 @@ class NPCMessageManager:
         
     def new_turn(self):
         """Call at the start of each game turn to update tracking.
-        Modified to maintain NPC action history across turns for better variety."""
+        Modified to maintain NPC action history across turns for better variety.
+        
+        Doesn't visit every NPC: cooldowns are counted down lazily and only
+        the entries that run out this turn are dropped."""
         self.turn_counter += 1
         
         # Process any pending actions from the previous turn
@@ -536,24 +620,13 @@ class NPCMessageManager:
         self.pending_actions.clear()
         self.action_categories.clear()
         
-        # Only clear last_summary_types every 3 turns to allow for variety
-        if self.turn_counter % 3 == 0:
-            self.last_summary_types.clear()
-        
-        # Instead of clearing npc_actions completely, we'll selectively refresh it
-        # to allow some NPCs to take new actions while preventing repetition
-        if self.turn_counter % 3 == 0:  # Every 3 turns
-            # Randomly select some NPCs to "forget" their actions
-            # This allows them to take new actions while still preventing spam
-            npcs_to_refresh = []
-            for npc_name in self.npc_actions.keys():
-                if random.random() < 0.3:  # 30% chance to refresh each NPC
-                    npcs_to_refresh.append(npc_name)
-            
-            # Remove these NPCs from the tracking dict
-            for npc_name in npcs_to_refresh:
-                if npc_name in self.npc_actions:
-                    del self.npc_actions[npc_name]
+        # Instead of clearing npc_actions completely, NPCs "forget" their tracked
+        # actions a few turns after they were first tracked, which lets them
+        # take new actions while still preventing spam
+        for npc_name in self.npc_action_wheel.advance(self.turn_counter):
+            if self.npc_action_expiry.get(npc_name, self.turn_counter + 1) <= self.turn_counter:
+                del self.npc_action_expiry[npc_name]
+                self.npc_actions.pop(npc_name, None)
         
         # Keep track of effects from last turn, but clear old ones
         if self.turn_counter % 2 == 0:  # Every other turn
@@ -562,14 +635,10 @@ class NPCMessageManager:
         # Every 5 turns, clear the message buffer completely to avoid stale messages
         if self.turn_counter % 5 == 0:
             self.message_buffer.clear()
+            self.buffer_summary.clear()
             
-        # Decay action history counts to allow actions to be repeated eventually
-        for npc_id, actions in self.npc_action_history.items():
-            for action_type in list(actions.keys()):
-                actions[action_type] = max(0, actions[action_type] - 1)
-                # Remove action types that have decayed to 0
-                if actions[action_type] == 0:
-                    del actions[action_type]
+        # Cooldowns count down on their own, this only drops the ones that ran out
+        self.npc_action_history.advance(self.turn_counter)
                     
     def _process_pending_actions(self):
         """Process all pending actions at once to enable better grouping."""
@@ -585,6 +654,7 @@ class NPCMessageManager:
                 # Add to the NPC's tracked actions
                 if npc_name not in self.npc_actions:
                     self.npc_actions[npc_name] = []
+                    self._schedule_forget(npc_name)
                 self.npc_actions[npc_name].append((action_type, message))
                 
                 # Add to the message buffer
@@ -593,18 +663,33 @@ class NPCMessageManager:
         # Mark as processed for this turn
         self.processed_this_turn = True
     
+    def _schedule_forget(self, npc_name):
+        """Forget the NPC's tracked actions ACTION_MEMORY_TURNS turns from now."""
+        expiry_turn = self.turn_counter + self.ACTION_MEMORY_TURNS
+        self.npc_action_expiry[npc_name] = expiry_turn
+        self.npc_action_wheel.schedule(npc_name, expiry_turn)
+    
     def add_message(self, message):
         """Add a message to the buffer, tracking per-NPC actions with improved priority and cooldown systems."""
         # Skip if message is empty or None
         if not message:
             return None
+        
+        # Structured events already carry the NPC, action type and item,
+        # plain text messages have to be parsed
+        if isinstance(message, NPCEvent):
+            event = message
+            npc_name, action_type = event.npc_name, event.action_type
+            gift_item = event.item_name
+            message = event.render()
+        else:
+            event = None
+            npc_name, action_type = self._extract_npc_info(message)
+            gift_item = None
             
         # Skip if this exact message is already in the buffer
         if message in self.message_buffer:
             return None
-            
-        # Extract NPC name and action type from message
-        npc_name, action_type = self._extract_npc_info(message)
         
         # Get message priority (default to lowest priority if not found)
         priority = self.message_priorities.get(action_type, 1)
@@ -612,19 +697,19 @@ class NPCMessageManager:
         # Even more aggressive filtering of low-priority messages
         if priority < 9:  # All non-critical messages
             # High priority (7-8) messages: show 50% of the time
-            if priority >= 7 and random.random() > 0.5:
+            if priority >= 7 and rng.messaging.random() > 0.5:
                 return None
             # Medium-high priority (5-6) messages: show 25% of the time
-            elif priority >= 5 and random.random() > 0.25:
+            elif priority >= 5 and rng.messaging.random() > 0.25:
                 return None
             # Medium priority (3-4) messages: show 10% of the time
-            elif priority >= 3 and random.random() > 0.1:
+            elif priority >= 3 and rng.messaging.random() > 0.1:
                 return None
             # Low priority (1-2) messages: show 2% of the time
-            elif priority >= 1 and random.random() > 0.02:
+            elif priority >= 1 and rng.messaging.random() > 0.02:
                 return None
             # Lowest priority (0) messages: show 0.5% of the time (extremely rare)
-            elif priority == 0 and random.random() > 0.005:
+            elif priority == 0 and rng.messaging.random() > 0.005:
                 return None
             
         # If we identified an NPC, apply action history tracking and cooldowns
@@ -632,13 +717,9 @@ class NPCMessageManager:
             # Create a unique ID for this NPC (name is sufficient)
             npc_id = npc_name
             
-            # Initialize action history for this NPC if needed
-            if npc_id not in self.npc_action_history:
-                self.npc_action_history[npc_id] = {}
-                
-            # Check if this action type is on cooldown for this NPC
+            # Check if this action type is on cooldown for this NPC (turns left, 0 = ready)
             cooldown = self.action_cooldowns.get(action_type, 2)  # Default 2-turn cooldown
-            current_count = self.npc_action_history.get(npc_id, {}).get(action_type, 0)
+            current_count = self.npc_action_history.remaining(npc_id, action_type)
             
             # Skip if on cooldown, unless it's a high-priority message
             # Even for high-priority messages like attacks, enforce some cooldown
@@ -648,15 +729,11 @@ class NPCMessageManager:
                 elif priority >= 8 and current_count > 1:  # High priority messages (like attacks)
                     return None  # Still enforce cooldown after seeing it twice
                 
-            # Initialize if this is the first action for this NPC in current turn
-            if npc_name not in self.npc_actions:
-                self.npc_actions[npc_name] = []
-            else:
-                # Limit: only one action per NPC per turn (except for high-priority actions)
-                if priority < 8 and len(self.npc_actions[npc_name]) > 0:
-                    # Skip this action if NPC already has an action this turn
-                    # (except for high-priority actions like attacks)
-                    return None
+            # Limit: only one action per NPC per turn (except for high-priority actions)
+            if priority < 8 and self.npc_actions.get(npc_name):
+                # Skip this action if NPC already has an action this turn
+                # (except for high-priority actions like attacks)
+                return None
             
             # For detection status messages (low priority), be extremely restrictive
             if action_type in ["unnoticed", "looking_away", "distracted"]:
@@ -673,13 +750,13 @@ class NPCMessageManager:
                     return None
                     
                 # Even if we don't have one yet, only show these rarely
-                if random.random() > 0.05:  # 5% chance to show
+                if rng.messaging.random() > 0.05:  # 5% chance to show
                     return None
             
             # For gift messages, prevent duplicates
             if action_type == "gift":
                 # Check if the message contains an item name that's already been mentioned
-                item_name = self._extract_item_from_gift_message(message)
+                item_name = gift_item or self._extract_item_from_gift_message(message)
                 if item_name:
                     for existing_npc, existing_actions in self.npc_actions.items():
                         for existing_action_type, existing_message in existing_actions:
@@ -690,12 +767,11 @@ class NPCMessageManager:
                                     return None
             
             # Record this action in the NPC's action history
-            if npc_id not in self.npc_action_history:
-                self.npc_action_history[npc_id] = {}
-            self.npc_action_history[npc_id][action_type] = cooldown
+            self.npc_action_history.record(npc_id, action_type, cooldown)
             
             # Add to pending actions for later processing
             self.pending_actions[npc_name].append((action_type, message))
+            self._count_for_summary(event, npc_name, action_type, message)
             
             # If we have enough pending actions, process them all at once
             if sum(len(actions) for actions in self.pending_actions.values()) >= self.max_buffer_size:
@@ -704,6 +780,7 @@ class NPCMessageManager:
         else:
             # For non-NPC messages, add directly to buffer
             self.message_buffer.append(message)
+            self._count_for_summary(event, npc_name, action_type, message)
             
             # If buffer exceeds max size, summarize and clear
             if len(self.message_buffer) >= self.max_buffer_size:
@@ -711,6 +788,14 @@ class NPCMessageManager:
                 
         return None
     
+    def _count_for_summary(self, event, npc_name, action_type, message):
+        """Count a message that is going into the buffer, for get_summary()."""
+        if event is not None:
+            self.buffer_summary.record_event(event, text=message)
+        else:
+            self.buffer_summary.record(npc_name, None, SUMMARY_MESSAGE_TYPES.get(action_type, action_type),
+                                       text=message)
+    
     def _extract_action_phrase(self, message):
         """Extract a key action phrase from a message for grouping similar actions."""
         # Common action phrases to look for
@@ -801,43 +886,9 @@ class NPCMessageManager:
                 member_part = message.split(" member ")[1]
                 npc_name = member_part.split()[0].rstrip(',.!')
                 
-                # Determine action type based on message content
-                if "attacks you" in message or "damage" in message:
-                    action_type = "attack"
-                # Check for hazard trigger messages
-                elif any(keyword in message.lower() for keyword in ["triggers the", "sets off the", "activates the", "fumbles with the"]):
-                    action_type = "hazard_trigger"
-                # Check for hallucination effects with more descriptive messages
-                elif any(keyword in message.lower() for keyword in ["is so high", "hallucinating", "seeing things", "imagines", "starts seeing"]):
-                    action_type = "hallucination"
-                # Check for friendliness effects with more descriptive messages
-                elif any(keyword in message.lower() for keyword in ["smiles at you", "friendly", "cheerful", "happy", "unusually friendly"]):
-                    action_type = "friendly"
-                # Check for gift-giving effects with more descriptive messages
-                elif any(keyword in message.lower() for keyword in ["gives you", "gift", "insists you take", "presses", "offers you", "generous", "give away", "share"]):
-                    action_type = "gift"
-                # Check for falling object effects with more descriptive messages
-                elif any(keyword in message.lower() for keyword in ["falls", "falling", "struck", "crashes", "heavy object"]):
-                    action_type = "falling_object"
-                # Check for gardening behaviors
-                elif any(keyword in message.lower() for keyword in ["waters the", "plants the", "harvests the", "fertilizer", "applies", "soil", "garden"]):
-                    action_type = "gardening"
-                # Check for idle behaviors
-                elif "standing around" in message or "is idle" in message:
-                    action_type = "idle"
-                # Check for looking away behaviors
-                elif "looking the other way" in message:
-                    action_type = "looking_away"
-                # Check for unnoticed behaviors - combine all "not detected" messages
-                elif any(keyword in message.lower() for keyword in ["doesn't notice you", "doesn't see you", "hasn't spotted you", "unaware", "oblivious", "so high that they don't see you"]):
-                    action_type = "unnoticed"
-                # Check for talking behaviors
-                elif "talks to" in message:
-                    action_type = "talk"
-                # Check for interaction behaviors
-                elif "interacts with" in message or "uses" in message:
-                    action_type = "interact"
-                else:
+                # Determine action type based on message content (first matching rule wins)
+                action_type = keyword_classifier.first_match(message, 'npc_action_type')
+                if action_type is None:
                     # Try to extract a more specific action type
                     action_phrase = self._extract_action_phrase(message)
                     if action_phrase:
@@ -882,634 +933,30 @@ class NPCMessageManager:
     # The _should_skip_message method has been replaced by the priority-based system in add_message
 
     def get_summary(self, clear=False):
-        """Get a summary of the current messages in the buffer."""
+        """
+        Get a summary of the current messages in the buffer.
+        
+        The summary is rendered from the counters kept as messages came in,
+        one sentence per group of NPCs doing the same thing.
+        """
         if not self.message_buffer:
             return None
             
-        # Always summarize if we have enough messages
-        result = self._create_summary()
+        result = "\n".join(self.buffer_summary.lines()) or None
             
         if clear:
             # Clear both the message buffer and NPC actions to prevent duplicates
             self.message_buffer.clear()
+            self.buffer_summary.clear()
             self.npc_actions.clear()
+            self.npc_action_expiry.clear()
             
         return result
-        
-    def _create_summary(self):
-        """Create a summary of messages by categorizing them with improved grouping."""
-        # Track message categories for this summary
-        current_summary_types = set()
-        
-        # Categorize messages by action type and gang
-        attack_messages = []
-        hallucination_messages = []
-        friendly_messages = []
-        gift_messages = []
-        awareness_messages = []
-        idle_messages = []  # Specifically for "standing around" messages
-        looking_away_messages = []  # For "looking the other way" messages
-        unnoticed_messages = []  # For "doesn't notice you" messages
-        distracted_messages = []  # For "is distracted" messages
-        interaction_messages = collections.defaultdict(list)  # Group by item being interacted with
-        item_search_messages = collections.defaultdict(list)  # Group by item being searched for
-        other_messages = []
-        
-        # Action-specific message collections
-        action_specific_messages = collections.defaultdict(list)
-        
-        # First pass: categorize messages and extract important info
-        for message in self.message_buffer:
-            # Prioritize attack messages
-            if "attacks you" in message or "damage" in message or "defeated" in message:
-                attack_messages.append(message)
-                current_summary_types.add("attack")
-            # Hallucination messages
-            elif "is so high" in message or "hallucinating" in message or "affected:hallucinations" in message:
-                hallucination_messages.append(message)
-                current_summary_types.add("hallucination")
-            # Friendly messages
-            elif "smiles at you" in message or "friendly" in message or "affected:friendliness" in message:
-                friendly_messages.append(message)
-                current_summary_types.add("friendly")
-            # Gift messages
-            elif "gives you" in message or "gift" in message or "affected:gift-giving" in message or "insists you take" in message or "presses" in message or "offers you" in message:
-                gift_messages.append(message)
-                current_summary_types.add("gift")
-            # Combine idle and detection-related messages into a single category
-            elif ("standing around" in message or "is idle" in message or
-                  "looking the other way" in message or 
-                  "doesn't notice you" in message or 
-                  "doesn't see you" in message or 
-                  "hasn't spotted you" in message or
-                  "hasn't noticed you" in message or
-                  "is distracted" in message or 
-                  "distracted" in message or
-                  "hasn't registered your presence" in message or
-                  "is unaware you're watching" in message or
-                  "fails to notice you" in message or
-                  "walks past your hiding spot" in message or
-                  "seems oblivious to your presence" in message):
-                
-                # Extract NPC name to avoid duplicates
-                npc_name, _ = self._extract_npc_info(message)
-                
-                # Only add this message if we haven't already added an idle/detection message for this NPC
-                if npc_name:
-                    # Check if this NPC already has any idle/detection message
-                    npc_already_has_idle_message = False
-                    for existing_msg in idle_messages + looking_away_messages + distracted_messages + unnoticed_messages:
-                        existing_npc, _ = self._extract_npc_info(existing_msg)
-                        if existing_npc == npc_name:
-                            npc_already_has_idle_message = True
-                            break
-                    
-                    if not npc_already_has_idle_message:
-                        # Categorize all as idle for better grouping
-                        idle_messages.append(message)
-                        current_summary_types.add("idle")
-            # Interaction messages
-            # Interaction messages - group by the item being interacted with
-            elif "interacts with" in message:
-                npc_name, _ = self._extract_npc_info(message)
-                if npc_name:
-                    # Extract the item being interacted with
-                    try:
-                        item = message.split("interacts with")[1].strip().rstrip(".")
-                        interaction_messages[item].append((npc_name, message))
-                        current_summary_types.add(f"interaction:{item}")
-                    except:
-                        # If we can't extract the item, just add to general interactions
-                        interaction_messages["something"].append((npc_name, message))
-                        current_summary_types.add("interaction:something")
-            
-            # Item search messages - group by the item being searched for
-            elif "looks for" in message:
-                npc_name, _ = self._extract_npc_info(message)
-                if npc_name:
-                    # Extract the item being searched for
-                    try:
-                        item = message.split("looks for")[1].strip().rstrip(".")
-                        item_search_messages[item].append((npc_name, message))
-                        current_summary_types.add(f"search:{item}")
-                    except:
-                        # If we can't extract the item, just add to general searches
-                        item_search_messages["something"].append((npc_name, message))
-                        current_summary_types.add("search:something")
-            # Awareness messages (noticed)
-            elif "spots you" in message or "noticed you" in message:
-                awareness_messages.append(message)
-                current_summary_types.add("awareness")
-            # Other messages - try to categorize by common phrases
-            else:
-                # Extract action phrase for grouping similar actions
-                action_phrase = self._extract_action_phrase(message)
-                if action_phrase:
-                    action_specific_messages[action_phrase].append(message)
-                    current_summary_types.add(f"action:{action_phrase}")
-                else:
-                    other_messages.append(message)
-                    current_summary_types.add("other")
-        
-        # Second pass: create summaries for each category
-        summary_parts = []
-        max_summary_parts = 10  # Limit the number of summary parts to display
-        
-        # Always include attack messages (most important)
-        if attack_messages:
-            # Don't summarize attacks - they're important
-            summary_parts.extend(attack_messages)
-        
-        # Summarize hallucination messages
-        if hallucination_messages and len(summary_parts) < max_summary_parts:
-            # Extract gang members who are hallucinating
-            gang_members = self._extract_gang_members(hallucination_messages)
-            if gang_members:
-                gang_name = next(iter(gang_members.keys()))
-                members = gang_members[gang_name]
-                
-                if len(members) == 1:
-                    hallucination = random.choice(NPC_REACTIONS.get("possible_hallucinations", {}).get("singular", ["is seeing things that aren't there."]))
-                    summary_parts.append(f"The {gang_name} member {members[0]} {hallucination}")
-                else:
-                    hallucination = random.choice(NPC_REACTIONS.get("possible_hallucinations", {}).get("plural", ["are seeing things that aren't there."]))
-                    # Only list up to 3 members by name
-                    member_list = ", ".join(members[:3])
-                    if len(members) > 3:
-                        member_list += f" and {len(members) - 3} others"
-                    summary_parts.append(f"The {gang_name} members {member_list} {hallucination}")
-        
-        # Summarize friendly messages
-        if friendly_messages and len(summary_parts) < max_summary_parts:
-            gang_members = self._extract_gang_members(friendly_messages)
-            if gang_members:
-                for gang_name, members in gang_members.items():
-                    if len(members) == 1:
-                        friendlyphrase = random.choice(NPC_REACTIONS.get("possible_friendly_phrases", {}).get("singular", ["seems unusually friendly."]))
-                        summary_parts.append(f"The {gang_name} member {members[0]} {friendlyphrase}")
-                    else:
-                        friendlyphrase = random.choice(NPC_REACTIONS.get("possible_friendly_phrases", {}).get("plural", ["seem unusually friendly."]))
-                        member_list = ", ".join(members[:3])
-                        if len(members) > 3:
-                            member_list += f" and {len(members) - 3} others"
-                        summary_parts.append(f"The {gang_name} members {member_list} {friendlyphrase}")
-                    
-                    # Only add one friendly message summary
-                    break
-        
-        # Summarize gift messages
-        if gift_messages and len(summary_parts) < max_summary_parts:
-            gang_members = self._extract_gang_members(gift_messages)
-            if gang_members:
-                for gang_name, members in gang_members.items():
-                    if len(members) == 1:
-                        summary_parts.append(f"The {gang_name} member {members[0]} is compulsively giving away items.")
-                    else:
-                        member_list = ", ".join(members[:3])
-                        if len(members) > 3:
-                            member_list += f" and {len(members) - 3} others"
-                        summary_parts.append(f"The {gang_name} members {member_list} are giving away items.")
-                    
-                    # Only add one gift message summary
-                    break
-        
-        # Summarize awareness messages (only if we don't have many other messages)
-        if awareness_messages and len(summary_parts) < max_summary_parts:
-            # Extract who has noticed the player
-            noticed = []
-            
-            for msg in awareness_messages:
-                if "spots you" in msg or "noticed you" in msg:
-                    # Extract name from message
-                    parts = msg.split()
-                    if "member" in msg:
-                        member_idx = parts.index("member") + 1 if "member" in parts else -1
-                        if member_idx >= 0 and member_idx < len(parts):
-                            noticed.append(parts[member_idx])
-            
-            # Only report if someone has noticed you (more important)
-            if noticed:
-                gang_name = "Bloodhounds"  # Default, should extract from message
-                if len(noticed) == 1:
-                    summary_parts.append(f"The {gang_name} member {noticed[0]} has spotted you!")
-                else:
-                    member_list = ", ".join(noticed[:3])
-                    if len(noticed) > 3:
-                        member_list += f" and {len(noticed) - 3} others"
-                    summary_parts.append(f"The {gang_name} members {member_list} have spotted you!")
-        
-        # Try to combine different types of "not noticing you" messages
-        unaware_members = collections.defaultdict(list)
-        
-        # Process unnoticed messages
-        if unnoticed_messages:
-            for gang_name, members in self._extract_gang_members(unnoticed_messages).items():
-                unaware_members[gang_name].extend(members)
-                
-        # Process looking away messages
-        if looking_away_messages:
-            for gang_name, members in self._extract_gang_members(looking_away_messages).items():
-                unaware_members[gang_name].extend(members)
-                
-        # Process distracted messages
-        if distracted_messages:
-            for gang_name, members in self._extract_gang_members(distracted_messages).items():
-                unaware_members[gang_name].extend(members)
-        
-        # Create combined "unaware" message if we have members and space
-        # Only show "unaware" messages very occasionally (1 in 10 turns) unless we have very few messages
-        if unaware_members and (len(summary_parts) < 1 or random.random() < 0.1) and len(summary_parts) < max_summary_parts:
-            for gang_name, members in unaware_members.items():
-                # Remove duplicates while preserving order
-                unique_members = []
-                for member in members:
-                    if member not in unique_members:
-                        unique_members.append(member)
-                
-                # If most/all NPCs haven't noticed you, use a simpler message
-                if len(unique_members) >= 5:
-                    summary_parts.append(f"None of the {gang_name} members have noticed you.")
-                elif len(unique_members) == 1:
-                    summary_parts.append(f"The {gang_name} member {unique_members[0]} hasn't noticed you.")
-                elif len(unique_members) <= 3:
-                    member_list = ", ".join(unique_members)
-                    summary_parts.append(f"The {gang_name} members {member_list} haven't noticed you.")
-                else:
-                    # For more than 3 members, summarize with count
-                    sample_members = random.sample(unique_members, 3)
-                    member_list = ", ".join(sample_members)
-                    summary_parts.append(f"The {gang_name} members {member_list} and {len(unique_members) - 3} others haven't noticed you.")
-                
-                # Only add one unaware message summary
-                break
-        
-        # Summarize item interaction messages - group by item
-        if interaction_messages and len(summary_parts) < max_summary_parts:
-            for item, npc_messages in interaction_messages.items():
-                if len(summary_parts) >= max_summary_parts:
-                    break
-                    
-                # Extract all NPCs interacting with this item
-                npc_names = [npc for npc, _ in npc_messages]
-                
-                # Format the list of NPCs
-                if len(npc_names) == 1:
-                    # Just use the original message for a single NPC
-                    summary_parts.append(npc_messages[0][1])
-                else:
-                    # Get the gang name from the first message
-                    gang_name = "Bloodhounds"  # Default
-                    first_message = npc_messages[0][1]
-                    if "The " in first_message and " member " in first_message:
-                        gang_name = first_message.split("The ")[1].split(" member ")[0]
-                    
-                    # Format the list of NPCs with proper grammar
-                    if len(npc_names) <= 3:
-                        npc_list = ", ".join(npc_names)
-                        summary_parts.append(f"The {gang_name} members {npc_list} are interacting with {item}.")
-                    else:
-                        # For more than 3 NPCs, summarize with count
-                        sample_npcs = random.sample(npc_names, 3)
-                        npc_list = ", ".join(sample_npcs)
-                        summary_parts.append(f"The {gang_name} members {npc_list} and {len(npc_names) - 3} others are interacting with {item}.")
-        
-        # Summarize item search messages - group by item
-        if item_search_messages and len(summary_parts) < max_summary_parts:
-            for item, npc_messages in item_search_messages.items():
-                if len(summary_parts) >= max_summary_parts:
-                    break
-                    
-                # Extract all NPCs searching for this item
-                npc_names = [npc for npc, _ in npc_messages]
-                
-                # Format the list of NPCs
-                if len(npc_names) == 1:
-                    # Just use the original message for a single NPC
-                    summary_parts.append(npc_messages[0][1])
-                else:
-                    # Get the gang name from the first message
-                    gang_name = "Bloodhounds"  # Default
-                    first_message = npc_messages[0][1]
-                    if "The " in first_message and " member " in first_message:
-                        gang_name = first_message.split("The ")[1].split(" member ")[0]
-                    
-                    # Format the list of NPCs with proper grammar
-                    if len(npc_names) <= 3:
-                        npc_list = ", ".join(npc_names)
-                        if "no longer there" in npc_messages[0][1]:
-                            summary_parts.append(f"The {gang_name} members {npc_list} look for {item}, but it's no longer there.")
-                        else:
-                            summary_parts.append(f"The {gang_name} members {npc_list} are looking for {item}.")
-                    else:
-                        # For more than 3 NPCs, summarize with count
-                        sample_npcs = random.sample(npc_names, 3)
-                        npc_list = ", ".join(sample_npcs)
-                        if "no longer there" in npc_messages[0][1]:
-                            summary_parts.append(f"The {gang_name} members {npc_list} and {len(npc_names) - 3} others look for {item}, but it's no longer there.")
-                        else:
-                            summary_parts.append(f"The {gang_name} members {npc_list} and {len(npc_names) - 3} others are looking for {item}.")
-        
-        # Summarize idle messages
-        if idle_messages and len(summary_parts) < max_summary_parts:
-            # Extract gang members who are idle
-            gang_members = self._extract_gang_members(idle_messages)
-            
-            # Create a summary for each gang
-            for gang_name, members in gang_members.items():
-                if len(summary_parts) >= max_summary_parts:
-                    break
-                    
-                # Format the list of members with proper grammar
-                if len(members) == 1:
-                    # Just use the original message for a single NPC
-                    for message in idle_messages:
-                        if members[0] in message:
-                            summary_parts.append(message)
-                            break
-                else:
-                    # Format the list of members with proper grammar
-                    if len(members) <= 3:
-                        member_list = ", ".join(members)
-                        summary_parts.append(f"The {gang_name} members {member_list} are standing around.")
-                    else:
-                        # For more than 3 members, summarize with count
-                        sample_members = random.sample(members, 3)
-                        member_list = ", ".join(sample_members)
-                        summary_parts.append(f"The {gang_name} members {member_list} and {len(members) - 3} others are standing around.")
-            
-        # Process combined NPC actions for other types of messages
-        if len(summary_parts) < max_summary_parts:
-            combined_messages = self._combine_npc_actions()
-            if combined_messages:
-                # Only add a limited number of combined messages
-                max_combined = max_summary_parts - len(summary_parts)
-                if len(combined_messages) > max_combined:
-                    combined_messages = random.sample(combined_messages, max_combined)
-                summary_parts.extend(combined_messages)
-        
-        # If we still don't have enough messages, add some action-specific messages
-        if len(summary_parts) < max_summary_parts and action_specific_messages:
-            # Select a random action type
-            action_types = list(action_specific_messages.keys())
-            if action_types:
-                action_type = random.choice(action_types)
-                messages = action_specific_messages[action_type]
-                
-                gang_members = self._extract_gang_members(messages)
-                for gang_name, members in gang_members.items():
-                    if len(members) == 1:
-                        # Just use the original message for a single NPC
-                        summary_parts.append(messages[0])
-                    else:
-                        # Format the list of members with proper grammar
-                        if len(members) <= 3:
-                            member_list = ", ".join(members)
-                            summary_parts.append(f"The {gang_name} members {member_list} {action_type}.")
-                        else:
-                            # For more than 3 members, summarize with count
-                            sample_members = random.sample(members, 3)
-                            member_list = ", ".join(sample_members)
-                            summary_parts.append(f"The {gang_name} members {member_list} and {len(members) - 3} others {action_type}.")
-                    break
-        
-        # If we still don't have enough messages, add some other messages
-        if len(summary_parts) < max_summary_parts and other_messages:
-            # Select up to 2 random other messages
-            remaining_slots = max_summary_parts - len(summary_parts)
-            sample_size = min(remaining_slots, len(other_messages))
-            selected_messages = random.sample(other_messages, sample_size)
-            summary_parts.extend(selected_messages)
-        
-        # Update tracking of what message types we've shown
-        self.last_summary_types = current_summary_types
-        
-        # Return the summary
-        return "\n".join(summary_parts)
-        
-    def _combine_npc_actions(self):
-        """Combine similar actions from different NPCs and ensure each NPC only appears once in the output."""
-        combined_messages = []
-        
-        # Track which NPCs we've mentioned in the output
-        mentioned_npcs = set()
-        
-        # First, group NPCs by their actions to find similar behaviors
-        action_to_npcs = collections.defaultdict(list)
-        
-        # First pass: identify NPCs with similar single actions
-        for npc_name, actions in self.npc_actions.items():
-            # Skip NPCs with no actions
-            if len(actions) <= 0:
-                continue
-                
-            # Get gang name (assuming format is consistent)
-            gang_name = "Bloodhounds"  # Default
-            for _, message in actions:
-                if "member" in message and npc_name in message:
-                    parts = message.split()
-                    if parts[0] == "The" and "member" in parts:
-                        gang_name = parts[1]
-                        break
-            
-            # For NPCs with a single action, group them by action type
-            if len(actions) == 1:
-                action_type, message = actions[0]
-                # Create a key that includes gang name to avoid mixing different gangs
-                action_key = f"{gang_name}:{action_type}"
-                action_to_npcs[action_key].append((npc_name, message))
-        
-        # Second pass: generate combined messages for similar actions
-        for action_key, npc_messages in action_to_npcs.items():
-            # Only combine if we have multiple NPCs with the same action
-            if len(npc_messages) > 1:
-                gang_name = action_key.split(":")[0]
-                action_type = action_key.split(":")[1]
-                
-                # Extract all NPC names that haven't been mentioned yet
-                npc_names = [name for name, _ in npc_messages if name not in mentioned_npcs]
-                
-                # Skip if all NPCs have already been mentioned
-                if not npc_names:
-                    continue
-                
-                # Mark these NPCs as mentioned
-                for name in npc_names:
-                    mentioned_npcs.add(name)
-                
-                # Format the list of NPCs
-                if len(npc_names) <= 3:
-                    npc_list = ", ".join(npc_names)
-                else:
-                    # For more than 3 NPCs, summarize with count
-                    npc_list = ", ".join(npc_names[:3]) + f" and {len(npc_names) - 3} others"
-                
-                # Create appropriate message based on action type
-                if action_type == "idle":
-                    combined_messages.append(f"The {gang_name} members {npc_list} are standing around.")
-                elif action_type == "looking_away":
-                    combined_messages.append(f"The {gang_name} members {npc_list} are looking the other way.")
-                elif action_type == "unnoticed":
-                    combined_messages.append(f"The {gang_name} members {npc_list} don't notice you.")
-                elif action_type == "hallucination":
-                    hallucination = random.choice(NPC_REACTIONS.get("possible_hallucinations", {}).get("plural", ["are seeing things that aren't there."]))
-                    combined_messages.append(f"The {gang_name} members {npc_list} {hallucination}")
-                elif action_type == "friendly":
-                    friendlyphrase = random.choice(NPC_REACTIONS.get("possible_friendly_phrases", {}).get("plural", ["seem unusually friendly."]))
-                    combined_messages.append(f"The {gang_name} members {npc_list} {friendlyphrase}")
-                elif action_type == "gift":
-                    combined_messages.append(f"The {gang_name} members {npc_list} are giving away items.")
-                elif action_type == "talk":
-                    combined_messages.append(f"The {gang_name} members {npc_list} are talking to others.")
-                elif action_type == "interact":
-                    combined_messages.append(f"The {gang_name} members {npc_list} are interacting with objects.")
-                elif action_type.startswith("action:"):
-                    # Extract the action phrase
-                    action_phrase = action_type.split(":", 1)[1]
-                    combined_messages.append(f"The {gang_name} members {npc_list} {action_phrase}.")
-                else:
-                    # For other action types, use the first message as a template
-                    sample_message = npc_messages[0][1]
-                    # Replace the NPC name with the list of NPCs
-                    if f"The {gang_name} member" in sample_message:
-                        combined_message = sample_message.replace(
-                            f"The {gang_name} member {npc_names[0]}", 
-                            f"The {gang_name} members {npc_list}"
-                        )
-                        # Fix verb agreement (is -> are)
-                        combined_message = combined_message.replace(" is ", " are ")
-                        combined_messages.append(combined_message)
-                    else:
-                        # If we can't properly format, just use individual messages
-                        for npc_name, message in npc_messages:
-                            if npc_name not in mentioned_npcs:
-                                combined_messages.append(message)
-                                mentioned_npcs.add(npc_name)
-            else:
-                # For single NPCs, just use the original message if not already mentioned
-                npc_name = npc_messages[0][0]
-                if npc_name not in mentioned_npcs:
-                    combined_messages.append(npc_messages[0][1])
-                    mentioned_npcs.add(npc_name)
-        
-        # Third pass: process remaining NPCs that haven't been grouped
-        for npc_name, actions in self.npc_actions.items():
-            # Skip NPCs we've already mentioned or with no actions
-            if npc_name in mentioned_npcs or len(actions) <= 0:
-                continue
-                
-            # Just use the first action for this NPC
-            action_type, message = actions[0]
-            combined_messages.append(message)
-            mentioned_npcs.add(npc_name)
-        
-        # Limit the number of combined messages to return
-        if len(combined_messages) > 5:
-            return random.sample(combined_messages, 5)
-        
-        return combined_messages
-        
-    def _create_cross_npc_message(self, npc1_name, npc1_data, npc2_name, npc2_data):
-        """Create a natural language message combining actions from two different NPCs."""
-        # Extract action types and messages
-        npc1_action_types = npc1_data['action_types']
-        npc2_action_types = npc2_data['action_types']
-        
-        # Get gang names
-        gang1_name = npc1_data['gang_name']
-        gang2_name = npc2_data['gang_name']
-        
-        # Try to find interesting combinations
-        
-        # Case 1: One NPC interacting with an item while another is doing something else
-        if "interact" in npc1_action_types:
-            interact_message = next((msg for type, msg in npc1_data['actions'] if type == "interact"), "")
-            if "interacts with" in interact_message:
-                item = interact_message.split("interacts with")[1].strip().rstrip(".")
-                
-                # Find a contrasting action for NPC2
-                if "idle" in npc2_action_types:
-                    return f"{npc1_name} interacts with {item} while {npc2_name} is standing around."
-                elif "looking_away" in npc2_action_types:
-                    return f"{npc1_name} interacts with {item} while {npc2_name} is looking the other way."
-                elif "distracted" in npc2_action_types:
-                    return f"{npc1_name} interacts with {item} while {npc2_name} is distracted."
-            elif "looks for" in interact_message:
-                item = interact_message.split("looks for")[1].strip().rstrip(".")
-                
-                # Find a contrasting action for NPC2
-                if "idle" in npc2_action_types:
-                    return f"{npc1_name} looks for {item} while {npc2_name} is standing around."
-        
-        # Case 2: One NPC looking for something while another is interacting
-        if "interact" in npc2_action_types and "idle" in npc1_action_types:
-            interact_message = next((msg for type, msg in npc2_data['actions'] if type == "interact"), "")
-            if "interacts with" in interact_message:
-                item = interact_message.split("interacts with")[1].strip().rstrip(".")
-                return f"{npc2_name} interacts with {item} while {npc1_name} is standing around."
-            elif "looks for" in interact_message:
-                item = interact_message.split("looks for")[1].strip().rstrip(".")
-                return f"{npc2_name} looks for {item} while {npc1_name} is standing around."
-        
-        # Case 3: One NPC hallucinating while another is doing something normal
-        if "hallucination" in npc1_action_types and "idle" in npc2_action_types:
-            return f"{npc1_name} is hallucinating while {npc2_name} is standing around watching."
-        
-        # Case 4: One NPC being friendly while another is distracted
-        if "friendly" in npc1_action_types and "distracted" in npc2_action_types:
-            return f"{npc1_name} is being unusually friendly while {npc2_name} seems distracted."
-        
-        # Case 5: Both NPCs are idle/unaware
-        if ("idle" in npc1_action_types or "unnoticed" in npc1_action_types or "looking_away" in npc1_action_types) and \
-           ("idle" in npc2_action_types or "unnoticed" in npc2_action_types or "looking_away" in npc2_action_types):
-            return f"{npc1_name} and {npc2_name} are both unaware of your presence."
-        
-        # No interesting combination found
-        return None
-    
-    def _extract_gang_members(self, messages):
-        """Extract gang members from a list of messages."""
-        gang_members = collections.defaultdict(list)
-        
-        for message in messages:
-            # Look for gang member references
-            if "member" in message:
-                # Extract gang name and member name
-                parts = message.split()
-                
-                # Find the position of "member" in the message
-                if "member" in parts:
-                    member_idx = parts.index("member")
-                    
-                    # Gang name should be right before "member"
-                    if member_idx > 1 and parts[member_idx-2] == "The":
-                        gang_name = parts[member_idx-1]
-                        
-                        # Member name should be right after "member"
-                        if member_idx + 1 < len(parts):
-                            member_name = parts[member_idx + 1]
-                            # Remove any punctuation from member name
-                            member_name = member_name.rstrip('.,!?:;')
-                            
-                            # Only add unique members
-                            if member_name not in gang_members[gang_name]:
-                                gang_members[gang_name].append(member_name)
-            
-            # Also check for "affected:" messages which have a different format
-            elif "affected:" in message:
-                parts = message.split()
-                if len(parts) >= 3:
-                    gang_name = parts[0]
-                    member_name = parts[2]
-                    # Remove any punctuation from member name
-                    member_name = member_name.rstrip('.,!?:;')
-                    
-                    if member_name not in gang_members[gang_name]:
-                        gang_members[gang_name].append(member_name)
-        
-        return gang_members
 
 class Behavior:
     """Base class for NPC behaviors."""
+    __slots__ = ('npc',)
+
     def __init__(self, npc):
         self.npc = npc
 
@@ -1522,51 +969,56 @@ class Behavior:
 
 class IdleBehavior(Behavior):
     """NPC does nothing or simple idle actions."""
+    __slots__ = ()
+
     def perform(self, game):
         # For gang members, use a consistent format to help with message grouping
         if hasattr(self.npc, 'gang'):
             # Use a very limited set of consistent idle messages for better grouping
             # This is crucial for the message summarization system to work properly
             idle_actions = [
-                "is standing around",  # Most common, for better grouping
-                "is looking the other way"  # Alternative for variety
+                "idle_standing",  # "is standing around" - most common, for better grouping
+                "idle_looking_away"  # "is looking the other way" - alternative for variety
             ]
             
             # Use weighted random choice to heavily favor "standing around" for better grouping
             weights = [0.95, 0.05]  # 95% chance of "standing around", only 5% for "looking the other way"
-            action = random.choices(idle_actions, weights=weights, k=1)[0]
+            action = rng.behavior.choices(idle_actions, weights=weights, k=1)[0]
             
-            return f"The {self.npc.gang.name} member {self.npc.name} {action}."
+            return NPCEvent(self.npc, action)
         else:
             # For non-gang NPCs, use the original behavior
-            reactions = game.NPC_REACTIONS.get("idle_phrases", ["{} is standing around."])
-            reaction = random.choice(reactions)
-            return reaction.format(self.npc.name)
+            return template_bank.render_choice(
+                rng.behavior, "idle_phrases", default=["{} is standing around."],
+                fields=('name',), name=self.npc.name)
 
 class TalkBehavior(Behavior):
     """NPC talks to another NPC or player."""
+    __slots__ = ('target',)
+
     def __init__(self, npc, target):
         super().__init__(npc)
         self.target = target
 
     def perform(self, game):
         # Use npc_reactions.json talking phrases
-        reactions = game.NPC_REACTIONS.get("talking_phrases", ["{} talks to {}."])
-        reaction = random.choice(reactions)
+        reaction = rng.behavior.choice(template_bank.templates(
+            "talking_phrases", default=["{} talks to {}."], fields=('name', 'target')))
         
         # Check if target is player (doesn't have name attribute)
         target_name = getattr(self.target, 'name', 'you')
         if target_name == 'you':
-            # Use a player-specific format if available
-            player_reactions = game.NPC_REACTIONS.get("player_talking_phrases", ["{} talks to you."])
-            if player_reactions:
-                reaction = random.choice(player_reactions)
-                return reaction.format(self.npc.name)
+            # Use a player-specific format
+            return template_bank.render_choice(
+                rng.behavior, "player_talking_phrases", default=["{} talks to you."],
+                fields=('name',), name=self.npc.name)
         
-        return reaction.format(self.npc.name, target_name)
+        return reaction.render(name=self.npc.name, target=target_name)
 
 class FightBehavior(Behavior):
     """NPC fights another NPC or player."""
+    __slots__ = ('target',)
+
     def __init__(self, npc, target):
         super().__init__(npc)
         self.target = target
@@ -1576,7 +1028,7 @@ class FightBehavior(Behavior):
         from combat_descriptions import format_combat_message, get_death_description
         
         # Simple fight logic: reduce health, print fight message
-        damage = random.randint(5, 15)
+        damage = rng.combat.randint(5, 15)
         
         # Check if NPC has a weapon for more damage and special descriptions
         weapon = None
@@ -1596,6 +1048,9 @@ class FightBehavior(Behavior):
         
         if self.target.health <= 0:
             self.target.is_alive = False
+            if not is_player:
+                # Dead NPCs don't need their cooldowns anymore
+                behavior_settings.forget_npc(self.target)
             if is_player:
                 # Use descriptive death message for player
                 result = f"{get_death_description()} {self.npc.name} has defeated you!"
@@ -1612,6 +1067,8 @@ class FightBehavior(Behavior):
 
 class UseItemBehavior(Behavior):
     """NPC uses an item in the environment."""
+    __slots__ = ('item',)
+
     def __init__(self, npc, item):
         super().__init__(npc)
         self.item = item
@@ -1657,7 +1114,7 @@ class UseItemBehavior(Behavior):
                 # Remove the item if it's consumable
                 if hasattr(self.item, 'consumable') and self.item.consumable:
                     if self.item in self.npc.location.items:
-                        self.npc.location.items.remove(self.item)
+                        self.npc.location.remove_item(self.item)
                     elif hasattr(self.npc, 'items') and self.item in self.npc.items:
                         self.npc.items.remove(self.item)
                 
@@ -1668,7 +1125,7 @@ class UseItemBehavior(Behavior):
             # Pick up the weapon if NPC doesn't already have it
             if hasattr(self.npc, 'items') and self.item not in self.npc.items and hasattr(self.npc, 'add_item'):
                 if self.item in self.npc.location.items:
-                    self.npc.location.items.remove(self.item)
+                    self.npc.location.remove_item(self.item)
                 self.npc.add_item(self.item)
                 return f"{self.npc.name} picks up the {self.item.name}."
             return f"{self.npc.name} brandishes {self.item.name} menacingly."
@@ -1701,7 +1158,7 @@ class UseItemBehavior(Behavior):
                     plant_messages.append(f"{self.npc.name} waters the {obj.name}.")
             
             if plants_watered:
-                return random.choice(plant_messages)
+                return rng.behavior.choice(plant_messages)
             else:
                 return f"{self.npc.name} looks for plants to water with the {self.item.name}."
         
@@ -1716,7 +1173,7 @@ class UseItemBehavior(Behavior):
                                             'soil' in obj.name.lower()):
                     # Remove fertilizer if it's in the location
                     if self.item in self.npc.location.items:
-                        self.npc.location.items.remove(self.item)
+                        self.npc.location.remove_item(self.item)
                     elif hasattr(self.npc, 'items') and self.item in self.npc.items:
                         self.npc.items.remove(self.item)
                         
@@ -1746,7 +1203,7 @@ class UseItemBehavior(Behavior):
             # Debug output to help understand the behavior
             # print(f"NPC: {self.npc.name}, Item: {self.item.name}, Base chance: {base_pickup_chance:.2f}, Adjusted chance: {pickup_chance:.2f}, NPCs in area: {npc_count}")
             
-            should_pickup = random.random() < pickup_chance
+            should_pickup = rng.behavior.random() < pickup_chance
         
         # If NPC decides to pick up the item
         if should_pickup and hasattr(self.npc, 'items') and hasattr(self.npc, 'add_item'):
@@ -1757,7 +1214,7 @@ class UseItemBehavior(Behavior):
                 if self.npc.add_item(self.item):
                     # Only remove from location if successfully added to inventory
                     # This is the critical step - remove the item from the area immediately
-                    self.npc.location.items.remove(self.item)
+                    self.npc.location.remove_item(self.item)
                     
                     pickup_messages = [
                         f"{self.npc.name} examines the {self.item.name} carefully and decides to keep it.",
@@ -1765,7 +1222,7 @@ class UseItemBehavior(Behavior):
                         f"{self.npc.name} takes the {self.item.name} after looking around.",
                         f"{self.npc.name} claims the {self.item.name} for themselves."
                     ]
-                    return random.choice(pickup_messages)
+                    return rng.behavior.choice(pickup_messages)
                 else:
                     # If add_item failed (not a valid Item), just interact with it
                     return f"{self.npc.name} examines the {self.item.name} but doesn't know what to do with it."
@@ -1775,17 +1232,12 @@ class UseItemBehavior(Behavior):
         
         # If the item is still in the area, mark it as being examined
         # This will prevent other NPCs from examining the same item in this turn
-        if hasattr(self.item, '_being_examined_by'):
+        if self.item in behavior_settings.examined_items:
             # Item is already being examined by another NPC
             return None
         else:
-            # Mark the item as being examined by this NPC
-            setattr(self.item, '_being_examined_by', self.npc.name)
-            
-            # Schedule the item to be "released" at the end of the turn
-            if not hasattr(game, '_items_to_release'):
-                game._items_to_release = []
-            game._items_to_release.append(self.item)
+            # Mark the item as being examined by this NPC (released at the end of the turn)
+            behavior_settings.claim_item(self.item, self.npc)
             
             # Generic interaction for items without special logic
             interaction_messages = [
@@ -1795,21 +1247,18 @@ class UseItemBehavior(Behavior):
                 f"{self.npc.name} seems interested in the {self.item.name}.",
                 f"{self.npc.name} interacts with the {self.item.name}."
             ]
-            return random.choice(interaction_messages)
+            return rng.behavior.choice(interaction_messages)
         
     def _plant_seed(self, game):
         """NPC attempts to plant a seed if soil is available."""
         # Check if the seed is already being used by another NPC
-        if hasattr(self.item, '_being_examined_by') and self.item._being_examined_by != self.npc.name:
+        holder = behavior_settings.examined_items.get(self.item)
+        if holder is not None and holder != self.npc.name:
             # Seed is already being used by another NPC
             return None
             
         # Look for soil in the current area
-        soil = None
-        for obj in self.npc.location.objects:
-            if hasattr(obj, 'add_plant'):  # Simple check for soil-like objects
-                soil = obj
-                break
+        soil = self.npc.location.first_object('soil')
                 
         if soil:
             # Try to plant the seed
@@ -1817,13 +1266,8 @@ class UseItemBehavior(Behavior):
             success = False
             message = "the soil is not suitable"
             
-            # Mark the seed as being used by this NPC
-            setattr(seed, '_being_examined_by', self.npc.name)
-            
-            # Schedule the seed to be "released" at the end of the turn if planting fails
-            if not hasattr(game, '_items_to_release'):
-                game._items_to_release = []
-            game._items_to_release.append(seed)
+            # Mark the seed as being used by this NPC (released at the end of the turn)
+            behavior_settings.claim_item(seed, self.npc)
             
             # Call add_plant if it exists and has the right signature
             if hasattr(soil, 'add_plant'):
@@ -1843,19 +1287,15 @@ class UseItemBehavior(Behavior):
                     # First check if it's a valid Item (for consistency)
                     if self.npc.add_item(seed):
                         # Remove from location immediately
-                        self.npc.location.items.remove(seed)
+                        self.npc.location.remove_item(seed)
                         # Remove from NPC's inventory (since it's been planted)
                         self.npc.items.remove(seed)
                     else:
                         # If it's not a valid item, just remove it from the location
-                        self.npc.location.items.remove(seed)
+                        self.npc.location.remove_item(seed)
                 elif hasattr(self.npc, 'items') and seed in self.npc.items:
                     self.npc.items.remove(seed)
                     
-                # Remove the seed from the items to release since it's been planted
-                if hasattr(game, '_items_to_release') and seed in game._items_to_release:
-                    game._items_to_release.remove(seed)
-                    
                 # Create a custom message
                 planting_messages = [
                     f"{self.npc.name} carefully plants the {seed.name} in the {soil.name}.",
@@ -1864,20 +1304,13 @@ class UseItemBehavior(Behavior):
                     f"{self.npc.name} adds the {seed.name} to the {soil.name}, patting the soil gently.",
                     f"{self.npc.name} successfully plants the {seed.name}, looking satisfied with their gardening."
                 ]
-                return random.choice(planting_messages)
+                return rng.behavior.choice(planting_messages)
             else:
                 # Soil might be full or incompatible
                 return f"{self.npc.name} tries to plant the {seed.name}, but {message.lower()}"
         else:
             # Look for soil-like objects by name as a fallback
-            potential_soil = None
-            soil_keywords = ['soil', 'dirt', 'garden', 'plot', 'planter', 'pot']
-            
-            # Check objects in the location
-            for obj in self.npc.location.objects:
-                if hasattr(obj, 'name') and any(keyword in obj.name.lower() for keyword in soil_keywords):
-                    potential_soil = obj
-                    break
+            potential_soil = self.npc.location.first_object('soil_named')
             
             # If we found a potential soil object but it doesn't have add_plant method,
             # we'll simulate planting by removing the seed and returning a message
@@ -1887,7 +1320,7 @@ class UseItemBehavior(Behavior):
                     # First check if it's a valid Item (for consistency)
                     if self.npc.add_item(self.item):
                         # Remove from location immediately
-                        self.npc.location.items.remove(self.item)
+                        self.npc.location.remove_item(self.item)
                         # Remove from NPC's inventory (since it's been planted)
                         self.npc.items.remove(self.item)
                         
@@ -1897,10 +1330,10 @@ class UseItemBehavior(Behavior):
                             f"{self.npc.name} decides to grow something and plants the {self.item.name}.",
                             f"{self.npc.name} adds the {self.item.name} to the {potential_soil.name}, patting it gently."
                         ]
-                        return random.choice(planting_messages)
+                        return rng.behavior.choice(planting_messages)
                     else:
                         # If it's not a valid item, just remove it from the location
-                        self.npc.location.items.remove(self.item)
+                        self.npc.location.remove_item(self.item)
                         
                         planting_messages = [
                             f"{self.npc.name} carefully plants the {self.item.name} in the {potential_soil.name}.",
@@ -1908,7 +1341,7 @@ class UseItemBehavior(Behavior):
                             f"{self.npc.name} decides to grow something and plants the {self.item.name}.",
                             f"{self.npc.name} adds the {self.item.name} to the {potential_soil.name}, patting it gently."
                         ]
-                        return random.choice(planting_messages)
+                        return rng.behavior.choice(planting_messages)
                 elif hasattr(self.npc, 'items') and self.item in self.npc.items:
                     self.npc.items.remove(self.item)
                     
@@ -1918,7 +1351,7 @@ class UseItemBehavior(Behavior):
                         f"{self.npc.name} decides to grow something and plants the {self.item.name}.",
                         f"{self.npc.name} adds the {self.item.name} to the {potential_soil.name}, patting it gently."
                     ]
-                    return random.choice(planting_messages)
+                    return rng.behavior.choice(planting_messages)
                 else:
                     # Item is no longer in the location
                     return f"{self.npc.name} looks for the {self.item.name}, but it's no longer there."
@@ -1947,7 +1380,7 @@ class UseItemBehavior(Behavior):
                 if self.npc.add_item(self.item):
                     # Only remove from location if successfully added to inventory
                     # This is the critical step - remove the item from the area immediately
-                    self.npc.location.items.remove(self.item)
+                    self.npc.location.remove_item(self.item)
                     
                     pickup_messages = [
                         f"{self.npc.name} grabs the {self.item.name} and adds it to their arsenal.",
@@ -1955,7 +1388,7 @@ class UseItemBehavior(Behavior):
                         f"{self.npc.name} examines the {self.item.name} before deciding to keep it.",
                         f"{self.npc.name} takes the {self.item.name}, testing its weight and balance."
                     ]
-                    return random.choice(pickup_messages)
+                    return rng.behavior.choice(pickup_messages)
                 else:
                     # If add_item failed (not a valid Item), just interact with it
                     return f"{self.npc.name} examines the {self.item.name} but doesn't know what to do with it."
@@ -1978,7 +1411,7 @@ class UseItemBehavior(Behavior):
                 # First add to inventory temporarily (to ensure it's a valid Item)
                 if self.npc.add_item(self.item):
                     # Remove from location immediately
-                    self.npc.location.items.remove(self.item)
+                    self.npc.location.remove_item(self.item)
                     # Then remove from inventory (consumed)
                     self.npc.items.remove(self.item)
                     
@@ -1991,7 +1424,7 @@ class UseItemBehavior(Behavior):
                         f"{self.npc.name} quickly devours the {self.item.name}, feeling better afterward.",
                         f"{self.npc.name} takes a moment to eat the {self.item.name}."
                     ]
-                    return random.choice(consume_messages)
+                    return rng.behavior.choice(consume_messages)
                 else:
                     # Not a valid Item
                     return f"{self.npc.name} examines the {self.item.name} but doesn't know how to use it."
@@ -2005,7 +1438,7 @@ class UseItemBehavior(Behavior):
     def _trigger_hazard(self, game):
         """NPC accidentally triggers a hazard."""
         # Only non-gang members or confused NPCs should trigger hazards
-        if isinstance(self.npc, GangMember) and any(effect.name == "hallucinations" for effect in self.npc.active_effects): # "not any" originally
+        if isinstance(self.npc, GangMember) and effect_scheduler.has(self.npc, "hallucinations"): # "not any" originally
             return f"{self.npc.name} carefully avoids the {self.item.name}, recognizing it as dangerous."
             
         # Check if the item is in the NPC's inventory or in the area
@@ -2014,20 +1447,12 @@ class UseItemBehavior(Behavior):
         
         # If the item is neither in inventory nor in the area, it's no longer available
         if not item_in_inventory and not item_in_area:
-            # Create a unique identifier for this item to track it's been removed
-            item_id = getattr(self.item, 'id', id(self.item))
             item_name = getattr(self.item, 'name', str(self.item))
             
-            # Check if this NPC has already looked for this item
-            if not hasattr(self.npc, '_searched_for_items'):
-                self.npc._searched_for_items = set()
-                
             # If NPC has already searched for this item, don't generate another message
-            if item_id in self.npc._searched_for_items:
+            # (otherwise this marks it as searched for by this NPC)
+            if not behavior_settings.mark_searched(self.npc, self.item):
                 return None
-                
-            # Mark this item as searched for by this NPC
-            self.npc._searched_for_items.add(item_id)
             
             # Always return the message but with a special format that will be recognized for grouping
             # The "ITEM_SEARCH:" prefix will be used by the message coordinator to identify and group these messages
@@ -2037,7 +1462,7 @@ class UseItemBehavior(Behavior):
         if item_in_inventory:
             self.npc.items.remove(self.item)
         elif item_in_area:
-            self.npc.location.items.remove(self.item)
+            self.npc.location.remove_item(self.item)
         
         # Trigger the hazard
         if hasattr(self.item, 'activate'):
@@ -2055,19 +1480,23 @@ class UseItemBehavior(Behavior):
                 if hasattr(self.item, 'effect'):
                     effect_result = self.npc.apply_hazard_effect(self.item)
                     # The effect_result now uses just the name, so we don't need to modify it
-                    return f"{random.choice(trigger_messages)} {effect_result}"
+                    return f"{rng.behavior.choice(trigger_messages)} {effect_result}"
                 
-                return random.choice(trigger_messages)
+                return rng.behavior.choice(trigger_messages)
             except Exception as e:
                 # Activation failed
-                print(f"Hazard activation failed: {e}")
-                pass
+                tracer.error("behaviors", "hazard_activation_failed", npc=self.npc.name,
+                             hazard=self.item.name, error=e)
                 
         # Item doesn't have an activate method or activation failed
         return f"{self.npc.name} fiddles with the {self.item.name} but nothing happens."
 
 class BehaviorManager:
     """Manages NPC behaviors and transitions with improved variety and reduced repetition."""
+    # One per NPC, so it's slotted like the NPC
+    __slots__ = ('npc', 'current_behavior', 'last_behavior_types', 'max_history',
+                 'consecutive_same_behavior', 'last_result', 'choice_pending')
+
     def __init__(self, npc):
         self.npc = npc
         self.current_behavior = IdleBehavior(npc)
@@ -2075,9 +1504,15 @@ class BehaviorManager:
         self.max_history = 5  # Remember the last 5 behaviors
         self.consecutive_same_behavior = 0  # Track consecutive same behaviors
         self.last_result = None  # Track the last behavior result to avoid repeating the same message
+        self.choice_pending = False  # Next behavior still has to be chosen (batched choosing)
 
-    def update(self, game):
-        """Update NPC behavior each tick with improved variety."""
+    def update(self, game, defer_choice=False):
+        """Update NPC behavior each tick with improved variety.
+        
+        With defer_choice, the next behavior isn't chosen here; the manager is
+        marked with choice_pending so choose_next_behaviors() can choose for a
+        whole batch of NPCs at once.
+        """
         # Check if NPCs are globally disabled
         if not behavior_settings.npcs_enabled:
             return None
@@ -2095,7 +1530,7 @@ class BehaviorManager:
 
         # Check if NPC has any hazard items in inventory and might trigger them
         # Only do this occasionally to avoid too many hazard triggers
-        if behavior_settings.can_perform_behavior(self.npc, BehaviorType.USE_ITEM, current_turn) and random.random() < 0.3:
+        if behavior_settings.can_perform_behavior(self.npc, BehaviorType.USE_ITEM, current_turn) and rng.behavior.random() < 0.3:
             hazard_result = self.check_hazard_items(game)
             if hazard_result:
                 # Record that the NPC used an item
@@ -2142,7 +1577,10 @@ class BehaviorManager:
                 self.last_behavior_types.pop(0)
 
         # Decide next behavior
-        self.choose_next_behavior(game)
+        if defer_choice:
+            self.choice_pending = True
+        else:
+            self.choose_next_behavior(game)
 
         return result
         
@@ -2179,7 +1617,7 @@ class BehaviorManager:
                 
             if is_hazard:
                 # 80% chance to trigger the hazard (increased from 50%)
-                if random.random() < 0.8:
+                if rng.behavior.random() < 0.8:
                     # Remove the item from inventory first to prevent multiple triggers
                     self.npc.items.remove(item)
                     
@@ -2198,13 +1636,14 @@ class BehaviorManager:
                         try:
                             item.activate()
                         except Exception as e:
-                            print(f"Error activating hazard: {e}")
+                            tracer.error("behaviors", "hazard_activation_failed", npc=self.npc.name,
+                                         hazard=item.name, error=e)
                     
                     # Apply the hazard effect to the NPC
                     effect_result = self.npc.apply_hazard_effect(item)
                     
                     # Return a combined message
-                    return f"{random.choice(trigger_messages)} {effect_result}"
+                    return f"{rng.behavior.choice(trigger_messages)} {effect_result}"
                     
         return None
 
@@ -2215,31 +1654,38 @@ class BehaviorManager:
             game: The game instance
             force_change: If True, force a behavior change (avoid current behavior type)
         """
+        behavior_weights = self.get_behavior_weights(game, force_change)
+        # Draw only when there is something to choose from (same as random.choices)
+        draw = rng.behavior.random() if sum(behavior_weights) > 0 else None
+        self.apply_behavior_choice(game, pick_behavior(behavior_weights, draw))
+
+    def get_behavior_weights(self, game, force_change=False, area_features=None, base_weights=None):
+        """
+        Get the weights of the behaviors the chooser picks from (CHOOSER_BEHAVIOR_TYPES order).
+
+        Behaviors that are on cooldown get a weight of 0.
+
+        Args:
+            game: The game instance
+            force_change: If True, the current behavior type gets a weight of 0
+            area_features: Precomputed get_area_behavior_features() for the NPC's area
+            base_weights: Precomputed behavior_settings.get_adjusted_weights()
+        """
         # Get the current turn from the game
         current_turn = game.message_manager.current_turn if hasattr(game, 'message_manager') else 0
-        
-        # Base behaviors
-        behaviors = [IdleBehavior, TalkBehavior, FightBehavior, UseItemBehavior]
-        behavior_types = [BehaviorType.IDLE, BehaviorType.TALK, BehaviorType.FIGHT, BehaviorType.USE_ITEM]
+        behavior_types = CHOOSER_BEHAVIOR_TYPES
         
         # Get the current behavior type
         current_behavior_type = self._get_behavior_type(self.current_behavior)
         
         # Start with adjusted weights from behavior settings
-        adjusted_weights = behavior_settings.get_adjusted_weights(self.npc, game)
-        behavior_weights = [
-            adjusted_weights[BehaviorType.IDLE],
-            adjusted_weights[BehaviorType.TALK],
-            adjusted_weights[BehaviorType.FIGHT],
-            adjusted_weights[BehaviorType.USE_ITEM]
-        ]
+        if base_weights is None:
+            base_weights = behavior_settings.get_adjusted_weights(self.npc, game)
+        behavior_weights = [base_weights[behavior_type] for behavior_type in behavior_types]
         
         # If forcing a change, set the weight of the current behavior type to 0
-        if force_change:
-            for i, behavior_type in enumerate(behavior_types):
-                if behavior_type == current_behavior_type:
-                    behavior_weights[i] = 0.0
-                    break
+        if force_change and current_behavior_type in behavior_types:
+            behavior_weights[behavior_types.index(current_behavior_type)] = 0.0
         
         # Reduce weights for recently used behaviors to encourage variety
         if self.last_behavior_types:
@@ -2261,139 +1707,106 @@ class BehaviorManager:
                 behavior_weights[2] *= 1.5  # Further increase fight weight
                 
             # Apply effects
-            if hasattr(self.npc, 'active_effects'):
+            if effect_scheduler.has_any(self.npc):
                 # If hallucinating, less fighting, more item interaction
-                if any(effect.name == "hallucinations" for effect in self.npc.active_effects):
+                if effect_scheduler.has(self.npc, "hallucinations"):
                     behavior_weights[2] *= 0.3  # Reduce fight weight
                     behavior_weights[3] *= 2.0  # Increase item use weight
                     
                 # If friendly effect, more talking, no fighting
-                if any(effect.name == "friendliness" for effect in self.npc.active_effects):
+                if effect_scheduler.has(self.npc, "friendliness"):
                     behavior_weights[1] *= 2.0  # Increase talk weight
                     behavior_weights[2] = 0.0   # No fighting
                     
                 # If gift-giving effect, more item interaction
-                if any(effect.name == "gift-giving" for effect in self.npc.active_effects):
+                if effect_scheduler.has(self.npc, "gift-giving"):
                     behavior_weights[3] *= 3.0  # Greatly increase item use weight
         
         # If there are interesting items in the area, increase chance of item interaction
-        items = self.npc.location.items if hasattr(self.npc.location, 'items') else []
-        if items:
-            # Check for special items
-            has_weapons = any(hasattr(item, 'damage') for item in items)
-            has_healing = any(hasattr(item, 'healing') or 
-                             (hasattr(item, 'type') and item.type == 'food') for item in items)
-            
-            # Check for seeds both by type and by name
-            has_seeds = any((hasattr(item, 'type') and item.type == 'seed') or 
-                           (hasattr(item, 'name') and 'seed' in item.name.lower()) for item in items)
-            
-            has_hazards = any(hasattr(item, 'type') and item.type == 'hazard' for item in items)
-            
-            # Check for gardening tools
-            has_gardening_tools = any(hasattr(item, 'name') and 
-                                     any(tool in item.name.lower() for tool in 
-                                        ['water', 'watering', 'fertilizer', 'compost', 'shovel', 'trowel', 'rake']) 
-                                     for item in items)
-            
-            # If there are special items, increase item interaction chance
-            if has_weapons or has_healing or has_seeds or has_hazards or has_gardening_tools:
-                # Apply boost based on behavior settings
-                boost_factor = 0.3 * behavior_settings.frequency_multipliers[BehaviorType.USE_ITEM]
-                
-                # Increase UseItemBehavior weight by taking from other behaviors
+        if area_features is None:
+            area_features = get_area_behavior_features(self.npc.location)
+        has_special_items, has_seeds_and_soil = area_features
+        if has_special_items:
+            # Apply boost based on behavior settings
+            boost_factor = 0.3 * behavior_settings.frequency_multipliers[BehaviorType.USE_ITEM]
+            
+            # Increase UseItemBehavior weight by taking from other behaviors
+            total_weight = sum(behavior_weights)
+            for i in range(len(behavior_weights)):
+                if i != 3:  # Not USE_ITEM
+                    behavior_weights[i] *= (1 - boost_factor)
+            behavior_weights[3] += boost_factor * total_weight
+            
+            # If there are seeds and soil in the same area, make planting even more likely
+            if has_seeds_and_soil:
+                # Apply gardening boost based on behavior settings
+                soil_boost_factor = 0.2 * behavior_settings.frequency_multipliers[BehaviorType.GARDENING]
+                
+                # Apply the boost
                 total_weight = sum(behavior_weights)
                 for i in range(len(behavior_weights)):
                     if i != 3:  # Not USE_ITEM
-                        behavior_weights[i] *= (1 - boost_factor)
-                behavior_weights[3] += boost_factor * total_weight
-                
-                # If there are seeds and soil in the same area, make planting even more likely
-                if has_seeds:
-                    # Check for soil in the area
-                    has_soil = False
-                    for obj in self.npc.location.objects:
-                        if (hasattr(obj, 'add_plant') or 
-                            (hasattr(obj, 'name') and 
-                             any(soil_word in obj.name.lower() for soil_word in 
-                                ['soil', 'dirt', 'garden', 'plot', 'planter', 'pot']))):
-                            has_soil = True
-                            break
-                    
-                    if has_soil:
-                        # Apply gardening boost based on behavior settings
-                        soil_boost_factor = 0.2 * behavior_settings.frequency_multipliers[BehaviorType.GARDENING]
-                        
-                        # Apply the boost
-                        total_weight = sum(behavior_weights)
-                        for i in range(len(behavior_weights)):
-                            if i != 3:  # Not USE_ITEM
-                                behavior_weights[i] *= (1 - soil_boost_factor)
-                        behavior_weights[3] += soil_boost_factor * total_weight
-        
-        # Filter out behaviors that are on cooldown
-        valid_behaviors = []
-        valid_weights = []
-        
-        for i, (behavior, behavior_type) in enumerate(zip(behaviors, behavior_types)):
-            if behavior_settings.can_perform_behavior(self.npc, behavior_type, current_turn):
-                valid_behaviors.append(behavior)
-                valid_weights.append(behavior_weights[i])
-        
-        # If no valid behaviors or all weights are zero, default to idle
-        if not valid_behaviors or sum(valid_weights) <= 0:
-            choice = IdleBehavior
-        else:
-            # Choose behavior based on weights
-            choice = random.choices(valid_behaviors, weights=valid_weights, k=1)[0]
+                        behavior_weights[i] *= (1 - soil_boost_factor)
+                behavior_weights[3] += soil_boost_factor * total_weight
+        
+        # Behaviors that are on cooldown can't be chosen
+        ready = behavior_settings.get_ready_behaviors(self.npc, behavior_types, current_turn)
+        for i in range(len(behavior_weights)):
+            if not ready[i]:
+                behavior_weights[i] = 0.0
+        
+        return behavior_weights
 
+    def apply_behavior_choice(self, game, choice, area_targets=None):
+        """Switch to the chosen behavior class, picking a target or item for it.
+        
+        Args:
+            game: The game instance
+            choice: The behavior class to switch to
+            area_targets: Precomputed AreaTargets for the NPC's area (built here if not given)
+        """
         if choice == IdleBehavior:
             self.current_behavior = IdleBehavior(self.npc)
         elif choice == TalkBehavior:
             # Pick a random NPC or player in the same area to talk to
-            targets = [npc for npc in self.npc.location.npcs if npc != self.npc and npc.is_alive]
+            if area_targets is None:
+                area_targets = AreaTargets(self.npc.location)
             
             # Add player as potential target if in same area
-            player_in_area = False
+            player_target = None
             if hasattr(game, 'player') and game.player.current_area == self.npc.location:
-                player_in_area = True
                 # Only add player as target if not already fighting with gang members
                 if not isinstance(self.npc, GangMember) or not game.player.detected_by or self.npc.gang not in game.player.detected_by:
-                    targets.append(game.player)
+                    player_target = game.player
             
-            if targets:
-                target = random.choice(targets)
+            target = area_targets.pick(area_targets.alive, self.npc, player_target)
+            if target is not None:
                 self.current_behavior = TalkBehavior(self.npc, target)
             else:
                 self.current_behavior = IdleBehavior(self.npc)
         elif choice == FightBehavior:
             # Pick a random NPC or player to fight
-            targets = []
+            if area_targets is None:
+                area_targets = AreaTargets(self.npc.location)
             
-            # Filter potential NPC targets
-            for npc in self.npc.location.npcs:
-                # Skip self and dead NPCs
-                if npc == self.npc or not npc.is_alive:
-                    continue
-                    
-                # Gang members don't attack members of the same gang
-                if isinstance(self.npc, GangMember) and isinstance(npc, GangMember) and self.npc.gang == npc.gang:
-                    continue
-                    
-                targets.append(npc)
+            # Gang members don't attack members of the same gang
+            if isinstance(self.npc, GangMember):
+                targets = area_targets.get_rivals(self.npc.gang)
+            else:
+                targets = area_targets.alive
             
             # Add player as potential target if in same area and already detected by this gang
+            player_target = None
             if hasattr(game, 'player') and game.player.current_area == self.npc.location:
                 # Only gang members who have detected the player will fight them
                 if isinstance(self.npc, GangMember) and hasattr(game.player, 'detected_by') and self.npc.gang in game.player.detected_by:
                     # Higher chance to target player if detected
-                    if random.random() < 0.7:  # 70% chance to target player if detected
-                        targets = [game.player]
-                    else:
-                        targets.append(game.player)
+                    if rng.behavior.random() < 0.7:  # 70% chance to target player if detected
+                        targets = []
+                    player_target = game.player
             
-            if targets:
-                target = random.choice(targets)
+            target = area_targets.pick(targets, self.npc, player_target)
+            if target is not None:
                 self.current_behavior = FightBehavior(self.npc, target)
             else:
                 self.current_behavior = IdleBehavior(self.npc)
@@ -2406,92 +1819,187 @@ class BehaviorManager:
                 prioritized_items = []
                 
                 # Gang members prioritize weapons when healthy, healing items when injured
+                location = self.npc.location
                 if isinstance(self.npc, GangMember):
                     if self.npc.health < 50:  # Injured
                         # Look for healing items
-                        healing_items = [item for item in items if hasattr(item, 'healing') or 
-                                        (hasattr(item, 'type') and item.type == 'food')]
-                        prioritized_items.extend(healing_items)
+                        prioritized_items.extend(location.get_items('healing'))
                     else:  # Healthy
                         # Look for weapons
-                        weapon_items = [item for item in items if hasattr(item, 'damage') or 
-                                       (hasattr(item, 'type') and item.type == 'weapon')]
-                        prioritized_items.extend(weapon_items)
+                        prioritized_items.extend(location.get_items('weapon'))
                 
                 # All NPCs might be interested in seeds if there's soil nearby
-                has_soil = any(hasattr(obj, 'add_plant') for obj in self.npc.location.objects)
-                if has_soil:
-                    seed_items = [item for item in items if hasattr(item, 'type') and item.type == 'seed']
-                    prioritized_items.extend(seed_items)
+                if location.has_objects('soil'):
+                    prioritized_items.extend(location.get_items('seed'))
                 
                 # If hallucinating, might interact with hazards
-                is_hallucinating = isinstance(self.npc, GangMember) and any(effect.name == "hallucinations" for effect in self.npc.active_effects)
+                is_hallucinating = isinstance(self.npc, GangMember) and effect_scheduler.has(self.npc, "hallucinations")
                 if is_hallucinating:
-                    hazard_items = [item for item in items if hasattr(item, 'type') and item.type == 'hazard']
-                    prioritized_items.extend(hazard_items)
+                    prioritized_items.extend(location.get_items('hazard'))
                 
                 # Choose an item, prioritizing the ones we've identified
-                if prioritized_items and random.random() < 0.7:  # 70% chance to pick a prioritized item
-                    item = random.choice(prioritized_items)
+                if prioritized_items and rng.behavior.random() < 0.7:  # 70% chance to pick a prioritized item
+                    item = rng.behavior.choice(prioritized_items)
                 else:
-                    item = random.choice(items)
+                    item = rng.behavior.choice(items)
                     
                 self.current_behavior = UseItemBehavior(self.npc, item)
             else:
                 self.current_behavior = IdleBehavior(self.npc)
 
-def group_hazard_results(hazard, results):
-    """Group hazard results by effect status with proper grammar and interesting details"""
-    # Debug: Print the raw results to help diagnose issues
-    print(f"DEBUG - Hazard: {hazard.name}, Effect: {hazard.effect}")
-    print(f"DEBUG - Raw results: {results}")
-    
-    # We'll categorize the results based on the effect type detected in the message
-    hallucinating_members = []
-    friendly_members = []
-    gift_giving_members = []
-    falling_object_members = []
-    generic_effect_members = []
-    resisted_members = []
-    gang_name = None
-
-    for result in results:
-        # Extract the gang member name and gang name from the result
-        if "member" in result:
-            # Extract gang name
-            if "The " in result and " member " in result:
-                gang_name_part = result.split("The ")[1].split(" member ")[0]
-                if gang_name is None:
-                    gang_name = gang_name_part
-            
-            # Extract member name - this is more complex with our descriptive messages
-            # Most messages follow the pattern "The [gang_name] member [name] ..."
-            if " member " in result:
-                member_part = result.split(" member ")[1]
-                member_name = member_part.split()[0].rstrip(',.!')
-                
-                # Categorize based on message content
-                if "resists" in result:
-                    resisted_members.append(member_name)
-                elif any(keyword in result.lower() for keyword in ["hallucinating", "seeing things", "imagines", "starts seeing", "see ", "sees ", "believe", "believes", "think", "thinks", "claim", "claims", "recite", "recites", "twirl", "twirls"]):
-                    hallucinating_members.append(member_name)
-                elif any(keyword in result.lower() for keyword in ["friendly", "smiles", "happy", "cheerful", "unusually friendly"]):
-                    friendly_members.append(member_name)
-                elif any(keyword in result.lower() for keyword in ["give away", "generous", "share", "giving", "compulsive"]):
-                    gift_giving_members.append(member_name)
-                elif any(keyword in result.lower() for keyword in ["falls", "falling", "struck", "crashes", "heavy object"]):
-                    falling_object_members.append(member_name)
-                else:
-                    generic_effect_members.append(member_name)
-    
-    # Debug: Print categorization results
-    print(f"DEBUG - Categorization results:")
-    print(f"DEBUG - Hallucinating: {hallucinating_members}")
-    print(f"DEBUG - Friendly: {friendly_members}")
-    print(f"DEBUG - Gift-giving: {gift_giving_members}")
-    print(f"DEBUG - Falling objects: {falling_object_members}")
-    print(f"DEBUG - Generic: {generic_effect_members}")
-    print(f"DEBUG - Resisted: {resisted_members}")
+class AreaTargets:
+    """
+    The living NPCs of one area, collected once so that many NPCs can pick
+    talk and fight targets without each of them scanning the whole area.
+    """
+    def __init__(self, area):
+        self.alive = [npc for npc in area.npcs if npc.is_alive]
+        self.alive_index = None  # npc -> position in alive (built when first needed)
+        self.rivals = {}  # gang -> living NPCs that aren't in that gang
+
+    def get_rivals(self, gang):
+        """Get the living NPCs that a member of the given gang could fight."""
+        rivals = self.rivals.get(gang)
+        if rivals is None:
+            rivals = [npc for npc in self.alive
+                      if not (isinstance(npc, GangMember) and npc.gang == gang)]
+            self.rivals[gang] = rivals
+        return rivals
+
+    def pick(self, candidates, npc, extra=None):
+        """
+        Pick uniformly among the candidates other than npc, plus extra (if given).
+
+        Same odds as building the target list and calling rng.behavior.choice() on
+        it, but without copying the list. Returns None if there's nobody.
+        """
+        # Only the full alive list can contain the NPC itself (rival lists
+        # never contain members of the NPC's own gang)
+        skip = None
+        if candidates is self.alive:
+            if self.alive_index is None:
+                self.alive_index = {alive_npc: i for i, alive_npc in enumerate(self.alive)}
+            skip = self.alive_index.get(npc)
+
+        count = len(candidates) - (1 if skip is not None else 0) + (1 if extra is not None else 0)
+        if count <= 0:
+            return None
+        index = rng.behavior.randrange(count)
+        if skip is not None and index >= skip:
+            index += 1
+        if index >= len(candidates):
+            return extra
+        return candidates[index]
+
+
+# The behaviors choose_next_behavior() picks between, and their types (same order)
+CHOOSER_BEHAVIORS = [IdleBehavior, TalkBehavior, FightBehavior, UseItemBehavior]
+CHOOSER_BEHAVIOR_TYPES = [BehaviorType.IDLE, BehaviorType.TALK, BehaviorType.FIGHT, BehaviorType.USE_ITEM]
+
+def get_area_behavior_features(area):
+    """
+    Look at an area once and report what matters for choosing behaviors.
+
+    Returns:
+        (has_special_items, has_seeds_and_soil)
+        has_special_items: Weapons, healing items, seeds, hazards or gardening tools lie around
+        has_seeds_and_soil: There are seeds and something to plant them in
+    """
+    # The area keeps capability indexes up to date, so these are all O(1)
+    has_seeds = area.has_items('seed')
+    has_special_items = (area.has_items('weapon') or area.has_items('healing') or has_seeds or
+                         area.has_items('hazard') or area.has_items('gardening_tool'))
+    has_seeds_and_soil = has_special_items and has_seeds and \
+        (area.has_objects('soil') or area.has_objects('soil_named'))
+    return (has_special_items, has_seeds_and_soil)
+
+
+def pick_behavior(behavior_weights, draw):
+    """
+    Pick a behavior class from chooser weights with one uniform draw in [0, 1).
+
+    This is the same cumulative-weight lookup random.choices() does, so a
+    batch of draws gives exactly the same distribution as calling
+    random.choices() once per NPC. A draw of None (nothing to choose from)
+    means idle.
+    """
+    if draw is None:
+        return IdleBehavior
+    cum_weights = list(itertools.accumulate(behavior_weights))
+    total = cum_weights[-1]
+    if total <= 0:
+        return IdleBehavior
+    return CHOOSER_BEHAVIORS[bisect.bisect(cum_weights, draw * total, 0, len(cum_weights) - 1)]
+
+
+def choose_next_behaviors(managers, game):
+    """
+    Choose the next behavior for many NPCs at once.
+
+    Area features and the adjusted base weights are computed once (per area,
+    not per NPC), every NPC gets one row of weights, and all the draws are
+    made together. Each NPC ends up with exactly the same odds as if
+    choose_next_behavior() had been called for it on its own.
+
+    Args:
+        managers: BehaviorManagers that need a new behavior
+        game: The game instance
+
+    Returns:
+        The number of NPCs that got a new behavior
+    """
+    if not managers:
+        return 0
+
+    base_weights = behavior_settings.get_adjusted_weights(None, game)
+    area_features = {}  # Area -> features, shared by every NPC standing there
+    weight_rows = []
+    for manager in managers:
+        area = manager.npc.location
+        features = area_features.get(area)
+        if features is None:
+            features = area_features[area] = get_area_behavior_features(area)
+        weight_rows.append(manager.get_behavior_weights(game, area_features=features,
+                                                        base_weights=base_weights))
+
+    draws = [rng.behavior.random() if sum(weights) > 0 else None for weights in weight_rows]
+
+    area_targets = {}  # Area -> AreaTargets, built the first time someone there needs a target
+    trace = tracer.debug_on
+    for manager, weights, draw in zip(managers, weight_rows, draws):
+        choice = pick_behavior(weights, draw)
+        if trace:
+            tracer.debug("behaviors", "chosen", npc=manager.npc.name,
+                         behavior=choice.__name__)
+        targets = None
+        if choice is TalkBehavior or choice is FightBehavior:
+            area = manager.npc.location
+            targets = area_targets.get(area)
+            if targets is None:
+                targets = area_targets[area] = AreaTargets(area)
+        manager.apply_behavior_choice(game, choice, area_targets=targets)
+        manager.choice_pending = False
+    return len(managers)
+
+def group_hazard_results(hazard, outcome):
+    """Group hazard results by effect status with proper grammar and interesting details
+
+    outcome is a HazardOutcome (see hazard_resolver.py): the members are
+    already grouped, so this only turns the groups into text.
+    """
+    groups = outcome.groups
+    hallucinating_members = groups["hallucinating"]
+    friendly_members = groups["friendly"]
+    gift_giving_members = groups["gift_giving"]
+    falling_object_members = groups["falling_object"]
+    generic_effect_members = groups["generic"]
+    resisted_members = groups["resisted"]
+    gang_name = outcome.gang_name
+
+    if tracer.debug_on:
+        tracer.debug("hazards", "grouped", hazard=hazard.name, effect=hazard.effect,
+                     gang=gang_name, counts=outcome.counts(),
+                     members={group: names for group, names in groups.items() if names})
 
     messages = []
 
@@ -2499,54 +2007,30 @@ def group_hazard_results(hazard, results):
     if resisted_members:
         if len(resisted_members) == 1:
             # Get a specific singular resistance message
-            resistance_message = random.choice(NPC_REACTIONS.get("possible_hallucinations", {}).get("resist_hallucination_singular", 
-                                             ["resists the {hazard.name} effect!"]))
-            
-            # Format the message with hazard name if needed
-            try:
-                resistance_message = resistance_message.format(hazard=hazard)
-            except (KeyError, AttributeError):
-                pass
-                
+            resistance_message = template_bank.render_choice(
+                rng.messaging, "possible_hallucinations", "resist_hallucination_singular",
+                default=["resists the {hazard.name} effect!"], fields=HAZARD_PHRASE_FIELDS,
+                hazard=hazard, member=resisted_members[0])
             messages.append(f"The {gang_name} member {resisted_members[0]} {resistance_message}")
         
         elif len(resisted_members) <= 3:
-            # Get a specific plural resistance message
-            resistance_message = random.choice(NPC_REACTIONS.get("possible_hallucinations", {}).get("resist_hallucination_plural", 
-                                             ["resist the {hazard.name} effect!"]))
+            # Get a specific plural resistance message ({member} is the first of them)
+            resistance_message = template_bank.render_choice(
+                rng.messaging, "possible_hallucinations", "resist_hallucination_plural",
+                default=["resist the {hazard.name} effect!"], fields=HAZARD_PHRASE_FIELDS,
+                hazard=hazard, member=resisted_members[0])
             
             # Create a simpler format for member names
             member_list = ", ".join(resisted_members)
-            
-            # Format the message with hazard name and member names if needed
-            try:
-                # Check if the message contains a reference to a specific member
-                if "{resisted_members[0].name}" in resistance_message or "{resisted_members[0]" in resistance_message:
-                    # Replace the reference with the actual name
-                    formatted_message = resistance_message.replace("{resisted_members[0].name}", resisted_members[0])
-                    formatted_message = formatted_message.format(hazard=hazard)
-                else:
-                    # Just format with hazard name
-                    formatted_message = resistance_message.format(hazard=hazard)
-                
-                messages.append(f"The {gang_name} members {member_list} {formatted_message}")
-            except (KeyError, AttributeError, IndexError, ValueError) as e:
-                # If formatting fails, use a simpler approach
-                print(f"DEBUG - Formatting error: {e}")
-                messages.append(f"The {gang_name} members {member_list} {resistance_message}")
+            messages.append(f"The {gang_name} members {member_list} {resistance_message}")
         
         else:
             # For larger groups, use a simpler format
             sample = resisted_members[:2]
-            resistance_message = random.choice(NPC_REACTIONS.get("possible_hallucinations", {}).get("resist_hallucination_plural", 
-                                             ["resist the {hazard.name} effect!"]))
-            
-            # Try to format with hazard name
-            try:
-                resistance_message = resistance_message.format(hazard=hazard)
-            except (KeyError, AttributeError):
-                pass
-                
+            resistance_message = template_bank.render_choice(
+                rng.messaging, "possible_hallucinations", "resist_hallucination_plural",
+                default=["resist the {hazard.name} effect!"], fields=HAZARD_PHRASE_FIELDS,
+                hazard=hazard, member=sample[0])
             messages.append(f"The {gang_name} members {sample[0]}, {sample[1]} and {len(resisted_members) - 2} others {resistance_message}")
 
     # Process hallucinating members - ALWAYS show hallucination messages with vivid descriptions
@@ -2554,10 +2038,11 @@ def group_hazard_results(hazard, results):
         # For single member hallucinations
         if len(hallucinating_members) == 1:
             # Get a specific hallucination description from the JSON file
-            hallucination = random.choice(NPC_REACTIONS.get("possible_hallucinations", {}).get("singular", ["starts seeing things that aren't there."]))
+            hallucination = template_bank.render_inflected(
+                rng.messaging, "possible_hallucinations", default=["{starts|start} seeing things that aren't there."])
             
             # Create a simpler format that highlights the specific hallucination
-            hazard_specific_intro = random.choice([
+            hazard_specific_intro = rng.messaging.choice([
                 f"The {hazard.name} hits the {gang_name} member {hallucinating_members[0]}! {hallucinating_members[0]} {hallucination}",
                 f"After exposure to the {hazard.name}, the {gang_name} member {hallucinating_members[0]} {hallucination}",
                 f"The {gang_name} member {hallucinating_members[0]} inhales the {hazard.name} and {hallucination}"
@@ -2567,13 +2052,15 @@ def group_hazard_results(hazard, results):
         # For multiple member hallucinations
         else:
             # Get a specific plural hallucination description from the JSON file
-            hallucination = random.choice(NPC_REACTIONS.get("possible_hallucinations", {}).get("plural", ["start seeing things that aren't there."]))
+            hallucination = template_bank.render_inflected(
+                rng.messaging, "possible_hallucinations", plural=True,
+                default=["{starts|start} seeing things that aren't there."])
             
             if len(hallucinating_members) <= 3:
                 member_list = ", ".join(hallucinating_members)
                 
                 # Create a simpler format that highlights the specific hallucination
-                hazard_specific_intro = random.choice([
+                hazard_specific_intro = rng.messaging.choice([
                     f"The {gang_name} members {member_list} breathe in the {hazard.name} and {hallucination}",
                     f"After exposure to the {hazard.name}, the {gang_name} members {member_list} {hallucination}",
                     f"The {hazard.name} affects the {gang_name} members {member_list}! They {hallucination}"
@@ -2583,10 +2070,10 @@ def group_hazard_results(hazard, results):
                 sample = hallucinating_members[:2]
                 
                 # Add a random group remainder description for larger groups
-                group_remainder = random.choice(NPC_REACTIONS.get("possible_hallucinations", {}).get("group_remainder", ["Meanwhile, the others twirl and dance around like ballerinas."]))
+                group_remainder = rng.messaging.choice(phrase_bank.phrases("possible_hallucinations", "group_remainder", ["Meanwhile, the others twirl and dance around like ballerinas."]))
                 
                 # Create a simpler format that highlights the specific hallucination
-                hazard_specific_intro = random.choice([
+                hazard_specific_intro = rng.messaging.choice([
                     f"The {gang_name} members {sample[0]}, {sample[1]} and {len(hallucinating_members) - 2} others breathe in the {hazard.name} and {hallucination} {group_remainder}",
                     f"After exposure to the {hazard.name}, the {gang_name} members {sample[0]}, {sample[1]} and {len(hallucinating_members) - 2} others {hallucination} {group_remainder}"
                 ])
@@ -2595,10 +2082,11 @@ def group_hazard_results(hazard, results):
     # Process friendly members with more entertaining descriptions
     if friendly_members:
         if len(friendly_members) == 1:
-            friendlyphrase = random.choice(NPC_REACTIONS.get("possible_friendly_phrases", {}).get("singular", ["becomes unusually friendly."]))
+            friendlyphrase = template_bank.render_inflected(
+                rng.messaging, "possible_friendly_phrases", default=["{becomes|become} unusually friendly."])
             
             # More entertaining and varied descriptions for single members
-            friendly_intro = random.choice([
+            friendly_intro = rng.messaging.choice([
                 f"The {hazard.name} transforms the {gang_name} member {friendly_members[0]} into a ray of sunshine! With a goofy grin, {friendly_members[0]} says, '{friendlyphrase}'",
                 f"Whoa! The {gang_name} member {friendly_members[0]} gets a whiff of {hazard.name} and turns into a total sweetheart. {friendly_members[0]} hugs the nearest object and says, '{friendlyphrase}'",
                 f"The {gang_name} member {friendly_members[0]} breathes in the {hazard.name} and undergoes a complete personality change! With hearts practically visible in their eyes, {friendly_members[0]} says, '{friendlyphrase}'",
@@ -2607,13 +2095,15 @@ def group_hazard_results(hazard, results):
             ])
             messages.append(friendly_intro)
         else:
-            friendlyphrase = random.choice(NPC_REACTIONS.get("possible_friendly_phrases", {}).get("plural", ["become unusually friendly."]))
+            friendlyphrase = template_bank.render_inflected(
+                rng.messaging, "possible_friendly_phrases", plural=True,
+                default=["{becomes|become} unusually friendly."])
             
             if len(friendly_members) <= 3:
                 member_list = ", ".join(friendly_members)
                 
                 # More entertaining and varied descriptions for groups
-                friendly_intro = random.choice([
+                friendly_intro = rng.messaging.choice([
                     f"The {hazard.name} turns the {gang_name} members {member_list} into a bunch of care bears! Group hugs ensue as someone says, '{friendlyphrase}'",
                     f"After exposure to the {hazard.name}, the {gang_name} members {member_list} start holding hands and swaying. One of them says, '{friendlyphrase}'",
                     f"The {gang_name} members {member_list} breathe in the {hazard.name} and immediately form a friendship circle. Someone in the circle says, '{friendlyphrase}'",
@@ -2625,9 +2115,9 @@ def group_hazard_results(hazard, results):
                 sample = friendly_members[:2]
                 
                 # Add a random group remainder description
-                group_remainder = random.choice(NPC_REACTIONS.get("possible_friendly_phrases", {}).get("group_remainder", ["meanwhile, the others smile and hum happily."]))
+                group_remainder = rng.messaging.choice(phrase_bank.phrases("possible_friendly_phrases", "group_remainder", ["meanwhile, the others smile and hum happily."]))
                 
-                friendly_intro = random.choice([
+                friendly_intro = rng.messaging.choice([
                     f"The {hazard.name} turns the {gang_name} members {sample[0]}, {sample[1]} and {len(friendly_members) - 2} others into a bunch of care bears! Group hugs ensue as someone says, '{friendlyphrase}' And {group_remainder}",
                     f"After exposure to the {hazard.name}, the {gang_name} members {sample[0]}, {sample[1]} and {len(friendly_members) - 2} others start holding hands and swaying. One of them says, '{friendlyphrase}' And {group_remainder}",
                     f"The {gang_name} members {sample[0]}, {sample[1]} and {len(friendly_members) - 2} others breathe in the {hazard.name} and immediately form a friendship circle. Someone in the circle says, '{friendlyphrase}' And {group_remainder}"
@@ -2638,7 +2128,7 @@ def group_hazard_results(hazard, results):
     if gift_giving_members:
         if len(gift_giving_members) == 1:
             # More entertaining and varied descriptions for single gift-givers
-            gift_intro = random.choice([
+            gift_intro = rng.messaging.choice([
                 f"The {gang_name} member {gift_giving_members[0]} gets covered in sparkly {hazard.name} dust and starts frantically emptying their pockets! 'TAKE IT ALL!' they shout, throwing items everywhere!",
                 f"After exposure to the {hazard.name}, the {gang_name} member {gift_giving_members[0]} develops an irresistible urge to give away everything they own! They're practically throwing items at people!",
                 f"The {hazard.name} turns the {gang_name} member {gift_giving_members[0]} into Santa Claus! They're digging through their pockets and bags, desperate to find things to give away!",
@@ -2650,7 +2140,7 @@ def group_hazard_results(hazard, results):
             member_list = ", ".join(gift_giving_members)
             
             # More entertaining and varied descriptions for small groups
-            gift_intro = random.choice([
+            gift_intro = rng.messaging.choice([
                 f"The {gang_name} members {member_list} get covered in sparkly {hazard.name} dust and start the world's most chaotic gift exchange! Items are flying everywhere!",
                 f"After exposure to the {hazard.name}, the {gang_name} members {member_list} form an impromptu charity organization! They're giving away everything they own!",
                 f"The {hazard.name} turns the {gang_name} members {member_list} into a gift-giving flash mob! They're throwing items at each other and anyone nearby!",
@@ -2662,7 +2152,7 @@ def group_hazard_results(hazard, results):
             sample = gift_giving_members[:2]
             
             # More entertaining and varied descriptions for larger groups
-            gift_intro = random.choice([
+            gift_intro = rng.messaging.choice([
                 f"The {gang_name} members {sample[0]}, {sample[1]} and {len(gift_giving_members) - 2} others get covered in sparkly {hazard.name} dust and turn the area into a chaotic flea market! 'FREE STUFF!' they shout in unison!",
                 f"After exposure to the {hazard.name}, the {gang_name} members {sample[0]}, {sample[1]} and {len(gift_giving_members) - 2} others start the most aggressive gift-giving competition you've ever seen!",
                 f"The {hazard.name} transforms the {gang_name} members {sample[0]}, {sample[1]} and {len(gift_giving_members) - 2} others into a gift-giving army! They're emptying their pockets and throwing items in all directions!",
@@ -2673,10 +2163,12 @@ def group_hazard_results(hazard, results):
     # Process falling object members with more entertaining descriptions
     if falling_object_members:
         if len(falling_object_members) == 1:
-            falling_reaction = random.choice(NPC_REACTIONS.get("possible_falling_reactions", {}).get("singular", ["is struck by a falling object!"]))
+            falling_reaction = template_bank.render_inflected(
+                rng.messaging, "possible_falling_reactions",
+                default=["{is struck by a falling object|are struck by falling objects}!"])
             
             # More entertaining and varied descriptions for single members
-            falling_intro = random.choice([
+            falling_intro = rng.messaging.choice([
                 f"The {hazard.name} causes gravity to go haywire around the {gang_name} member {falling_object_members[0]}! As objects start raining down, {falling_object_members[0]} {falling_reaction}",
                 f"After exposure to the {hazard.name}, the {gang_name} member {falling_object_members[0]} becomes a magnet for falling debris! {falling_object_members[0]} {falling_reaction}",
                 f"The {hazard.name} creates a localized physics anomaly! The {gang_name} member {falling_object_members[0]} looks up just in time as {falling_reaction}",
@@ -2685,13 +2177,15 @@ def group_hazard_results(hazard, results):
             ])
             messages.append(falling_intro)
         else:
-            falling_reaction = random.choice(NPC_REACTIONS.get("possible_falling_reactions", {}).get("plural", ["are struck by falling objects!"]))
+            falling_reaction = template_bank.render_inflected(
+                rng.messaging, "possible_falling_reactions", plural=True,
+                default=["{is struck by a falling object|are struck by falling objects}!"])
             
             if len(falling_object_members) <= 3:
                 member_list = ", ".join(falling_object_members)
                 
                 # More entertaining and varied descriptions for small groups
-                falling_intro = random.choice([
+                falling_intro = rng.messaging.choice([
                     f"The {hazard.name} causes gravity to go haywire! The {gang_name} members {member_list} look up in horror as objects start raining down! They {falling_reaction}",
                     f"After exposure to the {hazard.name}, the {gang_name} members {member_list} become magnets for falling debris! They {falling_reaction}",
                     f"The {hazard.name} creates a localized physics anomaly! The {gang_name} members {member_list} {falling_reaction}",
@@ -2703,9 +2197,9 @@ def group_hazard_results(hazard, results):
                 sample = falling_object_members[:2]
                 
                 # Add a random group remainder description
-                group_remainder = random.choice(NPC_REACTIONS.get("possible_falling_reactions", {}).get("group_remainder", ["meanwhile, the others pull out their phones and start recording."]))
+                group_remainder = rng.messaging.choice(phrase_bank.phrases("possible_falling_reactions", "group_remainder", ["meanwhile, the others pull out their phones and start recording."]))
                 
-                falling_intro = random.choice([
+                falling_intro = rng.messaging.choice([
                     f"The {hazard.name} causes gravity to go haywire! The {gang_name} members {sample[0]}, {sample[1]} and {len(falling_object_members) - 2} others look up in horror as objects start raining down! They {falling_reaction} And {group_remainder}",
                     f"After exposure to the {hazard.name}, the {gang_name} members {sample[0]}, {sample[1]} and {len(falling_object_members) - 2} others become magnets for falling debris! They {falling_reaction} And {group_remainder}",
                     f"The {hazard.name} creates a localized physics anomaly! The {gang_name} members {sample[0]}, {sample[1]} and {len(falling_object_members) - 2} others {falling_reaction} And {group_remainder}"
@@ -2714,44 +2208,16 @@ def group_hazard_results(hazard, results):
 
     # Process generic effect members with more descriptive and entertaining messages
     if generic_effect_members:
-        # Create a list of varied and entertaining generic effect descriptions
-        generic_effect_descriptions = [
-            f"stumbles around after exposure to the {hazard.name}, looking completely disoriented",
-            f"gets a face full of {hazard.name} and starts making weird faces",
-            f"inhales the {hazard.name} and starts laughing uncontrollably",
-            f"is hit by the {hazard.name} and starts doing an impromptu dance routine",
-            f"gets blasted with {hazard.name} and starts speaking in rhymes",
-            f"is affected by the {hazard.name} and starts walking backward everywhere",
-            f"breathes in the {hazard.name} and develops a temporary British accent",
-            f"is exposed to the {hazard.name} and starts narrating everything they do",
-            f"gets a dose of {hazard.name} and begins telling dad jokes to everyone",
-            f"is hit with {hazard.name} and starts moving in slow motion"
-        ]
-        
-        # Plural versions of the same descriptions
-        generic_effect_descriptions_plural = [
-            f"stumble around after exposure to the {hazard.name}, looking completely disoriented",
-            f"get a face full of {hazard.name} and start making weird faces",
-            f"inhale the {hazard.name} and start laughing uncontrollably",
-            f"are hit by the {hazard.name} and start doing impromptu dance routines",
-            f"get blasted with {hazard.name} and start speaking in rhymes",
-            f"are affected by the {hazard.name} and start walking backward everywhere",
-            f"breathe in the {hazard.name} and develop temporary British accents",
-            f"are exposed to the {hazard.name} and start narrating everything they do",
-            f"get a dose of {hazard.name} and begin telling dad jokes to everyone",
-            f"are hit with {hazard.name} and start moving in slow motion"
-        ]
-        
         if len(generic_effect_members) == 1:
-            effect_desc = random.choice(generic_effect_descriptions)
+            effect_desc = rng.messaging.choice(GENERIC_EFFECT_TEMPLATES).render(hazard=hazard)
             messages.append(f"The {gang_name} member {generic_effect_members[0]} {effect_desc}.")
         elif len(generic_effect_members) <= 3:
             member_list = ", ".join(generic_effect_members)
-            effect_desc = random.choice(generic_effect_descriptions_plural)
+            effect_desc = rng.messaging.choice(GENERIC_EFFECT_TEMPLATES).render(plural=True, hazard=hazard)
             messages.append(f"The {gang_name} members {member_list} {effect_desc}.")
         else:
             sample = generic_effect_members[:2]
-            effect_desc = random.choice(generic_effect_descriptions_plural)
+            effect_desc = rng.messaging.choice(GENERIC_EFFECT_TEMPLATES).render(plural=True, hazard=hazard)
             messages.append(f"The {gang_name} members {sample[0]}, {sample[1]} and {len(generic_effect_members) - 2} others {effect_desc}.")
 
     return "\n".join(messages) if messages else f"The hazard has no effect on anyone."
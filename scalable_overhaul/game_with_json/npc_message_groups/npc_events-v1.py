@@ -0,0 +1,231 @@
+"""
+NPC Events for Root Access
+
+NPC behaviors used to return finished English sentences, and the message systems
+then had to pick those sentences apart again (split(" member "), keyword scans)
+to find out who did what. This module lets behaviors describe what happened as a
+small structured record instead. The sentence is only rendered when something
+actually needs the text (display, the message buffers, notifications), so
+events that are deduplicated, throttled or only counted in the summary are
+never rendered.
+
+Key Components:
+--------------
+1. EventTemplate: The text variants of one kind of event plus its action/message types
+2. EVENT_TEMPLATES: Registry of all event templates, keyed by template id
+3. NPCEvent: One thing an NPC did (npc, gang, action type, item, hazard, template id)
+
+Action Types vs Message Types:
+-----------------------------
+- action_type uses the NPCMessageManager vocabulary ("idle", "gift", "hallucination", ...)
+  and decides throttling priority, cooldowns and hazard grouping
+- message_type uses the MessageCoordinator vocabulary ("npc_idle", "npc_gift", ...)
+  and decides per-type caps, categories and notifications
+
+Template Placeholders:
+---------------------
+{name}    The NPC's name
+{gang}    The NPC's gang name
+{item}    The item involved (name)
+{hazard}  The hazard object (use {hazard.name}, {hazard.damage}, ...)
+{detail}  Finished text, e.g. a rendered reaction phrase or a combat description
+
+The texts are compiled into MessageTemplates when the template is created, so a
+text with an unknown placeholder fails at import instead of when it's shown.
+
+Adding a new event:
+------------------
+EVENT_TEMPLATES["npc_waters_plant"] = EventTemplate(
+    ["{name} waters the {item}."], action_type="gardening", message_type="npc_gardening")
+return NPCEvent(npc, "npc_waters_plant", item=plant)
+"""
+
+from rng_streams import rng
+from message_templates import MessageTemplate
+
+
+# Values every event text can use
+EVENT_FIELDS = ('name', 'gang', 'item', 'hazard', 'detail')
+
+
+class EventTemplate:
+    """Text variants for one kind of NPC event, plus how the message systems should treat it."""
+    __slots__ = ('texts', 'templates', 'action_type', 'message_type')
+
+    def __init__(self, texts, action_type, message_type=None):
+        self.texts = tuple(texts)
+        self.templates = tuple(MessageTemplate(text, EVENT_FIELDS) for text in self.texts)
+        self.action_type = action_type  # NPCMessageManager action type
+        self.message_type = message_type  # MessageCoordinator message type (None = untyped)
+
+
+EVENT_TEMPLATES = {
+    # Idle behaviors (IdleBehavior.perform)
+    "idle_standing": EventTemplate(
+        ["{name} is standing around."],
+        action_type="idle", message_type="npc_idle"),
+    "idle_looking_away": EventTemplate(
+        ["{name} is looking the other way."],
+        action_type="looking_away", message_type="npc_idle"),
+
+    # Interactions with the player (GangMember.attack_player)
+    "player_unseen_high": EventTemplate(
+        ["{name} is so high that they don't see you."],
+        action_type="hallucination", message_type="npc_idle"),
+    "player_friendly": EventTemplate(
+        ["{name} smiles at you warmly.",
+         "{name} gives you a friendly nod.",
+         "{name} waves cheerfully in your direction.",
+         "{name} seems unusually happy to see you.",
+         "{name} greets you like an old friend."],
+        action_type="friendly", message_type="npc_friendly"),
+    "player_gift": EventTemplate(
+        ["{name} gives you {item} as a gift!",
+         "{name} insists you take their {item}.",
+         "{name} presses {item} into your hands.",
+         "{name} seems compelled to give you their {item}.",
+         "{name} offers you {item} with a strange smile."],
+        action_type="gift", message_type="npc_gift"),
+    "player_attack": EventTemplate(
+        ["{detail}"],
+        action_type="attack", message_type="npc_attack"),
+    "player_defeated": EventTemplate(
+        ["{detail} {name} has defeated you!"],
+        action_type="attack", message_type="npc_attack"),
+    "player_threat": EventTemplate(
+        ["{name} spots you and threatens you but has no weapon!",
+         "{name} sees you and shouts threats, but is unarmed.",
+         "{name} notices you and makes threatening gestures.",
+         "{name} locks eyes with you and makes intimidating motions.",
+         "{name} spots you and yells for backup!"],
+        action_type="attack", message_type="npc_attack"),
+    "player_hidden": EventTemplate(
+        ["{name} looks around but doesn't see you.",
+         "{name} walks past your hiding spot.",
+         "{name} seems oblivious to your presence.",
+         "{name} fails to notice you lurking nearby.",
+         "{name} is unaware you're watching them.",
+         "{name} doesn't notice you.",
+         "{name} hasn't spotted you yet.",
+         "{name} is distracted and hasn't seen you.",
+         "{name} is looking the other way.",
+         "{name} hasn't registered your presence."],
+        action_type="unnoticed", message_type="npc_idle"),
+    "player_unnoticed": EventTemplate(
+        ["{name} doesn't notice you.",
+         "{name} hasn't spotted you yet.",
+         "{name} is distracted and hasn't seen you.",
+         "{name} is looking the other way.",
+         "{name} hasn't registered your presence."],
+        action_type="unnoticed", message_type="npc_idle"),
+
+    # Hazard effects (NPC.apply_hazard_effect / GangMember.apply_hazard_effect)
+    "hazard_unaffected": EventTemplate(
+        ["{name} is unaffected by the {hazard.name}."],
+        action_type="resist", message_type="npc_resist_hazard"),
+    "hazard_resist": EventTemplate(
+        ["{name} resisted and {detail}"],
+        action_type="resist", message_type="npc_resist_hazard"),
+    "hazard_hallucination": EventTemplate(
+        ["{name} is hallucinating and {detail}"],
+        action_type="hallucination", message_type="npc_hallucination_detail"),
+    "hazard_gift_urge": EventTemplate(
+        ["{name} gets a strange urge to give away their possessions.",
+         "{name} suddenly feels very generous.",
+         "{name} starts looking through their pockets for items to give away.",
+         "{name} is overcome with a desire to share everything they own."],
+        action_type="gift"),
+    "hazard_friendly": EventTemplate(
+        ["{name} {detail}"],
+        action_type="friendly", message_type="npc_friendly"),
+    "hazard_falling": EventTemplate(
+        ["A heavy object falls on {name}, causing {hazard.damage} damage!",
+         "{name} is struck by a falling object, taking {hazard.damage} damage!",
+         "Something crashes down on {name} for {hazard.damage} damage!"],
+        action_type="falling_object", message_type="npc_attack"),
+    "hazard_falling_defeated": EventTemplate(
+        ["A heavy object falls on {name}, causing {hazard.damage} damage! They collapse to the ground, defeated.",
+         "{name} is struck by a falling object, taking {hazard.damage} damage! They collapse to the ground, defeated.",
+         "Something crashes down on {name} for {hazard.damage} damage! They collapse to the ground, defeated."],
+        action_type="falling_object", message_type="npc_attack"),
+    "hazard_generic": EventTemplate(
+        ["{name} is affected by the {hazard.name}.",
+         "The {hazard.name} causes {name} to {hazard.effect}.",
+         "{name} suffers from the effects of the {hazard.name}."],
+        action_type="hazard_effect"),
+}
+
+
+class NPCEvent:
+    """
+    A structured record of something an NPC did.
+
+    The text is rendered lazily (and only once) from the event's template, so
+    the message systems can read the NPC, gang, item and action type directly
+    instead of parsing them back out of a sentence.
+    """
+    __slots__ = ('npc', 'gang', 'action_type', 'message_type', 'template_id',
+                 'variant', 'item', 'hazard', 'detail', '_text')
+
+    def __init__(self, npc, template_id, item=None, hazard=None, detail=None, variant=None):
+        template = EVENT_TEMPLATES[template_id]
+        self.npc = npc
+        self.gang = getattr(npc, 'gang', None)
+        self.action_type = template.action_type
+        self.message_type = template.message_type
+        self.template_id = template_id
+        # Pick the text variant now so the random choice happens when the event does
+        self.variant = rng.messaging.randrange(len(template.texts)) if variant is None else variant
+        self.item = item
+        self.hazard = hazard
+        self.detail = detail
+        self._text = None
+
+    @property
+    def npc_name(self):
+        return self.npc.name if self.npc is not None else None
+
+    @property
+    def gang_name(self):
+        return self.gang.name if self.gang is not None else None
+
+    @property
+    def key(self):
+        """What makes two events the same event, without rendering either of them."""
+        return (self.npc, self.message_type, self.template_id, self.variant,
+                self.item, self.hazard, self.detail)
+
+    @property
+    def item_name(self):
+        if self.item is None:
+            return None
+        return getattr(self.item, 'name', str(self.item))
+
+    def render(self):
+        """Render the event as display text (cached after the first call)."""
+        if self._text is None:
+            template = EVENT_TEMPLATES[self.template_id].templates[self.variant]
+            self._text = template.render_singular(
+                name=self.npc_name,
+                gang=self.gang_name,
+                item=self.item_name,
+                hazard=self.hazard,
+                detail=self.detail,
+            )
+        return self._text
+
+    def __str__(self):
+        return self.render()
+
+    def __repr__(self):
+        return f"NPCEvent({self.template_id!r}, npc={self.npc_name!r}, action={self.action_type!r})"
+
+    # Events compare and hash by their structured fields (see key), so duplicate
+    # checks and sets of events never render any text
+    def __eq__(self, other):
+        if isinstance(other, NPCEvent):
+            return self.key == other.key
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.key)
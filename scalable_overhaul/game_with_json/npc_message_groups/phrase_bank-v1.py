@@ -0,0 +1,269 @@
+"""
+Phrase Bank for Root Access
+
+NPC reaction phrases used to be loaded with json.load() when npc_behavior was
+imported, so every phrase in npc_reactions.json was parsed and kept in memory
+whether or not the game ever used it. That is fine for one small file but not
+for big community reaction packs.
+
+This module compiles each reaction JSON file once into an indexed binary file
+next to it (npc_reactions.json -> npc_reactions.json.phrasebank). The compiled
+file is memory-mapped, only its small index is read up front, and a category's
+phrases are decoded the first time someone asks for them. The compiled file is
+rebuilt automatically when the JSON file changes.
+
+Key Components:
+--------------
+1. compile_phrase_file: Turns a reaction JSON file into the indexed binary format
+2. PhraseSource: One compiled, memory-mapped reaction file
+3. PhraseBank: All reaction sources together, with a per-category cache
+4. phrase_bank: The shared bank, loaded from npc_reactions.json
+
+Categories:
+----------
+Nested JSON objects become slash-separated category paths:
+    {"possible_hallucinations": {"singular": [...]}}  ->  "possible_hallucinations/singular"
+
+    phrase_bank.phrases("possible_hallucinations", "singular", ["starts seeing things."])
+    phrase_bank.phrases("idle_phrases", default=["{} is standing around."])
+
+When several sources have the same category (a reaction pack adding more
+hallucinations), their phrases are combined in the order the sources were added.
+
+Compiled File Layout (little-endian):
+------------------------------------
+header:  magic "RAPB", format version (u16), source size (u64), source mtime in ns (u64),
+         category count (u32)
+index:   per category: key length (u16), data offset (u64), phrase count (u32),
+         data length (u32), key (utf-8)
+data:    per phrase: length (u32), text (utf-8)
+"""
+
+import os
+import json
+import mmap
+import struct
+
+from trace_channel import tracer
+
+
+MAGIC = b'RAPB'
+FORMAT_VERSION = 1
+EXTENSION = ".phrasebank"
+
+_HEADER = struct.Struct('<4sHQQI')
+_ENTRY = struct.Struct('<HQII')
+_LENGTH = struct.Struct('<I')
+
+
+def _flatten(data, prefix=""):
+    """Yield (category path, phrases) for every phrase list in a reaction JSON object."""
+    for key, value in data.items():
+        path = f"{prefix}/{key}" if prefix else key
+        if isinstance(value, dict):
+            yield from _flatten(value, path)
+        elif isinstance(value, list):
+            yield path, [str(phrase) for phrase in value]
+        elif isinstance(value, str):
+            yield path, [value]
+
+
+def compile_phrase_file(source_path, target_path):
+    """
+    Compile a reaction JSON file into the indexed phrase bank format.
+
+    The file is written under a temporary name and then moved into place, so
+    a half-written file is never picked up.
+    """
+    with open(source_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    stat = os.stat(source_path)
+
+    categories = list(_flatten(data))
+    index = bytearray()
+    body = bytearray()
+    for key, phrases in categories:
+        start = len(body)
+        for phrase in phrases:
+            raw = phrase.encode("utf-8")
+            body += _LENGTH.pack(len(raw))
+            body += raw
+        raw_key = key.encode("utf-8")
+        index += _ENTRY.pack(len(raw_key), start, len(phrases), len(body) - start)
+        index += raw_key
+
+    temp_path = target_path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, stat.st_size, stat.st_mtime_ns, len(categories)))
+        f.write(index)
+        f.write(body)
+    os.replace(temp_path, target_path)
+    return len(categories)
+
+
+class PhraseSource:
+    """One reaction JSON file, compiled and memory-mapped on first use."""
+
+    def __init__(self, source_path, compiled_path=None):
+        self.source_path = source_path
+        self.compiled_path = compiled_path or source_path + EXTENSION
+        self._buffer = None  # mmap of the compiled file (or bytes if it couldn't be written)
+        self._index = None  # category path -> (data offset, phrase count, data length)
+        self._data_start = 0
+        self._loaded = {}  # category path -> decoded phrase list
+
+    def _is_current(self, path, stat):
+        """Check if a compiled file exists and was built from the current source file."""
+        try:
+            with open(path, "rb") as f:
+                header = f.read(_HEADER.size)
+        except OSError:
+            return False
+        if len(header) < _HEADER.size:
+            return False
+        magic, version, size, mtime_ns, _ = _HEADER.unpack(header)
+        return (magic == MAGIC and version == FORMAT_VERSION
+                and size == stat.st_size and mtime_ns == stat.st_mtime_ns)
+
+    def _open(self):
+        """Compile the source if needed, map the compiled file and read its index."""
+        self._index = {}
+        try:
+            stat = os.stat(self.source_path)
+        except OSError as e:
+            tracer.error("phrase_bank", "load_failed", file=os.path.basename(self.source_path), error=e)
+            return
+
+        try:
+            if not self._is_current(self.compiled_path, stat):
+                compile_phrase_file(self.source_path, self.compiled_path)
+            with open(self.compiled_path, "rb") as f:
+                self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:
+            # Broken JSON: the game falls back to its built-in default phrases
+            tracer.error("phrase_bank", "load_failed", file=os.path.basename(self.source_path), error=e)
+            return
+        except OSError:
+            # Read-only folder: fall back to compiling in memory
+            try:
+                self._buffer = self._compile_in_memory()
+            except (OSError, ValueError) as inner:
+                tracer.error("phrase_bank", "load_failed", file=os.path.basename(self.source_path), error=inner)
+                return
+
+        buffer = self._buffer
+        _, _, _, _, count = _HEADER.unpack_from(buffer, 0)
+        pos = _HEADER.size
+        for _ in range(count):
+            key_length, offset, phrase_count, length = _ENTRY.unpack_from(buffer, pos)
+            pos += _ENTRY.size
+            key = bytes(buffer[pos:pos + key_length]).decode("utf-8")
+            pos += key_length
+            self._index[key] = (offset, phrase_count, length)
+        self._data_start = pos
+
+    def _compile_in_memory(self):
+        """Build the compiled format as bytes without keeping it on disk."""
+        import tempfile
+        with tempfile.TemporaryDirectory() as folder:
+            target = os.path.join(folder, "reactions" + EXTENSION)
+            compile_phrase_file(self.source_path, target)
+            with open(target, "rb") as f:
+                return f.read()
+
+    def categories(self):
+        """Get every category path in this source."""
+        if self._index is None:
+            self._open()
+        return list(self._index)
+
+    def get(self, key):
+        """Get a category's phrases (decoded on first access), or None if it isn't in this source."""
+        phrases = self._loaded.get(key)
+        if phrases is not None:
+            return phrases
+        if self._index is None:
+            self._open()
+        entry = self._index.get(key)
+        if entry is None:
+            return None
+
+        offset, count, length = entry
+        buffer = self._buffer
+        pos = self._data_start + offset
+        phrases = []
+        for _ in range(count):
+            (phrase_length,) = _LENGTH.unpack_from(buffer, pos)
+            pos += _LENGTH.size
+            phrases.append(bytes(buffer[pos:pos + phrase_length]).decode("utf-8"))
+            pos += phrase_length
+        self._loaded[key] = phrases
+        return phrases
+
+    def close(self):
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        self._buffer = None
+        self._index = None
+        self._loaded = {}
+
+
+class PhraseBank:
+    """Every reaction source together, looked up by category and cached per category."""
+
+    def __init__(self, source_paths=()):
+        self.sources = []
+        self._cache = {}  # category path -> combined phrase list
+        for path in source_paths:
+            self.add_source(path)
+
+    def add_source(self, source_path, compiled_path=None):
+        """Add a reaction file (e.g. a community reaction pack). Nothing is read until it's used."""
+        self.sources.append(PhraseSource(source_path, compiled_path))
+        self._cache.clear()
+
+    def phrases(self, group, key=None, default=None):
+        """
+        Get the phrases of a category.
+
+        Args:
+            group: Top-level JSON key, e.g. "possible_hallucinations"
+            key: Optional nested key, e.g. "singular"
+            default: Returned when no source has the category (or it's empty)
+
+        Returns:
+            The phrase list (shared, don't modify it) or the default
+        """
+        path = group if key is None else f"{group}/{key}"
+        phrases = self._cache.get(path)
+        if phrases is None:
+            found = [source.get(path) for source in self.sources]
+            found = [source_phrases for source_phrases in found if source_phrases]
+            if len(found) == 1:
+                phrases = found[0]
+            else:
+                phrases = [phrase for source_phrases in found for phrase in source_phrases]
+            self._cache[path] = phrases
+        if not phrases:
+            return default if default is not None else []
+        return phrases
+
+    def has(self, group, key=None):
+        return bool(self.phrases(group, key))
+
+    def categories(self):
+        """Get every category path in every source."""
+        paths = []
+        for source in self.sources:
+            for path in source.categories():
+                if path not in paths:
+                    paths.append(path)
+        return paths
+
+    def loaded_categories(self):
+        """Get the category paths that have been decoded so far."""
+        return [path for path, phrases in self._cache.items() if phrases]
+
+
+# Shared phrase bank, loaded from the reaction file next to the game modules
+phrase_bank = PhraseBank([os.path.join(os.path.dirname(os.path.abspath(__file__)), "npc_reactions.json")])
@@ -0,0 +1,112 @@
+"""
+RNG Streams for Root Access
+
+Every random decision in the game used to come from the one global generator
+in the random module. Any extra draw anywhere (one more NPC in an area, one more
+message to throttle) shifted every draw after it, so two runs of the same
+command script never did the same work and benchmark numbers between versions
+couldn't be compared.
+
+This module splits the randomness into named streams, one per subsystem, each
+with its own generator seeded from the game seed and the stream name. A change
+in how often one subsystem draws no longer changes what any other subsystem
+gets, and the same seed always gives the same game.
+
+Key Components:
+--------------
+1. RNGService: The named streams plus seeding and injection
+2. rng: The shared service every game module draws from
+3. STREAMS: The standard stream names
+
+Streams:
+-------
+behavior   NPC behavior choices, targets and item use
+combat     Attacks on and by the player, damage rolls, combat text
+messaging  Message throttling, summaries and text variants
+hazards    Which NPCs a hazard hits and how they react
+worldgen   Spawned items, generated names, extra gang members
+
+Usage:
+-----
+    from rng_streams import rng
+    if rng.combat.random() < 0.5: ...
+    target = rng.behavior.choice(targets)
+
+    rng.seed(42)                           # Reproducible run
+    rng.install('combat', FixedRandom())   # Inject a custom generator (tests, replays)
+"""
+
+import random
+
+
+STREAMS = ('behavior', 'combat', 'messaging', 'hazards', 'worldgen')
+
+
+class RNGService:
+    """Independently seeded random generators, one per named subsystem stream."""
+
+    def __init__(self, seed=None, streams=STREAMS):
+        self.base_seed = seed
+        self._streams = {}
+        for name in streams:
+            self._streams[name] = random.Random()
+        self.seed(seed)
+
+    def seed(self, seed=None):
+        """
+        Reseed every stream from one seed.
+
+        Each stream is seeded from "seed:name", so the streams don't repeat
+        each other. A seed of None seeds every stream from the system's
+        entropy source (a normal, unrepeatable game).
+        """
+        self.base_seed = seed
+        for name, generator in self._streams.items():
+            generator.seed(None if seed is None else f"{seed}:{name}")
+
+    def stream(self, name):
+        """Get a stream by name, creating (and seeding) it if it doesn't exist yet."""
+        generator = self._streams.get(name)
+        if generator is None:
+            generator = random.Random(None if self.base_seed is None else f"{self.base_seed}:{name}")
+            self._streams[name] = generator
+        return generator
+
+    def install(self, name, generator):
+        """Replace a stream with another generator (anything with the random.Random methods)."""
+        self._streams[name] = generator
+
+    def get_state(self):
+        """Get the state of every stream (for saving or replaying from a point)."""
+        return {name: generator.getstate() for name, generator in self._streams.items()
+                if hasattr(generator, 'getstate')}
+
+    def set_state(self, state):
+        """Restore stream states from get_state()."""
+        for name, generator_state in state.items():
+            self.stream(name).setstate(generator_state)
+
+    # The standard streams as attributes (rng.combat instead of rng.stream('combat'))
+    @property
+    def behavior(self):
+        return self._streams['behavior']
+
+    @property
+    def combat(self):
+        return self._streams['combat']
+
+    @property
+    def messaging(self):
+        return self._streams['messaging']
+
+    @property
+    def hazards(self):
+        return self._streams['hazards']
+
+    @property
+    def worldgen(self):
+        return self._streams['worldgen']
+
+
+# Shared service used by all game modules
+rng = RNGService()
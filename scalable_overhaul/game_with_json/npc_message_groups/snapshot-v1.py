@@ -0,0 +1,955 @@
+"""
+Snapshot Save/Load for Root Access
+
+The game had no way to save at all. This module writes the whole world (areas,
+items, objects, NPCs, gangs, the player, behavior cooldowns) to a compact
+binary file and reads it back.
+
+Every object in the world gets a stable snapshot id the first time it is
+saved, and every string (names, descriptions, attribute names) is stored once
+in a string table and referenced by index after that. Because both stay the
+same between saves, a later save only has to write the objects whose state
+actually changed since the previous one (a "delta"). Loading reads the full
+save and then applies its deltas in order.
+
+Key Components:
+--------------
+1. SnapshotWriter: Walks the object graph from the roots and encodes records
+2. SnapshotReader: Decodes a full save plus its deltas and rebuilds the objects
+3. SnapshotManager: Owns the string/class tables and ids between saves, and
+   plugs save/load/autosave into the Game
+4. SnapshotError: Raised for unreadable or incompatible snapshot files
+
+File Layout (all integers are varints unless noted):
+---------------------------------------------------
+MAGIC (6 bytes), FORMAT_VERSION (u16), kind (u8: full/delta)
+sequence, base sequence, turn
+new strings:  first index, count, then (length, utf-8 bytes) per string
+new classes:  first index, count, then (module string, qualname string) per class
+records:      count, then (object id, class index, mode, state value) per record
+roots:        one value (a dict of root name -> value)
+
+Values are tagged (one byte tag, then the payload). Objects are never written
+inline: a value that is an object is written as a reference to its id, so
+shared objects and cycles (area -> npc -> area) come back as the same object.
+
+Objects can control what gets saved by defining __getstate__/__setstate__,
+the same hooks pickle uses (AreaCollection does this, since it is indexed by
+id() which changes between runs).
+"""
+
+import os
+import sys
+import random
+import enum
+import struct
+import importlib
+import collections
+from array import array
+
+from trace_channel import tracer
+
+
+MAGIC = b'RASNAP'
+FORMAT_VERSION = 1
+
+KIND_FULL = 0
+KIND_DELTA = 1
+
+# Record modes
+MODE_ATTRS = 0  # State is a dict of attribute name -> value
+MODE_SETSTATE = 1  # State is whatever __getstate__ returned, handed to __setstate__
+
+# Value tags
+T_NONE = 0
+T_TRUE = 1
+T_FALSE = 2
+T_INT = 3
+T_FLOAT = 4
+T_STR = 5
+T_LIST = 6
+T_TUPLE = 7
+T_DICT = 8
+T_SET = 9
+T_FROZENSET = 10
+T_REF = 11
+T_ENUM = 12
+T_ARRAY = 13
+T_ODICT = 14
+T_DEQUE = 15
+T_BYTES = 16
+T_METHOD = 17
+T_GLOBAL = 18
+T_GAME = 19
+T_DEFAULTDICT = 20
+
+_DOUBLE = struct.Struct('<d')
+_HEADER = struct.Struct('<6sHB')
+
+# Classes may be saved from a game started as a script (module "__main__") and
+# loaded by one that imported main.py (module "main"), or the other way round
+_MODULE_ALIASES = {'__main__': 'main', 'main': '__main__'}
+
+# Types that are written inline as plain values rather than as object records
+_FUNCTION_TYPES = (type(len), type(lambda: None), type)
+
+
+class SnapshotError(Exception):
+    """A snapshot file could not be written or read."""
+
+
+def _write_varint(out, value):
+    """Append an unsigned varint (7 bits per byte, high bit = more bytes follow)."""
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, pos):
+    """Read an unsigned varint. Returns (value, new position)."""
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _zigzag(value):
+    """Map signed ints onto unsigned ones (0, -1, 1, -2, ...) so small negatives stay short."""
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _unzigzag(value):
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+def _has_custom_state(cls):
+    """Check if a class takes over its own saving with __getstate__/__setstate__."""
+    return (getattr(cls, '__setstate__', None) is not None
+            and getattr(cls, '__getstate__', None) is not object.__getstate__)
+
+
+def _slot_names(cls):
+    """Get every __slots__ attribute name of a class and its bases."""
+    names = []
+    for klass in cls.__mro__:
+        slots = klass.__dict__.get('__slots__', ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        for name in slots:
+            if name not in ('__dict__', '__weakref__') and name not in names:
+                names.append(name)
+    return names
+
+
+def resolve_global(module_name, qualname):
+    """Find a class or function by module and qualified name."""
+    module = sys.modules.get(module_name)
+    if module is None or not hasattr(module, qualname.split('.')[0]):
+        alias = _MODULE_ALIASES.get(module_name)
+        if alias is not None and alias in sys.modules:
+            module = sys.modules[alias]
+    if module is None:
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:
+            raise SnapshotError(f"Snapshot needs module '{module_name}', which can't be imported")
+
+    target = module
+    for part in qualname.split('.'):
+        target = getattr(target, part, None)
+        if target is None:
+            raise SnapshotError(f"Snapshot needs '{module_name}.{qualname}', which doesn't exist")
+    return target
+
+
+class SnapshotTables:
+    """
+    The string table, class table and object ids shared by a full save and its deltas.
+
+    Indexes only ever get appended to, so a record encoded for one save encodes
+    to the same bytes in the next save if the object didn't change. That is
+    what lets delta saves find changed objects by comparing bytes.
+    """
+
+    def __init__(self):
+        self.strings = []  # index -> string
+        self.string_index = {}  # string -> index
+        self.classes = []  # index -> class
+        self.class_index = {}  # class -> index
+        self.objects = {}  # object id -> object (keeps saved objects alive, so id() stays unique)
+        self.object_ids = {}  # id(object) -> object id
+        self.next_object_id = 1
+        self.digests = {}  # object id -> encoded record bytes of the last save
+
+    def intern_string(self, text):
+        index = self.string_index.get(text)
+        if index is None:
+            index = len(self.strings)
+            self.strings.append(text)
+            self.string_index[text] = index
+        return index
+
+    def intern_class(self, cls):
+        index = self.class_index.get(cls)
+        if index is None:
+            index = len(self.classes)
+            self.classes.append(cls)
+            self.class_index[cls] = index
+            # The names have to be in the string table as well
+            self.intern_string(self.module_name(cls))
+            self.intern_string(cls.__qualname__)
+        return index
+
+    def mark(self):
+        """Remember how big the string and class tables are (see rollback)."""
+        return len(self.strings), len(self.classes)
+
+    def rollback(self, mark):
+        """
+        Drop the strings and classes added since mark() (a save that failed).
+
+        They were never written to a file, so later deltas must not refer to
+        them. Object ids stay assigned: an id only gets written along with its
+        record, and records without a digest are written by the next save.
+        """
+        string_count, class_count = mark
+        for cls in self.classes[class_count:]:
+            del self.class_index[cls]
+        del self.classes[class_count:]
+        for text in self.strings[string_count:]:
+            del self.string_index[text]
+        del self.strings[string_count:]
+
+    def object_id(self, obj):
+        """Get an object's snapshot id, assigning a new one if it doesn't have one. Returns (id, is_new)."""
+        object_id = self.object_ids.get(id(obj))
+        if object_id is not None:
+            return object_id, False
+        object_id = self.next_object_id
+        self.next_object_id += 1
+        self.object_ids[id(obj)] = object_id
+        self.objects[object_id] = obj
+        return object_id, True
+
+    def bind(self, object_id, obj):
+        """Register a loaded object under the id it had in the snapshot."""
+        self.object_ids[id(obj)] = object_id
+        self.objects[object_id] = obj
+        self.next_object_id = max(self.next_object_id, object_id + 1)
+
+    @staticmethod
+    def module_name(cls):
+        return cls.__module__
+
+
+class SnapshotWriter:
+    """Encodes the objects reachable from a set of roots into a snapshot file."""
+
+    def __init__(self, game, tables):
+        self.game = game
+        self.tables = tables
+        self.string_start = len(tables.strings)  # Strings before this are already in earlier files
+        self.class_start = len(tables.classes)
+        self.pending = collections.deque()  # Objects referenced but not encoded yet
+        self.queued = set()  # Object ids already queued in this save
+        self.records = {}  # object id -> encoded record body (class, mode, state)
+
+    def _reference(self, obj):
+        """Get the object's id and queue it for encoding."""
+        object_id, _ = self.tables.object_id(obj)
+        if object_id not in self.queued:
+            self.queued.add(object_id)
+            self.pending.append((object_id, obj))
+        return object_id
+
+    def encode_value(self, value, out):
+        """Append one tagged value."""
+        # Exact type checks first: they're the common case and bool is a subclass of int
+        value_type = type(value)
+        if value is None:
+            out.append(T_NONE)
+        elif value is True:
+            out.append(T_TRUE)
+        elif value is False:
+            out.append(T_FALSE)
+        elif value_type is int:
+            out.append(T_INT)
+            _write_varint(out, _zigzag(value))
+        elif value_type is str:
+            out.append(T_STR)
+            _write_varint(out, self.tables.intern_string(value))
+        elif value_type is float:
+            out.append(T_FLOAT)
+            out += _DOUBLE.pack(value)
+        elif value_type is list or value_type is tuple:
+            out.append(T_LIST if value_type is list else T_TUPLE)
+            _write_varint(out, len(value))
+            for element in value:
+                self.encode_value(element, out)
+        elif value_type is dict or value_type is collections.OrderedDict:
+            out.append(T_DICT if value_type is dict else T_ODICT)
+            self._encode_items(value, out)
+        elif value_type is collections.defaultdict:
+            out.append(T_DEFAULTDICT)
+            self.encode_value(value.default_factory, out)
+            self._encode_items(value, out)
+        elif value_type is set or value_type is frozenset:
+            out.append(T_SET if value_type is set else T_FROZENSET)
+            _write_varint(out, len(value))
+            for element in value:
+                self.encode_value(element, out)
+        elif value_type is collections.deque:
+            out.append(T_DEQUE)
+            _write_varint(out, 0 if value.maxlen is None else value.maxlen + 1)
+            _write_varint(out, len(value))
+            for element in value:
+                self.encode_value(element, out)
+        elif value_type is array:
+            out.append(T_ARRAY)
+            _write_varint(out, self.tables.intern_string(value.typecode))
+            raw = value.tobytes()
+            _write_varint(out, len(raw))
+            out += raw
+        elif value_type is bytes:
+            out.append(T_BYTES)
+            _write_varint(out, len(value))
+            out += value
+        elif isinstance(value, enum.Enum):
+            out.append(T_ENUM)
+            _write_varint(out, self.tables.intern_class(value_type))
+            _write_varint(out, self.tables.intern_string(value.name))
+        elif value is self.game:
+            # The game is rebuilt on load, not saved; references point at the loading game
+            out.append(T_GAME)
+        elif hasattr(value, '__self__') and hasattr(value, '__func__'):
+            # Bound method (e.g. the smartphone app options): save the object and the name
+            out.append(T_METHOD)
+            self.encode_value(value.__self__, out)
+            _write_varint(out, self.tables.intern_string(value.__func__.__name__))
+        elif isinstance(value, _FUNCTION_TYPES):
+            if '<lambda>' in value.__qualname__ or '<locals>' in value.__qualname__:
+                raise SnapshotError(f"Can't save {value!r}: it can't be looked up by name")
+            out.append(T_GLOBAL)
+            _write_varint(out, self.tables.intern_class(value))
+        elif hasattr(value, '__dict__') or hasattr(type(value), '__slots__'):
+            out.append(T_REF)
+            _write_varint(out, self._reference(value))
+        else:
+            raise SnapshotError(f"Can't save a value of type {value_type.__name__}")
+
+    def _encode_items(self, mapping, out):
+        _write_varint(out, len(mapping))
+        for key, item in mapping.items():
+            self.encode_value(key, out)
+            self.encode_value(item, out)
+
+    def encode_object(self, obj):
+        """Encode one object record body: class index, mode and state."""
+        cls = type(obj)
+        out = bytearray()
+        _write_varint(out, self.tables.intern_class(cls))
+        if _has_custom_state(cls):
+            out.append(MODE_SETSTATE)
+            self.encode_value(obj.__getstate__(), out)
+            return bytes(out)
+
+        out.append(MODE_ATTRS)
+        state = dict(getattr(obj, '__dict__', ()))
+        for name in _slot_names(cls):
+            if hasattr(obj, name):
+                state[name] = getattr(obj, name)
+        self.encode_value(state, out)
+        return bytes(out)
+
+    def write(self, roots, kind, sequence, base_sequence, turn):
+        """
+        Encode everything reachable from the roots.
+
+        For delta saves only records that differ from the previous save are written.
+        The tables' digests are left alone until commit() is called, once the
+        file has been written.
+
+        Returns:
+            (file bytes, number of records written, number of objects reachable)
+        """
+        roots_out = bytearray()
+        self.encode_value(roots, roots_out)
+
+        # Breadth-first over the object graph; encoding a record queues whatever it references
+        while self.pending:
+            object_id, obj = self.pending.popleft()
+            self.records[object_id] = self.encode_object(obj)
+
+        digests = self.tables.digests
+        if kind == KIND_FULL:
+            changed = sorted(self.records)
+        else:
+            changed = [object_id for object_id in sorted(self.records)
+                       if digests.get(object_id) != self.records[object_id]]
+
+        out = bytearray(_HEADER.pack(MAGIC, FORMAT_VERSION, kind))
+        _write_varint(out, sequence)
+        _write_varint(out, base_sequence)
+        _write_varint(out, turn)
+
+        # Only the strings and classes this file added to the shared tables
+        strings = self.tables.strings
+        _write_varint(out, self.string_start)
+        _write_varint(out, len(strings) - self.string_start)
+        for text in strings[self.string_start:]:
+            raw = text.encode('utf-8', 'surrogatepass')
+            _write_varint(out, len(raw))
+            out += raw
+
+        classes = self.tables.classes
+        _write_varint(out, self.class_start)
+        _write_varint(out, len(classes) - self.class_start)
+        for cls in classes[self.class_start:]:
+            _write_varint(out, self.tables.string_index[self.tables.module_name(cls)])
+            _write_varint(out, self.tables.string_index[cls.__qualname__])
+
+        _write_varint(out, len(changed))
+        for object_id in changed:
+            _write_varint(out, object_id)
+            out += self.records[object_id]
+
+        out += roots_out
+        return bytes(out), len(changed), len(self.records)
+
+    def commit(self):
+        """The file was written: its records are what the next delta compares against."""
+        self.tables.digests.update(self.records)
+
+
+class SnapshotReader:
+    """Decodes a full snapshot plus its deltas and rebuilds the object graph."""
+
+    def __init__(self, game):
+        self.game = game
+        self.strings = []
+        self.classes = []
+        self.class_names = []  # (module, qualname) per class index
+        self.records = {}  # object id -> (class index, mode, raw bytes, offset of the state value)
+        self.roots = None
+        self.turn = 0
+        self.sequence = -1
+        self.objects = {}  # object id -> rebuilt object
+        self.fill_later = []  # (container, items) for dicts and sets, filled after every object
+
+    def read_file(self, data, expected_kind=None):
+        """Read one snapshot file (full or delta) on top of what was read so far."""
+        if len(data) < _HEADER.size:
+            raise SnapshotError("Snapshot file is truncated")
+        magic, version, kind = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise SnapshotError("Not a Root Access snapshot file")
+        if version != FORMAT_VERSION:
+            raise SnapshotError(f"Snapshot format version {version} is not supported "
+                                f"(this game reads version {FORMAT_VERSION})")
+        if expected_kind is not None and kind != expected_kind:
+            raise SnapshotError("Snapshot file is not the expected kind (full save or delta)")
+
+        pos = _HEADER.size
+        sequence, pos = _read_varint(data, pos)
+        base_sequence, pos = _read_varint(data, pos)
+        self.turn, pos = _read_varint(data, pos)
+        if kind == KIND_DELTA and base_sequence != self.sequence:
+            raise SnapshotError(f"Delta {sequence} doesn't follow save {self.sequence}")
+        self.sequence = sequence
+
+        first, pos = _read_varint(data, pos)
+        count, pos = _read_varint(data, pos)
+        if first != len(self.strings):
+            raise SnapshotError("Snapshot string table is out of order")
+        for _ in range(count):
+            length, pos = _read_varint(data, pos)
+            self.strings.append(data[pos:pos + length].decode('utf-8', 'surrogatepass'))
+            pos += length
+
+        first, pos = _read_varint(data, pos)
+        count, pos = _read_varint(data, pos)
+        if first != len(self.class_names):
+            raise SnapshotError("Snapshot class table is out of order")
+        for _ in range(count):
+            module_index, pos = _read_varint(data, pos)
+            name_index, pos = _read_varint(data, pos)
+            self.class_names.append((self.strings[module_index], self.strings[name_index]))
+
+        count, pos = _read_varint(data, pos)
+        for _ in range(count):
+            object_id, pos = _read_varint(data, pos)
+            start = pos
+            class_index, pos = _read_varint(data, pos)
+            mode = data[pos]
+            pos += 1
+            state_start = pos
+            pos = self._skip_value(data, pos)
+            self.records[object_id] = (class_index, mode, data, start, state_start, pos)
+
+        self.roots = (data, pos)
+
+    def _skip_value(self, data, pos):
+        """Find the end of a value without decoding it (records are only decoded once, at the end)."""
+        tag = data[pos]
+        pos += 1
+        if tag in (T_NONE, T_TRUE, T_FALSE, T_GAME):
+            return pos
+        if tag in (T_INT, T_STR, T_REF, T_GLOBAL):
+            return _read_varint(data, pos)[1]
+        if tag == T_FLOAT:
+            return pos + _DOUBLE.size
+        if tag in (T_LIST, T_TUPLE, T_SET, T_FROZENSET):
+            count, pos = _read_varint(data, pos)
+            for _ in range(count):
+                pos = self._skip_value(data, pos)
+            return pos
+        if tag in (T_DICT, T_ODICT, T_DEFAULTDICT):
+            if tag == T_DEFAULTDICT:
+                pos = self._skip_value(data, pos)
+            count, pos = _read_varint(data, pos)
+            for _ in range(count * 2):
+                pos = self._skip_value(data, pos)
+            return pos
+        if tag == T_DEQUE:
+            _, pos = _read_varint(data, pos)
+            count, pos = _read_varint(data, pos)
+            for _ in range(count):
+                pos = self._skip_value(data, pos)
+            return pos
+        if tag == T_ENUM:
+            _, pos = _read_varint(data, pos)
+            return _read_varint(data, pos)[1]
+        if tag == T_ARRAY:
+            _, pos = _read_varint(data, pos)
+            length, pos = _read_varint(data, pos)
+            return pos + length
+        if tag == T_BYTES:
+            length, pos = _read_varint(data, pos)
+            return pos + length
+        if tag == T_METHOD:
+            pos = self._skip_value(data, pos)
+            return _read_varint(data, pos)[1]
+        raise SnapshotError(f"Unknown value tag {tag} in snapshot")
+
+    def get_class(self, index):
+        while len(self.classes) <= index:
+            self.classes.append(None)
+        cls = self.classes[index]
+        if cls is None:
+            cls = resolve_global(*self.class_names[index])
+            self.classes[index] = cls
+        return cls
+
+    def decode_value(self, data, pos):
+        """Decode one tagged value. Returns (value, new position)."""
+        tag = data[pos]
+        pos += 1
+        if tag == T_NONE:
+            return None, pos
+        if tag == T_TRUE:
+            return True, pos
+        if tag == T_FALSE:
+            return False, pos
+        if tag == T_INT:
+            value, pos = _read_varint(data, pos)
+            return _unzigzag(value), pos
+        if tag == T_STR:
+            index, pos = _read_varint(data, pos)
+            return self.strings[index], pos
+        if tag == T_FLOAT:
+            return _DOUBLE.unpack_from(data, pos)[0], pos + _DOUBLE.size
+        if tag == T_REF:
+            object_id, pos = _read_varint(data, pos)
+            obj = self.objects.get(object_id)
+            if obj is None:
+                raise SnapshotError(f"Snapshot references missing object {object_id}")
+            return obj, pos
+        if tag == T_LIST or tag == T_TUPLE:
+            count, pos = _read_varint(data, pos)
+            values = []
+            for _ in range(count):
+                value, pos = self.decode_value(data, pos)
+                values.append(value)
+            return (values if tag == T_LIST else tuple(values)), pos
+        if tag in (T_DICT, T_ODICT, T_DEFAULTDICT):
+            if tag == T_DEFAULTDICT:
+                factory, pos = self.decode_value(data, pos)
+                container = collections.defaultdict(factory)
+            else:
+                container = {} if tag == T_DICT else collections.OrderedDict()
+            count, pos = _read_varint(data, pos)
+            items = []
+            for _ in range(count):
+                key, pos = self.decode_value(data, pos)
+                value, pos = self.decode_value(data, pos)
+                items.append((key, value))
+            # Keys may be objects whose hash depends on state that isn't loaded yet
+            self.fill_later.append((container, items))
+            return container, pos
+        if tag == T_SET:
+            count, pos = _read_varint(data, pos)
+            items = []
+            for _ in range(count):
+                value, pos = self.decode_value(data, pos)
+                items.append(value)
+            container = set()
+            self.fill_later.append((container, items))
+            return container, pos
+        if tag == T_FROZENSET:
+            count, pos = _read_varint(data, pos)
+            items = []
+            for _ in range(count):
+                value, pos = self.decode_value(data, pos)
+                items.append(value)
+            return frozenset(items), pos
+        if tag == T_DEQUE:
+            maxlen, pos = _read_varint(data, pos)
+            count, pos = _read_varint(data, pos)
+            items = []
+            for _ in range(count):
+                value, pos = self.decode_value(data, pos)
+                items.append(value)
+            return collections.deque(items, maxlen - 1 if maxlen else None), pos
+        if tag == T_ENUM:
+            class_index, pos = _read_varint(data, pos)
+            name_index, pos = _read_varint(data, pos)
+            return self.get_class(class_index)[self.strings[name_index]], pos
+        if tag == T_ARRAY:
+            typecode_index, pos = _read_varint(data, pos)
+            length, pos = _read_varint(data, pos)
+            values = array(self.strings[typecode_index])
+            values.frombytes(data[pos:pos + length])
+            return values, pos + length
+        if tag == T_BYTES:
+            length, pos = _read_varint(data, pos)
+            return bytes(data[pos:pos + length]), pos + length
+        if tag == T_METHOD:
+            owner, pos = self.decode_value(data, pos)
+            name_index, pos = _read_varint(data, pos)
+            return getattr(owner, self.strings[name_index]), pos
+        if tag == T_GLOBAL:
+            class_index, pos = _read_varint(data, pos)
+            return self.get_class(class_index), pos
+        if tag == T_GAME:
+            return self.game, pos
+        raise SnapshotError(f"Unknown value tag {tag} in snapshot")
+
+    def decode_attrs(self, data, pos):
+        """Decode an attribute dict as a list of (name, value) pairs, right away rather than deferred."""
+        if data[pos] != T_DICT:
+            raise SnapshotError("Object record without an attribute dict")
+        count, pos = _read_varint(data, pos + 1)
+        attrs = []
+        for _ in range(count):
+            name, pos = self.decode_value(data, pos)
+            value, pos = self.decode_value(data, pos)
+            attrs.append((name, value))
+        return attrs
+
+    def build(self, existing=None):
+        """
+        Rebuild every object and return the decoded roots.
+
+        Objects are created empty first (so references and cycles can be
+        resolved), then given their state, then dicts and sets are filled,
+        and only then are __setstate__ hooks called.
+
+        Args:
+            existing: Optional {object id: live object} to restore in place
+                      instead of creating (module-level singletons)
+        """
+        existing = existing or {}
+        for object_id, (class_index, _, _, _, _, _) in self.records.items():
+            obj = existing.get(object_id)
+            if obj is None:
+                cls = self.get_class(class_index)
+                obj = cls.__new__(cls)
+            self.objects[object_id] = obj
+
+        setstate_calls = []
+        slot_names = {}  # class -> its __slots__ names
+        for object_id, (_, mode, data, _, state_start, _) in self.records.items():
+            obj = self.objects[object_id]
+            if mode == MODE_SETSTATE:
+                state, _ = self.decode_value(data, state_start)
+                setstate_calls.append((obj, state))
+                continue
+            state = self.decode_attrs(data, state_start)
+            cls = type(obj)
+            slots = slot_names.get(cls)
+            if slots is None:
+                slots = slot_names[cls] = set(_slot_names(cls))
+            obj_dict = getattr(obj, '__dict__', None)
+            for name, value in state:
+                if name in slots or obj_dict is None:
+                    object.__setattr__(obj, name, value)
+                else:
+                    obj_dict[name] = value  # Straight into __dict__, past any property setters
+
+        data, pos = self.roots
+        roots, _ = self.decode_value(data, pos)
+
+        # Every object has its state now, so keys that hash by content hash correctly
+        for container, items in self.fill_later:
+            if isinstance(container, set):
+                container.update(items)
+            else:
+                for key, value in items:
+                    container[key] = value
+        self.fill_later = []
+
+        for obj, state in setstate_calls:
+            obj.__setstate__(state)
+        return roots
+
+    def record_bytes(self):
+        """Get each record's encoded bytes, in the same form SnapshotWriter compares."""
+        return {object_id: bytes(data[start:end])
+                for object_id, (_, _, data, start, _, end) in self.records.items()}
+
+
+class SnapshotManager:
+    """
+    Saves and loads the game's world.
+
+    The first save writes a full snapshot; later saves of the same name write
+    a delta next to it (name.snap, name.snap.1, name.snap.2, ...) holding only
+    the objects that changed. Loading reads the full snapshot and every delta
+    after it. A new full save is written once a save has too many deltas.
+    """
+
+    SAVE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "saves")
+    EXTENSION = ".snap"
+    MAX_DELTAS = 20  # Deltas per save before the next save is a full one again
+
+    def __init__(self, game, save_dir=None):
+        self.game = game
+        self.save_dir = save_dir or self.SAVE_DIR
+        self.tables = None  # Shared tables of the current save chain
+        self.chain_path = None  # Full save the current chain belongs to
+        self.sequence = 0  # Number of the last file written or read in the chain
+        self.autosave_interval = 0  # Turns between autosaves (0 = off)
+        self.autosave_name = "autosave"
+        self.last_save_stats = None  # (path, records written, objects reachable, bytes, seconds)
+
+    def get_path(self, name):
+        """Get the path of a save name (names without a directory go in the save folder)."""
+        if not name.endswith(self.EXTENSION):
+            name += self.EXTENSION
+        if os.path.dirname(name):
+            return name
+        return os.path.join(self.save_dir, name)
+
+    def get_current_turn(self):
+        message_manager = getattr(self.game, 'message_manager', None)
+        return getattr(message_manager, 'current_turn', 0)
+
+    def get_singletons(self):
+        """Module-level objects that are restored in place instead of replaced, by root name."""
+        from npc_behavior import behavior_settings
+        from item_prototypes import item_prototypes
+        from effect_scheduler import effect_scheduler
+        # The loaded items point at the saved prototypes, so they become the shared ones
+        return {'behavior_settings': behavior_settings, 'item_prototypes': item_prototypes,
+                'effect_scheduler': effect_scheduler}
+
+    def get_roots(self):
+        """Everything that makes up the saved world."""
+        game = self.game
+        roots = {
+            'areas': game.areas,
+            'items': game.items,
+            'objects': game.objects,
+            'npcs': game.npcs,
+            'gangs': getattr(game, 'gangs', {}),
+            'player': game.player,
+            'npc_message_manager': game.npc_message_manager,
+            'turn': self.get_current_turn(),
+        }
+        scheduler = getattr(game, 'activity_scheduler', None)
+        if scheduler is not None:
+            roots['area_ticks'] = scheduler.last_tick_turn
+        rng = getattr(game, 'rng', None)
+        if rng is not None:
+            # Restoring the streams makes a loaded game continue exactly like the saved one would have
+            roots['rng'] = rng.get_state()
+        # Modules outside this folder (combat_descriptions) still use the random module
+        roots['random'] = random.getstate()
+        roots.update(self.get_singletons())
+        return roots
+
+    def save(self, name=None, full=False):
+        """
+        Save the world. Writes a delta if this save name already has a chain
+        this game wrote or loaded, otherwise a full snapshot.
+
+        Returns:
+            The path of the file that was written
+        """
+        import time
+        started = time.perf_counter()
+        path = self.get_path(name or self.autosave_name)
+        full = (full or self.tables is None or path != self.chain_path
+                or self.sequence >= self.MAX_DELTAS or not os.path.exists(path))
+
+        if full:
+            tables = SnapshotTables()
+            sequence = 0
+            base_sequence = 0
+            kind = KIND_FULL
+        else:
+            tables = self.tables
+            base_sequence = self.sequence
+            sequence = self.sequence + 1
+            kind = KIND_DELTA
+
+        writer = SnapshotWriter(self.game, tables)
+        target = path if kind == KIND_FULL else f"{path}.{sequence}"
+        temp_path = target + ".tmp"
+        # A delta shares the chain's tables: if it isn't written, what it added
+        # to them has to go, or later deltas would refer to strings no file has
+        mark = tables.mark()
+        try:
+            data, written, reachable = writer.write(
+                self.get_roots(), kind, sequence, base_sequence, self.get_current_turn())
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(temp_path, "wb") as handle:
+                handle.write(data)
+            os.replace(temp_path, target)
+        except BaseException:
+            tables.rollback(mark)
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        writer.commit()
+        if kind == KIND_FULL:
+            # The old chain is gone now; if its deltas can't be removed either,
+            # the next save has to be a full one again
+            self.tables = None
+            # Deltas of an older full save don't apply to this one
+            self._remove_deltas(path)
+
+        self.tables = tables
+        self.chain_path = path
+        self.sequence = sequence
+        self.last_save_stats = (target, written, reachable, len(data), time.perf_counter() - started)
+        return target
+
+    def _remove_deltas(self, path):
+        sequence = 1
+        while os.path.exists(f"{path}.{sequence}"):
+            os.remove(f"{path}.{sequence}")
+            sequence += 1
+
+    def load(self, name=None):
+        """
+        Load a save (the full snapshot plus all of its deltas) into the game.
+
+        Returns:
+            The turn the save was made on
+        """
+        path = self.get_path(name or self.autosave_name)
+        if not os.path.exists(path):
+            raise SnapshotError(f"No save found at {path}")
+
+        reader = SnapshotReader(self.game)
+        with open(path, "rb") as handle:
+            reader.read_file(handle.read(), KIND_FULL)
+        sequence = 1
+        while os.path.exists(f"{path}.{sequence}"):
+            with open(f"{path}.{sequence}", "rb") as handle:
+                reader.read_file(handle.read(), KIND_DELTA)
+            sequence += 1
+
+        # Singletons are found through the roots of the snapshot
+        singleton_ids = {}
+        for root_name, obj in self.get_singletons().items():
+            object_id = self._find_root_ref(reader, root_name)
+            if object_id is not None:
+                singleton_ids[object_id] = obj
+        roots = reader.build(singleton_ids)
+        self._apply_roots(roots, reader.turn)
+
+        # Continue the same chain: later saves of this name are deltas on top of it
+        tables = SnapshotTables()
+        tables.strings = list(reader.strings)
+        tables.string_index = {text: index for index, text in enumerate(tables.strings)}
+        for index in range(len(reader.class_names)):
+            cls = reader.get_class(index)
+            tables.classes.append(cls)
+            tables.class_index[cls] = index
+        for object_id, obj in reader.objects.items():
+            tables.bind(object_id, obj)
+        tables.digests = reader.record_bytes()
+
+        self.tables = tables
+        self.chain_path = path
+        self.sequence = reader.sequence
+        return reader.turn
+
+    def _find_root_ref(self, reader, root_name):
+        """Get the object id a root name refers to, without building anything."""
+        data, pos = reader.roots
+        if data[pos] != T_DICT:
+            raise SnapshotError("Snapshot roots are missing")
+        count, pos = _read_varint(data, pos + 1)
+        for _ in range(count):
+            if data[pos] == T_STR:
+                index, value_pos = _read_varint(data, pos + 1)
+                if reader.strings[index] == root_name and data[value_pos] == T_REF:
+                    return _read_varint(data, value_pos + 1)[0]
+            pos = reader._skip_value(data, pos)
+            pos = reader._skip_value(data, pos)
+        return None
+
+    def _apply_roots(self, roots, turn):
+        """Put the loaded world into the game."""
+        game = self.game
+        game.areas = roots['areas']
+        game.items = roots['items']
+        game.objects = roots['objects']
+        game.npcs = roots['npcs']
+        game.gangs = roots.get('gangs', {})  # Saves from before gangs were a root only have them through npcs
+        game.player = roots['player']
+        game.player_starting_items = game.player.inventory
+
+        # Everything that holds on to the old managers has to see the new ones
+        game.npc_message_manager = roots['npc_message_manager']
+        coordinator = getattr(game, 'message_coordinator', None)
+        if coordinator is not None:
+            coordinator.npc_message_manager = game.npc_message_manager
+            if hasattr(game.player, 'notification_manager'):
+                coordinator.notification_manager = game.player.notification_manager
+            coordinator.reset_turn_state()
+
+        # Messages and "last shown" turns from after the save point would change
+        # what the loaded game shows (and throttles), so they go too
+        message_manager = getattr(game, 'message_manager', None)
+        if message_manager is not None:
+            message_manager.current_turn = roots.get('turn', turn)
+            message_manager.clear_messages()
+            message_manager.last_shown.clear()
+        scheduler = getattr(game, 'activity_scheduler', None)
+        if scheduler is not None:
+            scheduler.last_tick_turn = roots.get('area_ticks', {})
+            scheduler.active_areas = []
+        if 'rng' in roots and getattr(game, 'rng', None) is not None:
+            game.rng.set_state(roots['rng'])
+        if 'random' in roots:
+            random.setstate(roots['random'])
+
+    def on_turn_end(self, turn):
+        """Autosave hook, called by Game.run_turn at the end of every turn."""
+        if self.autosave_interval and turn and turn % self.autosave_interval == 0:
+            try:
+                self.save(self.autosave_name)
+            except (OSError, SnapshotError) as error:
+                tracer.error("snapshot", "autosave_failed", name=self.autosave_name, error=error)
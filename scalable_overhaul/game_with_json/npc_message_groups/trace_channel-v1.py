@@ -0,0 +1,279 @@
+"""
+Trace Channel for Root Access
+
+Diagnostics used to be print() calls spread over the code: seven "DEBUG -"
+lines (with the full member lists) every time a hazard was resolved, a
+warning when an NPC was handed something that isn't an item, errors when a
+hazard failed to go off, a phrase file failed to load or an autosave failed.
+All of them went straight to the terminal on every call, whether anyone was
+looking or not, and the hazard ones took longer than the hazard itself.
+
+This module gives them one structured channel instead. A trace record is
+(turn, level, source, event, fields): the fields are kept as values and only
+turned into text when a sink writes them out.
+
+- Levels: DEBUG, INFO, WARNING, ERROR (and OFF). Records below the tracer's
+  level are never built. Hot paths check tracer.debug_on (a plain attribute)
+  before gathering their fields, so a disabled trace point costs one
+  attribute lookup.
+- Ring buffer: the most recent records are kept in memory (tracer.recent()),
+  so something that went wrong can be looked at afterwards.
+- Sinks: where records are sent as they are kept. Each sink has its own
+  minimum level.
+
+Key Components:
+--------------
+1. TraceLevel: How important a record is
+2. TraceRecord: One thing that happened (turn, level, source, event, fields)
+3. Tracer: Level check, ring buffer and sinks
+4. ConsoleSink: Prints records (warnings and errors by default, like the old prints)
+5. FileSink: Appends records to a file, one line each
+6. MemorySink: Keeps records in a list (tests, the headless simulator)
+7. MessageSink: Sends records to a MessageManager as MessageCategory.DEBUG messages (shown in debug mode)
+8. tracer: The shared tracer every module traces to
+
+Sources:
+-------
+- hazards: Hazard resolution (hazard_resolver.py, group_hazard_results)
+- behaviors: NPC behaviors and inventories (npc_behavior.py)
+- coordinator: Messages the MessageCoordinator drops, and why
+- phrase_bank, snapshot: Loading phrases, autosaves
+- templates: Phrases that don't compile into message templates (message_templates.py)
+
+In-Game Commands:
+---------------
+trace                       # Level, sinks and the most recent records
+trace [level]               # debug, info, warning, error or off
+trace recent [n]            # The last n records
+trace file [path]           # Also write records to a file ("trace file off" stops)
+trace messages [on/off]     # Show records as debug messages in the game
+
+Usage:
+-----
+    tracer.warning("behaviors", "invalid_item", npc=npc.name, item=item)
+    if tracer.debug_on:
+        tracer.debug("hazards", "resolved", hazard=hazard.name, counts=outcome.counts())
+
+    tracer.set_level(TraceLevel.DEBUG)
+    tracer.set_sink(FileSink("trace.log"))
+"""
+
+import abc
+import collections
+import enum
+
+
+class TraceLevel(enum.IntEnum):
+    """How important a trace record is."""
+    DEBUG = 10  # Details for following what the game is doing
+    INFO = 20  # Notable things that are expected
+    WARNING = 30  # Something odd that the game recovered from
+    ERROR = 40  # Something failed
+    OFF = 100  # Above every level: nothing is traced
+
+
+class TraceRecord:
+    """One thing that happened, with its fields kept as values."""
+    __slots__ = ('turn', 'level', 'source', 'event', 'fields')
+
+    def __init__(self, turn, level, source, event, fields):
+        self.turn = turn
+        self.level = level
+        self.source = source
+        self.event = event
+        self.fields = fields
+
+    def format(self):
+        """The record as one line of text."""
+        details = ", ".join(f"{key}={value}" for key, value in self.fields.items())
+        text = f"[turn {self.turn}] {self.level.name} {self.source}.{self.event}"
+        return f"{text}: {details}" if details else text
+
+    def __repr__(self):
+        return f"TraceRecord({self.format()!r})"
+
+
+class TraceSink(abc.ABC):
+    """Somewhere trace records are sent. Subclasses implement write()."""
+
+    def __init__(self, level=TraceLevel.DEBUG):
+        self.level = TraceLevel(level)  # Records below this level are not sent here
+
+    @abc.abstractmethod
+    def write(self, record):
+        """Send one record on (only called for records at or above self.level)."""
+
+    def close(self):
+        pass
+
+    def describe(self):
+        return f"{type(self).__name__} ({self.level.name.lower()} and up)"
+
+
+class ConsoleSink(TraceSink):
+    """Prints records."""
+
+    def __init__(self, level=TraceLevel.WARNING):
+        super().__init__(level)
+
+    def write(self, record):
+        print(record.format())
+
+
+class FileSink(TraceSink):
+    """Appends records to a file, one line each (the file is opened on the first record)."""
+
+    def __init__(self, path, level=TraceLevel.DEBUG):
+        super().__init__(level)
+        self.path = path
+        self._file = None
+
+    def write(self, record):
+        if self._file is None:
+            # Line buffered, so the file is up to date if the game stops
+            self._file = open(self.path, 'a', encoding='utf-8', buffering=1)
+        self._file.write(record.format() + "\n")
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def describe(self):
+        return f"{super().describe()}: {self.path}"
+
+
+class MemorySink(TraceSink):
+    """Keeps every record it is sent in a list."""
+
+    def __init__(self, level=TraceLevel.DEBUG):
+        super().__init__(level)
+        self.records = []
+
+    def write(self, record):
+        self.records.append(record)
+
+    def events(self, source=None):
+        """The (source, event) of each record, optionally only from one source."""
+        return [(record.source, record.event) for record in self.records
+                if source is None or record.source == source]
+
+    def clear(self):
+        self.records.clear()
+
+
+class MessageSink(TraceSink):
+    """
+    Sends records to a MessageManager as MessageCategory.DEBUG messages.
+
+    Debug messages are only shown while the manager is in debug mode, so
+    nothing is sent otherwise.
+    """
+
+    def __init__(self, message_manager, level=TraceLevel.DEBUG):
+        super().__init__(level)
+        from message_system import MessageCategory, MessagePriority
+        self.message_manager = message_manager
+        self.category = MessageCategory.DEBUG
+        self.priority = MessagePriority.LOW
+
+    def write(self, record):
+        if self.message_manager.debug_mode:
+            self.message_manager.add_message(record.format(), category=self.category,
+                                             priority=self.priority, metadata={'trace': record})
+
+
+class Tracer:
+    """Keeps recent trace records in a ring buffer and sends them to its sinks."""
+
+    def __init__(self, level=TraceLevel.WARNING, capacity=1000, sinks=()):
+        self.records = collections.deque(maxlen=capacity)  # The most recent records
+        self.sinks = list(sinks)
+        self.turn = 0  # Stamped on every record (the game sets it each turn)
+        self._writing = False  # A sink that traces must not loop back into the sinks
+        self.set_level(level)
+
+    def set_level(self, level):
+        """Trace records at this level and above (TraceLevel.OFF turns tracing off)."""
+        self.level = TraceLevel(level)
+        # Checked by trace points before they gather their fields
+        self.debug_on = self.level <= TraceLevel.DEBUG
+        self.info_on = self.level <= TraceLevel.INFO
+
+    def enabled(self, level):
+        return level >= self.level
+
+    def emit(self, level, source, event, fields):
+        """Keep a record and send it to the sinks. Returns the record (None if below the level)."""
+        if level < self.level:
+            return None
+        record = TraceRecord(self.turn, level, source, event, fields)
+        self.records.append(record)
+        if self._writing:
+            return record
+        self._writing = True
+        try:
+            for sink in self.sinks:
+                if level >= sink.level:
+                    sink.write(record)
+        finally:
+            self._writing = False
+        return record
+
+    def debug(self, source, event, **fields):
+        if self.debug_on:
+            return self.emit(TraceLevel.DEBUG, source, event, fields)
+        return None
+
+    def info(self, source, event, **fields):
+        if self.info_on:
+            return self.emit(TraceLevel.INFO, source, event, fields)
+        return None
+
+    def warning(self, source, event, **fields):
+        return self.emit(TraceLevel.WARNING, source, event, fields)
+
+    def error(self, source, event, **fields):
+        return self.emit(TraceLevel.ERROR, source, event, fields)
+
+    # ------------------------------------------------------------------
+    # Sinks
+    # ------------------------------------------------------------------
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+        return sink
+
+    def set_sink(self, sink):
+        """Add a sink in place of any sink of the same kind (one file, one message manager, ...)."""
+        self.remove_sinks(type(sink))
+        return self.add_sink(sink)
+
+    def remove_sinks(self, sink_class):
+        """Remove (and close) every sink of a kind. Returns how many there were."""
+        removed = [sink for sink in self.sinks if type(sink) is sink_class]
+        for sink in removed:
+            sink.close()
+            self.sinks.remove(sink)
+        return len(removed)
+
+    def find_sink(self, sink_class):
+        return next((sink for sink in self.sinks if type(sink) is sink_class), None)
+
+    # ------------------------------------------------------------------
+    # Ring buffer
+    # ------------------------------------------------------------------
+
+    def recent(self, count=None, level=TraceLevel.DEBUG, source=None):
+        """The most recent records (oldest first), optionally only from one source or above a level."""
+        records = [record for record in self.records
+                   if record.level >= level and (source is None or record.source == source)]
+        return records if count is None else records[-count:]
+
+    def clear(self):
+        self.records.clear()
+
+
+# Shared by every module. Warnings and errors are printed, like the prints they replace;
+# debug and info records are off until the level is lowered.
+tracer = Tracer(level=TraceLevel.WARNING, sinks=[ConsoleSink()])
@@ -0,0 +1,254 @@
+"""
+Turn Pipeline for Root Access
+
+Game.run_turn() used to be one long inline sequence (command, hazards, NPC
+behaviors, gang attacks, summaries). The only way to see which part of it was
+eating the turn was the headless simulator's profiler, and the only way to
+turn a part off was to edit the code.
+
+This module turns the sequence into a list of registered phases. Each phase is
+a named function that runs in order with the same per-turn context. Phases can
+be disabled, re-enabled and moved around while the game runs, other code can
+hook in before or after any phase, and every phase is timed. A new order
+takes effect from the next turn: the turn that is running (e.g. the command
+phase running "phases move") finishes in the order it started with.
+
+Key Components:
+--------------
+1. TurnContext: Per-turn data handed from phase to phase (command, args, output, ...)
+2. TurnPhase: One named stage of the turn, with its before/after hooks
+3. PhaseStats: Running timings for one phase (calls, total/max/last time, allocations)
+4. TurnPipeline: The ordered phases, the hooks and the stats
+
+Phase Handlers and Hooks:
+------------------------
+Handlers and hooks are called as fn(game, context). A phase can set
+context.stop = True to skip the rest of the turn (after hooks of that phase
+still run). Hooks run even when they are added by modules that know nothing
+about the phase's code, e.g.
+
+    game.turn_pipeline.add_hook('hazards', 'after', lambda game, context: ...)
+
+Timing:
+------
+Each phase records wall-clock time (time.perf_counter) and the net change in
+allocated memory blocks (sys.getallocatedblocks), which is cheap enough to run
+every turn and shows phases that keep building up objects.
+"""
+
+import sys
+import time
+
+
+class TurnContext:
+    """Everything the phases of one turn share."""
+
+    def __init__(self, command, args, cmd_entry):
+        self.command = command  # Command word the player typed
+        self.args = args  # Remaining words
+        self.cmd_entry = cmd_entry  # Entry from Game.commands
+        self.output = None  # What the command handler returned
+        self.stop = False  # Set by a phase to end the turn early
+        self.data = {}  # Free space for phases/hooks to pass things along
+
+
+class PhaseStats:
+    """Running timings for one phase."""
+
+    def __init__(self):
+        self.calls = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.last_seconds = 0.0
+        self.total_blocks = 0  # Net allocated blocks over all calls
+
+    def record(self, seconds, blocks=0):
+        self.calls += 1
+        self.total_seconds += seconds
+        self.last_seconds = seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+        self.total_blocks += blocks
+
+    @property
+    def mean_seconds(self):
+        return self.total_seconds / self.calls if self.calls else 0.0
+
+
+class TurnPhase:
+    """One named stage of the turn."""
+
+    def __init__(self, name, handler, description="", required=False):
+        self.name = name
+        self.handler = handler  # fn(game, context)
+        self.description = description
+        self.required = required  # Required phases can't be disabled
+        self.enabled = True
+        self.before_hooks = []  # fn(game, context), run before the handler
+        self.after_hooks = []  # fn(game, context), run after the handler
+
+
+class TurnPipeline:
+    """Runs the registered turn phases in order, with hooks and per-phase timing."""
+
+    def __init__(self):
+        self.phases = []  # TurnPhase objects in run order
+        self._by_name = {}  # name -> TurnPhase
+        self.stats = {}  # name -> PhaseStats
+        self.track_allocations = True
+
+    def register(self, name, handler, description="", required=False, before=None, after=None):
+        """
+        Add a phase. By default it goes at the end; before/after put it next to another phase.
+
+        Returns:
+            The new TurnPhase
+        """
+        if name in self._by_name:
+            raise ValueError(f"Turn phase '{name}' is already registered")
+        phase = TurnPhase(name, handler, description, required)
+        self._by_name[name] = phase
+        self.stats[name] = PhaseStats()
+        self.phases.insert(self._insert_index(before, after), phase)
+        return phase
+
+    def unregister(self, name):
+        """Remove a phase completely. Returns True if it was registered."""
+        phase = self._by_name.pop(name, None)
+        if phase is None:
+            return False
+        self.phases.remove(phase)
+        self.stats.pop(name, None)
+        return True
+
+    def get_phase(self, name):
+        return self._by_name.get(name)
+
+    def _insert_index(self, before, after):
+        if before is not None:
+            return self.phases.index(self._require(before))
+        if after is not None:
+            return self.phases.index(self._require(after)) + 1
+        return len(self.phases)
+
+    def _require(self, name):
+        phase = self._by_name.get(name)
+        if phase is None:
+            raise KeyError(f"No turn phase named '{name}'")
+        return phase
+
+    def set_enabled(self, name, enabled):
+        """Turn a phase on or off. Returns an error message, or None on success."""
+        phase = self._by_name.get(name)
+        if phase is None:
+            return f"No turn phase named '{name}'."
+        if not enabled and phase.required:
+            return f"The '{name}' phase is required and can't be disabled."
+        phase.enabled = enabled
+        return None
+
+    def move(self, name, before=None, after=None):
+        """Move a phase so it runs right before or after another one."""
+        phase = self._require(name)
+        if before == name or after == name:
+            return
+        self.phases.remove(phase)
+        self.phases.insert(self._insert_index(before, after), phase)
+
+    def set_order(self, names):
+        """Reorder phases. Phases not listed keep their relative order after the listed ones."""
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Turn phases listed more than once: {', '.join(duplicates)}")
+        listed = [self._require(name) for name in names]
+        rest = [phase for phase in self.phases if phase not in listed]
+        self.phases = listed + rest
+
+    def add_hook(self, name, when, hook):
+        """Run hook(game, context) before or after a phase ('before'/'after')."""
+        phase = self._require(name)
+        if when == 'before':
+            phase.before_hooks.append(hook)
+        elif when == 'after':
+            phase.after_hooks.append(hook)
+        else:
+            raise ValueError("Hook time must be 'before' or 'after'")
+
+    def remove_hook(self, name, when, hook):
+        phase = self._require(name)
+        hooks = phase.before_hooks if when == 'before' else phase.after_hooks
+        if hook in hooks:
+            hooks.remove(hook)
+
+    def record(self, name, seconds, blocks=0, profiler=None):
+        """
+        Record a timing for a phase (also used for work timed outside the pipeline).
+
+        The profiler is anything with record_phase(name, seconds), like the
+        headless simulator's TurnProfiler attached as game.turn_profiler.
+        """
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = PhaseStats()
+        stats.record(seconds, blocks)
+        if profiler is not None:
+            profiler.record_phase(name, seconds)
+
+    def run(self, game, context):
+        """Run every enabled phase in order. Returns the context."""
+        perf_counter = time.perf_counter
+        profiler = getattr(game, 'turn_profiler', None)
+        allocated_blocks = sys.getallocatedblocks if self.track_allocations else None
+        # The order at the start of the turn (phases can be moved while the turn runs)
+        for phase in tuple(self.phases):
+            if not phase.enabled:
+                continue
+            blocks_before = allocated_blocks() if allocated_blocks else 0
+            start = perf_counter()
+            for hook in phase.before_hooks:
+                hook(game, context)
+            if not context.stop:
+                phase.handler(game, context)
+            for hook in phase.after_hooks:
+                hook(game, context)
+            seconds = perf_counter() - start
+            blocks = allocated_blocks() - blocks_before if allocated_blocks else 0
+            self.record(phase.name, seconds, blocks, profiler)
+            if context.stop:
+                break
+        return context
+
+    def reset_stats(self):
+        for name in self.stats:
+            self.stats[name] = PhaseStats()
+
+    def format_stats(self):
+        """Format the phase timings as a table (in run order, extra timings last)."""
+        names = [phase.name for phase in self.phases]
+        names += [name for name in self.stats if name not in self._by_name]
+        total = sum(stats.total_seconds for stats in self.stats.values())
+
+        lines = [f"{'Phase':<18}{'Calls':>7}{'Mean ms':>10}{'Max ms':>10}{'Share':>8}{'Blocks/call':>13}"]
+        for name in names:
+            stats = self.stats.get(name)
+            if stats is None:
+                continue
+            phase = self._by_name.get(name)
+            label = name if phase is None or phase.enabled else f"{name} (off)"
+            share = (stats.total_seconds / total) * 100 if total else 0.0
+            blocks = stats.total_blocks / stats.calls if stats.calls else 0.0
+            lines.append(f"{label:<18}{stats.calls:>7}{stats.mean_seconds * 1000:>10.3f}"
+                         f"{stats.max_seconds * 1000:>10.3f}{share:>7.1f}%{blocks:>13.1f}")
+        return "\n".join(lines)
+
+    def format_phases(self):
+        """Format the phase order with on/off state and hook counts."""
+        lines = []
+        for index, phase in enumerate(self.phases, 1):
+            state = "on" if phase.enabled else "off"
+            if phase.required:
+                state += ", required"
+            hooks = len(phase.before_hooks) + len(phase.after_hooks)
+            hook_text = f", {hooks} hook{'s' if hooks != 1 else ''}" if hooks else ""
+            lines.append(f"{index:>2}. {phase.name:<16} ({state}{hook_text}) {phase.description}")
+        return "\n".join(lines)
@@ -0,0 +1,233 @@
+"""
+Turn Summary for Root Access
+
+The end-of-turn NPC summary used to be built by reading the turn's messages
+back several times: NPCMessageManager._create_summary sorted its buffer into a
+dozen categories by keyword, MessageCoordinator re-walked its own copies for
+hazard and action summaries, and convert_to_natural_language in main split
+the result into lines and sorted them by keyword again. The cost grew with
+messages x keywords x passes, every turn.
+
+This module counts what happened as the events arrive instead. Each event is
+added to a group keyed by (gang, action, hazard, item), which keeps a count,
+a few member names and the first message text. The summary is rendered from
+the groups in one pass, so the end-of-turn cost depends on how many different
+things happened, not on how many messages there were.
+
+Key Components:
+--------------
+1. SummaryGroup: The counters for one (gang, action, hazard, item) key
+2. SUMMARY_ACTIONS: How each message type is described and which section it goes in
+3. TurnSummary: The groups of one turn (or one message buffer) and the renderer
+
+Usage:
+-----
+    summary = TurnSummary()
+    summary.record_event(event)                         # NPCEvent from a behavior
+    summary.record("Buck", "Bloodhounds", "npc_idle", text="Buck is standing around.")
+    print(summary.render(rng.messaging))                # One natural-language paragraph
+    summary.clear()                                     # Next turn
+
+Actions are MessageCoordinator message types ("npc_idle", "npc_gift", ...).
+Unknown actions still get counted and are described by their first message.
+"""
+
+from message_templates import MessageTemplate
+
+
+# Fields the summary phrases can use: {hazard.name} (hazard object) and {item} (item name)
+SUMMARY_FIELDS = ('hazard', 'item')
+
+# Sections in the order they are told, most important first
+SECTIONS = ('combat', 'hazard', 'gardening', 'interaction', 'social', 'idle', 'other')
+_SECTION_RANK = {section: rank for rank, section in enumerate(SECTIONS)}
+
+
+class SummaryAction:
+    """How one action is described in the summary."""
+    __slots__ = ('section', 'keyed', 'plain')
+
+    def __init__(self, section, keyed, plain):
+        self.section = section
+        # {one|many} templates: keyed is used when the group has a hazard/item, plain otherwise
+        self.keyed = MessageTemplate(keyed, SUMMARY_FIELDS) if keyed else None
+        self.plain = MessageTemplate(plain, SUMMARY_FIELDS) if plain else None
+
+    def phrase(self, group, plural):
+        template = self.keyed if (self.keyed and (group.hazard is not None or group.item is not None)) else self.plain
+        if template is None:
+            return None
+        return template.render(plural, hazard=group.hazard, item=group.item)
+
+
+SUMMARY_ACTIONS = {
+    "npc_attack": SummaryAction("combat", None, None),  # Attacks are always told as they happened
+    "hazard_trigger": SummaryAction("hazard", "{triggers|trigger} the {hazard.name}", "{sets|set} off a hazard"),
+    "npc_hallucination_detail": SummaryAction(
+        "hazard", "{is|are} hallucinating from the {hazard.name}", "{is|are} hallucinating"),
+    "npc_hallucination": SummaryAction(
+        "hazard", "{is|are} hallucinating from the {hazard.name}", "{is|are} hallucinating"),
+    "npc_friendly": SummaryAction("hazard", None, "{is|are} acting unusually friendly"),
+    "npc_falling_object": SummaryAction("hazard", None, "{is|are} struck by falling objects"),
+    "npc_resist_hazard": SummaryAction(
+        "hazard", "{resists|resist} the {hazard.name}", "{resists|resist} a hazard effect"),
+    "npc_gift": SummaryAction("interaction", "{gives|give} you {item}", "{is|are} giving away items"),
+    "npc_gardening": SummaryAction("gardening", "{tends|tend} the {item}", "{is|are} tending to plants"),
+    "npc_interact": SummaryAction(
+        "interaction", "{is|are} interacting with the {item}", "{is|are} interacting with objects"),
+    "npc_item_search": SummaryAction(
+        "interaction", "{is|are} looking for the {item}", "{is|are} looking for something"),
+    "npc_talk": SummaryAction("social", None, "{is talking|are talking to each other}"),
+    "npc_idle": SummaryAction("idle", None, "{is|are} standing around"),
+}
+
+# Fallback for actions without an entry (hazard effects without a message type, plain text)
+OTHER_ACTION = SummaryAction("other", "{is|are} affected by the {hazard.name}", "{is|are} keeping busy")
+
+
+class SummaryGroup:
+    """Counters for everything one gang did with one action (and hazard/item) this turn."""
+    __slots__ = ('gang', 'action', 'hazard', 'item', 'count', 'members', 'sample', 'texts', 'order')
+
+    MAX_TEXTS = 2  # Texts kept per group (told as-is for single NPCs and attacks, NPCEvents rendered then)
+
+    def __init__(self, gang, action, hazard, item, order):
+        self.gang = gang
+        self.action = action
+        self.hazard = hazard
+        self.item = item
+        self.count = 0  # Events in this group
+        self.members = set()  # Every distinct NPC name (for the "and N others" count)
+        self.sample = []  # The first few NPC names, in the order they came in
+        self.texts = []  # The first few message texts or NPCEvents
+        self.order = order  # When the group was created (keeps the summary in event order)
+
+    def add(self, npc_name, text, max_names):
+        self.count += 1
+        if npc_name is not None and npc_name not in self.members:
+            self.members.add(npc_name)
+            if len(self.sample) < max_names:
+                self.sample.append(npc_name)
+        if text and len(self.texts) < self.MAX_TEXTS:
+            self.texts.append(text)
+
+
+class TurnSummary:
+    """Per-turn counters keyed by (gang, action, hazard, item), rendered as one paragraph."""
+
+    MAX_NAMES = 3  # Names listed before "and N others"
+    MAX_SENTENCES = 6  # Sentences in the rendered summary (after the intro)
+    CONNECTORS = ["Meanwhile, ", "At the same time, ", "Nearby, ", "Elsewhere, ", "Also, "]
+
+    def __init__(self, actions=None):
+        # Custom action descriptions (None = SUMMARY_ACTIONS, looked up when
+        # rendering so saved games don't carry a copy of the table)
+        self.actions = actions
+        self.groups = {}  # (gang, action, hazard, item) -> SummaryGroup
+        self.gang_counts = {}  # gang name -> events (in first-seen order)
+        self.total = 0
+
+    def __len__(self):
+        return self.total
+
+    def __bool__(self):
+        return self.total > 0
+
+    def clear(self):
+        self.groups.clear()
+        self.gang_counts.clear()
+        self.total = 0
+
+    def record(self, npc_name, gang_name, action, hazard=None, item=None, text=None):
+        """Count one thing an NPC did. O(1)."""
+        key = (gang_name, action, hazard, item)
+        group = self.groups.get(key)
+        if group is None:
+            group = self.groups[key] = SummaryGroup(gang_name, action, hazard, item, len(self.groups))
+        group.add(npc_name, text, self.MAX_NAMES)
+        if gang_name is not None:
+            self.gang_counts[gang_name] = self.gang_counts.get(gang_name, 0) + 1
+        self.total += 1
+
+    def record_event(self, event, action=None, text=None):
+        """Count an NPCEvent (its message type is the action unless one is given). It is only rendered if it is told."""
+        self.record(event.npc_name, event.gang_name, action or event.message_type or event.action_type,
+                    hazard=event.hazard, item=event.item_name,
+                    text=text if text is not None else event)
+
+    @property
+    def active_gangs(self):
+        """Gangs that did something, in the order they were first seen."""
+        return list(self.gang_counts)
+
+    def _action(self, group):
+        actions = self.actions if self.actions is not None else SUMMARY_ACTIONS
+        return actions.get(group.action, OTHER_ACTION)
+
+    def _describe(self, group):
+        """One sentence for a group, or None if it can't be described."""
+        action = self._action(group)
+        members = len(group.members)
+        # One NPC (or an unnamed event): its own message says it best
+        if members <= 1:
+            return str(group.texts[0]) if group.texts else None
+
+        phrase = action.phrase(group, plural=True)
+        if phrase is None:
+            return str(group.texts[0]) if group.texts else None
+        names = ", ".join(group.sample[:-1]) + " and " + group.sample[-1] if members <= self.MAX_NAMES \
+            else ", ".join(group.sample) + f" and {members - len(group.sample)} others"
+        return f"{names} {phrase}."
+
+    def lines(self):
+        """
+        Get the summary sentences, most important sections first.
+
+        Attacks are listed one by one (up to the text kept per group); every
+        other group becomes a single sentence.
+        """
+        ordered = sorted(self.groups.values(), key=lambda group: (
+            _SECTION_RANK[self._action(group).section], -group.count, group.order))
+        lines = []
+        for group in ordered:
+            if len(lines) >= self.MAX_SENTENCES:
+                break
+            if self._action(group).section == "combat":
+                lines.extend(str(text) for text in group.texts[:self.MAX_SENTENCES - len(lines)])
+                continue
+            sentence = self._describe(group)
+            if sentence:
+                lines.append(sentence)
+        return lines
+
+    def intro(self):
+        gangs = self.active_gangs
+        if len(gangs) == 1:
+            return f"The {gangs[0]} are active in the area."
+        if gangs:
+            return f"Multiple gangs ({', '.join(gangs)}) are active in the area."
+        return "NPCs are active in the area."
+
+    def render(self, generator):
+        """
+        Render the turn as one natural-language paragraph.
+
+        Args:
+            generator: Random stream used to pick the connecting phrases
+
+        Returns:
+            The paragraph, or None if nothing was recorded
+        """
+        if not self.total:
+            return None
+        parts = [self.intro()]
+        for index, line in enumerate(self.lines()):
+            if index:
+                # "The Hacked Milk ..." reads better as "Meanwhile, the Hacked Milk ..."
+                if line.startswith("The "):
+                    line = "the " + line[4:]
+                line = generator.choice(self.CONNECTORS) + line
+            if not line.endswith(('.', '!', '?', "'")):
+                line += '.'
+            parts.append(line)
+        return " ".join(parts)
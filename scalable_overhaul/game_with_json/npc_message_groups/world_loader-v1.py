@@ -0,0 +1,527 @@
+"""
+World Loader for Root Access
+
+The world used to be built by four Game methods (create_items, create_areas,
+create_objects, create_npcs) full of hand-written constructor calls, so
+adding an area or moving an item meant editing main.py, and a typo in an
+area or item name just made add_item_to_area() quietly do nothing (Jack was
+never placed at the fuel station because he was added before he existed).
+
+This module reads the world from a data file (world.json, or a .toml file
+with the same layout) instead. Every reference in the file (exits, items
+placed in areas, storage contents, NPCs, gang areas, the player's start) is
+checked once before anything is built, and all the problems are reported
+together in one WorldError.
+
+Building the world (checking constructor fields, creating every object,
+placing it) is then cached: the built world is pickled into a binary file
+next to the source (world.json -> world.json.worldcache). While the world is
+pickled, every module the pickle refers to (the world's classes, the plant
+beds in soil objects, item prototypes, ...) is recorded. The cache header
+lists those modules and holds a SHA-256 of the source file, this loader and
+all of them, so editing any of them rebuilds the cache on the next start. A
+cache that can't be read or written is simply ignored.
+
+Key Components:
+--------------
+1. WorldError: Every problem found in a world file, reported together
+2. WorldTypes: Which class each "type" name in the file creates (given by main)
+3. WorldBuilder: Checks a world file's data and builds the world from it
+4. World: The built world (registries, the player's start, gang members to generate)
+5. load_world: Reads a world file, using the cache when it is up to date
+
+World File Layout:
+-----------------
+    items:    name -> {type, description, value, ...}   (fields are the class's constructor arguments)
+    objects:  name -> {type, description, ..., items: [...]}   (items only for storage)
+    areas:    key  -> {name, description, exits: {direction: area key},
+                       items: [...], objects: [...], npcs: [...]}
+    npcs:     name -> {type, description}
+    gangs:    name -> {area, member_description, members: [...],
+                       name_variations: [...], starting_items: [...]}
+    player:   {area, items: [...]}
+
+"name" defaults to the entry's key. An item list can hold registered item
+names or inline definitions ({"type": "weapon", "name": "Gun", ...}). The
+first time a registered item is placed it is the registered item itself,
+after that every placement gets its own copy. A watering can can start
+filled with "fill_with": substance name.
+
+Gang members with name variations are made when the game starts (not cached),
+because the variations come from the game's worldgen random stream.
+
+Usage:
+-----
+    world = load_world("world.json", WORLD_TYPES)
+    world.add_name_variations(rng.worldgen, GangMember)
+    game.areas, game.items = world.areas, world.items
+"""
+
+import io
+import os
+import sys
+import json
+import struct
+import pickle
+import inspect
+import hashlib
+import importlib
+from types import FunctionType, BuiltinFunctionType
+
+try:
+    import tomllib  # Python 3.11+
+except ImportError:
+    tomllib = None
+
+
+MAGIC = b'RAWC'
+FORMAT_VERSION = 2
+EXTENSION = ".worldcache"
+
+# Magic, format version, fingerprint, length of the module list that follows
+_HEADER = struct.Struct('<4sH32sI')
+
+# Keys in an entry that aren't constructor arguments
+ITEM_KEYS = {'type', 'name', 'fill_with'}
+OBJECT_KEYS = {'type', 'name', 'items'}
+NPC_KEYS = {'type', 'name'}
+AREA_KEYS = {'name', 'description', 'exits', 'items', 'objects', 'npcs'}
+GANG_KEYS = {'area', 'member_description', 'members', 'name_variations', 'starting_items'}
+PLAYER_KEYS = {'area', 'items'}
+
+
+class WorldError(Exception):
+    """Raised when a world file can't be read or has problems (all of them are listed)."""
+
+    def __init__(self, path, problems):
+        self.path = path
+        self.problems = list(problems)
+        lines = [f"{os.path.basename(path)} has {len(self.problems)} problem(s):"]
+        lines.extend(f"  - {problem}" for problem in self.problems)
+        super().__init__("\n".join(lines))
+
+
+class WorldTypes:
+    """
+    The classes a world file can create, by the "type" names it uses.
+
+    main passes these in so this module never has to import main (which may be
+    running as __main__, with its own copies of the classes).
+    """
+
+    def __init__(self, items, objects, npcs, substances, area, gang, gang_member):
+        self.items = items  # type name -> item class
+        self.objects = objects  # type name -> object class
+        self.npcs = npcs  # type name -> NPC class
+        self.substances = substances  # substance name -> class (for fill_with)
+        self.area = area
+        self.gang = gang
+        self.gang_member = gang_member
+
+    def classes(self):
+        """Every class the world can contain."""
+        yield from self.items.values()
+        yield from self.objects.values()
+        yield from self.npcs.values()
+        yield from self.substances.values()
+        yield self.area
+        yield self.gang
+        yield self.gang_member
+
+
+def _constructor_fields(cls):
+    """Get (all argument names, required argument names) of a class's constructor."""
+    parameters = list(inspect.signature(cls.__init__).parameters.values())[1:]  # Skip self
+    names = {p.name for p in parameters if p.kind in (p.POSITIONAL_OR_KEYWORD, p.KEYWORD_ONLY)}
+    required = {p.name for p in parameters
+                if p.name in names and p.default is inspect.Parameter.empty}
+    return names, required
+
+
+class World:
+    """A built world: the game's registries plus what the player starts with."""
+
+    def __init__(self):
+        self.areas = {}  # area key -> Area (in file order)
+        self.items = {}  # item name -> registered Item
+        self.objects = {}  # object name -> registered object
+        self.npcs = {}  # NPC name -> NPC
+        self.gangs = {}  # gang name -> Gang
+        self.player_area = None
+        self.player_items = []
+        # Exits are connected after loading (see connect_exits) so the cache
+        # doesn't have to follow a long chain of areas to pickle one
+        self.exits = []  # (area key, direction, area key)
+        # Gang members still to generate: (gang, area, description, names, variations, starting items)
+        self.name_variations = []
+
+    def connect_exits(self):
+        for area_key, direction, target_key in self.exits:
+            self.areas[area_key].add_exit(direction, self.areas[target_key])
+
+    def add_name_variations(self, random, member_class):
+        """
+        Add the gang members whose names are variations of the listed ones.
+
+        Each listed name loses its last letter and gets a random suffix
+        ("Buck" -> "Bucoodle"), drawn from random (the game's worldgen stream).
+        """
+        for gang, area, description, names, variations, starting_items in self.name_variations:
+            for name in names:
+                variation = random.choice(variations)
+                member = member_class(name[:-1] + variation, description, gang)
+                for item in starting_items:
+                    member.add_item(item.copy())
+                self.npcs[member.name] = member
+                if area is not None:
+                    area.add_npc(member)
+        self.name_variations = []
+
+
+class WorldBuilder:
+    """Checks a world file's data and builds a World from it."""
+
+    def __init__(self, data, types, path="world"):
+        self.data = data
+        self.types = types
+        self.path = path
+        self.problems = []
+        self._fields = {}  # class -> constructor fields (signatures are slow to inspect)
+
+    # ------------------------------------------------------------------
+    # Checking
+    # ------------------------------------------------------------------
+
+    def _section(self, name, expected=dict):
+        value = self.data.get(name, expected())
+        if not isinstance(value, expected):
+            self.problems.append(f"'{name}' should be a {'table' if expected is dict else 'list'}")
+            return expected()
+        return value
+
+    def _check_fields(self, where, entry, classes, extra_keys, inline=False):
+        """Check an entry's type and that its fields match the class constructor."""
+        if not isinstance(entry, dict):
+            self.problems.append(f"{where}: should be a table of fields")
+            return None
+        type_name = entry.get('type')
+        cls = classes.get(type_name)
+        if cls is None:
+            self.problems.append(f"{where}: unknown type {type_name!r} (expected one of {', '.join(sorted(classes))})")
+            return None
+        if cls not in self._fields:
+            self._fields[cls] = _constructor_fields(cls)
+        names, required = self._fields[cls]
+        for key in entry:
+            if key not in names and key not in extra_keys:
+                self.problems.append(f"{where}: {type_name} has no field {key!r}")
+        # Entries in a table are named by their key; inline items need a name
+        # unless the class has a default one ("Watering Can")
+        for key in (required if inline else required - {'name'}):
+            if key not in entry:
+                self.problems.append(f"{where}: missing {key!r}")
+        if 'fill_with' in entry:
+            if not hasattr(cls, 'fill_with'):
+                self.problems.append(f"{where}: a {type_name} can't be filled")
+            elif entry['fill_with'] not in self.types.substances:
+                self.problems.append(f"{where}: unknown substance {entry['fill_with']!r}")
+        if 'items' in entry and not hasattr(cls, 'add_item'):
+            self.problems.append(f"{where}: a {type_name} can't hold items")
+        return cls
+
+    def _check_item_list(self, where, entries, items):
+        if not isinstance(entries, list):
+            self.problems.append(f"{where}: should be a list")
+            return
+        for entry in entries:
+            if isinstance(entry, dict):
+                self._check_fields(f"{where} ({entry.get('name', 'inline item')})", entry, self.types.items,
+                                   ITEM_KEYS, inline=True)
+            elif entry not in items:
+                self.problems.append(f"{where}: unknown item {entry!r}")
+
+    def _check_keys(self, where, entry, allowed):
+        if not isinstance(entry, dict):
+            self.problems.append(f"{where}: should be a table")
+            return False
+        for key in entry:
+            if key not in allowed:
+                self.problems.append(f"{where}: unknown key {key!r}")
+        return True
+
+    def check(self):
+        """Check the whole file and raise a WorldError listing every problem found."""
+        items = self._section('items')
+        objects = self._section('objects')
+        areas = self._section('areas')
+        npcs = self._section('npcs')
+        gangs = self._section('gangs')
+        player = self._section('player')
+
+        for name, entry in items.items():
+            self._check_fields(f"items.{name}", entry, self.types.items, ITEM_KEYS)
+        for name, entry in objects.items():
+            self._check_fields(f"objects.{name}", entry, self.types.objects, OBJECT_KEYS)
+            if isinstance(entry, dict) and 'items' in entry:
+                self._check_item_list(f"objects.{name}.items", entry['items'], items)
+        for name, entry in npcs.items():
+            self._check_fields(f"npcs.{name}", entry, self.types.npcs, NPC_KEYS)
+
+        placed_objects = {}
+        placed_npcs = {}
+        for key, area in areas.items():
+            where = f"areas.{key}"
+            if not self._check_keys(where, area, AREA_KEYS):
+                continue
+            if 'description' not in area:
+                self.problems.append(f"{where}: missing 'description'")
+            exits = area.get('exits', {})
+            if not isinstance(exits, dict):
+                self.problems.append(f"{where}.exits: should be a table of direction -> area")
+            else:
+                for direction, target in exits.items():
+                    if target not in areas:
+                        self.problems.append(f"{where}.exits.{direction}: unknown area {target!r}")
+            self._check_item_list(f"{where}.items", area.get('items', []), items)
+            for name in area.get('objects', []):
+                if name not in objects:
+                    self.problems.append(f"{where}.objects: unknown object {name!r}")
+                elif name in placed_objects:
+                    self.problems.append(f"{where}.objects: {name!r} is already in {placed_objects[name]}")
+                else:
+                    placed_objects[name] = key
+            for name in area.get('npcs', []):
+                if name not in npcs:
+                    self.problems.append(f"{where}.npcs: unknown NPC {name!r}")
+                elif name in placed_npcs:
+                    self.problems.append(f"{where}.npcs: {name!r} is already in {placed_npcs[name]}")
+                else:
+                    placed_npcs[name] = key
+
+        for name, gang in gangs.items():
+            where = f"gangs.{name}"
+            if not self._check_keys(where, gang, GANG_KEYS):
+                continue
+            if gang.get('area') is not None and gang['area'] not in areas:
+                self.problems.append(f"{where}: unknown area {gang['area']!r}")
+            for item_name in gang.get('starting_items', []):
+                if item_name not in items:
+                    self.problems.append(f"{where}.starting_items: unknown item {item_name!r}")
+            for member in gang.get('members', []):
+                if member in npcs:
+                    self.problems.append(f"{where}.members: {member!r} is also in npcs")
+            if gang.get('name_variations') == []:
+                self.problems.append(f"{where}.name_variations: should have at least one suffix")
+
+        if self._check_keys("player", player, PLAYER_KEYS):
+            if player.get('area') not in areas:
+                self.problems.append(f"player: unknown start area {player.get('area')!r}")
+            self._check_item_list("player.items", player.get('items', []), items)
+
+        if self.problems:
+            raise WorldError(self.path, self.problems)
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    def _create(self, name, entry, classes, extra_keys):
+        cls = classes[entry['type']]
+        fields = {key: value for key, value in entry.items() if key not in extra_keys}
+        name = entry.get('name', name)
+        if name is not None:
+            fields['name'] = name
+        return cls(**fields)
+
+    def _create_item(self, name, entry):
+        item = self._create(name, entry, self.types.items, ITEM_KEYS)
+        if 'fill_with' in entry:
+            item.fill_with(self.types.substances[entry['fill_with']]())
+        return item
+
+    def _place_item(self, world, entry, placed):
+        """Get the item for one entry of an item list (see the module docstring)."""
+        if isinstance(entry, dict):
+            return self._create_item(None, entry)
+        if entry not in placed:
+            placed.add(entry)
+            return world.items[entry]
+        return world.items[entry].copy()
+
+    def build(self):
+        """Check the data and build the World."""
+        self.check()
+        data = self.data
+        world = World()
+        placed = set()  # Registered items that have been placed once already
+
+        for name, entry in data.get('items', {}).items():
+            world.items[name] = self._create_item(name, entry)
+
+        for key, entry in data.get('areas', {}).items():
+            world.areas[key] = self.types.area(entry.get('name', key), entry['description'])
+            for direction, target in entry.get('exits', {}).items():
+                world.exits.append((key, direction, target))
+
+        for name, entry in data.get('objects', {}).items():
+            obj = self._create(name, entry, self.types.objects, OBJECT_KEYS)
+            for item_entry in entry.get('items', []):
+                obj.add_item(self._place_item(world, item_entry, placed))
+            world.objects[name] = obj
+
+        for name, entry in data.get('npcs', {}).items():
+            world.npcs[name] = self._create(name, entry, self.types.npcs, NPC_KEYS)
+
+        for key, entry in data.get('areas', {}).items():
+            area = world.areas[key]
+            for item_entry in entry.get('items', []):
+                area.add_item(self._place_item(world, item_entry, placed))
+            for name in entry.get('objects', []):
+                area.add_object(world.objects[name])
+            for name in entry.get('npcs', []):
+                area.add_npc(world.npcs[name])
+
+        for name, entry in data.get('gangs', {}).items():
+            gang = world.gangs[name] = self.types.gang(name)
+            area = world.areas.get(entry.get('area'))
+            description = entry.get('member_description', "A member of the {gang} gang.").format(gang=gang.name)
+            starting_items = [world.items[item_name] for item_name in entry.get('starting_items', [])]
+            for member_name in entry.get('members', []):
+                member = self.types.gang_member(member_name, description, gang)
+                for item in starting_items:
+                    member.add_item(item.copy())
+                world.npcs[member_name] = member
+                if area is not None:
+                    area.add_npc(member)
+            if entry.get('name_variations'):
+                world.name_variations.append((gang, area, description, list(entry.get('members', [])),
+                                              list(entry['name_variations']), starting_items))
+
+        player = data.get('player', {})
+        world.player_area = player.get('area')
+        world.player_items = [self._place_item(world, entry, placed) for entry in player.get('items', [])]
+        return world
+
+
+def read_world_data(path, source=None):
+    """Parse a world file (.json or .toml) into plain data, raising WorldError if it can't be read."""
+    try:
+        if source is None:
+            with open(path, "rb") as f:
+                source = f.read()
+        if path.endswith(".toml"):
+            if tomllib is None:
+                raise WorldError(path, ["TOML world files need Python 3.11 or newer (use a .json file)"])
+            return tomllib.loads(source.decode("utf-8"))
+        return json.loads(source)
+    except WorldError:
+        raise
+    except (OSError, ValueError) as e:
+        # tomllib.TOMLDecodeError and json.JSONDecodeError are both ValueErrors
+        raise WorldError(path, [str(e)]) from e
+
+
+class _ModuleRecorder(pickle.Pickler):
+    """Pickler that records the module of every class and function the pickle refers to."""
+
+    def __init__(self, file):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.modules = set()
+
+    def reducer_override(self, obj):
+        if isinstance(obj, (type, FunctionType, BuiltinFunctionType)):
+            module = getattr(obj, '__module__', None)
+        else:
+            module = type(obj).__module__  # Instances are rebuilt from their class
+        if module:
+            self.modules.add(module)
+        return NotImplemented  # Pickle it the normal way
+
+
+def _fingerprint(source, module_names):
+    """Hash of the world file plus the code of this loader and the modules the pickled world refers to."""
+    digest = hashlib.sha256(source)
+    digest.update(str(FORMAT_VERSION).encode())
+    for name in sorted(set(module_names) | {__name__}):  # This loader builds the world too
+        # The module name matters too: classes pickled from __main__ only load in __main__
+        digest.update(name.encode())
+        module = sys.modules.get(name)
+        if module is None:
+            try:
+                module = importlib.import_module(name)
+            except ImportError:
+                digest.update(b"missing")  # Gone since the cache was written
+                continue
+        path = getattr(module, '__file__', None)
+        if path:
+            try:
+                with open(path, "rb") as f:
+                    digest.update(f.read())
+            except OSError:
+                pass
+    return digest.digest()
+
+
+def _read_cache(path, source):
+    """Get the cached World if the cache file was built from this exact source and code (None otherwise)."""
+    try:
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return None
+            magic, version, digest, names_size = _HEADER.unpack(header)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                return None
+            module_names = f.read(names_size).decode("utf-8").split("\n")
+            if digest != _fingerprint(source, module_names):
+                return None
+            return pickle.load(f)
+    except Exception:
+        # Missing, truncated or from code that no longer matches: build from the source instead
+        return None
+
+
+def _write_cache(path, source, world):
+    """Write the cache under a temporary name and move it into place (skipped if the folder is read-only)."""
+    temp_path = path + ".tmp"
+    try:
+        # Pickle first: the fingerprint covers the modules the pickle turns out to refer to
+        data = io.BytesIO()
+        pickler = _ModuleRecorder(data)
+        pickler.dump(world)
+        module_names = sorted(pickler.modules)
+        names = "\n".join(module_names).encode("utf-8")
+        with open(temp_path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, _fingerprint(source, module_names), len(names)))
+            f.write(names)
+            f.write(data.getbuffer())
+        os.replace(temp_path, path)
+    except (OSError, pickle.PicklingError, RecursionError):
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+
+def load_world(path, types, use_cache=True):
+    """
+    Load the world from a world file, from its cache when the cache is up to date.
+
+    Raises WorldError if the file can't be read or has problems. The returned
+    World's exits are connected; gang name variations still have to be added
+    with World.add_name_variations().
+    """
+    try:
+        with open(path, "rb") as f:
+            source = f.read()
+    except OSError as e:
+        raise WorldError(path, [str(e)]) from e
+
+    cache_path = path + EXTENSION
+    world = _read_cache(cache_path, source) if use_cache else None
+    if world is None:
+        world = WorldBuilder(read_world_data(path, source), types, path).build()
+        if use_cache:
+            _write_cache(cache_path, source, world)
+    world.connect_exits()
+    return world